@@ -0,0 +1,222 @@
+"""FakeBotAPI — an in-process stand-in for the Telegram Bot API.
+
+Serves the methods the bot uses (getMe, getUpdates long polling, setWebhook /
+deleteWebhook, sendMessage, editMessageText, sendChatAction, sendDocument) on
+`src.http_server.HTTPServer`. `inject()` delivers a user message the way
+Telegram would: pushed to the registered webhook (with its secret token), or
+queued for the next getUpdates call. Every outgoing bot message is recorded
+with a monotonic timestamp in `sent`.
+
+With `flood=(global_rate, chat_rate)`, message methods are held to those
+rates per second the way Telegram's flood control does (a second's worth of
+burst globally, FLOOD_CHAT_BURST calls per chat): over the limit, a 429 with
+`retry_after` instead of the call.
+
+    api = await FakeBotAPI("123:abc").start()
+    config = replace(config, telegram_api_url=api.url)
+"""
+import asyncio
+import itertools
+import json
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from urllib.parse import parse_qs
+
+import httpx
+
+from src.constants import WEBHOOK_SECRET_HEADER
+from src.http_server import HTTPServer, Request, Response
+from src.telegram.ratelimit import TokenBucket, endpoint_lane
+
+UPLOAD_LIMIT = 50 * 1024 * 1024
+FLOOD_CHAT_BURST = 3.0
+BOT_USER = {"id": 1, "is_bot": True, "first_name": "Fake", "username": "fake_bot"}
+
+
+@dataclass(frozen=True, slots=True)
+class Sent:
+    at: float  # time.monotonic()
+    method: str
+    chat_id: int
+    text: str
+
+
+def _params(request: Request) -> dict:
+    """PTB posts form fields whose non-string values are JSON-encoded."""
+    def decode(value: str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+
+    match request.headers.get("content-type", "").split(";")[0]:
+        case "application/json":
+            return json.loads(request.body or b"{}")
+        case "multipart/form-data":
+            # file uploads: only the plain fields matter here
+            fields = re.findall(rb'name="(\w+)"\r\n\r\n([^\r]*)\r\n', request.body)
+            return {k.decode(): decode(v.decode()) for k, v in fields}
+        case _:
+            fields = parse_qs(request.body.decode(), keep_blank_values=True)
+            return {k: decode(v[-1]) for k, v in fields.items()}
+
+
+def _ok(result) -> Response:
+    return Response(body=json.dumps({"ok": True, "result": result}).encode(), content_type="application/json")
+
+
+def _too_many(retry_after: int) -> Response:
+    body = {
+        "ok": False,
+        "error_code": 429,
+        "description": f"Too Many Requests: retry after {retry_after}",
+        "parameters": {"retry_after": retry_after},
+    }
+    return Response(429, json.dumps(body).encode(), "application/json")
+
+
+class FakeBotAPI:
+
+    def __init__(
+        self, token: str, latency: float = 0.0, flood: tuple[float, float] | None = None
+    ) -> None:
+        self._token = token
+        self._latency = latency   # simulated Bot API service time per call
+        self._flood = flood
+        self._buckets: dict[str, TokenBucket] = {}
+        self.flooded = 0
+        self._ids = itertools.count(1)
+        self._updates: asyncio.Queue[dict] = asyncio.Queue()
+        self._http = httpx.AsyncClient()
+        self.webhook: tuple[str, str] | None = None   # (url, secret)
+        self.sent: list[Sent] = []
+        self.calls: dict[str, int] = {}
+        self.on_sent: Callable[[Sent], None] | None = None
+        methods = {
+            "getMe": self._get_me,
+            "getUpdates": self._get_updates,
+            "setWebhook": self._set_webhook,
+            "deleteWebhook": self._delete_webhook,
+            "sendMessage": self._send_message,
+            "editMessageText": self._edit_message,
+            "sendChatAction": self._true,
+            "sendDocument": self._send_document,
+        }
+        self._server = HTTPServer(
+            {("POST", f"/bot{token}/{name}"): self._counted(name, fn) for name, fn in methods.items()},
+            max_body=UPLOAD_LIMIT,
+        )
+
+    @property
+    def url(self) -> str:
+        return self._server.url
+
+    async def start(self) -> "FakeBotAPI":
+        await self._server.start()
+        return self
+
+    async def stop(self) -> None:
+        await self._server.stop()
+        await self._http.aclose()
+
+    def _counted(self, name: str, fn: Callable) -> Callable:
+        async def handle(request: Request) -> Response:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            await asyncio.sleep(self._latency)
+            params = _params(request)
+            match (self._flood, endpoint_lane(name)):
+                case (None, _) | (_, None):
+                    return await fn(params)
+                case ((global_rate, chat_rate), _):
+                    retry = self._over_limit(str(params.get("chat_id")), global_rate, chat_rate)
+            match retry:
+                case 0:
+                    return await fn(params)
+                case _:
+                    self.flooded += 1
+                    return _too_many(retry)
+        return handle
+
+    def _over_limit(self, chat_id: str, global_rate: float, chat_rate: float) -> int:
+        """0 when the call fits, else the whole seconds to wait (as Telegram reports them)."""
+        now = time.monotonic()
+        buckets = [
+            self._buckets.setdefault("*", TokenBucket(global_rate, max(1.0, global_rate))),
+            self._buckets.setdefault(chat_id, TokenBucket(chat_rate, FLOOD_CHAT_BURST)),
+        ]
+        match max(b.eta(now) for b in buckets):
+            case 0.0:
+                list(map(lambda b: setattr(b, "tokens", b.tokens - 1), buckets))
+                return 0
+            case wait:
+                return max(1, round(wait))
+
+    def _message(self, chat_id: int, text: str, from_user: dict | None = None) -> dict:
+        return {
+            "message_id": next(self._ids),
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": from_user or BOT_USER,
+            "text": text,
+        }
+
+    def _record(self, method: str, params: dict) -> dict:
+        sent = Sent(time.monotonic(), method, int(params["chat_id"]), str(params.get("text", "")))
+        self.sent.append(sent)
+        match self.on_sent:
+            case None:
+                pass
+            case callback:
+                callback(sent)
+        return self._message(sent.chat_id, sent.text)
+
+    async def _get_me(self, params: dict) -> Response:
+        return _ok(BOT_USER)
+
+    async def _true(self, params: dict) -> Response:
+        return _ok(True)
+
+    async def _get_updates(self, params: dict) -> Response:
+        try:
+            first = await asyncio.wait_for(self._updates.get(), float(params.get("timeout") or 0) or 0.01)
+        except asyncio.TimeoutError:
+            return _ok([])
+        batch = [first]
+        while not self._updates.empty():
+            batch.append(self._updates.get_nowait())
+        return _ok(batch)
+
+    async def _set_webhook(self, params: dict) -> Response:
+        self.webhook = (params["url"], params.get("secret_token", ""))
+        return _ok(True)
+
+    async def _delete_webhook(self, params: dict) -> Response:
+        self.webhook = None
+        return _ok(True)
+
+    async def _send_message(self, params: dict) -> Response:
+        return _ok(self._record("sendMessage", params))
+
+    async def _edit_message(self, params: dict) -> Response:
+        return _ok(self._record("editMessageText", params))
+
+    async def _send_document(self, params: dict) -> Response:
+        return _ok(self._record("sendDocument", params))
+
+    async def inject(self, chat_id: int, text: str) -> float:
+        """Deliver a user message as Telegram would; returns the monotonic send time."""
+        update_id = next(self._ids)
+        user = {"id": chat_id, "is_bot": False, "first_name": "User"}
+        update = {"update_id": update_id, "message": self._message(chat_id, text, user)}
+        started = time.monotonic()
+        match self.webhook:
+            case None:
+                self._updates.put_nowait(update)
+            case (url, secret):
+                response = await self._http.post(
+                    url, json=update, headers={WEBHOOK_SECRET_HEADER: secret}
+                )
+                response.raise_for_status()
+        return started
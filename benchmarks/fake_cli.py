@@ -0,0 +1,139 @@
+"""Fake `claude` / `agent` executables for load tests — stdlib only, no src imports.
+
+    FAKE_CLI_DELAY=0.3 FAKE_CLI_TOKENS=200 FAKE_CLI_RATE=50 python benchmarks/fake_cli.py -p hi --output-format stream-json
+
+Speaks as much of both CLIs as MessageRouter and ClaudeWorkerPool use:
+
+    create-chat                          prints a new chat id (agent)
+    -p MSG --output-format json          one result object once the reply is done (claude, buffered)
+    -p MSG --output-format stream-json   an assistant event per FAKE_CLI_CHUNK words, then the result
+      + --include-partial-messages       a stream_event text delta per word as well
+    --input-format stream-json           worker: one turn per stdin line until EOF
+    -p MSG                               the reply as plain text (agent, resumed claude)
+
+Every process waits FAKE_CLI_DELAY seconds (startup and session load) before
+its first output; a reply is FAKE_CLI_TOKENS words produced at FAKE_CLI_RATE
+words per second (0 = all at once) and ends with the prompt, so a caller can
+tell which request a reply answers. `install()` writes `claude` and `agent`
+wrappers with those settings baked in.
+"""
+import json
+import os
+import shlex
+import sys
+import time
+import uuid
+from pathlib import Path
+
+CHUNK = int(os.environ.get("FAKE_CLI_CHUNK", "20"))
+
+
+def _settings() -> tuple[float, int, float]:
+    return (
+        float(os.environ.get("FAKE_CLI_DELAY", "0.3")),
+        int(os.environ.get("FAKE_CLI_TOKENS", "200")),
+        float(os.environ.get("FAKE_CLI_RATE", "50")),
+    )
+
+
+def _flag(args: list[str], name: str) -> str | None:
+    match args.index(name) if name in args else None:
+        case int() as at if at + 1 < len(args):
+            return args[at + 1]
+        case _:
+            return None
+
+
+def _emit(event: dict) -> None:
+    sys.stdout.write(json.dumps(event) + "\n")
+    sys.stdout.flush()
+
+
+def _words(prompt: str, tokens: int) -> list[str]:
+    return [f"word{n}" for n in range(tokens)] + [prompt]
+
+
+def _produce(words: list[str], rate: float, on_word) -> None:
+    """Call `on_word(index, word)` for each word, paced at `rate` per second."""
+    pause = 1 / rate if rate > 0 else 0.0
+    index = 0
+    while index < len(words):
+        time.sleep(pause)
+        on_word(index, words[index])
+        index += 1
+
+
+def _assistant(text: str) -> dict:
+    return {"type": "assistant", "message": {"role": "assistant", "content": [{"type": "text", "text": text}]}}
+
+
+def _stream_turn(prompt: str, session: str, partial: bool, tokens: int, rate: float) -> None:
+    words = _words(prompt, tokens)
+    chunk: list[str] = []
+
+    def on_word(index: int, word: str) -> None:
+        piece = word + ("" if index == len(words) - 1 else " ")
+        match partial:
+            case True:
+                delta = {"type": "text_delta", "text": piece}
+                _emit({"type": "stream_event", "event": {"type": "content_block_delta", "index": 0, "delta": delta}})
+            case False:
+                pass
+        chunk.append(piece)
+        match len(chunk) >= CHUNK or index == len(words) - 1:
+            case True:
+                _emit(_assistant("".join(chunk)))
+                chunk.clear()
+            case False:
+                pass
+
+    _produce(words, rate, on_word)
+    _emit({"type": "result", "subtype": "success", "is_error": False, "result": " ".join(words), "session_id": session})
+
+
+def _whole(prompt: str, tokens: int, rate: float) -> str:
+    words = _words(prompt, tokens)
+    _produce(words, rate, lambda index, word: None)
+    return " ".join(words)
+
+
+def main(args: list[str]) -> None:
+    delay, tokens, rate = _settings()
+    session = _flag(args, "--resume") or str(uuid.uuid4())
+    partial = "--include-partial-messages" in args
+    time.sleep(delay)
+    match (args[:1], _flag(args, "--input-format"), _flag(args, "--output-format")):
+        case (["create-chat"], _, _):
+            print(uuid.uuid4())
+        case (_, "stream-json", _):
+            while line := sys.stdin.readline():
+                try:
+                    turn = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                _stream_turn(str(turn.get("message", {}).get("content", "")), session, partial, tokens, rate)
+        case (_, _, "stream-json"):
+            _stream_turn(_flag(args, "-p") or "", session, partial, tokens, rate)
+        case (_, _, "json"):
+            result = _whole(_flag(args, "-p") or "", tokens, rate)
+            print(json.dumps({"type": "result", "is_error": False, "result": result, "session_id": session}))
+        case _:
+            print(_whole(_flag(args, "-p") or "", tokens, rate))
+
+
+def install(directory: Path, delay: float, tokens: int, rate: float) -> tuple[Path, Path]:
+    """Write executable `claude` and `agent` wrappers into `directory`; returns their paths."""
+    env = f"FAKE_CLI_DELAY={delay} FAKE_CLI_TOKENS={tokens} FAKE_CLI_RATE={rate}"
+    script = f'#!/bin/sh\n{env} exec {shlex.quote(sys.executable)} {shlex.quote(__file__)} "$@"\n'
+
+    def write(name: str) -> Path:
+        path = directory / name
+        path.write_text(script)
+        path.chmod(0o755)
+        return path
+
+    return write("claude"), write("agent")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,105 @@
+"""Vision preprocessing over an image corpus: upload bytes, tokens, latency.
+
+    python -m benchmarks.image_preprocess [--corpus DIR] [--target 1280] [--uplink-mbps 20]
+
+Without --corpus a synthetic set of camera-sized JPEGs is generated (needs
+Pillow). "full" is the old path (largest size, base64 on the loop); "prepared"
+downsamples to --target in a worker thread first. Latency is one
+OpenAIVisionClient.analyze() round trip against a local stub API (preprocessing
++ encoding + loopback upload, no model time) plus the time the encoded payload
+would take on an uplink of --uplink-mbps. Claude tokens are
+estimated as w*h/750 after Claude's own 1568 px long-edge resize.
+"""
+import argparse
+import asyncio
+import io
+import statistics
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from benchmarks.provider_pool import COMPLETION
+from benchmarks.stub_http import StubHTTPServer
+from src.providers import ProviderRegistry
+from src.vision.openai import OpenAIVisionClient
+from src.media import encode_base64
+from src.vision.preprocess import prepare_image
+
+CLAUDE_MAX_EDGE = 1568
+SYNTHETIC_SIZES = ((4032, 3024), (3000, 4000), (2560, 1920), (1920, 1080), (1280, 960))
+
+
+def synthetic_corpus() -> list[bytes]:
+    def render(size: tuple[int, int]) -> bytes:
+        # noise defeats JPEG compression the way real photo detail does
+        img = Image.effect_noise(size, 60).convert("RGB")
+        out = io.BytesIO()
+        img.save(out, format="JPEG", quality=90)
+        return out.getvalue()
+
+    return list(map(render, SYNTHETIC_SIZES))
+
+
+def load_corpus(path: Path) -> list[bytes]:
+    suffixes = {".jpg", ".jpeg", ".png", ".webp"}
+    return [p.read_bytes() for p in sorted(path.iterdir()) if p.suffix.lower() in suffixes]
+
+
+def claude_tokens(data: bytes | memoryview) -> int:
+    with Image.open(io.BytesIO(data)) as img:
+        w, h = img.size
+    scale = min(1.0, CLAUDE_MAX_EDGE / max(w, h))
+    return int((w * scale) * (h * scale) / 750)
+
+
+async def measure(
+    corpus: list[bytes], target: int, client: OpenAIVisionClient, uplink_mbps: float
+) -> dict:
+    async def one(data: bytes) -> tuple[int, int, float, float]:
+        started = time.perf_counter()
+        image = await prepare_image(data, target, 85)
+        encoded = await asyncio.to_thread(encode_base64, image)
+        prepared = time.perf_counter() - started
+        await client.analyze(image)
+        transfer = len(encoded) * 8 / (uplink_mbps * 1e6)
+        return len(encoded), claude_tokens(image), prepared, time.perf_counter() - started + transfer
+
+    rows = [await one(data) for data in corpus]
+    return {
+        "upload_kb": sum(r[0] for r in rows) / 1024,
+        "tokens": sum(r[1] for r in rows),
+        "prep_ms": statistics.median(r[2] for r in rows) * 1000,
+        "e2e_ms": statistics.median(r[3] for r in rows) * 1000,
+    }
+
+
+async def main(corpus: list[bytes], target: int, uplink_mbps: float) -> None:
+    server = await StubHTTPServer({"/v1/chat/completions": COMPLETION}).start()
+    registry = ProviderRegistry(openai_api_key="bench", openai_base_url=server.url + "/v1")
+    client = OpenAIVisionClient(registry)
+    try:
+        full = await measure(corpus, 0, client, uplink_mbps)
+        prepared = await measure(corpus, target, client, uplink_mbps)
+    finally:
+        await registry.aclose()
+        await server.stop()
+    print(f"{len(corpus)} images, target {target}px, uplink {uplink_mbps:g} Mbit/s")
+    print(f"{'':>9}  {'upload KB':>10}  {'tokens':>8}  {'prep ms':>8}  {'e2e ms':>8}")
+    list(map(
+        lambda row: print(
+            f"{row[0]:>9}  {row[1]['upload_kb']:>10.0f}  {row[1]['tokens']:>8}  "
+            f"{row[1]['prep_ms']:>8.1f}  {row[1]['e2e_ms']:>8.1f}"
+        ),
+        (("full", full), ("prepared", prepared)),
+    ))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, help="directory of sample images")
+    parser.add_argument("--target", type=int, default=1280, help="long-side target in px")
+    parser.add_argument("--uplink-mbps", type=float, default=20.0)
+    args = parser.parse_args()
+    images = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    asyncio.run(main(images, args.target, args.uplink_mbps))
@@ -0,0 +1,314 @@
+"""End-to-end load: synthetic chats through the real TelegramClient and MessageRouter.
+
+    python -m benchmarks.load [--chats 8] [--messages 5] [--route mixed] [--stream] [--out load.json]
+
+The fake `claude` / `agent` executables from benchmarks/fake_cli.py stand in
+for the CLIs and FakeBotAPI for Telegram; everything in between — webhook or
+polling, sequencer, router, spawn scheduler, worker pool, streaming renderer,
+request pools, rate limiter — is the production code. Each chat sends
+--messages messages, the next one as soon as the reply to the previous one is
+complete; all chats run at once. ALLOWED_CHAT_ID admits a single chat, so the
+harness's client admits the synthetic ones as well.
+
+Reported: reply latency p50 / p95 / p99 (injection to the complete reply at the
+fake API), time to the first edit for streamed replies, replies per second,
+failed replies (busy, error or --timeout), Bot API calls, and the bot
+process's peak RSS (a high-water mark: one run per process). --out writes it
+all as JSON, parameters included, so runs can be compared.
+"""
+import argparse
+import asyncio
+import contextlib
+import dataclasses
+import json
+import logging
+import math
+import os
+import platform
+import resource
+import tempfile
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from telegram import Update
+
+from benchmarks.fake_bot_api import FakeBotAPI, Sent
+from benchmarks.fake_cli import install
+from src.config import Config
+from src.constants import MSG_ERR_BUSY, MSG_STREAM_PLACEHOLDER, TELEGRAM_MODE_WEBHOOK
+from src.http_server import HTTPServer
+from src.router import MessageRouter
+from src.telegram.client import TelegramClient
+
+TOKEN = "123:bench"
+FIRST_CHAT = 1000
+ROUTES = ("claude", "cursor", "mixed")
+
+
+@dataclasses.dataclass(slots=True)
+class _Pending:
+    marker: str
+    started: float
+    done: asyncio.Event = dataclasses.field(default_factory=asyncio.Event)
+    first_edit: float | None = None
+    finished: float | None = None
+
+
+class _LoadClient(TelegramClient):
+    """The production client, admitting the synthetic chats."""
+
+    def __init__(self, config: Config, chats: set[str]) -> None:
+        super().__init__(config)
+        self._load_chats = chats
+
+    def _is_allowed(self, update: Update) -> bool:
+        return update.effective_chat is not None and str(update.effective_chat.id) in self._load_chats
+
+
+@contextlib.contextmanager
+def _workdir() -> Iterator[Path]:
+    """A scratch cwd, so the router's session stores do not touch the real ones."""
+    previous = Path.cwd()
+    with tempfile.TemporaryDirectory(prefix="bench-load-") as scratch:
+        os.chdir(scratch)
+        try:
+            yield Path(scratch)
+        finally:
+            os.chdir(previous)
+
+
+def _config(args: argparse.Namespace, api_url: str, claude: Path, agent: Path, port: int) -> Config:
+    return Config(
+        telegram_bot_token=TOKEN,
+        allowed_chat_id=str(FIRST_CHAT),
+        claude_cli_path=str(claude),
+        log_level="WARNING",
+        cursor_cli_path=str(agent),
+        cursor_timeout=args.timeout,
+        claude_timeout=args.timeout,
+        claude_patterns=("@claude",),
+        claude_model_aliases={},
+        cursor_working_dir=None,
+        openai_api_key=None,
+        anthropic_api_key=None,
+        stream_responses=args.stream,
+        claude_partial_messages=args.partial,
+        claude_pool_enabled=args.worker_pool,
+        claude_max_processes=args.processes,
+        cursor_max_processes=args.processes,
+        spawn_queue_max=args.queue_max,
+        max_concurrent_updates=args.concurrent_updates,
+        telegram_api_url=api_url,
+        telegram_rate_limit=args.rate_limit,
+        telegram_mode=args.mode,
+        webhook_url=f"http://127.0.0.1:{port}/hook",
+        webhook_listen="127.0.0.1",
+        webhook_port=port,
+        webhook_secret="bench",
+    )
+
+
+async def _free_port() -> int:
+    probe = await HTTPServer({}).start()
+    port = probe.port
+    await probe.stop()
+    return port
+
+
+def _text(route: str, chat: int, n: int) -> tuple[str, str]:
+    """(message, marker) — the fake CLIs end every reply with the prompt they got."""
+    marker = f"req-{chat}-{n}."
+    match (route, (chat + n) % 2):
+        case ("claude", _) | ("mixed", 0):
+            return f"@claude {marker}", marker
+        case _:
+            return marker, marker
+
+
+def _percentiles(values: list[float]) -> dict[str, float] | None:
+    ordered = sorted(values)
+    match ordered:
+        case []:
+            return None
+        case _:
+            rank = lambda q: ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)]
+            return {
+                "p50": round(rank(0.50), 4),
+                "p95": round(rank(0.95), 4),
+                "p99": round(rank(0.99), 4),
+                "max": round(ordered[-1], 4),
+            }
+
+
+def _peak_rss_mb() -> float:
+    # KiB on Linux; RUSAGE_CHILDREN is no use for the CLIs, it counts their pre-exec fork copies
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+async def measure(args: argparse.Namespace) -> dict:
+    with _workdir() as scratch:
+        claude, agent = install(scratch, args.cli_delay, args.tokens, args.token_rate)
+        api = await FakeBotAPI(TOKEN, latency=args.api_latency).start()
+        config = _config(args, api.url, claude, agent, await _free_port())
+        chats = [FIRST_CHAT + n for n in range(args.chats)]
+        router = MessageRouter(config)
+        client = _LoadClient(config, set(map(str, chats)))
+        router.set_notifier(client.send_message)
+        app = client.build_application(
+            router.handle,
+            stream_events=router.stream_events if args.stream else None,
+            on_shutdown=router.aclose,
+        )
+        waiting: dict[int, _Pending] = {}
+
+        def on_sent(sent: Sent) -> None:
+            match waiting.get(sent.chat_id):
+                case None:
+                    return
+                case pending:
+                    pass
+            match (sent.method, sent.text):
+                case ("editMessageText", text) if pending.first_edit is None and text != MSG_STREAM_PLACEHOLDER:
+                    pending.first_edit = sent.at
+                case _:
+                    pass
+            match sent.text:
+                case text if pending.marker in text:
+                    pending.finished = sent.at
+                    pending.done.set()
+                case text if text == MSG_ERR_BUSY or text.startswith("Error"):
+                    pending.done.set()
+                case _:
+                    pass
+
+        api.on_sent = on_sent
+        latencies: list[float] = []
+        first_edits: list[float] = []
+        failed = 0
+
+        async def chat(chat_id: int) -> None:
+            nonlocal failed
+            n = 0
+            while n < args.messages:
+                n += 1
+                text, marker = _text(args.route, chat_id, n)
+                pending = waiting[chat_id] = _Pending(marker, time.monotonic())
+                await api.inject(chat_id, text)
+                try:
+                    await asyncio.wait_for(pending.done.wait(), args.timeout)
+                except asyncio.TimeoutError:
+                    pass
+                match pending.finished:
+                    case None:
+                        failed += 1
+                    case finished:
+                        latencies.append(finished - pending.started)
+                match pending.first_edit:
+                    case None:
+                        pass
+                    case edited:
+                        first_edits.append(edited - pending.started)
+
+        stop = asyncio.Event()
+        match args.mode:
+            case mode if mode == TELEGRAM_MODE_WEBHOOK:
+                runner = asyncio.create_task(client.serve_webhook(stop))
+                while api.webhook is None:
+                    await asyncio.sleep(0.01)
+            case _:
+                # what run_polling() does, without taking over the loop
+                await app.initialize()
+                await app.post_init(app)
+                await app.updater.start_polling(poll_interval=0.0, timeout=10)
+                await app.start()
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*map(chat, chats))
+        finally:
+            wall = time.perf_counter() - started
+            match args.mode:
+                case mode if mode == TELEGRAM_MODE_WEBHOOK:
+                    stop.set()
+                    await runner
+                case _:
+                    await app.updater.stop()
+                    await app.stop()
+                    await app.shutdown()
+                    await app.post_shutdown(app)
+            await api.stop()
+    return {
+        "benchmark": "load",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "params": {k: v for k, v in vars(args).items() if k != "out"},
+        "replies": len(latencies),
+        "failed": failed,
+        "wall_seconds": round(wall, 3),
+        "throughput_per_second": round(len(latencies) / wall, 3) if wall else 0.0,
+        "latency_seconds": _percentiles(latencies),
+        "first_edit_seconds": _percentiles(first_edits),
+        "bot_api_calls": dict(sorted(api.calls.items())),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _line(name: str, stats: dict | None) -> str:
+    match stats:
+        case None:
+            return f"  {name:<12} n/a"
+        case s:
+            return f"  {name:<12} " + "   ".join(f"{k} {v * 1000:8.1f} ms" for k, v in s.items())
+
+
+def report(result: dict) -> None:
+    p = result["params"]
+    print(
+        f"{p['chats']} chats x {p['messages']} messages, route {p['route']}, "
+        f"{'streamed' if p['stream'] else 'buffered'}, {p['mode']}"
+    )
+    print(_line("latency", result["latency_seconds"]))
+    print(_line("first edit", result["first_edit_seconds"]))
+    print(
+        f"  {result['replies']} replies, {result['failed']} failed in {result['wall_seconds']:.2f}s "
+        f"({result['throughput_per_second']:.2f}/s), peak RSS {result['peak_rss_mb']} MB"
+    )
+
+
+def parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--chats", type=int, default=8)
+    p.add_argument("--messages", type=int, default=5, help="messages per chat, sent one after another")
+    p.add_argument("--route", choices=ROUTES, default="mixed")
+    p.add_argument("--stream", action=argparse.BooleanOptionalAction, default=True)
+    p.add_argument("--partial", action="store_true", help="token-level deltas (--include-partial-messages)")
+    p.add_argument("--worker-pool", action="store_true", help="long-lived Claude workers")
+    p.add_argument("--mode", choices=("webhook", "polling"), default="webhook")
+    p.add_argument("--tokens", type=int, default=200, help="words per reply")
+    p.add_argument("--token-rate", type=float, default=100.0, help="words per second (0 = all at once)")
+    p.add_argument("--cli-delay", type=float, default=0.3, help="seconds before a CLI's first output")
+    p.add_argument("--api-latency", type=float, default=0.01, help="seconds per Bot API call")
+    p.add_argument("--processes", type=int, default=4, help="CLAUDE/CURSOR_MAX_PROCESSES")
+    p.add_argument("--queue-max", type=int, default=100, help="SPAWN_QUEUE_MAX")
+    p.add_argument("--concurrent-updates", type=int, default=64)
+    p.add_argument("--rate-limit", action=argparse.BooleanOptionalAction, default=True)
+    p.add_argument("--timeout", type=int, default=60, help="seconds before a reply counts as failed")
+    p.add_argument("--out", type=Path, help="write the result as JSON")
+    return p
+
+
+async def main(args: argparse.Namespace) -> dict:
+    result = await measure(args)
+    report(result)
+    match args.out:
+        case None:
+            pass
+        case path:
+            path.write_text(json.dumps(result, indent=2) + "\n")
+            print(f"  written to {path}")
+    return result
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main(parser().parse_args()))
@@ -0,0 +1,151 @@
+"""Peak RSS per media message: PTB bytearray downloads vs the zero-copy path.
+
+    python -m benchmarks.media_download [--sizes 1,8,20] [--spill-mb 8]
+
+For each file size (MB) and kind, a fresh child process downloads the file
+from a local stub Bot API file server and uploads it to a stub provider API:
+
+  voice/old  download_as_bytearray() → bytes() → BytesIO → Whisper multipart
+  voice/new  MediaDownloader → memoryview → ViewReader → Whisper multipart
+  photo/old  download_as_bytearray() → b2a_base64().decode() → vision request
+  photo/new  MediaDownloader → memoryview → chunked encode_base64 → vision request
+
+Reported is the child's peak RSS (VmHWM, reset just before the message) above
+its RSS at that point, in MB. Linux only.
+The stub servers run in the parent so request bodies they buffer are not
+counted. Photos skip downsampling to isolate the copies.
+"""
+import argparse
+import asyncio
+import binascii
+import io
+import json
+import os
+import sys
+
+from benchmarks.provider_pool import COMPLETION
+from benchmarks.stub_http import StubHTTPServer
+
+TOKEN = "123:bench"
+KINDS = ("voice", "photo")
+GET_ME = {"ok": True, "result": {"id": 1, "is_bot": True, "first_name": "bench", "username": "bench_bot"}}
+VARIANTS = ("old", "new")
+
+
+def _status_mb(field: str) -> float:
+    with open("/proc/self/status") as status:
+        line = next(line for line in status if line.startswith(field + ":"))
+    return int(line.split()[1]) / 1024
+
+
+def _reset_peak() -> None:
+    # "5" resets VmHWM to the current RSS (Linux ≥ 4.0), so earlier import spikes do not count
+    with open("/proc/self/clear_refs", "w") as clear_refs:
+        clear_refs.write("5")
+
+
+async def child(url: str, kind: str, variant: str, size: int, spill: int) -> dict:
+    from telegram import Bot, File
+
+    from src.providers import ProviderRegistry
+    from src.telegram.download import MediaDownloader
+    from src.transcription.whisper import WhisperTranscriptionClient
+    from src.vision.openai import OpenAIVisionClient
+
+    registry = ProviderRegistry(openai_api_key="bench", openai_base_url=url + "/v1")
+    bot = Bot(TOKEN, base_url=url + "/bot", base_file_url=url + "/file/bot")
+    await bot.initialize()
+    tg_file = File("id", "uid", file_size=size, file_path=f"{url}/file/bot{TOKEN}/media")
+    tg_file.set_bot(bot)
+    downloader = MediaDownloader(spill)
+
+    async def old_voice() -> None:
+        audio = bytes(await tg_file.download_as_bytearray())
+        handle = io.BytesIO(audio)
+        handle.name = "voice.ogg"
+        async with registry.openai() as client:
+            await client.audio.transcriptions.create(model="whisper-1", file=handle)
+
+    async def new_voice() -> None:
+        with await downloader.fetch(tg_file) as media:
+            await WhisperTranscriptionClient(registry).transcribe(media.view)
+
+    async def old_photo() -> None:
+        data = await tg_file.download_as_bytearray()
+        encoded = binascii.b2a_base64(data, newline=False).decode("ascii")
+        async with registry.openai() as client:
+            await client.chat.completions.create(model="gpt-4o", messages=[{
+                "role": "user",
+                "content": [
+                    {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{encoded}"}},
+                    {"type": "text", "text": "Describe"},
+                ],
+            }])
+
+    async def new_photo() -> None:
+        with await downloader.fetch(tg_file) as media:
+            await OpenAIVisionClient(registry).analyze(media.view)
+
+    run = {
+        ("voice", "old"): old_voice, ("voice", "new"): new_voice,
+        ("photo", "old"): old_photo, ("photo", "new"): new_photo,
+    }[(kind, variant)]
+    # warm up connections and lazy imports on a tiny request before measuring
+    async with registry.openai() as client:
+        await client.models.list()
+    _reset_peak()
+    before = _status_mb("VmRSS")
+    await run()
+    peak = _status_mb("VmHWM")
+    await downloader.aclose()
+    await registry.aclose()
+    await bot.shutdown()
+    return {"kind": kind, "variant": variant, "mb": size / 2**20, "peak_mb": peak - before}
+
+
+async def main(sizes: list[float], spill: int) -> None:
+    rows = []
+    while sizes:
+        size = int(sizes.pop(0) * 2**20)
+        server = await StubHTTPServer({
+            "/file/": os.urandom(size),
+            "/bot": GET_ME,
+            "/v1/audio": {"text": "ok"},
+            "/v1/models": {"object": "list", "data": []},
+            "/v1/chat/completions": COMPLETION,
+        }).start()
+        pairs = [(k, v) for k in KINDS for v in VARIANTS]
+        while pairs:
+            kind, variant = pairs.pop(0)
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, "-m", "benchmarks.media_download",
+                "--child", server.url, kind, variant, str(size), str(spill),
+                stdout=asyncio.subprocess.PIPE,
+            )
+            out, _ = await process.communicate()
+            rows.append(json.loads(out))
+        await server.stop()
+    print(f"spill threshold {spill / 2**20:g} MB; peak RSS above baseline, MB")
+    print(f"{'size MB':>8}  {'kind':>6}  {'old':>8}  {'new':>8}")
+    keyed = {(r["mb"], r["kind"], r["variant"]): r["peak_mb"] for r in rows}
+    list(map(
+        lambda key: print(
+            f"{key[0]:>8g}  {key[1]:>6}  {keyed[(*key, 'old')]:>8.1f}  {keyed[(*key, 'new')]:>8.1f}"
+        ),
+        sorted({(r["mb"], r["kind"]) for r in rows}),
+    ))
+
+
+if __name__ == "__main__":
+    match sys.argv[1:2]:
+        case ["--child"]:
+            url, kind, variant, size, spill = sys.argv[2:7]
+            result = asyncio.run(child(url, kind, variant, int(size), int(spill)))
+            print(json.dumps(result))
+        case _:
+            parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+            parser.add_argument("--sizes", default="1,8,20", help="file sizes in MB, comma-separated")
+            parser.add_argument("--spill-mb", type=float, default=8.0)
+            args = parser.parse_args()
+            sizes = [float(s) for s in args.sizes.split(",")]
+            asyncio.run(main(sizes, int(args.spill_mb * 2**20)))
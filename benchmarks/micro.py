@@ -0,0 +1,267 @@
+"""Microbenchmarks for the hot pure-Python paths, checked against stored baselines.
+
+    python -m benchmarks.micro [--senders 10000] [--response-mb 2] [--only history] [--check | --save]
+
+Each case times one operation on synthetic data big enough for scaling
+problems to show: session and processed-message stores with --senders keys,
+a history archive with --history entries per sender, and --response-mb
+replies for the tag helpers, the history store and the stream-json parser.
+A case is timed with `timeit` (auto-ranged, best of --repeat) and reported
+as seconds per call.
+
+--save writes the results to the baseline file (benchmarks/baselines/micro.json
+by default). --check compares against it and exits 1 when any case is more
+than --threshold percent slower. Baselines are per machine: re-save after
+moving to new hardware or a new Python. One baseline holds one set of sizes:
+a --save at other sizes must re-run every stored case, or it is refused.
+"""
+import argparse
+import contextlib
+import dataclasses
+import json
+import platform
+import re
+import sys
+import tempfile
+import timeit
+from collections.abc import Callable
+from itertools import count, cycle
+from pathlib import Path
+
+from src.chat_store import ChatStore, MessageHistoryStore, ProcessedMessageStore
+from src.router import _is_claude_tagged, _strip_claude_tag
+from src.streaming import ClaudeStreamParser, TextBuffer
+
+BASELINE = Path(__file__).with_name("baselines") / "micro.json"
+PATTERNS = ("@claude", "claude:", "hey claude")
+DELTA_CHARS = 24   # text per stream_event delta line, about a token or five
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Sizes:
+    senders: int
+    history: int
+    response_bytes: int
+
+
+# setup(scratch, sizes, cleanup) -> the operation to time; cleanup runs before scratch is removed
+Setup = Callable[[Path, Sizes, contextlib.ExitStack], Callable[[], object]]
+
+
+def _senders(sizes: Sizes) -> list[str]:
+    return [str(100000000 + n) for n in range(sizes.senders)]
+
+
+def _response(sizes: Sizes) -> str:
+    words = "lorem ipsum dolor sit amet consectetur adipiscing elit ".encode()
+    return (words * (sizes.response_bytes // len(words) + 1))[: sizes.response_bytes].decode()
+
+
+def _snapshot(path: Path, sizes: Sizes) -> Path:
+    """A store snapshot with one entry per sender, as the stores write them."""
+    path.write_text(json.dumps({s: f"chat-{s}" for s in _senders(sizes)}))
+    return path
+
+
+def _settled(store: ChatStore, cleanup: contextlib.ExitStack) -> ChatStore:
+    # a final compaction waits out any still running in the background
+    cleanup.callback(store._save)
+    return store
+
+
+def _store_set(scratch: Path, sizes: Sizes, cleanup: contextlib.ExitStack) -> Callable[[], object]:
+    store = _settled(ChatStore(_snapshot(scratch / "chats.json", sizes)), cleanup)
+    senders, n = cycle(_senders(sizes)), count()
+    return lambda: store.set(next(senders), f"chat-{next(n)}")
+
+
+def _mark_processed(scratch: Path, sizes: Sizes, cleanup: contextlib.ExitStack) -> Callable[[], object]:
+    store = _settled(ProcessedMessageStore(_snapshot(scratch / "processed.json", sizes)), cleanup)
+    senders, n = cycle(_senders(sizes)), count()
+    return lambda: store.mark_processed(next(senders), f"message {next(n)}")
+
+
+def _history(scratch: Path, sizes: Sizes) -> MessageHistoryStore:
+    history = MessageHistoryStore(scratch / "history.db", legacy_path=scratch / "none.json")
+    entries = [(s, role) for s in _senders(sizes) for role in ("you", "bot") * (sizes.history // 2)]
+    list(map(lambda entry: history.append(entry[0], entry[1], "a short message"), entries))
+    return history
+
+
+def _history_append(scratch: Path, sizes: Sizes, cleanup: contextlib.ExitStack) -> Callable[[], object]:
+    history, senders = _history(scratch, sizes), cycle(_senders(sizes))
+    return lambda: history.append(next(senders), "you", "a short message")
+
+
+def _history_append_large(scratch: Path, sizes: Sizes, cleanup: contextlib.ExitStack) -> Callable[[], object]:
+    history, senders, reply = _history(scratch, sizes), cycle(_senders(sizes)), _response(sizes)
+    return lambda: history.append(next(senders), "bot", reply)
+
+
+def _history_get(scratch: Path, sizes: Sizes, cleanup: contextlib.ExitStack) -> Callable[[], object]:
+    history, senders = _history(scratch, sizes), cycle(_senders(sizes))
+    return lambda: history.get(next(senders))
+
+
+def _tagged(message: str) -> Callable[[], object]:
+    return lambda: _is_claude_tagged(message, PATTERNS)
+
+
+def _stripped(message: str) -> Callable[[], object]:
+    return lambda: _strip_claude_tag(message, PATTERNS)
+
+
+def _stream_lines(text: str) -> list[str]:
+    """What `claude --output-format stream-json --include-partial-messages` prints for `text`."""
+    deltas = [text[at:at + DELTA_CHARS] for at in range(0, len(text), DELTA_CHARS)]
+    events = [
+        {"type": "stream_event", "event": {"type": "content_block_delta", "index": 0,
+                                            "delta": {"type": "text_delta", "text": d}}}
+        for d in deltas
+    ] + [
+        {"type": "assistant", "message": {"role": "assistant", "content": [{"type": "text", "text": text}]}},
+        {"type": "result", "subtype": "success", "is_error": False, "result": text, "session_id": "s"},
+    ]
+    return [json.dumps(e) + "\n" for e in events]
+
+
+def _parse_line(scratch: Path, sizes: Sizes, cleanup: contextlib.ExitStack) -> Callable[[], object]:
+    line, parser = _stream_lines("one delta of text here")[0], ClaudeStreamParser()
+    return lambda: parser.feed_line(line)
+
+
+def _parse_reply(scratch: Path, sizes: Sizes, cleanup: contextlib.ExitStack) -> Callable[[], object]:
+    lines = _stream_lines(_response(sizes))
+
+    def parse() -> str:
+        parser, buffer = ClaudeStreamParser(), TextBuffer()
+        list(map(buffer.apply, (e for line in lines for e in parser.feed_line(line))))
+        return buffer.text
+
+    return parse
+
+
+CASES: dict[str, Setup] = {
+    "chat_store.set": _store_set,
+    "processed.mark_processed": _mark_processed,
+    "history.append": _history_append,
+    "history.append_large": _history_append_large,
+    "history.get": _history_get,
+    "router.is_claude_tagged": lambda scratch, sizes, cleanup: _tagged("please fix the failing test"),
+    "router.is_claude_tagged_large": lambda scratch, sizes, cleanup: _tagged(_response(sizes)),
+    "router.strip_claude_tag": lambda scratch, sizes, cleanup: _stripped("@claude please fix the failing test"),
+    "router.strip_claude_tag_large": lambda scratch, sizes, cleanup: _stripped("@claude " + _response(sizes)),
+    "streaming.parse_line": _parse_line,
+    "streaming.parse_reply": _parse_reply,
+}
+
+
+def time_case(setup: Setup, sizes: Sizes, repeat: int) -> float:
+    """Best seconds per call over `repeat` auto-ranged runs."""
+    with tempfile.TemporaryDirectory(prefix="bench-micro-") as scratch, contextlib.ExitStack() as cleanup:
+        operation = setup(Path(scratch), sizes, cleanup)
+        timer = timeit.Timer(operation)
+        number, _ = timer.autorange()
+        return min(timer.repeat(repeat, number)) / number
+
+
+def run(names: list[str], sizes: Sizes, repeat: int, on_result: Callable[[str, float], None]) -> dict[str, float]:
+    results: dict[str, float] = {}
+    while names:
+        name = names.pop(0)
+        results[name] = time_case(CASES[name], sizes, repeat)
+        on_result(name, results[name])
+    return results
+
+
+def regressions(
+    results: dict[str, float], baseline: dict[str, float], threshold: float
+) -> list[tuple[str, float, float]]:
+    """(case, baseline, now) for every case more than `threshold` percent slower than its baseline."""
+    return [
+        (name, baseline[name], now)
+        for name, now in results.items()
+        if name in baseline and now > baseline[name] * (1 + threshold / 100)
+    ]
+
+
+def _seconds(value: float) -> str:
+    match value:
+        case v if v >= 1e-3:
+            return f"{v * 1e3:9.2f} ms"
+        case v:
+            return f"{v * 1e6:9.2f} us"
+
+
+def _change(name: str, now: float, baseline: dict[str, float]) -> str:
+    match baseline.get(name):
+        case None:
+            return "      new"
+        case base:
+            return f"{(now / base - 1) * 100:+8.1f}%"
+
+
+def main(args: argparse.Namespace) -> int:
+    sizes = Sizes(args.senders, args.history, int(args.response_mb * 1024 * 1024))
+    stored = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    baseline: dict[str, float] = stored.get("results", {})
+    match (args.check, stored.get("sizes"), dataclasses.asdict(sizes)):
+        case (True, saved, current) if saved not in (None, current):
+            print(f"warning: baseline was recorded with {saved}, this run uses {current}")
+        case _:
+            pass
+    names = [n for n in CASES if re.search(args.only, n)]
+    print(f"{sizes.senders} senders, {sizes.history} history entries each, "
+          f"{args.response_mb:g} MB responses, best of {args.repeat}")
+    results = run(
+        names, sizes, args.repeat,
+        lambda name, now: print(f"  {name:<32}{_seconds(now)}  {_change(name, now, baseline)}", flush=True),
+    )
+    stale = sorted(set(baseline) - set(results))
+    match (args.save, args.check, stored.get("sizes"), dataclasses.asdict(sizes)):
+        case (True, _, saved, current) if saved not in (None, current) and stale:
+            # one "sizes" describes every stored number: no mixing
+            print(f"error: the baseline was recorded with {saved}, this run uses {current}; "
+                  f"--save would keep {', '.join(stale)} at the old sizes. Re-save those cases too "
+                  f"(widen --only) or run at the baseline's sizes.")
+            return 2
+        case (True, _, _, _):
+            args.baseline.parent.mkdir(parents=True, exist_ok=True)
+            record = {
+                "machine": platform.machine(),
+                "python": platform.python_version(),
+                "sizes": dataclasses.asdict(sizes),
+                "results": {**baseline, **results},
+            }
+            args.baseline.write_text(json.dumps(record, indent=2) + "\n")
+            print(f"baseline written to {args.baseline}")
+            return 0
+        case (_, True, _, _):
+            slower = regressions(results, baseline, args.threshold)
+            list(map(
+                lambda r: print(f"REGRESSION {r[0]}: {_seconds(r[1]).strip()} -> {_seconds(r[2]).strip()}"),
+                slower,
+            ))
+            print(f"{len(slower)} of {len(results)} cases over the {args.threshold:g}% threshold")
+            return 1 if slower else 0
+        case _:
+            return 0
+
+
+def parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--senders", type=int, default=10000)
+    p.add_argument("--history", type=int, default=4, help="history entries per sender")
+    p.add_argument("--response-mb", type=float, default=2.0)
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--only", default="", help="regex on case names")
+    p.add_argument("--baseline", type=Path, default=BASELINE)
+    p.add_argument("--threshold", type=float, default=25.0, help="percent slower that counts as a regression")
+    mode = p.add_mutually_exclusive_group()
+    mode.add_argument("--save", action="store_true", help="store the results as the baseline")
+    mode.add_argument("--check", action="store_true", help="exit 1 on a regression against the baseline")
+    return p
+
+
+if __name__ == "__main__":
+    sys.exit(main(parser().parse_args()))
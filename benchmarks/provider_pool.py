@@ -0,0 +1,90 @@
+"""Pooled vs per-call provider clients against a local stub API.
+
+    python -m benchmarks.provider_pool [--calls 200] [--delay 0.002]
+
+"per-call" rebuilds the SDK client for every request, as the backends used to;
+"pooled" borrows one long-lived client from ProviderRegistry. The stub speaks
+plain HTTP, so the gap shown is client construction + TCP connect only — real
+API calls additionally pay a TLS handshake per fresh connection.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.stub_http import StubHTTPServer
+from src.providers import ProviderRegistry
+from src.vision.openai import OpenAIVisionClient
+
+COMPLETION = {
+    "id": "bench",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o",
+    "choices": [{
+        "index": 0,
+        "finish_reason": "stop",
+        "message": {"role": "assistant", "content": "a cat"},
+    }],
+}
+
+
+def _registry(url: str) -> ProviderRegistry:
+    return ProviderRegistry(openai_api_key="bench", openai_base_url=url + "/v1", max_retries=0)
+
+
+async def _timed(call) -> float:
+    started = time.perf_counter()
+    await call()
+    return time.perf_counter() - started
+
+
+async def per_call(url: str, calls: int) -> list[float]:
+    async def one() -> None:
+        registry = _registry(url)
+        await OpenAIVisionClient(registry).analyze(b"img")
+        await registry.aclose()
+
+    return [await _timed(one) for _ in range(calls)]
+
+
+async def pooled(url: str, calls: int) -> list[float]:
+    registry = _registry(url)
+    client = OpenAIVisionClient(registry)
+    try:
+        return [await _timed(lambda: client.analyze(b"img")) for _ in range(calls)]
+    finally:
+        await registry.aclose()
+
+
+def _report(name: str, samples: list[float], connections: int) -> None:
+    ms = sorted(s * 1000 for s in samples)
+    p95 = ms[int(len(ms) * 0.95) - 1]
+    print(
+        f"{name:>9}: median {statistics.median(ms):7.2f} ms  p95 {p95:7.2f} ms  "
+        f"connections {connections}"
+    )
+
+
+async def _run(name: str, strategy, server: StubHTTPServer, calls: int) -> None:
+    before = server.connections
+    samples = await strategy(server.url, calls)
+    _report(name, samples, server.connections - before)
+
+
+async def main(calls: int, delay: float) -> None:
+    server = await StubHTTPServer({"/v1/chat/completions": COMPLETION}, delay=delay).start()
+    try:
+        await pooled(server.url, 5)  # warm imports and the event loop
+        await _run("per-call", per_call, server, calls)
+        await _run("pooled", pooled, server, calls)
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.002, help="stub service time (s)")
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.delay))
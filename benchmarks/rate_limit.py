@@ -0,0 +1,112 @@
+"""Final replies under flood control: no limiter vs LaneRateLimiter.
+
+    python -m benchmarks.rate_limit [--chats 10] [--stream 3] [--global-rate 30] [--chat-rate 1]
+
+FakeBotAPI enforces Telegram-style flood control at the given rates. Every
+chat streams a reply for --stream seconds the way the bot does (placeholder,
+typing indicator on the shared TypingMultiplexer, EditScheduler edits as text
+grows), then delivers it: the final edit plus one follow-up message. Reported
+per mode: final messages delivered and their delay after the stream ended,
+429s returned by the fake API, and — with the limiter — per-lane stats.
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from telegram.ext import ExtBot
+
+from benchmarks.fake_bot_api import FLOOD_CHAT_BURST, FakeBotAPI
+from src.telegram.edit_scheduler import EditScheduler
+from src.telegram.ratelimit import LaneRateLimiter
+from src.telegram.typing import TypingMultiplexer
+
+TOKEN = "123:bench"
+TOKEN_EVERY = 0.02      # seconds between streamed chunks
+TYPING_INTERVAL = 0.5   # compressed from 4 s so typing competes at load
+
+
+async def _chat(bot: ExtBot, typing: TypingMultiplexer, chat_id: int, stream: float) -> float | None:
+    """Delay from end of stream to the follow-up landing; None when the reply was lost."""
+    try:
+        placeholder = await bot.send_message(chat_id, "…")
+    except Exception:
+        return None
+    typing.acquire(bot, str(chat_id))
+    state = {"text": ""}
+    editor = EditScheduler(
+        bot, chat_id, placeholder.message_id, source=lambda: state["text"],
+        on_edit=lambda: typing.edited(str(chat_id)),
+    )
+    ends = time.monotonic() + stream
+    while time.monotonic() < ends:
+        state["text"] += "word "
+        editor.notify()
+        await asyncio.sleep(TOKEN_EVERY)
+    await typing.release(str(chat_id))
+    delivered = await editor.close()
+    try:
+        await bot.send_message(chat_id, "follow-up")
+    except Exception:
+        return None
+    match delivered:
+        case True:
+            return time.monotonic() - ends
+        case False:
+            return None
+
+
+async def measure(limited: bool, chats: int, stream: float, rates: tuple[float, float]):
+    api = await FakeBotAPI(TOKEN, flood=rates).start()
+    global_rate, chat_rate = rates
+    # same limits as the fake's flood control
+    limiter = (
+        LaneRateLimiter(global_rate, max(1.0, global_rate), chat_rate, FLOOD_CHAT_BURST)
+        if limited else None
+    )
+    bot = ExtBot(TOKEN, base_url=f"{api.url}/bot", rate_limiter=limiter)
+    typing = TypingMultiplexer(interval=TYPING_INTERVAL)
+    await bot.initialize()
+    try:
+        delays = await asyncio.gather(*(_chat(bot, typing, n, stream) for n in range(1, chats + 1)))
+    finally:
+        await bot.shutdown()
+        await api.stop()
+    return delays, api, limiter
+
+
+def _report(name: str, delays: list, api: FakeBotAPI, limiter: LaneRateLimiter | None) -> None:
+    landed = sorted(d for d in delays if d is not None)
+    p50 = statistics.median(landed) if landed else float("nan")
+    worst = landed[-1] if landed else float("nan")
+    actions = api.calls.get("sendChatAction", 0)
+    print(
+        f"{name:>10}: delivered {len(landed)}/{len(delays)}   delay p50 {p50:5.2f}s max {worst:5.2f}s"
+        f"   429s {api.flooded}   typing calls {actions}"
+    )
+    match limiter:
+        case None:
+            pass
+        case _:
+            print(f"{'':>12}{limiter.summary()}")
+
+
+async def main(chats: int, stream: float, rates: tuple[float, float]) -> None:
+    # 429 warnings from the unlimited run would drown the table
+    logging.getLogger("src").setLevel(logging.ERROR)
+    print(f"{chats} chats streaming {stream:g}s; flood control {rates[0]:g}/s global, {rates[1]:g}/s per chat")
+    modes = [("unlimited", False), ("lanes", True)]
+    while modes:
+        name, limited = modes.pop(0)
+        _report(name, *await measure(limited, chats, stream, rates))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chats", type=int, default=10)
+    parser.add_argument("--stream", type=float, default=3.0, help="seconds each reply streams")
+    parser.add_argument("--global-rate", type=float, default=30.0)
+    parser.add_argument("--chat-rate", type=float, default=1.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.chats, args.stream, (args.global_rate, args.chat_rate)))
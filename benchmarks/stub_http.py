@@ -0,0 +1,71 @@
+"""Minimal keep-alive HTTP/1.1 stub server for benchmarks.
+
+Answers every request with a fixed body chosen by path prefix (dicts as JSON,
+bytes as a binary file), after an optional artificial service delay. Counts accepted TCP connections so a
+benchmark can show how many handshakes each client strategy costs.
+"""
+import asyncio
+import json
+from collections.abc import Mapping
+
+
+class StubHTTPServer:
+
+    def __init__(self, routes: Mapping[str, dict | bytes], delay: float = 0.0) -> None:
+        self._routes = dict(routes)
+        self._delay = delay
+        self._server: asyncio.AbstractServer | None = None
+        self.connections = 0
+        self.requests = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def start(self) -> "StubHTTPServer":
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    def _body_for(self, path: str) -> tuple[bytes, str]:
+        matches = [body for prefix, body in self._routes.items() if path.startswith(prefix)]
+        match matches:
+            case [bytes() as raw, *_]:
+                return raw, "application/octet-stream"
+            case [body, *_]:
+                return json.dumps(body).encode(), "application/json"
+            case _:
+                return b"{}", "application/json"
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while request_line := await reader.readline():
+                _, path, _ = request_line.decode().split(" ", 2)
+                headers = await _read_headers(reader)
+                await reader.readexactly(int(headers.get("content-length", "0")))
+                await asyncio.sleep(self._delay)
+                self.requests += 1
+                body, content_type = self._body_for(path)
+                writer.write(
+                    f"HTTP/1.1 200 OK\r\ncontent-type: {content_type}\r\n"
+                    f"content-length: {len(body)}\r\n\r\n".encode()
+                )
+                writer.write(body)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> dict[str, str]:
+    headers: dict[str, str] = {}
+    while (line := (await reader.readline()).decode().strip()):
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return headers
@@ -0,0 +1,81 @@
+"""Pool wait per Bot API method under concurrent chats, by pool size.
+
+    python -m benchmarks.telegram_pool [--chats 20] [--edits 10] [--pools 1,4,32] [--api-latency 0.05]
+
+Each simulated chat does what a streamed reply does: a typing action, a
+placeholder sendMessage, --edits editMessageText calls, and another typing
+action every few edits — all chats at once, through one bot request pool of
+each size, against FakeBotAPI. Reported per pool size: wall time and the
+`PoolWaitStats` mean / max wait for each method.
+"""
+import argparse
+import asyncio
+import time
+
+from telegram import Bot
+from telegram.constants import ChatAction
+
+from benchmarks.fake_bot_api import FakeBotAPI
+from src.constants import TELEGRAM_POOL_BOT
+from src.telegram.request import PoolWaitStats, build_request
+
+TOKEN = "123:bench"
+TYPING_EVERY = 3
+
+
+async def _chat(bot: Bot, chat_id: int, edits: int) -> None:
+    await bot.send_chat_action(chat_id, ChatAction.TYPING)
+    placeholder = await bot.send_message(chat_id, "…")
+    step = 0
+    while step < edits:
+        step += 1
+        await bot.edit_message_text(f"part {step}", chat_id, placeholder.message_id)
+        match step % TYPING_EVERY:
+            case 0:
+                await bot.send_chat_action(chat_id, ChatAction.TYPING)
+            case _:
+                pass
+
+
+async def measure(pool_size: int, chats: int, edits: int, api_latency: float) -> tuple[float, PoolWaitStats]:
+    api = await FakeBotAPI(TOKEN, latency=api_latency).start()
+    stats = PoolWaitStats(warn_after=float("inf"))
+    request = build_request(
+        TELEGRAM_POOL_BOT, stats, pool_size=pool_size, pool_timeout=60,
+        connect_timeout=5, read_timeout=30, write_timeout=5,
+    )
+    bot = Bot(TOKEN, base_url=f"{api.url}/bot", request=request)
+    await bot.initialize()
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(_chat(bot, chat_id, edits) for chat_id in range(1, chats + 1)))
+    finally:
+        elapsed = time.perf_counter() - started
+        await bot.shutdown()
+        await api.stop()
+    return elapsed, stats
+
+
+async def main(pools: list[int], chats: int, edits: int, api_latency: float) -> None:
+    print(f"{chats} chats x {edits} edits, Bot API latency {api_latency * 1000:g} ms")
+    while pools:
+        size = pools.pop(0)
+        elapsed, stats = await measure(size, chats, edits, api_latency)
+        print(f"\npool {size:>3}: {elapsed:.2f}s")
+        list(map(
+            lambda item: print(
+                f"  {item[0]:<16} n={item[1].count:<5} mean {item[1].mean * 1000:8.1f} ms"
+                f"   max {item[1].worst * 1000:8.1f} ms"
+            ),
+            sorted(stats.methods.items()),
+        ))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chats", type=int, default=20)
+    parser.add_argument("--edits", type=int, default=10)
+    parser.add_argument("--pools", default="1,4,32", help="pool sizes, comma-separated")
+    parser.add_argument("--api-latency", type=float, default=0.05, help="seconds per Bot API call")
+    args = parser.parse_args()
+    asyncio.run(main([int(p) for p in args.pools.split(",")], args.chats, args.edits, args.api_latency))
@@ -0,0 +1,96 @@
+"""Real-time factor of the local and Whisper transcription backends.
+
+    python -m benchmarks.transcription_rtf VOICE.ogg [...] [--engine faster-whisper]
+        [--model base] [--workers 2] [--seconds N]
+
+RTF = processing time / audio duration (below 1.0 is faster than real time).
+"serial" transcribes one file at a time; "parallel" submits all of them at once
+and divides wall time by the total audio length. Durations are read from the
+last Ogg page (Telegram voice notes are Ogg/Opus) unless --seconds is given.
+Whisper is measured only when OPENAI_API_KEY is set; the local model load is
+excluded (workers are warmed first), as it is in the bot.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from pathlib import Path
+
+from src.providers import ProviderRegistry
+from src.transcription.client import TranscriptionClient
+from src.transcription.local import LocalTranscriptionClient
+from src.transcription.whisper import WhisperTranscriptionClient
+
+OPUS_RATE = 48000
+
+
+def ogg_seconds(data: bytes) -> float:
+    """Duration from the granule position of the last Ogg page (48 kHz for Opus)."""
+    last = data.rfind(b"OggS")
+    match last:
+        case -1:
+            raise ValueError("not an Ogg file; pass --seconds")
+        case _:
+            return int.from_bytes(data[last + 6:last + 14], "little") / OPUS_RATE
+
+
+async def measure(client: TranscriptionClient, clips: list[tuple[bytes, float]]) -> dict:
+    async def one(audio: bytes) -> float:
+        started = time.perf_counter()
+        await client.transcribe(audio)
+        return time.perf_counter() - started
+
+    serial = [await one(audio) / seconds for audio, seconds in clips]
+    started = time.perf_counter()
+    await asyncio.gather(*(client.transcribe(audio) for audio, _ in clips))
+    wall = time.perf_counter() - started
+    return {
+        "serial_rtf": statistics.median(serial),
+        "parallel_rtf": wall / sum(seconds for _, seconds in clips),
+    }
+
+
+async def main(clips: list[tuple[bytes, float]], engine: str, model: str, workers: int) -> None:
+    local = LocalTranscriptionClient(
+        engine=engine, model=model, workers=workers, queue_size=len(clips)
+    )
+    load_started = time.perf_counter()
+    await asyncio.gather(*map(asyncio.wrap_future, local.start()))
+    load = time.perf_counter() - load_started
+    rows = {}
+    try:
+        rows[f"local {engine}/{model}"] = await measure(local, clips)
+    finally:
+        await local.aclose()
+    match os.getenv("OPENAI_API_KEY"):
+        case str() as key if key:
+            registry = ProviderRegistry(openai_api_key=key)
+            try:
+                rows["whisper API"] = await measure(WhisperTranscriptionClient(registry), clips)
+            finally:
+                await registry.aclose()
+        case _:
+            print("OPENAI_API_KEY not set — skipping Whisper")
+    total = sum(seconds for _, seconds in clips)
+    print(f"{len(clips)} clips, {total:.1f}s of audio, {workers} local worker(s), model load {load:.1f}s")
+    print(f"{'':>28}  {'serial RTF':>10}  {'parallel RTF':>12}")
+    list(map(
+        lambda item: print(
+            f"{item[0]:>28}  {item[1]['serial_rtf']:>10.3f}  {item[1]['parallel_rtf']:>12.3f}"
+        ),
+        rows.items(),
+    ))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("audio", type=Path, nargs="+", help="voice notes (.ogg)")
+    parser.add_argument("--engine", default="faster-whisper")
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, help="duration of every clip, for non-Ogg input")
+    args = parser.parse_args()
+    blobs = [p.read_bytes() for p in args.audio]
+    clips = [(b, args.seconds or ogg_seconds(b)) for b in blobs]
+    asyncio.run(main(clips, args.engine, args.model, args.workers))
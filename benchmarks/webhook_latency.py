@@ -0,0 +1,132 @@
+"""Update → reply latency: long polling vs webhook, against FakeBotAPI.
+
+    python -m benchmarks.webhook_latency [--messages 200] [--api-latency 0.02] [--burst 1]
+
+The real TelegramClient runs with an echo handler in each mode. Messages are
+injected in bursts of --burst (one after the other by default); latency is
+from injection to the echo arriving at the fake API. --api-latency adds a
+per-call service time to every Bot API method, getUpdates included, which is
+where polling pays: an update that lands while the previous getUpdates
+response is still in flight waits for the next poll.
+"""
+import argparse
+import asyncio
+import dataclasses
+import statistics
+import time
+
+from benchmarks.fake_bot_api import FakeBotAPI
+from src.config import Config
+from src.constants import TELEGRAM_MODE_POLLING, TELEGRAM_MODE_WEBHOOK
+from src.http_server import HTTPServer
+from src.telegram.client import TelegramClient
+
+TOKEN = "123:bench"
+CHAT_ID = 123456789
+
+
+def _config(mode: str, api_url: str, port: int) -> Config:
+    return Config(
+        telegram_bot_token=TOKEN,
+        allowed_chat_id=str(CHAT_ID),
+        claude_cli_path="claude",
+        log_level="WARNING",
+        cursor_cli_path=None,
+        cursor_timeout=60,
+        claude_timeout=45,
+        claude_patterns=("@claude",),
+        claude_model_aliases={},
+        cursor_working_dir=None,
+        openai_api_key=None,
+        anthropic_api_key=None,
+        stream_responses=False,
+        telegram_api_url=api_url,
+        telegram_rate_limit=False,   # 1 msg/s per chat would dominate the latency
+        telegram_mode=mode,
+        webhook_url=f"http://127.0.0.1:{port}/hook",
+        webhook_listen="127.0.0.1",
+        webhook_port=port,
+        webhook_secret="bench",
+    )
+
+
+async def _free_port() -> int:
+    probe = await HTTPServer({}).start()
+    port = probe.port
+    await probe.stop()
+    return port
+
+
+async def _echo(message) -> str:
+    return message.content
+
+
+async def measure(mode: str, messages: int, burst: int, api_latency: float) -> list[float]:
+    api = await FakeBotAPI(TOKEN, latency=api_latency).start()
+    client = TelegramClient(_config(mode, api.url, await _free_port()))
+    app = client.build_application(_echo)
+    replies: dict[str, float] = {}
+    arrived = asyncio.Event()
+
+    def on_sent(sent) -> None:
+        replies[sent.text] = sent.at
+        arrived.set()
+
+    api.on_sent = on_sent
+    stop = asyncio.Event()
+    match mode:
+        case m if m == TELEGRAM_MODE_WEBHOOK:
+            runner = asyncio.create_task(client.serve_webhook(stop))
+            while api.webhook is None:
+                await asyncio.sleep(0.01)
+        case _:
+            await app.initialize()
+            await app.updater.start_polling(poll_interval=0.0, timeout=10)
+            await app.start()
+    latencies: list[float] = []
+    sent = 0
+    try:
+        while sent < messages:
+            texts = [f"m{n}" for n in range(sent, min(sent + burst, messages))]
+            started = {t: await api.inject(CHAT_ID, t) for t in texts}
+            while not all(t in replies for t in texts):
+                arrived.clear()
+                await asyncio.wait_for(arrived.wait(), 10)
+            latencies.extend(replies[t] - started[t] for t in texts)
+            sent += len(texts)
+    finally:
+        match mode:
+            case m if m == TELEGRAM_MODE_WEBHOOK:
+                stop.set()
+                await runner
+            case _:
+                await app.updater.stop()
+                await app.stop()
+                await app.shutdown()
+        await api.stop()
+    return latencies
+
+
+def _summary(values: list[float]) -> str:
+    ordered = sorted(values)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    return f"p50 {statistics.median(ordered) * 1000:7.1f} ms   p95 {p95 * 1000:7.1f} ms   max {ordered[-1] * 1000:7.1f} ms"
+
+
+async def main(messages: int, burst: int, api_latency: float) -> None:
+    print(f"{messages} messages, bursts of {burst}, Bot API latency {api_latency * 1000:g} ms")
+    modes = [TELEGRAM_MODE_POLLING, TELEGRAM_MODE_WEBHOOK]
+    while modes:
+        mode = modes.pop(0)
+        started = time.perf_counter()
+        latencies = await measure(mode, messages, burst, api_latency)
+        print(f"{mode:>8}: {_summary(latencies)}   ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--burst", type=int, default=1)
+    parser.add_argument("--api-latency", type=float, default=0.02, help="seconds per Bot API call")
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.burst, args.api_latency))
@@ -221,6 +221,7 @@ Type=simple
 WorkingDirectory=${PROJECT_DIR}
 EnvironmentFile=${PROJECT_DIR}/.env
 Environment=PYTHONPATH=${PROJECT_DIR}
+Environment=LOG_FORMAT=plain
 ExecStart=${PROJECT_DIR}/venv/bin/python3 -m src.main
 Restart=on-failure
 RestartSec=5
@@ -1,31 +1,44 @@
-import json
 import logging
+import time
 from pathlib import Path
 from typing import NamedTuple
 
+from src.constants import (
+    STORE_CLAUDE_SESSIONS,
+    STORE_CURSOR_CHATS,
+    STORE_HISTORY,
+    STORE_PROCESSED,
+)
 from src.message_handler import normalize_phone
+from src.metrics import STORE_WRITE_SECONDS
+from src.storage.history import SQLiteHistory
+from src.storage.log import AppendLog
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_STORE_PATH = Path(".cursor_chat_ids.json")
 CLAUDE_STORE_PATH = Path(".claude_session_ids.json")
 MESSAGE_STORE_PATH = Path(".processed_messages.json")
-HISTORY_STORE_PATH = Path(".message_history.json")
+HISTORY_STORE_PATH = Path(".message_history.json")  # legacy JSON, imported once
+HISTORY_DB_PATH = Path(".message_history.db")
 
 
 class ChatStore:
+    """Key → value store persisted as a JSON snapshot plus a group-committed change log."""
+
+    store_name = STORE_CURSOR_CHATS
 
     def __init__(self, path: Path = DEFAULT_STORE_PATH):
         self._path = path
+        self._log = AppendLog(path)
         self._store: dict[str, str] = {}
         self._load()
 
     def _load(self) -> None:
-        match self._path.exists():
+        match self._log.exists():
             case True:
                 try:
-                    with open(self._path) as f:
-                        raw = json.load(f)
+                    raw = self._log.load()
                     self._store = dict(
                         map(lambda kv: (normalize_phone(kv[0]) or kv[0], kv[1]), raw.items())
                     )
@@ -41,29 +54,45 @@ class ChatStore:
                 pass
 
     def _save(self) -> None:
+        """Rewrite the snapshot from memory and truncate the log."""
         try:
-            with open(self._path, "w") as f:
-                json.dump(self._store, f, indent=2)
+            self._log.compact(self._store)
         except Exception as e:
             logger.warning(f"Store save failed: {e}")
 
+    def _record(self, sender: str, value: str | None) -> None:
+        started = time.perf_counter()
+        try:
+            self._log.append(sender, value)
+        except Exception as e:
+            logger.warning(f"Store save failed: {e}")
+            return
+        STORE_WRITE_SECONDS.labels(self.store_name).observe(time.perf_counter() - started)
+        match self._log.needs_compaction(len(self._store)):
+            case True:
+                self._log.compact_soon(self._store)
+            case False:
+                pass
+
     def get(self, sender: str) -> str | None:
         return self._store.get(sender)
 
     def set(self, sender: str, value: str) -> None:
         self._store[sender] = value
-        self._save()
+        self._record(sender, value)
 
     def delete(self, sender: str) -> None:
         match self._store.pop(sender, None):
             case None:
                 pass
             case _:
-                self._save()
+                self._record(sender, None)
 
 
 class ClaudeSessionStore(ChatStore):
 
+    store_name = STORE_CLAUDE_SESSIONS
+
     def __init__(self, path: Path = CLAUDE_STORE_PATH):
         super().__init__(path)
 
@@ -74,53 +103,42 @@ class HistoryEntry(NamedTuple):
 
 
 class MessageHistoryStore:
-
-    def __init__(self, path: Path = HISTORY_STORE_PATH, max_per_sender: int = 20) -> None:
+    """Full per-sender message archive; `get` returns only the newest `max_per_sender` entries."""
+
+    def __init__(
+        self,
+        path: Path = HISTORY_DB_PATH,
+        max_per_sender: int = 20,
+        legacy_path: Path = HISTORY_STORE_PATH,
+    ) -> None:
         self._path = path
         self._max = max_per_sender
-        self._store: dict[str, list[dict]] = {}
-        self._load()
-
-    def _load(self) -> None:
-        match self._path.exists():
-            case True:
-                try:
-                    with open(self._path) as f:
-                        self._store = json.load(f)
-                except Exception as e:
-                    logger.warning("History load failed: %s, starting fresh", e)
-            case False:
-                pass
+        self._db = SQLiteHistory(path)
+        self._db.import_legacy_json(legacy_path)
 
-    def _save(self) -> None:
+    def append(self, sender: str, role: str, content: str) -> None:
+        key = normalize_phone(sender) or sender
+        started = time.perf_counter()
         try:
-            with open(self._path, "w") as f:
-                json.dump(self._store, f, indent=2)
+            self._db.append(key, role, content)
         except Exception as e:
             logger.warning("History save failed: %s", e)
+            return
+        STORE_WRITE_SECONDS.labels(STORE_HISTORY).observe(time.perf_counter() - started)
 
-    def append(self, sender: str, role: str, content: str) -> None:
-        key = normalize_phone(sender) or sender
-        history = self._store.get(key, [])
-        history.append({"role": role, "content": content})
-        self._store[key] = history[-self._max:]
-        self._save()
-
-    def get(self, sender: str) -> list[HistoryEntry]:
+    def get(self, sender: str, limit: int | None = None) -> list[HistoryEntry]:
         key = normalize_phone(sender) or sender
-        return list(map(lambda e: HistoryEntry(**e), self._store.get(key, [])))
+        return list(map(HistoryEntry._make, self._db.tail(key, limit or self._max)))
 
     def delete(self, sender: str) -> None:
         key = normalize_phone(sender) or sender
-        match self._store.pop(key, None):
-            case None:
-                pass
-            case _:
-                self._save()
+        self._db.delete(key)
 
 
 class ProcessedMessageStore(ChatStore):
 
+    store_name = STORE_PROCESSED
+
     def __init__(self, path: Path = MESSAGE_STORE_PATH):
         super().__init__(path)
 
@@ -132,7 +150,7 @@ class ProcessedMessageStore(ChatStore):
         match len(self._store):
             case n if n > 100:
                 self._store = dict(list(self._store.items())[-50:])
-                self._save()
+                self._log.compact_soon(self._store)
                 logger.info(f"Cleaned up, kept {len(self._store)} recent senders")
             case _:
                 pass
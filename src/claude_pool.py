@@ -0,0 +1,291 @@
+"""ClaudeWorkerPool — long-lived Claude CLI processes, one per sender session.
+
+Each worker runs `claude -p --input-format stream-json --output-format stream-json`
+and is fed one user turn per stdin line, so the CLI's startup and session reload
+are paid once per session instead of once per message.  ClaudeSessionStore stays
+the source of truth: a worker is reused only while its session ID still matches
+the stored one.
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import AsyncGenerator
+
+from src.constants import (
+    CLAUDE_INPUT_FLAG,
+    CLAUDE_MODEL_FLAG,
+    CLAUDE_OUTPUT_FLAG,
+    CLAUDE_PROMPT_FLAG,
+    CLAUDE_RESUME_FLAG,
+    CLAUDE_VERBOSE_FLAG,
+    CLAUDE_WORKER_FORMAT,
+    CLAUDE_WORKER_STOP_GRACE,
+    CLI_LINE_LIMIT,
+    MSG_CLAUDE_WORKER_RETIRED,
+    MSG_CLAUDE_WORKER_SPAWNED,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ClaudeWorkerError(Exception):
+    """The worker is unusable — callers should fall back to a one-shot spawn."""
+
+
+def _user_turn(message: str) -> bytes:
+    payload = {"type": "user", "message": {"role": "user", "content": message}}
+    return json.dumps(payload).encode() + b"\n"
+
+
+class ClaudeWorker:
+
+    def __init__(
+        self,
+        process: asyncio.subprocess.Process,
+        session_id: str | None,
+        model: str | None,
+    ) -> None:
+        self._process = process
+        self.session_id = session_id
+        self.model = model
+        self.last_used = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def pid(self) -> int:
+        return self._process.pid
+
+    @property
+    def alive(self) -> bool:
+        return self._process.returncode is None
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    async def turn(self, message: str, timeout: float) -> AsyncGenerator[dict, None]:
+        """Send one user turn and yield stream-json events up to and including `result`.
+
+        `timeout` covers the whole turn. A turn that ends any other way — timeout,
+        bad output, or the caller closing the generator early — kills the worker,
+        so no half-read reply is left for the next turn.
+        """
+        async with self._lock:
+            stdin, stdout = self._process.stdin, self._process.stdout
+            match (stdin, stdout, self.alive):
+                case (None, _, _) | (_, None, _) | (_, _, False):
+                    raise ClaudeWorkerError("worker is not running")
+                case _:
+                    pass
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            finished = False
+            try:
+                try:
+                    stdin.write(_user_turn(message))
+                    await stdin.drain()
+                except (BrokenPipeError, ConnectionResetError) as exc:
+                    raise ClaudeWorkerError(f"stdin closed: {exc}") from exc
+
+                while not finished:
+                    try:
+                        raw = await asyncio.wait_for(stdout.readline(), max(0.0, deadline - loop.time()))
+                    except asyncio.TimeoutError:
+                        raise
+                    except Exception as exc:
+                        # e.g. ValueError: a line over CLI_LINE_LIMIT
+                        raise ClaudeWorkerError(f"unreadable output: {exc}") from exc
+                    match raw:
+                        case b"":
+                            raise ClaudeWorkerError(
+                                f"worker exited mid-turn (code {self._process.returncode})"
+                            )
+                        case _:
+                            pass
+                    try:
+                        event = json.loads(raw.decode(errors="replace"))
+                    except json.JSONDecodeError:
+                        continue
+                    match event:
+                        case {"type": "result", **rest}:
+                            finished = True
+                            match rest.get("session_id"):
+                                case str() as s if s:
+                                    self.session_id = s
+                                case _:
+                                    pass
+                        case _:
+                            pass
+                    yield event
+                self.last_used = time.monotonic()
+            finally:
+                match finished:
+                    case True:
+                        pass
+                    case False:
+                        await self.kill()
+
+    async def kill(self) -> None:
+        """Stop at once; the pool retires a dead worker on its next acquire or sweep."""
+        match self._process.stdin:
+            case None:
+                pass
+            case stdin:
+                stdin.close()
+        match self.alive:
+            case True:
+                try:
+                    self._process.kill()
+                except ProcessLookupError:
+                    pass
+            case False:
+                pass
+        await self._process.wait()
+
+    async def stop(self) -> None:
+        match self._process.stdin:
+            case None:
+                pass
+            case stdin:
+                stdin.close()
+        match self.alive:
+            case False:
+                return
+            case True:
+                pass
+        try:
+            await asyncio.wait_for(self._process.wait(), CLAUDE_WORKER_STOP_GRACE)
+        except asyncio.TimeoutError:
+            self._process.kill()
+            await self._process.wait()
+        except ProcessLookupError:
+            pass
+
+
+class ClaudeWorkerPool:
+    """Keeps at most `max_workers` Claude workers alive, evicting idle ones after `idle_ttl` s."""
+
+    def __init__(
+        self,
+        claude_path: str,
+        max_workers: int,
+        idle_ttl: float,
+        extra_args: list[str] | None = None,
+    ) -> None:
+        self._claude_path = claude_path
+        self._extra_args = extra_args or []
+        self._max_workers = max_workers
+        self._idle_ttl = idle_ttl
+        self._workers: OrderedDict[str, ClaudeWorker] = OrderedDict()
+        self._lock = asyncio.Lock()
+        self._reaper: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._workers)
+
+    async def acquire(self, key: str, session_id: str | None, model: str | None) -> ClaudeWorker:
+        """Return the live worker for `key`, spawning one if none matches session and model."""
+        self._ensure_reaper()
+        async with self._lock:
+            await self._evict_idle()
+            match self._workers.get(key):
+                case ClaudeWorker() as w if (
+                    w.alive and w.session_id == session_id and w.model == model
+                ):
+                    self._workers.move_to_end(key)
+                    return w
+                case ClaudeWorker() as w:
+                    reason = "exited" if not w.alive else "session changed"
+                    await self._retire(key, reason)
+                case None:
+                    pass
+            await self._make_room()
+            worker = await self._spawn(session_id, model)
+            self._workers[key] = worker
+            logger.info(MSG_CLAUDE_WORKER_SPAWNED, key, worker.pid)
+            return worker
+
+    async def discard(self, key: str) -> None:
+        async with self._lock:
+            await self._retire(key, "discarded")
+
+    async def close(self) -> None:
+        match self._reaper:
+            case None:
+                pass
+            case task:
+                task.cancel()
+                self._reaper = None
+        async with self._lock:
+            await asyncio.gather(
+                *map(lambda k: self._retire(k, "shutdown"), list(self._workers))
+            )
+
+    # ── internals ─────────────────────────────────────────────────────────────
+
+    def _spawn_args(self, session_id: str | None, model: str | None) -> list[str]:
+        resume = [CLAUDE_RESUME_FLAG, session_id] if session_id else []
+        model_args = [CLAUDE_MODEL_FLAG, model] if model else []
+        return [
+            self._claude_path,
+            CLAUDE_PROMPT_FLAG,
+            CLAUDE_INPUT_FLAG, CLAUDE_WORKER_FORMAT,
+            CLAUDE_OUTPUT_FLAG, CLAUDE_WORKER_FORMAT,
+            CLAUDE_VERBOSE_FLAG,
+        ] + self._extra_args + resume + model_args
+
+    async def _spawn(self, session_id: str | None, model: str | None) -> ClaudeWorker:
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *self._spawn_args(session_id, model),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                limit=CLI_LINE_LIMIT,
+            )
+        except OSError as exc:
+            raise ClaudeWorkerError(f"spawn failed: {exc}") from exc
+        return ClaudeWorker(process, session_id, model)
+
+    async def _retire(self, key: str, reason: str) -> None:
+        match self._workers.pop(key, None):
+            case None:
+                pass
+            case worker:
+                logger.info(MSG_CLAUDE_WORKER_RETIRED, key, reason)
+                await worker.stop()
+
+    async def _make_room(self) -> None:
+        idle = [k for k, w in self._workers.items() if not w.busy]
+        excess = len(self._workers) - self._max_workers + 1
+        match excess:
+            case n if n <= 0:
+                return
+            case n if n > len(idle):
+                raise ClaudeWorkerError("pool is full")
+            case n:
+                # OrderedDict keeps least-recently-used first
+                await asyncio.gather(*map(lambda k: self._retire(k, "evicted"), idle[:n]))
+
+    async def _evict_idle(self) -> None:
+        cutoff = time.monotonic() - self._idle_ttl
+        expired = [
+            k for k, w in self._workers.items()
+            if not w.busy and (w.last_used < cutoff or not w.alive)
+        ]
+        await asyncio.gather(*map(lambda k: self._retire(k, "idle"), expired))
+
+    def _ensure_reaper(self) -> None:
+        match self._reaper:
+            case asyncio.Task() as t if not t.done():
+                return
+            case _:
+                self._reaper = asyncio.create_task(self._reap_loop())
+
+    async def _reap_loop(self) -> None:
+        while True:
+            await asyncio.sleep(max(1.0, self._idle_ttl / 2))
+            async with self._lock:
+                await self._evict_idle()
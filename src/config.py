@@ -3,7 +3,13 @@ from typing import Optional
 import os
 from dotenv import load_dotenv
 
-from src.constants import DEFAULT_CLAUDE_MODEL_ALIASES
+from src.constants import (
+    DEFAULT_CLAUDE_MODEL_ALIASES,
+    LOG_FORMATS,
+    TELEGRAM_MODE_WEBHOOK,
+    TELEGRAM_MODES,
+    TRANSCRIPTION_BACKENDS,
+)
 
 
 @dataclass(frozen=True)
@@ -21,6 +27,63 @@ class Config:
     openai_api_key: Optional[str]
     anthropic_api_key: Optional[str]
     stream_responses: bool
+    claude_pool_enabled: bool = False
+    claude_pool_max_workers: int = 4
+    claude_pool_idle_ttl: int = 600
+    max_concurrent_updates: int = 8
+    claude_max_processes: int = 2
+    cursor_max_processes: int = 2
+    spawn_queue_max: int = 10
+    spawn_max_wait: int = 300
+    claude_partial_messages: bool = False
+    cursor_streaming: bool = True
+    telegram_document_threshold: int = 0
+    provider_timeout: float = 60.0
+    provider_max_retries: int = 2
+    openai_max_concurrency: int = 4
+    anthropic_max_concurrency: int = 4
+    media_cache_enabled: bool = True
+    media_cache_max_entries: int = 5000
+    media_cache_ttl: int = 2592000
+    vision_target_size: int = 1280
+    vision_jpeg_quality: int = 85
+    album_max_images: int = 10
+    album_max_pending: int = 8
+    voice_segment_seconds: int = 120
+    voice_max_concurrency: int = 3
+    ffmpeg_path: str | None = None
+    transcription_backend: str = "whisper"
+    local_stt_engine: str = "faster-whisper"
+    local_stt_model: str = "base"
+    local_stt_workers: int = 2
+    local_stt_queue: int = 8
+    media_spill_threshold: int = 8388608
+    telegram_mode: str = "polling"
+    webhook_url: str | None = None
+    webhook_listen: str = "0.0.0.0"
+    webhook_port: int = 8443
+    webhook_secret: str | None = None
+    telegram_api_url: str | None = None
+    telegram_pool_size: int = 256
+    telegram_pool_timeout: float = 1.0
+    telegram_connect_timeout: float = 5.0
+    telegram_read_timeout: float = 5.0
+    telegram_write_timeout: float = 5.0
+    telegram_http2: bool = False
+    telegram_updates_pool_size: int = 1
+    telegram_updates_pool_timeout: float = 1.0
+    telegram_updates_connect_timeout: float = 5.0
+    telegram_updates_read_timeout: float = 5.0
+    telegram_updates_write_timeout: float = 5.0
+    telegram_updates_http2: bool = False
+    telegram_rate_limit: bool = True
+    telegram_rate_global: float = 30.0
+    telegram_rate_global_burst: float = 30.0
+    telegram_rate_chat: float = 1.0
+    telegram_rate_chat_burst: float = 10.0
+    metrics_port: int = 0
+    metrics_listen: str = "127.0.0.1"
+    log_format: str = "rich"
 
     @classmethod
     def from_env(cls) -> "Config":
@@ -39,6 +102,63 @@ class Config:
         openai_api_key = os.getenv("OPENAI_API_KEY") or None
         anthropic_api_key = os.getenv("ANTHROPIC_API_KEY") or None
         stream_responses = os.getenv("STREAM_RESPONSES", "false").lower() == "true"
+        claude_pool_enabled = os.getenv("CLAUDE_WORKER_POOL", "false").lower() == "true"
+        claude_pool_max_workers = os.getenv("CLAUDE_POOL_MAX_WORKERS", "4")
+        claude_pool_idle_ttl = os.getenv("CLAUDE_POOL_IDLE_TTL", "600")
+        max_concurrent_updates = os.getenv("MAX_CONCURRENT_UPDATES", "8")
+        claude_max_processes = os.getenv("CLAUDE_MAX_PROCESSES", "2")
+        cursor_max_processes = os.getenv("CURSOR_MAX_PROCESSES", "2")
+        spawn_queue_max = os.getenv("SPAWN_QUEUE_MAX", "10")
+        spawn_max_wait = os.getenv("SPAWN_MAX_WAIT", "300")
+        claude_partial_messages = os.getenv("CLAUDE_PARTIAL_MESSAGES", "false").lower() == "true"
+        cursor_streaming = os.getenv("CURSOR_STREAMING", "true").lower() == "true"
+        telegram_document_threshold = os.getenv("TELEGRAM_DOCUMENT_THRESHOLD", "0")
+        provider_timeout = os.getenv("PROVIDER_TIMEOUT", "60")
+        provider_max_retries = os.getenv("PROVIDER_MAX_RETRIES", "2")
+        openai_max_concurrency = os.getenv("OPENAI_MAX_CONCURRENCY", "4")
+        anthropic_max_concurrency = os.getenv("ANTHROPIC_MAX_CONCURRENCY", "4")
+        media_cache_enabled = os.getenv("MEDIA_CACHE_ENABLED", "true").lower() == "true"
+        media_cache_max_entries = os.getenv("MEDIA_CACHE_MAX_ENTRIES", "5000")
+        media_cache_ttl = os.getenv("MEDIA_CACHE_TTL", "2592000")
+        vision_target_size = os.getenv("VISION_TARGET_SIZE", "1280")
+        vision_jpeg_quality = os.getenv("VISION_JPEG_QUALITY", "85")
+        album_max_images = os.getenv("ALBUM_MAX_IMAGES", "10")
+        album_max_pending = os.getenv("ALBUM_MAX_PENDING", "8")
+        voice_segment_seconds = os.getenv("VOICE_SEGMENT_SECONDS", "120")
+        voice_max_concurrency = os.getenv("VOICE_MAX_CONCURRENCY", "3")
+        ffmpeg_path = os.getenv("FFMPEG_PATH") or None
+        transcription_backend = os.getenv("TRANSCRIPTION_BACKEND", "whisper").strip().lower()
+        local_stt_engine = os.getenv("LOCAL_STT_ENGINE", "faster-whisper").strip().lower()
+        local_stt_model = os.getenv("LOCAL_STT_MODEL", "base").strip()
+        local_stt_workers = os.getenv("LOCAL_STT_WORKERS", "2")
+        local_stt_queue = os.getenv("LOCAL_STT_QUEUE", "8")
+        media_spill_threshold = os.getenv("MEDIA_SPILL_THRESHOLD", "8388608")
+        telegram_mode = os.getenv("TELEGRAM_MODE", "polling").strip().lower()
+        webhook_url = os.getenv("WEBHOOK_URL") or None
+        webhook_listen = os.getenv("WEBHOOK_LISTEN", "0.0.0.0")
+        webhook_port = os.getenv("WEBHOOK_PORT", "8443")
+        webhook_secret = os.getenv("WEBHOOK_SECRET") or None
+        telegram_api_url = (os.getenv("TELEGRAM_API_URL") or "").rstrip("/") or None
+        telegram_pool_size = os.getenv("TELEGRAM_POOL_SIZE", "256")
+        telegram_pool_timeout = os.getenv("TELEGRAM_POOL_TIMEOUT", "1")
+        telegram_connect_timeout = os.getenv("TELEGRAM_CONNECT_TIMEOUT", "5")
+        telegram_read_timeout = os.getenv("TELEGRAM_READ_TIMEOUT", "5")
+        telegram_write_timeout = os.getenv("TELEGRAM_WRITE_TIMEOUT", "5")
+        telegram_http2 = os.getenv("TELEGRAM_HTTP2", "false").lower() == "true"
+        telegram_updates_pool_size = os.getenv("TELEGRAM_UPDATES_POOL_SIZE", "1")
+        telegram_updates_pool_timeout = os.getenv("TELEGRAM_UPDATES_POOL_TIMEOUT", "1")
+        telegram_updates_connect_timeout = os.getenv("TELEGRAM_UPDATES_CONNECT_TIMEOUT", "5")
+        telegram_updates_read_timeout = os.getenv("TELEGRAM_UPDATES_READ_TIMEOUT", "5")
+        telegram_updates_write_timeout = os.getenv("TELEGRAM_UPDATES_WRITE_TIMEOUT", "5")
+        telegram_updates_http2 = os.getenv("TELEGRAM_UPDATES_HTTP2", "false").lower() == "true"
+        telegram_rate_limit = os.getenv("TELEGRAM_RATE_LIMIT", "true").lower() == "true"
+        telegram_rate_global = os.getenv("TELEGRAM_RATE_GLOBAL", "30")
+        telegram_rate_global_burst = os.getenv("TELEGRAM_RATE_GLOBAL_BURST", "30")
+        telegram_rate_chat = os.getenv("TELEGRAM_RATE_CHAT", "1")
+        telegram_rate_chat_burst = os.getenv("TELEGRAM_RATE_CHAT_BURST", "10")
+        metrics_port = os.getenv("METRICS_PORT", "0")
+        metrics_listen = os.getenv("METRICS_LISTEN", "127.0.0.1")
+        log_format = os.getenv("LOG_FORMAT", "rich").lower()
 
         patterns = tuple(p.strip() for p in raw_patterns.split(",") if p.strip())
         aliases = dict(
@@ -61,6 +181,63 @@ class Config:
             openai_api_key=openai_api_key,
             anthropic_api_key=anthropic_api_key,
             stream_responses=stream_responses,
+            claude_pool_enabled=claude_pool_enabled,
+            claude_pool_max_workers=int(claude_pool_max_workers),
+            claude_pool_idle_ttl=int(claude_pool_idle_ttl),
+            max_concurrent_updates=int(max_concurrent_updates),
+            claude_max_processes=int(claude_max_processes),
+            cursor_max_processes=int(cursor_max_processes),
+            spawn_queue_max=int(spawn_queue_max),
+            spawn_max_wait=int(spawn_max_wait),
+            claude_partial_messages=claude_partial_messages,
+            cursor_streaming=cursor_streaming,
+            telegram_document_threshold=max(0, int(telegram_document_threshold)),
+            provider_timeout=float(provider_timeout),
+            provider_max_retries=int(provider_max_retries),
+            openai_max_concurrency=int(openai_max_concurrency),
+            anthropic_max_concurrency=int(anthropic_max_concurrency),
+            media_cache_enabled=media_cache_enabled,
+            media_cache_max_entries=int(media_cache_max_entries),
+            media_cache_ttl=int(media_cache_ttl),
+            vision_target_size=max(0, int(vision_target_size)),
+            vision_jpeg_quality=min(95, max(1, int(vision_jpeg_quality))),
+            album_max_images=max(1, int(album_max_images)),
+            album_max_pending=max(1, int(album_max_pending)),
+            voice_segment_seconds=max(10, int(voice_segment_seconds)),
+            voice_max_concurrency=int(voice_max_concurrency),
+            ffmpeg_path=ffmpeg_path,
+            transcription_backend=transcription_backend,
+            local_stt_engine=local_stt_engine,
+            local_stt_model=local_stt_model,
+            local_stt_workers=max(1, int(local_stt_workers)),
+            local_stt_queue=max(0, int(local_stt_queue)),
+            media_spill_threshold=max(0, int(media_spill_threshold)),
+            telegram_mode=telegram_mode,
+            webhook_url=webhook_url,
+            webhook_listen=webhook_listen,
+            webhook_port=int(webhook_port),
+            webhook_secret=webhook_secret,
+            telegram_api_url=telegram_api_url,
+            telegram_pool_size=max(1, int(telegram_pool_size)),
+            telegram_pool_timeout=float(telegram_pool_timeout),
+            telegram_connect_timeout=float(telegram_connect_timeout),
+            telegram_read_timeout=float(telegram_read_timeout),
+            telegram_write_timeout=float(telegram_write_timeout),
+            telegram_http2=telegram_http2,
+            telegram_updates_pool_size=max(1, int(telegram_updates_pool_size)),
+            telegram_updates_pool_timeout=float(telegram_updates_pool_timeout),
+            telegram_updates_connect_timeout=float(telegram_updates_connect_timeout),
+            telegram_updates_read_timeout=float(telegram_updates_read_timeout),
+            telegram_updates_write_timeout=float(telegram_updates_write_timeout),
+            telegram_updates_http2=telegram_updates_http2,
+            telegram_rate_limit=telegram_rate_limit,
+            telegram_rate_global=max(0.1, float(telegram_rate_global)),
+            telegram_rate_global_burst=max(1.0, float(telegram_rate_global_burst)),
+            telegram_rate_chat=max(0.1, float(telegram_rate_chat)),
+            telegram_rate_chat_burst=max(1.0, float(telegram_rate_chat_burst)),
+            metrics_port=max(0, int(metrics_port)),
+            metrics_listen=metrics_listen,
+            log_format=log_format,
         )
 
     @staticmethod
@@ -78,6 +255,63 @@ class Config:
         openai_api_key: Optional[str],
         anthropic_api_key: Optional[str],
         stream_responses: bool,
+        claude_pool_enabled: bool,
+        claude_pool_max_workers: int,
+        claude_pool_idle_ttl: int,
+        max_concurrent_updates: int,
+        claude_max_processes: int,
+        cursor_max_processes: int,
+        spawn_queue_max: int,
+        spawn_max_wait: int,
+        claude_partial_messages: bool,
+        cursor_streaming: bool,
+        telegram_document_threshold: int,
+        provider_timeout: float,
+        provider_max_retries: int,
+        openai_max_concurrency: int,
+        anthropic_max_concurrency: int,
+        media_cache_enabled: bool,
+        media_cache_max_entries: int,
+        media_cache_ttl: int,
+        vision_target_size: int,
+        vision_jpeg_quality: int,
+        album_max_images: int,
+        album_max_pending: int,
+        voice_segment_seconds: int,
+        voice_max_concurrency: int,
+        ffmpeg_path: str | None,
+        transcription_backend: str,
+        local_stt_engine: str,
+        local_stt_model: str,
+        local_stt_workers: int,
+        local_stt_queue: int,
+        media_spill_threshold: int,
+        telegram_mode: str,
+        webhook_url: str | None,
+        webhook_listen: str,
+        webhook_port: int,
+        webhook_secret: str | None,
+        telegram_api_url: str | None,
+        telegram_pool_size: int,
+        telegram_pool_timeout: float,
+        telegram_connect_timeout: float,
+        telegram_read_timeout: float,
+        telegram_write_timeout: float,
+        telegram_http2: bool,
+        telegram_updates_pool_size: int,
+        telegram_updates_pool_timeout: float,
+        telegram_updates_connect_timeout: float,
+        telegram_updates_read_timeout: float,
+        telegram_updates_write_timeout: float,
+        telegram_updates_http2: bool,
+        telegram_rate_limit: bool,
+        telegram_rate_global: float,
+        telegram_rate_global_burst: float,
+        telegram_rate_chat: float,
+        telegram_rate_chat_burst: float,
+        metrics_port: int,
+        metrics_listen: str,
+        log_format: str,
     ) -> "Config":
         match telegram_bot_token:
             case None | "":
@@ -91,6 +325,33 @@ class Config:
             case _:
                 pass
 
+        match (telegram_mode, webhook_url):
+            case (mode, _) if mode not in TELEGRAM_MODES:
+                raise ValueError(
+                    "TELEGRAM_MODE must be one of %s, got %r" % (", ".join(TELEGRAM_MODES), mode)
+                )
+            case (mode, None) if mode == TELEGRAM_MODE_WEBHOOK:
+                raise ValueError("WEBHOOK_URL must be set when TELEGRAM_MODE=webhook")
+            case _:
+                pass
+
+        match log_format:
+            case fmt if fmt not in LOG_FORMATS:
+                raise ValueError(
+                    "LOG_FORMAT must be one of %s, got %r" % (", ".join(LOG_FORMATS), fmt)
+                )
+            case _:
+                pass
+
+        match transcription_backend:
+            case str() as b if b in TRANSCRIPTION_BACKENDS:
+                pass
+            case other:
+                raise ValueError(
+                    "TRANSCRIPTION_BACKEND must be one of %s, got %r"
+                    % (", ".join(TRANSCRIPTION_BACKENDS), other)
+                )
+
         return Config(
             telegram_bot_token=telegram_bot_token,
             allowed_chat_id=allowed_chat_id,
@@ -105,4 +366,61 @@ class Config:
             openai_api_key=openai_api_key,
             anthropic_api_key=anthropic_api_key,
             stream_responses=stream_responses,
+            claude_pool_enabled=claude_pool_enabled,
+            claude_pool_max_workers=claude_pool_max_workers,
+            claude_pool_idle_ttl=claude_pool_idle_ttl,
+            max_concurrent_updates=max_concurrent_updates,
+            claude_max_processes=claude_max_processes,
+            cursor_max_processes=cursor_max_processes,
+            spawn_queue_max=spawn_queue_max,
+            spawn_max_wait=spawn_max_wait,
+            claude_partial_messages=claude_partial_messages,
+            cursor_streaming=cursor_streaming,
+            telegram_document_threshold=telegram_document_threshold,
+            provider_timeout=provider_timeout,
+            provider_max_retries=provider_max_retries,
+            openai_max_concurrency=openai_max_concurrency,
+            anthropic_max_concurrency=anthropic_max_concurrency,
+            media_cache_enabled=media_cache_enabled,
+            media_cache_max_entries=media_cache_max_entries,
+            media_cache_ttl=media_cache_ttl,
+            vision_target_size=vision_target_size,
+            vision_jpeg_quality=vision_jpeg_quality,
+            album_max_images=album_max_images,
+            album_max_pending=album_max_pending,
+            voice_segment_seconds=voice_segment_seconds,
+            voice_max_concurrency=voice_max_concurrency,
+            ffmpeg_path=ffmpeg_path,
+            transcription_backend=transcription_backend,
+            local_stt_engine=local_stt_engine,
+            local_stt_model=local_stt_model,
+            local_stt_workers=local_stt_workers,
+            local_stt_queue=local_stt_queue,
+            media_spill_threshold=media_spill_threshold,
+            telegram_mode=telegram_mode,
+            webhook_url=webhook_url,
+            webhook_listen=webhook_listen,
+            webhook_port=webhook_port,
+            webhook_secret=webhook_secret,
+            telegram_api_url=telegram_api_url,
+            telegram_pool_size=telegram_pool_size,
+            telegram_pool_timeout=telegram_pool_timeout,
+            telegram_connect_timeout=telegram_connect_timeout,
+            telegram_read_timeout=telegram_read_timeout,
+            telegram_write_timeout=telegram_write_timeout,
+            telegram_http2=telegram_http2,
+            telegram_updates_pool_size=telegram_updates_pool_size,
+            telegram_updates_pool_timeout=telegram_updates_pool_timeout,
+            telegram_updates_connect_timeout=telegram_updates_connect_timeout,
+            telegram_updates_read_timeout=telegram_updates_read_timeout,
+            telegram_updates_write_timeout=telegram_updates_write_timeout,
+            telegram_updates_http2=telegram_updates_http2,
+            telegram_rate_limit=telegram_rate_limit,
+            telegram_rate_global=telegram_rate_global,
+            telegram_rate_global_burst=telegram_rate_global_burst,
+            telegram_rate_chat=telegram_rate_chat,
+            telegram_rate_chat_burst=telegram_rate_chat_burst,
+            metrics_port=metrics_port,
+            metrics_listen=metrics_listen,
+            log_format=log_format,
         )
@@ -3,6 +3,8 @@
 # Telegram typing indicator re-send interval (seconds).
 # The TYPING action expires after ~5 s, so we refresh every 4 s.
 TELEGRAM_TYPING_INTERVAL: float = 4.0
+# A streaming edit within this many seconds stands in for the typing action.
+TELEGRAM_TYPING_EDIT_QUIET: float = 4.0
 
 # Claude CLI flags
 CLAUDE_OUTPUT_FORMAT = "json"
@@ -10,12 +12,52 @@ CLAUDE_RESUME_FLAG = "--resume"
 CLAUDE_OUTPUT_FLAG = "--output-format"
 CLAUDE_PROMPT_FLAG = "-p"
 CLAUDE_MODEL_FLAG = "--model"
+CLAUDE_INPUT_FLAG = "--input-format"
+CLAUDE_VERBOSE_FLAG = "--verbose"
+CLAUDE_PARTIAL_FLAG = "--include-partial-messages"
+
+# Claude CLI persistent worker pool
+# Workers run `claude -p --input-format stream-json --output-format stream-json`
+# and receive one JSON user message per line on stdin.
+CLAUDE_WORKER_FORMAT = "stream-json"
+CLAUDE_WORKER_STOP_GRACE: float = 5.0
+# StreamReader line limit for CLI stdout: one stream-json line carries a whole
+# result / assistant message / tool_result, far past asyncio's 64 KiB default
+CLI_LINE_LIMIT = 32 * 1024 * 1024
+MSG_CLAUDE_WORKER_FALLBACK = "Claude worker unavailable (%s) — falling back to one-shot spawn"
+MSG_CLAUDE_WORKER_SPAWNED = "Spawned Claude worker for %s (pid %s)"
+MSG_CLAUDE_WORKER_RETIRED = "Retired Claude worker for %s (%s)"
 
 # Cursor CLI flags
 CURSOR_CREATE_CHAT = "create-chat"
 CURSOR_RESUME_FLAG = "--resume"
 CURSOR_PROMPT_FLAG = "-p"
 CURSOR_TRUST_FLAG = "--trust"
+CURSOR_OUTPUT_FLAG = "--output-format"
+CURSOR_STREAM_FORMAT = "stream-json"
+# stderr fragments meaning the installed agent predates --output-format stream-json
+CURSOR_STREAM_UNSUPPORTED_HINTS = ("unknown option", "unrecognized", "output-format")
+MSG_CURSOR_STREAM_UNSUPPORTED = "Cursor Agent has no stream-json output (%s) — using buffered mode"
+
+# Session stores (snapshot + append log, see src/storage/log.py)
+STORE_LOG_SUFFIX = ".log"
+STORE_COMMIT_WINDOW: float = 0.05       # writes landing within this window share one fsync
+STORE_COMPACT_MIN_RECORDS = 1000        # never compact a log shorter than this
+STORE_COMPACT_RATIO = 4                 # compact once the log holds 4× the live keys
+
+# Spawn admission control (see src/scheduler.py)
+SPAWN_KIND_CLAUDE = "claude"
+SPAWN_KIND_CURSOR = "cursor"
+SPAWN_INITIAL_ESTIMATE: float = 20.0    # seconds per run until real durations are measured
+SPAWN_DURATION_SMOOTHING: float = 0.3   # EWMA weight of the newest run duration
+MSG_QUEUED = "⏳ Queued — position %d, about %ds"
+MSG_ERR_BUSY = "Busy right now — please try again in a few minutes."
+MSG_SPAWN_REJECTED = "Rejected %s run: %s"
+
+# Message sources — media-derived prompts queue behind typed text
+SOURCE_TEXT = "text"
+SOURCE_VOICE = "voice"
+SOURCE_PHOTO = "photo"
 
 # Log / user-facing messages
 MSG_BOT_STARTING = "Starting Telegram bot…"
@@ -39,17 +81,167 @@ WHISPER_MODEL = "whisper-1"
 VOICE_FILENAME = "voice.ogg"
 MSG_VOICE_TRANSCRIPTION_FAILED = "Could not transcribe voice message — please try again"
 MSG_VOICE_NOT_CONFIGURED = "Voice messages are not supported in this setup."
+# Long voice notes (see src/transcription/segment.py)
+FFMPEG_SILENCE_FILTER = "silencedetect=noise=-35dB:d=0.4"
+MSG_FFMPEG_MISSING = "ffmpeg not found — transcribing long voice note in one request"
+FFMPEG_TIMEOUT: float = 60.0  # seconds per ffmpeg run (silence scan, cutting); killed past it
+MSG_FFMPEG_TIMEOUT = "ffmpeg took over %.0fs — transcribing long voice note in one request"
+MSG_VOICE_SEGMENTED = "Split %.0fs voice note into %d segments"
+MSG_PARTIAL_TRANSCRIPT = "🎙 (%d/%d) %s"
+# Transcription backends (TRANSCRIPTION_BACKEND)
+TRANSCRIPTION_WHISPER = "whisper"
+TRANSCRIPTION_LOCAL = "local"
+TRANSCRIPTION_BACKENDS = (TRANSCRIPTION_WHISPER, TRANSCRIPTION_LOCAL)
+# Local speech-to-text (see src/transcription/local.py)
+LOCAL_ENGINE_FASTER_WHISPER = "faster-whisper"
+LOCAL_ENGINE_STUB = "stub"
+LOCAL_STT_COMPUTE_TYPE = "int8"
+LOCAL_STT_STUB_TEXT = "[stub %s] %d bytes"
+MSG_LOCAL_STT_UNKNOWN_ENGINE = "Unknown local speech-to-text engine: %s"
+MSG_LOCAL_STT_MISSING = (
+    "TRANSCRIPTION_BACKEND=local needs faster-whisper: pip install -r requirements-optional.txt"
+)
+MSG_LOCAL_STT_QUEUE_FULL = "Local transcription queue is full (%d jobs)"
+MSG_LOCAL_STT_READY = "Local speech-to-text %s/%s warm in %d worker(s) (%.1fs)"
+MSG_LOCAL_STT_CLOSED = "Local speech-to-text workers stopped"
+
+# Media downloads (see src/media.py, src/telegram/download.py)
+DOWNLOAD_CHUNK = 64 * 1024
+BASE64_CHUNK = 3 * 64 * 1024   # multiple of 3: chunks encode without padding
+MSG_MEDIA_SPILLED = "Media download of %d bytes spilled to disk"
+MSG_DOWNLOAD_FAILED = "Telegram file download failed: HTTP %d"
+
+# Embedded HTTP server (see src/http_server.py)
+HTTP_IDLE_TIMEOUT: float = 75.0   # seconds a keep-alive connection may sit idle
+HTTP_MAX_BODY = 1024 * 1024
+HTTP_MAX_HEADERS = 100
+HTTP_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+}
+MSG_HTTP_LISTENING = "HTTP server on %s:%d (%s)"
+MSG_HTTP_HANDLER_FAILED = "HTTP handler for %s %s failed"
+
+# Telegram transport (TELEGRAM_MODE; see src/telegram/webhook.py)
+TELEGRAM_MODE_POLLING = "polling"
+TELEGRAM_MODE_WEBHOOK = "webhook"
+TELEGRAM_MODES = (TELEGRAM_MODE_POLLING, TELEGRAM_MODE_WEBHOOK)
+WEBHOOK_SECRET_HEADER = "x-telegram-bot-api-secret-token"
+WEBHOOK_MAX_CONNECTIONS = 40
+MSG_WEBHOOK_SET = "Webhook registered: Telegram delivers to %s"
+MSG_WEBHOOK_REJECTED = "Webhook request with a bad secret token rejected"
+MSG_WEBHOOK_BAD_UPDATE = "Webhook request with an unparsable update ignored: %s"
+
+# Telegram request pools (see src/telegram/request.py)
+TELEGRAM_POOL_BOT = "bot"
+TELEGRAM_POOL_UPDATES = "updates"
+TELEGRAM_POOL_WAIT_WARN: float = 0.25   # seconds queued for a connection before it is logged
+MSG_POOL_WAIT_SLOW = "Telegram %s pool: %s waited %.0f ms for a connection"
+MSG_POOL_WAIT_SUMMARY = "Telegram pool waits: %s"
+MSG_HTTP2_UNAVAILABLE = "HTTP/2 requested for the Telegram %s pool but h2 is not installed; using HTTP/1.1"
+
+# Bot API rate limiting (see src/telegram/ratelimit.py), highest priority first
+LANE_FINAL = "final"
+LANE_EDIT = "edit"
+LANE_TYPING = "typing"
+LANES = (LANE_FINAL, LANE_EDIT, LANE_TYPING)
+# share of each bucket's burst a lane must leave behind; final calls may take the last token
+RATE_LANE_RESERVE = {LANE_FINAL: 0.0, LANE_EDIT: 0.2, LANE_TYPING: 0.5}
+RATE_LIMIT_MAX_CHATS = 10000     # per-chat buckets kept; the least recently used is evicted past this
+RATE_LIMIT_MAX_RETRIES = 1       # final calls retried after Telegram's RetryAfter
+MSG_RATE_LIMIT_FLOOD = "Telegram flood control on %s (chat %s): blocked for %.1fs"
+MSG_RATE_LIMIT_SUMMARY = "Telegram rate limiter: %s"
+
+# Metrics (METRICS_PORT; see src/metrics.py)
+ROUTE_CLAUDE = "claude"
+ROUTE_CURSOR = "cursor"
+METRICS_PATH = "/metrics"
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+METRICS_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+METRICS_FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+METRICS_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+STORE_CURSOR_CHATS = "cursor_chats"
+STORE_CLAUDE_SESSIONS = "claude_sessions"
+STORE_PROCESSED = "processed_messages"
+STORE_HISTORY = "history"
+QUEUE_TELEGRAM_UPDATES = "telegram_updates"
+
+# Logging (LOG_FORMAT; see src/logs.py) — only "rich" imports rich
+LOG_FORMAT_PLAIN = "plain"
+LOG_FORMAT_JSON = "json"
+LOG_FORMAT_RICH = "rich"
+LOG_FORMATS = (LOG_FORMAT_PLAIN, LOG_FORMAT_JSON, LOG_FORMAT_RICH)
+LOG_PLAIN_FORMAT = "%(asctime)s %(levelname)-8s %(name)s: %(message)s"
+
+# Startup report (python -m src.main --startup-report; see src/startup.py)
+STARTUP_BUDGET_SECONDS: float = 3.0   # process spawn to the first getUpdates, checked by the tests
+STARTUP_POLL_METHOD = "getUpdates"
+STARTUP_REPORT_TIMEOUT: float = 30.0  # give up waiting for the first poll after this long
+MSG_STARTUP_PHASE = "  %-30s %8.1f ms"
+MSG_STARTUP_FIRST_POLL = "  %-30s %8.1f ms  (src.main loaded to the first getUpdates)"
+MSG_STARTUP_NO_POLL = "No getUpdates request within %.0fs"
+MSG_STARTUP_WEBHOOK = "--startup-report measures the polling path; ignoring TELEGRAM_MODE=webhook"
+
+# Provider clients (see src/providers.py)
+PROVIDER_OPENAI = "openai"
+PROVIDER_ANTHROPIC = "anthropic"
+PROVIDER_MAX_CONNECTIONS = 20
+PROVIDER_MAX_KEEPALIVE = 10
+PROVIDER_KEEPALIVE_EXPIRY: float = 120.0   # idle seconds before a pooled connection is dropped
+MSG_PROVIDER_NOT_CONFIGURED = "No API key configured for provider %s"
+MSG_PROVIDERS_CLOSED = "Closed provider clients: %s"
+
+# Media result cache (see src/storage/media_cache.py)
+MEDIA_KIND_VOICE = "voice"
+MEDIA_KIND_PHOTO = "photo"
+MEDIA_CACHE_MEMORY_ENTRIES = 256           # in-memory LRU front; the SQLite table holds the rest
+MSG_MEDIA_CACHE_HIT = "Media cache hit (%s) — skipped download and %s call"
 
 # Image analysis
 CLAUDE_VISION_MODEL = "claude-opus-4-6"
 OPENAI_VISION_MODEL = "gpt-4o"
 ALBUM_DEBOUNCE_SECONDS: float = 0.5
+MSG_ALBUM_FLUSHED = "Too many pending albums — analyzing group %s early"
+MSG_ALBUM_TOO_LARGE = "Album %s has more than %d photos — ignoring the rest"
+MSG_ALBUM_IMAGE_LABEL = "Image %d:"
+MSG_PILLOW_MISSING = "Pillow not installed — sending photos without downsampling"
 
 # Streaming responses
 CLAUDE_STREAM_FORMAT = "stream-json"
-STREAM_EDIT_INTERVAL: float = 1.0
+STREAM_EDIT_INTERVAL: float = 1.0          # minimum gap between edits of one message
+STREAM_EDIT_MAX_INTERVAL: float = 5.0      # longest a small pending change is held back
+STREAM_EDIT_MIN_GROWTH = 40                # chars of new text worth an edit before the max interval
+STREAM_EDIT_LATENCY_FACTOR: float = 3.0    # keep edits ≥ 3× the measured edit round-trip apart
+STREAM_EDIT_LATENCY_SMOOTHING: float = 0.3
+STREAM_FINAL_ATTEMPTS = 3                  # final edit tries before falling back to a new message
+MSG_EDIT_RETRY_AFTER = "Telegram flood control on chat %s — next edit in %.1fs"
+MSG_EDIT_FAILED = "Streaming edit failed on chat %s: %s"
+MSG_EDIT_FALLBACK = "Final edit on chat %s not delivered — sending the reply as a new message"
+MSG_EDIT_NOT_MODIFIED = "message is not modified"
+
+# Long replies (see src/telegram/renderer.py)
+TELEGRAM_MESSAGE_LIMIT = 4096              # Bot API hard cap per message text
+TELEGRAM_DOCUMENT_NAME = "reply.md"
+DOCUMENT_WRITE_CHUNK = 64 * 1024           # chars encoded + written per step when spooling a document
+MSG_DOCUMENT_CAPTION = "Reply continues in the attached file"
+MSG_DOCUMENT_FAILED = "Sending reply document to chat %s failed: %s"
+MSG_REPLY_FAILED = "Sending reply to chat %s failed: %s"
+MSG_REPLY_REWRITTEN = "Final reply on chat %s rewrites frozen streamed text — sending it in full"
+MSG_TTFT = "Claude time-to-first-token: %.2fs (%s)"
+TTFT_MODE_PARTIAL = "partial"
+TTFT_MODE_MESSAGE = "message"
 MSG_STREAM_PLACEHOLDER = "..."
 MSG_IMAGE_DEFAULT_PROMPT = "What do you see in this image? Describe it in detail."
+MSG_ALBUM_DEFAULT_PROMPT = (
+    "These images were sent together. Describe each one in detail and how they relate."
+)
 MSG_IMAGE_ANALYSIS_FAILED = "Could not analyze image — please try again."
 MSG_IMAGE_NOT_CONFIGURED = "Image analysis is not supported in this setup."
 
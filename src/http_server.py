@@ -0,0 +1,189 @@
+"""HTTPServer — minimal embedded HTTP/1.1 server on asyncio streams.
+
+Enough for machine-to-machine endpoints (Telegram webhook deliveries, metrics
+scrapes): exact-path routes, `Content-Length` bodies with a size cap,
+keep-alive, and an idle timeout per connection. No TLS, no chunked requests:
+put a reverse proxy in front for anything public.
+"""
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+
+from src.constants import (
+    HTTP_IDLE_TIMEOUT,
+    HTTP_MAX_BODY,
+    HTTP_MAX_HEADERS,
+    HTTP_REASONS,
+    MSG_HTTP_HANDLER_FAILED,
+    MSG_HTTP_LISTENING,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class Request:
+    method: str
+    path: str
+    headers: dict[str, str]  # lower-cased names
+    body: bytes = b""
+
+
+@dataclass(frozen=True, slots=True)
+class Response:
+    status: int = 200
+    body: bytes = b""
+    content_type: str = "text/plain; charset=utf-8"
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+Handler = Callable[[Request], Awaitable[Response]]
+
+
+class _BadRequest(Exception):
+    def __init__(self, status: int) -> None:
+        super().__init__(status)
+        self.status = status
+
+
+async def _read_request(reader: asyncio.StreamReader, max_body: int) -> Request | None:
+    """Next request on the connection; None when the peer closed it."""
+    line = await reader.readline()
+    match line.split():
+        case []:
+            return None
+        case [method, target, _]:
+            pass
+        case _:
+            raise _BadRequest(400)
+    headers: dict[str, str] = {}
+    while (raw := (await reader.readline()).strip()):
+        name, sep, value = raw.decode("latin-1").partition(":")
+        match (sep, len(headers) < HTTP_MAX_HEADERS):
+            case (":", True):
+                headers[name.strip().lower()] = value.strip()
+            case _:
+                raise _BadRequest(400)
+    match (headers.get("transfer-encoding"), headers.get("content-length", "0")):
+        case (str(), _):
+            raise _BadRequest(411)
+        case (None, length) if not length.isdigit():
+            raise _BadRequest(400)
+        case (None, length) if int(length) > max_body:
+            raise _BadRequest(413)
+        case (None, length):
+            body = await reader.readexactly(int(length))
+    path = target.decode("latin-1").split("?", 1)[0]
+    return Request(method.decode("ascii", "replace").upper(), path, headers, body)
+
+
+def _encode(response: Response, keep_alive: bool) -> bytes:
+    reason = HTTP_REASONS.get(response.status, "Unknown")
+    headers = {
+        "content-type": response.content_type,
+        "content-length": str(len(response.body)),
+        "connection": "keep-alive" if keep_alive else "close",
+        **response.headers,
+    }
+    head = "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+    return f"HTTP/1.1 {response.status} {reason}\r\n{head}\r\n".encode("latin-1") + response.body
+
+
+class HTTPServer:
+
+    def __init__(
+        self,
+        routes: Mapping[tuple[str, str], Handler],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        max_body: int = HTTP_MAX_BODY,
+        idle_timeout: float = HTTP_IDLE_TIMEOUT,
+    ) -> None:
+        # (method, path) → handler
+        self._routes = dict(routes)
+        self._host = host
+        self._port = port
+        self._max_body = max_body
+        self._idle_timeout = idle_timeout
+        self._server: asyncio.AbstractServer | None = None
+        self._connections: dict[asyncio.StreamWriter, asyncio.Task] = {}
+
+    @property
+    def port(self) -> int:
+        """Bound port (the real one when constructed with port 0)."""
+        return self._server.sockets[0].getsockname()[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self._host}:{self.port}"
+
+    async def start(self) -> "HTTPServer":
+        self._server = await asyncio.start_server(self._serve, self._host, self._port)
+        logger.info(MSG_HTTP_LISTENING, self._host, self.port, ", ".join(p for _, p in self._routes))
+        return self
+
+    async def stop(self) -> None:
+        server, self._server = self._server, None
+        match server:
+            case None:
+                return
+            case _:
+                server.close()
+        # idle keep-alive connections and in-flight handlers would otherwise hold wait_closed() open
+        tasks = list(self._connections.values())
+        list(map(lambda t: t.cancel(), tasks))
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await server.wait_closed()
+
+    async def _dispatch(self, request: Request) -> Response:
+        match (self._routes.get((request.method, request.path)), request.path):
+            case (None, path) if any(p == path for _, p in self._routes):
+                return Response(405)
+            case (None, _):
+                return Response(404)
+            case (handler, _):
+                pass
+        try:
+            return await handler(request)
+        except Exception:
+            logger.exception(MSG_HTTP_HANDLER_FAILED, request.method, request.path)
+            return Response(500)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(
+                        _read_request(reader, self._max_body), self._idle_timeout
+                    )
+                except _BadRequest as exc:
+                    writer.write(_encode(Response(exc.status), keep_alive=False))
+                    await writer.drain()
+                    return
+                match request:
+                    case None:
+                        return
+                    case _:
+                        pass
+                keep_alive = request.headers.get("connection", "").lower() != "close"
+                writer.write(_encode(await self._dispatch(request), keep_alive))
+                await writer.drain()
+                match keep_alive:
+                    case True:
+                        pass
+                    case False:
+                        return
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            match self._server:
+                case None:
+                    # cancelled by stop(); end quietly instead of as a cancelled task
+                    pass
+                case _:
+                    raise
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
@@ -0,0 +1,51 @@
+"""Root logger setup for LOG_FORMAT=plain | json | rich.
+
+rich is imported only for the rich format, so a service logging plain lines
+to journald (or JSON to a collector) never loads it.
+"""
+import json
+import logging
+import sys
+
+from src.constants import LOG_FORMAT_JSON, LOG_FORMAT_PLAIN, LOG_PLAIN_FORMAT
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message (+ exc_info)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        match record.exc_info:
+            case None:
+                pass
+            case exc_info:
+                entry["exc_info"] = self.formatException(exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _handler(fmt: str) -> logging.Handler:
+    match fmt:
+        case f if f == LOG_FORMAT_PLAIN:
+            handler = logging.StreamHandler(sys.stderr)
+            handler.setFormatter(logging.Formatter(LOG_PLAIN_FORMAT))
+            return handler
+        case f if f == LOG_FORMAT_JSON:
+            handler = logging.StreamHandler(sys.stderr)
+            handler.setFormatter(JsonFormatter())
+            return handler
+        case _:
+            from rich.logging import RichHandler
+
+            return RichHandler(rich_tracebacks=True)
+
+
+def setup_logging(level: str, fmt: str) -> None:
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, level.upper(), logging.INFO))
+    list(map(root.removeHandler, root.handlers[:]))
+    root.addHandler(_handler(fmt))
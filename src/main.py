@@ -1,53 +1,196 @@
-"""Entry point — wires Config → TelegramClient → MessageRouter."""
-import logging
+"""Entry point — wires Config → TelegramClient → MessageRouter.
+
+    python -m src.main [--startup-report]
 
-from rich.logging import RichHandler
+Only config and logging are imported up front; the Telegram stack, router and
+backends are imported as they are built, each as a timed startup phase.
+--startup-report starts polling, waits for the first getUpdates and prints
+the phase breakdown and time to first poll instead of serving.
+"""
+import argparse
+import asyncio
+import dataclasses
+import logging
+import sys
+import time
 
 from src.config import Config
-from src.constants import MSG_BOT_STARTING
-from src.router import MessageRouter
-from src.telegram.client import TelegramClient
-from src.transcription.whisper import WhisperTranscriptionClient
-from src.vision.claude import ClaudeVisionClient
-from src.vision.openai import OpenAIVisionClient
+from src.constants import (
+    MSG_BOT_STARTING,
+    MSG_STARTUP_NO_POLL,
+    MSG_STARTUP_WEBHOOK,
+    PROVIDER_ANTHROPIC,
+    PROVIDER_OPENAI,
+    STARTUP_POLL_METHOD,
+    STARTUP_REPORT_TIMEOUT,
+    TELEGRAM_MODE_POLLING,
+    TELEGRAM_MODE_WEBHOOK,
+    TRANSCRIPTION_LOCAL,
+)
+from src.logs import setup_logging
+from src.startup import StartupTimer
 
+STARTED = time.perf_counter()   # the report's zero: interpreter start up to here is not included
 
-def _setup_logging(level: str) -> None:
-    root = logging.getLogger()
-    root.setLevel(getattr(logging, level.upper(), logging.INFO))
-    list(map(root.removeHandler, root.handlers[:]))
-    root.addHandler(RichHandler(rich_tracebacks=True))
+logger = logging.getLogger(__name__)
 
 
-def main() -> None:
-    config = Config.from_env()
-    _setup_logging(config.log_level)
+def _transcriber(config: Config, providers, timer: StartupTimer):
+    match (config.transcription_backend, config.openai_api_key):
+        case (backend, _) if backend == TRANSCRIPTION_LOCAL:
+            with timer.phase("import local transcription"):
+                from src.transcription.local import LocalTranscriptionClient
+            transcriber = LocalTranscriptionClient(
+                engine=config.local_stt_engine,
+                model=config.local_stt_model,
+                workers=config.local_stt_workers,
+                queue_size=config.local_stt_queue,
+                segment_seconds=config.voice_segment_seconds,
+                ffmpeg_path=config.ffmpeg_path,
+            )
+            transcriber.start()
+            return transcriber
+        case (_, str() as k) if k:
+            with timer.phase("import whisper (openai)"):
+                from src.providers import load_sdk
+                from src.transcription.whisper import WhisperTranscriptionClient
 
-    logger = logging.getLogger(__name__)
-    logger.info(MSG_BOT_STARTING)
+                load_sdk(PROVIDER_OPENAI)
+            return WhisperTranscriptionClient(
+                providers,
+                segment_seconds=config.voice_segment_seconds,
+                max_concurrency=config.voice_max_concurrency,
+                ffmpeg_path=config.ffmpeg_path,
+            )
+        case _:
+            return None
 
-    router = MessageRouter(config)
-    transcriber = (
-        WhisperTranscriptionClient(config.openai_api_key)
-        if config.openai_api_key
-        else None
-    )
+
+def _vision(config: Config, providers, timer: StartupTimer):
     match (config.anthropic_api_key, config.openai_api_key):
         case (str() as k, _) if k:
-            vision = ClaudeVisionClient(k)
+            with timer.phase("import vision (anthropic)"):
+                from src.providers import load_sdk
+                from src.vision.claude import ClaudeVisionClient
+
+                load_sdk(PROVIDER_ANTHROPIC)
+            return ClaudeVisionClient(providers)
         case (_, str() as k) if k:
-            vision = OpenAIVisionClient(k)
+            with timer.phase("import vision (openai)"):
+                from src.providers import load_sdk
+                from src.vision.openai import OpenAIVisionClient
+
+                load_sdk(PROVIDER_OPENAI)
+            return OpenAIVisionClient(providers)
+        case _:
+            return None
+
+
+async def _first_poll(client, app, timer: StartupTimer) -> float | None:
+    """Start polling the way run_polling() does; seconds from STARTED to the first getUpdates sent."""
+    with timer.phase("initialize (getMe)"):
+        await app.initialize()
+        await app.post_init(app)
+    with timer.phase("start polling"):
+        # no long poll: the first getUpdates returns at once and stop() has nothing to cut off
+        await app.updater.start_polling(timeout=0)
+        await app.start()
+    deadline = time.perf_counter() + STARTUP_REPORT_TIMEOUT
+    # a pool wait is recorded as the request takes its connection, i.e. as it is sent
+    while STARTUP_POLL_METHOD not in client.pool_waits.methods and time.perf_counter() < deadline:
+        await asyncio.sleep(0.001)
+    first_poll = timer.elapsed() if STARTUP_POLL_METHOD in client.pool_waits.methods else None
+    await app.updater.stop()
+    await app.stop()
+    await app.shutdown()
+    await app.post_shutdown(app)
+    return first_poll
+
+
+def _parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Telegram bridge to the Claude and Cursor CLIs.")
+    p.add_argument(
+        "--startup-report", action="store_true",
+        help="start polling, print the startup phase timings and time to first poll, then exit",
+    )
+    return p
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parser().parse_args(argv)
+    timer = StartupTimer(STARTED)
+    with timer.phase("config + logging"):
+        config = Config.from_env()
+        setup_logging(config.log_level, config.log_format)
+    logger.info(MSG_BOT_STARTING)
+
+    match (args.startup_report, config.telegram_mode):
+        case (True, mode) if mode == TELEGRAM_MODE_WEBHOOK:
+            logger.warning(MSG_STARTUP_WEBHOOK)
+            config = dataclasses.replace(config, telegram_mode=TELEGRAM_MODE_POLLING)
         case _:
-            vision = None
-    client = TelegramClient(config, transcriber=transcriber, vision_client=vision)
-    client.run(
-        router.handle,
+            pass
+
+    with timer.phase("import telegram client"):
+        from src.telegram.client import TelegramClient
+    with timer.phase("import router"):
+        from src.router import MessageRouter
+    with timer.phase("import providers, media cache"):
+        from src.providers import ProviderRegistry
+        from src.storage.media_cache import MediaCache
+
+    with timer.phase("build router"):
+        router = MessageRouter(config)
+        providers = ProviderRegistry.from_config(config)
+    transcriber = _transcriber(config, providers, timer)
+    vision = _vision(config, providers, timer)
+    with timer.phase("build client"):
+        media_cache = (
+            MediaCache(max_entries=config.media_cache_max_entries, ttl=config.media_cache_ttl)
+            if config.media_cache_enabled
+            else None
+        )
+        client = TelegramClient(
+            config, transcriber=transcriber, vision_client=vision, media_cache=media_cache
+        )
+        router.set_notifier(client.send_message)
+
+    async def _shutdown() -> None:
+        await router.aclose()
+        await providers.aclose()
+        match transcriber:
+            case None:
+                pass
+            case backend:
+                await backend.aclose()
+        match media_cache:
+            case None:
+                pass
+            case cache:
+                cache.close()
+
+    handlers = dict(
         on_model=router.handle_model_command,
         on_status=router.handle_status_command,
         on_new=router.handle_new_command,
         on_history=router.handle_history_command,
-        stream_handle=router.stream_handle if config.stream_responses else None,
+        stream_events=router.stream_events if config.stream_responses else None,
+        on_shutdown=_shutdown,
     )
+    match args.startup_report:
+        case True:
+            with timer.phase("build application"):
+                app = client.build_application(router.handle, **handlers)
+            first_poll = asyncio.run(_first_poll(client, app, timer))
+            print(timer.report(first_poll), flush=True)
+            match first_poll:
+                case None:
+                    logger.error(MSG_STARTUP_NO_POLL, STARTUP_REPORT_TIMEOUT)
+                    sys.exit(1)
+                case _:
+                    pass
+        case False:
+            client.run(router.handle, **handlers)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,160 @@
+"""Media buffers — downloaded voice notes and photos without extra copies.
+
+`MediaBuffer` receives a download chunk by chunk: into a bytearray sized up
+front when the length is known, or into an anonymous temp file once it grows
+past the spill threshold (then mapped read-only). Either way consumers get one
+`memoryview` over the data. `ViewReader` hands that view to APIs that want a
+file object (multipart uploads, Pillow) without `io.BytesIO`'s copy, and
+`encode_base64` encodes it in fixed-size chunks into one output buffer.
+"""
+import binascii
+import io
+import mmap
+import tempfile
+from typing import IO
+
+from src.constants import BASE64_CHUNK
+
+Buffer = bytes | bytearray | memoryview
+
+
+class ViewReader(io.RawIOBase):
+    """Seekable read-only file object over a buffer; reads copy only what the caller asks for."""
+
+    def __init__(self, data: Buffer) -> None:
+        super().__init__()
+        self._view = memoryview(data).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        n = max(0, min(len(target), len(self._view) - self._pos))
+        target[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+
+def encode_base64(data: Buffer) -> str:
+    """Base64 text of `data`, encoded chunk by chunk into one preallocated buffer."""
+    view = memoryview(data).cast("B")
+    out = bytearray(4 * ((len(view) + 2) // 3))
+    target = memoryview(out)
+
+    # BASE64_CHUNK is a multiple of 3, so only the last chunk carries padding
+    def _encode(start: int) -> None:
+        encoded = binascii.b2a_base64(view[start:start + BASE64_CHUNK], newline=False)
+        offset = start // 3 * 4
+        target[offset:offset + len(encoded)] = encoded
+
+    list(map(_encode, range(0, len(view), BASE64_CHUNK)))
+    target.release()
+    return out.decode("ascii")
+
+
+class MediaBuffer:
+    """One downloaded file: in memory up to `spill_threshold` bytes, a mapped temp file beyond.
+    A threshold of 0 keeps everything in memory. Use as a context manager; `view` is valid until close."""
+
+    def __init__(self, expected_size: int = 0, spill_threshold: int = 0) -> None:
+        self._threshold = spill_threshold
+        self._size = 0
+        self._file: IO[bytes] | None = None
+        self._map: mmap.mmap | None = None
+        self._view: memoryview | None = None
+        match self._over(expected_size):
+            case True:
+                self._memory = bytearray()
+                self._file = tempfile.TemporaryFile()
+            case False:
+                # preallocated: chunks are written in place, no regrowth
+                self._memory = bytearray(max(0, expected_size))
+
+    def _over(self, size: int) -> bool:
+        return bool(self._threshold) and size > self._threshold
+
+    @property
+    def spilled(self) -> bool:
+        return self._file is not None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def write(self, chunk: Buffer) -> None:
+        end = self._size + len(chunk)
+        match (self._file, self._over(end)):
+            case (None, True):
+                self._spill()
+                self._file.write(chunk)
+            case (None, False) if end <= len(self._memory):
+                self._memory[self._size:end] = chunk
+            case (None, False):
+                # longer than announced: grow
+                del self._memory[self._size:]
+                self._memory += chunk
+            case (file, _):
+                file.write(chunk)
+        self._size = end
+
+    def _spill(self) -> None:
+        self._file = tempfile.TemporaryFile()
+        self._file.write(memoryview(self._memory)[:self._size])
+        self._memory = bytearray()
+
+    @property
+    def view(self) -> memoryview:
+        """The whole file; finishes writing on first access."""
+        match (self._view, self._file):
+            case (None, None):
+                del self._memory[self._size:]
+                self._view = memoryview(self._memory)
+            case (None, file) if self._size:
+                file.flush()
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                self._view = memoryview(self._map)
+            case (None, _):
+                self._view = memoryview(b"")
+            case _:
+                pass
+        return self._view
+
+    def close(self) -> None:
+        match self._view:
+            case None:
+                pass
+            case view:
+                view.release()
+        match self._map:
+            case None:
+                pass
+            case mapped:
+                try:
+                    mapped.close()
+                except BufferError:
+                    # a consumer still holds a slice; the map goes with the last reference
+                    pass
+        match self._file:
+            case None:
+                pass
+            case file:
+                file.close()
+        self._view = self._map = self._file = None
+        self._memory = bytearray()
+
+    def __enter__(self) -> "MediaBuffer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
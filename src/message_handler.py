@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from typing import Optional
 import logging
 
+from src.constants import SOURCE_TEXT
+
 logger = logging.getLogger(__name__)
 
 
@@ -10,6 +12,7 @@ class ChatMessage:
     sender: str
     content: str
     timestamp: int
+    source: str = SOURCE_TEXT
 
 
 @dataclass(frozen=True)
@@ -0,0 +1,255 @@
+"""Process-wide metrics in the Prometheus text format, without a client library.
+
+Counters, gauges and histograms are plain objects updated from the event-loop
+thread: an update is a dict lookup plus an add (a histogram also bisects its
+bucket bounds), with no locks and no allocation once a label set has been seen.
+Buckets are counted individually and only made cumulative in `render()`, which
+`metrics_handler` serves as `/metrics` on the embedded HTTP server.
+
+    REPLY_SECONDS.labels(ROUTE_CLAUDE).observe(elapsed)
+    QUEUE_DEPTH.labels(SPAWN_KIND_CLAUDE).set_function(lambda: scheduler.depth(...))
+
+`reply_route` carries the route a text message took (set by the router, read
+by the Telegram client once the reply is out) within the update's task.
+"""
+import bisect
+import contextvars
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator, Sequence
+
+from src.constants import (
+    METRICS_CONTENT_TYPE,
+    METRICS_COUNT_BUCKETS,
+    METRICS_FAST_BUCKETS,
+    METRICS_LATENCY_BUCKETS,
+)
+from src.http_server import Request, Response
+
+reply_route: contextvars.ContextVar[str | None] = contextvars.ContextVar("reply_route", default=None)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)] + ([extra] if extra else [])
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    match value:
+        case float() if value == float("inf"):
+            return "+Inf"
+        case float() if value.is_integer():
+            return str(int(value))
+        case _:
+            return repr(value)
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("_value", "_function")
+
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._function: Callable[[], float] | None = None
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._value -= amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the value from `function` at scrape time instead."""
+        self._function = function
+
+    @property
+    def value(self) -> float:
+        match self._function:
+            case None:
+                return self._value
+            case function:
+                return float(function())
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self._bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)   # per bucket, last one is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self._bounds, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(
+        self, name: str, documentation: str, label_names: Sequence[str] = (), registry: list | None = None
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        # label values → child
+        self._children: dict[tuple[str, ...], object] = {}
+        (REGISTRY if registry is None else registry).append(self)
+
+    @abstractmethod
+    def _new_child(self) -> object:
+        ...
+
+    def labels(self, *values: str):
+        match self._children.get(values):
+            case None:
+                child = self._children[values] = self._new_child()
+                return child
+            case child:
+                return child
+
+    @abstractmethod
+    def _samples(self) -> Iterator[str]:
+        ...
+
+    def render(self) -> str:
+        head = f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n"
+        return head + "".join(line + "\n" for line in self._samples())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self) -> Iterator[str]:
+        return (
+            f"{self.name}_total{_labels(self.label_names, values)} {_number(child.value)}"
+            for values, child in self._children.items()
+        )
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def _samples(self) -> Iterator[str]:
+        return (
+            f"{self.name}{_labels(self.label_names, values)} {_number(float(child.value))}"
+            for values, child in self._children.items()
+        )
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = METRICS_LATENCY_BUCKETS,
+        registry: list | None = None,
+    ) -> None:
+        self._bounds = tuple(sorted(buckets))
+        super().__init__(name, documentation, label_names, registry)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self._bounds)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _series(self, values: tuple[str, ...], child: _HistogramChild) -> Iterator[str]:
+        running = 0
+        bounds = (*self._bounds, float("inf"))
+        position = 0
+        while position < len(bounds):
+            running += child.counts[position]
+            le = f'le="{_number(float(bounds[position]))}"'
+            yield f"{self.name}_bucket{_labels(self.label_names, values, le)} {running}"
+            position += 1
+        yield f"{self.name}_sum{_labels(self.label_names, values)} {_number(child.sum)}"
+        yield f"{self.name}_count{_labels(self.label_names, values)} {running}"
+
+    def _samples(self) -> Iterator[str]:
+        for values, child in list(self._children.items()):
+            yield from self._series(values, child)
+
+
+REGISTRY: list[_Metric] = []
+
+
+def render(registry: list[_Metric] | None = None) -> str:
+    return "".join(metric.render() for metric in (REGISTRY if registry is None else registry))
+
+
+async def metrics_handler(request: Request) -> Response:
+    return Response(body=render().encode(), content_type=METRICS_CONTENT_TYPE)
+
+
+# ── the bot's metrics ─────────────────────────────────────────────────────────
+
+REPLY_SECONDS = Histogram(
+    "bot_reply_seconds", "Update received to reply delivered, per route.", ("route",)
+)
+SUBPROCESS_FIRST_BYTE_SECONDS = Histogram(
+    "bot_subprocess_first_byte_seconds",
+    "CLI spawn (or worker turn) to the first byte of streamed output.",
+    ("backend",),
+)
+SUBPROCESS_SECONDS = Histogram(
+    "bot_subprocess_seconds", "CLI call duration, from spawn to exit.", ("backend",)
+)
+STREAM_EDITS = Histogram(
+    "bot_stream_edits", "Message edits per streamed reply.", buckets=METRICS_COUNT_BUCKETS
+)
+STORE_WRITE_SECONDS = Histogram(
+    "bot_store_write_seconds", "Session / history store write latency.", ("store",),
+    buckets=METRICS_FAST_BUCKETS,
+)
+QUEUE_DEPTH = Gauge("bot_queue_depth", "Work waiting to start, per queue.", ("queue",))
+TELEGRAM_API_SECONDS = Histogram(
+    "telegram_api_seconds", "Bot API request to response headers, per method.", ("method",),
+    buckets=METRICS_FAST_BUCKETS,
+)
+TELEGRAM_POOL_WAIT_SECONDS = Histogram(
+    "telegram_pool_wait_seconds", "Time queued for a pooled connection, per method.", ("method",),
+    buckets=METRICS_FAST_BUCKETS,
+)
+TELEGRAM_RATE_WAIT_SECONDS = Histogram(
+    "telegram_rate_wait_seconds", "Time waited for a rate-limit token, per lane.", ("lane",),
+    buckets=METRICS_FAST_BUCKETS,
+)
+TELEGRAM_RATE_DROPPED = Counter(
+    "telegram_rate_dropped", "Calls dropped by the rate limiter, per lane.", ("lane",)
+)
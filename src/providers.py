@@ -0,0 +1,177 @@
+"""ProviderRegistry — long-lived, pooled API clients shared by all backends.
+
+Built once in `main.main()`. Each provider gets one SDK client on top of a
+keep-alive httpx pool (so voice notes and photos reuse warm TLS connections),
+one concurrency limit, and the configured timeout / retry policy. Backends
+borrow a client for the duration of one call:
+
+    async with registry.openai() as client:
+        await client.audio.transcriptions.create(...)
+
+`aclose()` closes every pool at shutdown.
+
+The openai and anthropic SDKs take over a second to import, so they are only
+imported when needed: `load_sdk()` as a backend using them is built, or the
+first borrow. A bot without API keys never loads them. Their names still
+resolve as module attributes (`src.providers.AsyncOpenAI`).
+"""
+import asyncio
+import importlib
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from src.config import Config
+from src.constants import (
+    MSG_PROVIDER_NOT_CONFIGURED,
+    MSG_PROVIDERS_CLOSED,
+    PROVIDER_ANTHROPIC,
+    PROVIDER_KEEPALIVE_EXPIRY,
+    PROVIDER_MAX_CONNECTIONS,
+    PROVIDER_MAX_KEEPALIVE,
+    PROVIDER_OPENAI,
+)
+
+if TYPE_CHECKING:
+    from anthropic import AsyncAnthropic
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+# module attribute → (SDK module, name), imported on first use; each SDK's
+# package is named after its provider
+_SDK = {
+    "AsyncOpenAI": (PROVIDER_OPENAI, "AsyncOpenAI"),
+    "OpenAIHttpxClient": (PROVIDER_OPENAI, "DefaultAsyncHttpxClient"),
+    "AsyncAnthropic": (PROVIDER_ANTHROPIC, "AsyncAnthropic"),
+    "AnthropicHttpxClient": (PROVIDER_ANTHROPIC, "DefaultAsyncHttpxClient"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    match _SDK.get(name):
+        case None:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        case (module, attr):
+            value = globals()[name] = getattr(importlib.import_module(module), attr)
+            return value
+
+
+def _sdk(name: str) -> Any:
+    """An SDK class, imported on first use (or whatever a test patched in)."""
+    return globals().get(name) or __getattr__(name)
+
+
+def load_sdk(provider: str) -> None:
+    """Import `provider`'s SDK now, so a backend built at startup does not pay
+    for it on its first request."""
+    list(map(_sdk, (name for name, (module, _) in _SDK.items() if module == provider)))
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=PROVIDER_MAX_CONNECTIONS,
+        max_keepalive_connections=PROVIDER_MAX_KEEPALIVE,
+        keepalive_expiry=PROVIDER_KEEPALIVE_EXPIRY,
+    )
+
+
+class ProviderRegistry:
+
+    def __init__(
+        self,
+        openai_api_key: str | None = None,
+        anthropic_api_key: str | None = None,
+        timeout: float = 60.0,
+        max_retries: int = 2,
+        openai_max_concurrency: int = 4,
+        anthropic_max_concurrency: int = 4,
+        openai_base_url: str | None = None,
+        anthropic_base_url: str | None = None,
+    ) -> None:
+        self._keys = {PROVIDER_OPENAI: openai_api_key, PROVIDER_ANTHROPIC: anthropic_api_key}
+        self._base_urls = {PROVIDER_OPENAI: openai_base_url, PROVIDER_ANTHROPIC: anthropic_base_url}
+        self._timeout = timeout
+        self._max_retries = max_retries
+        self._limits = {
+            PROVIDER_OPENAI: asyncio.Semaphore(max(1, openai_max_concurrency)),
+            PROVIDER_ANTHROPIC: asyncio.Semaphore(max(1, anthropic_max_concurrency)),
+        }
+        # built lazily on first borrow, then reused for the process lifetime
+        self._openai: "AsyncOpenAI | None" = None
+        self._anthropic: "AsyncAnthropic | None" = None
+
+    @classmethod
+    def from_config(cls, config: Config) -> "ProviderRegistry":
+        return cls(
+            openai_api_key=config.openai_api_key,
+            anthropic_api_key=config.anthropic_api_key,
+            timeout=config.provider_timeout,
+            max_retries=config.provider_max_retries,
+            openai_max_concurrency=config.openai_max_concurrency,
+            anthropic_max_concurrency=config.anthropic_max_concurrency,
+        )
+
+    def has(self, provider: str) -> bool:
+        return bool(self._keys.get(provider))
+
+    def _key(self, provider: str) -> str:
+        match self._keys.get(provider):
+            case str() as key if key:
+                return key
+            case _:
+                raise RuntimeError(MSG_PROVIDER_NOT_CONFIGURED % provider)
+
+    def _openai_client(self) -> "AsyncOpenAI":
+        match self._openai:
+            case None:
+                self._openai = _sdk("AsyncOpenAI")(
+                    api_key=self._key(PROVIDER_OPENAI),
+                    base_url=self._base_urls[PROVIDER_OPENAI],
+                    timeout=self._timeout,
+                    max_retries=self._max_retries,
+                    http_client=_sdk("OpenAIHttpxClient")(limits=_limits(), timeout=self._timeout),
+                )
+            case _:
+                pass
+        return self._openai
+
+    def _anthropic_client(self) -> "AsyncAnthropic":
+        match self._anthropic:
+            case None:
+                self._anthropic = _sdk("AsyncAnthropic")(
+                    api_key=self._key(PROVIDER_ANTHROPIC),
+                    base_url=self._base_urls[PROVIDER_ANTHROPIC],
+                    timeout=self._timeout,
+                    max_retries=self._max_retries,
+                    http_client=_sdk("AnthropicHttpxClient")(limits=_limits(), timeout=self._timeout),
+                )
+            case _:
+                pass
+        return self._anthropic
+
+    @asynccontextmanager
+    async def openai(self) -> AsyncIterator["AsyncOpenAI"]:
+        """Borrow the shared OpenAI client under the OpenAI concurrency limit."""
+        async with self._limits[PROVIDER_OPENAI]:
+            yield self._openai_client()
+
+    @asynccontextmanager
+    async def anthropic(self) -> AsyncIterator["AsyncAnthropic"]:
+        """Borrow the shared Anthropic client under the Anthropic concurrency limit."""
+        async with self._limits[PROVIDER_ANTHROPIC]:
+            yield self._anthropic_client()
+
+    async def aclose(self) -> None:
+        clients = {PROVIDER_OPENAI: self._openai, PROVIDER_ANTHROPIC: self._anthropic}
+        self._openai = self._anthropic = None
+        opened = {name: c for name, c in clients.items() if c is not None}
+        await asyncio.gather(*(c.close() for c in opened.values()), return_exceptions=True)
+        match opened:
+            case {}:
+                pass
+            case _:
+                logger.info(MSG_PROVIDERS_CLOSED, ", ".join(opened))
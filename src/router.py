@@ -2,25 +2,50 @@
 import asyncio
 import json
 import logging
-from collections.abc import AsyncGenerator
+import time
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable
 from functools import reduce
 
 from src.chat_store import ChatStore, ClaudeSessionStore, MessageHistoryStore
+from src.claude_pool import ClaudeWorkerError, ClaudeWorkerPool
 from src.config import Config
+from src.scheduler import OnQueued, Priority, SchedulerBusy, SpawnScheduler
+from src.streaming import (
+    ERR_PREFIX_CURSOR,
+    META_SESSION_ID,
+    META_TTFT,
+    ClaudeStreamParser,
+    FinalResult,
+    StreamError,
+    StreamEvent,
+    StreamMeta,
+    TextBuffer,
+    TextDelta,
+    accumulated_text,
+)
 from src.constants import (
     CLAUDE_MODEL_FLAG,
     CLAUDE_OUTPUT_FLAG,
     CLAUDE_OUTPUT_FORMAT,
+    CLAUDE_PARTIAL_FLAG,
     CLAUDE_PROMPT_FLAG,
     CLAUDE_RESUME_FLAG,
+    CLAUDE_VERBOSE_FLAG,
+    CLI_LINE_LIMIT,
     CURSOR_CREATE_CHAT,
+    CURSOR_OUTPUT_FLAG,
+    CURSOR_STREAM_FORMAT,
+    CURSOR_STREAM_UNSUPPORTED_HINTS,
     CURSOR_PROMPT_FLAG,
     CURSOR_RESUME_FLAG,
     CURSOR_TRUST_FLAG,
     MSG_CLAUDE_TIMEOUT,
+    MSG_CLAUDE_WORKER_FALLBACK,
+    MSG_CURSOR_STREAM_UNSUPPORTED,
     MSG_CURSOR_TIMEOUT,
     MSG_ERR_NO_CURSOR,
     MSG_ERR_NO_CURSOR_RESPONSE,
+    MSG_ERR_BUSY,
     MSG_ERR_TIMEOUT,
     CLAUDE_STREAM_FORMAT,
     CMD_HISTORY,
@@ -32,11 +57,28 @@ from src.constants import (
     MSG_MODEL_SET_CLAUDE,
     MSG_MODEL_USAGE,
     MSG_NEW_SESSION,
+    MSG_QUEUED,
     MSG_ROUTING_CLAUDE,
     MSG_ROUTING_CURSOR,
+    MSG_SPAWN_REJECTED,
     MSG_STATUS,
+    MSG_TTFT,
+    ROUTE_CLAUDE,
+    ROUTE_CURSOR,
+    SOURCE_TEXT,
+    SPAWN_KIND_CLAUDE,
+    SPAWN_KIND_CURSOR,
+    TRANSCRIPTION_LOCAL,
+    TTFT_MODE_MESSAGE,
+    TTFT_MODE_PARTIAL,
 )
 from src.message_handler import ChatMessage, normalize_phone
+from src.metrics import (
+    QUEUE_DEPTH,
+    SUBPROCESS_FIRST_BYTE_SECONDS,
+    SUBPROCESS_SECONDS,
+    reply_route,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +98,15 @@ def _strip_claude_tag(message: str, patterns: tuple[str, ...]) -> str:
     ).strip()
 
 
+def _priority(message: ChatMessage) -> Priority:
+    """Typed text outranks prompts derived from voice notes and photos."""
+    match message.source:
+        case s if s == SOURCE_TEXT:
+            return Priority.INTERACTIVE
+        case _:
+            return Priority.MEDIA
+
+
 def match_model_args(model: str | None) -> list[str]:
     """Return --model <id> args when a model is set, else empty list."""
     match model:
@@ -65,6 +116,85 @@ def match_model_args(model: str | None) -> list[str]:
             return []
 
 
+async def _lines_until(
+    stream: asyncio.StreamReader, deadline: float
+) -> AsyncGenerator[bytes, None]:
+    """Lines from `stream` until EOF; TimeoutError once the loop clock passes `deadline`."""
+    loop = asyncio.get_running_loop()
+    while line := await asyncio.wait_for(stream.readline(), max(0.0, deadline - loop.time())):
+        yield line
+
+
+def _drain(stream: asyncio.StreamReader | None) -> "asyncio.Future[bytes] | None":
+    """Read `stream` to EOF in the background, so a chatty stderr cannot fill its pipe
+    and stall the process while stdout is being read."""
+    match stream:
+        case asyncio.StreamReader():
+            return asyncio.ensure_future(stream.read())
+        case _:
+            return None
+
+
+async def _drained(reader: "asyncio.Future[bytes] | None") -> bytes:
+    match reader:
+        case None:
+            return b""
+        case future:
+            return await future
+
+
+async def _reap(
+    process: asyncio.subprocess.Process | None, reader: "asyncio.Future[bytes] | None" = None
+) -> None:
+    """Kill `process` if it is still running and wait for it; stop its stderr reader."""
+    match process:
+        case None:
+            pass
+        case proc if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+        case _:
+            pass
+    match reader:
+        case None:
+            pass
+        case future if not future.done():
+            future.cancel()
+        case _:
+            pass
+
+
+async def _first_byte(backend: str, started: float, chunks: AsyncIterator) -> AsyncIterator:
+    """Pass `chunks` through, timing the first one against `started` (the spawn).
+
+    Closing this generator closes `chunks` at once (a worker turn, `_lines_until`),
+    rather than leaving its cleanup to garbage collection."""
+    waiting = True
+    try:
+        async for chunk in chunks:
+            match waiting:
+                case True:
+                    waiting = False
+                    SUBPROCESS_FIRST_BYTE_SECONDS.labels(backend).observe(time.monotonic() - started)
+                case False:
+                    pass
+            yield chunk
+    finally:
+        match chunks:
+            case AsyncGenerator():
+                await chunks.aclose()
+            case _:
+                pass
+
+
+def _cursor_args(cursor: str, message: str, chat_id: str | None) -> list[str]:
+    resume = [CURSOR_RESUME_FLAG, chat_id] if chat_id else []
+    return [cursor, CURSOR_TRUST_FLAG, CURSOR_PROMPT_FLAG, message] + resume
+
+
 # ── router ────────────────────────────────────────────────────────────────────
 
 
@@ -77,6 +207,55 @@ class MessageRouter:
         self._claude_store = ClaudeSessionStore()
         self._history_store = MessageHistoryStore(max_per_sender=HISTORY_MAX_ENTRIES * 2)
         self._claude_model: str | None = None
+        self._claude_pool = (
+            ClaudeWorkerPool(
+                config.claude_cli_path,
+                max_workers=config.claude_pool_max_workers,
+                idle_ttl=config.claude_pool_idle_ttl,
+                extra_args=[CLAUDE_PARTIAL_FLAG] if config.claude_partial_messages else [],
+            )
+            if config.claude_pool_enabled
+            else None
+        )
+        self._scheduler = SpawnScheduler(
+            {
+                SPAWN_KIND_CLAUDE: config.claude_max_processes,
+                SPAWN_KIND_CURSOR: config.cursor_max_processes,
+            },
+            max_queue=config.spawn_queue_max,
+            max_wait=config.spawn_max_wait,
+        )
+        QUEUE_DEPTH.labels(SPAWN_KIND_CLAUDE).set_function(
+            lambda: self._scheduler.depth(SPAWN_KIND_CLAUDE)
+        )
+        QUEUE_DEPTH.labels(SPAWN_KIND_CURSOR).set_function(
+            lambda: self._scheduler.depth(SPAWN_KIND_CURSOR)
+        )
+        # cleared once the installed agent turns out not to support stream-json
+        self._cursor_streaming = config.cursor_streaming
+        # transport hook for out-of-band notices (queue position); (to, text) -> ok
+        self._notify: Callable[[str, str], Awaitable[bool]] | None = None
+
+    def set_notifier(self, notify: Callable[[str, str], Awaitable[bool]]) -> None:
+        self._notify = notify
+
+    def _queue_notice(self, sender: str) -> OnQueued | None:
+        match self._notify:
+            case None:
+                return None
+            case notify:
+                async def _on_queued(position: int, expected_wait: float) -> None:
+                    await notify(sender, MSG_QUEUED % (position, expected_wait))
+
+                return _on_queued
+
+    async def aclose(self) -> None:
+        """Stop long-lived Claude workers. Safe to call when the pool is disabled."""
+        match self._claude_pool:
+            case None:
+                pass
+            case pool:
+                await pool.close()
 
     # ── model state ───────────────────────────────────────────────────────────
 
@@ -100,7 +279,13 @@ class MessageRouter:
 
     def handle_status_command(self) -> str:
         model = self._claude_model or "default"
-        voice = "enabled" if self._config.openai_api_key else "disabled"
+        match (self._config.transcription_backend, self._config.openai_api_key):
+            case (backend, _) if backend == TRANSCRIPTION_LOCAL:
+                voice = "enabled (local)"
+            case (_, str() as key) if key:
+                voice = "enabled"
+            case _:
+                voice = "disabled"
         cursor = self._config.cursor_cli_path or "not configured"
         return MSG_STATUS % (model, voice, cursor)
 
@@ -133,121 +318,338 @@ class MessageRouter:
         match use_claude:
             case True:
                 logger.info(MSG_ROUTING_CLAUDE)
+                reply_route.set(ROUTE_CLAUDE)
                 response = await self._call_claude_cli(
                     message.sender,
                     _strip_claude_tag(message.content, self._config.claude_patterns),
+                    priority=_priority(message),
                 )
             case False:
                 logger.info(MSG_ROUTING_CURSOR)
-                response = await self._call_cursor_cli(message.sender, message.content)
+                reply_route.set(ROUTE_CURSOR)
+                response = await self._call_cursor_cli(
+                    message.sender, message.content, priority=_priority(message)
+                )
         self._history_store.append(message.sender, "bot", response)
         return response
 
     async def stream_handle(self, message: ChatMessage) -> AsyncGenerator[str, None]:
-        """Yields accumulated text chunks as Claude responds. Cursor routes fall back to one chunk."""
+        """Compatibility adapter: yields the accumulated text after every change."""
+        async for text in accumulated_text(self.stream_events(message)):
+            yield text
+
+    async def stream_events(self, message: ChatMessage) -> AsyncGenerator[StreamEvent, None]:
+        """Yields typed events as the reply is produced (Claude and Cursor alike)."""
         use_claude = (
             _is_claude_tagged(message.content, self._config.claude_patterns)
             or not self._config.cursor_cli_path
         )
         self._history_store.append(message.sender, "you", message.content)
+        buffer = TextBuffer()
         match use_claude:
             case True:
                 logger.info(MSG_ROUTING_CLAUDE)
-                full_text = ""
-                async for chunk in self._stream_claude_cli(
+                reply_route.set(ROUTE_CLAUDE)
+                events = self._stream_claude_cli(
                     message.sender,
                     _strip_claude_tag(message.content, self._config.claude_patterns),
-                ):
-                    full_text = chunk
-                    yield chunk
-                self._history_store.append(message.sender, "bot", full_text)
+                    priority=_priority(message),
+                )
             case False:
                 logger.info(MSG_ROUTING_CURSOR)
-                response = await self._call_cursor_cli(message.sender, message.content)
-                self._history_store.append(message.sender, "bot", response)
-                yield response
+                reply_route.set(ROUTE_CURSOR)
+                events = self._stream_cursor_cli(
+                    message.sender, message.content, priority=_priority(message)
+                )
+        async for event in events:
+            buffer.apply(event)
+            yield event
+        self._history_store.append(message.sender, "bot", buffer.text.strip())
+
+    async def _stream_cursor_cli(
+        self, sender: str, message: str, priority: Priority = Priority.INTERACTIVE
+    ) -> AsyncGenerator[StreamEvent, None]:
+        match (self._config.cursor_cli_path, self._cursor_streaming):
+            case (str() as cursor, True) if cursor:
+                pass
+            case _:
+                yield FinalResult(await self._call_cursor_cli(sender, message, priority=priority))
+                return
+        try:
+            async with self._scheduler.admit(
+                SPAWN_KIND_CURSOR, priority, self._queue_notice(sender)
+            ):
+                started = time.monotonic()
+                try:
+                    async for event in self._run_stream_cursor_cli(cursor, sender, message):
+                        yield event
+                finally:
+                    SUBPROCESS_SECONDS.labels(SPAWN_KIND_CURSOR).observe(time.monotonic() - started)
+        except SchedulerBusy as exc:
+            logger.warning(MSG_SPAWN_REJECTED, SPAWN_KIND_CURSOR, exc)
+            yield StreamError(MSG_ERR_BUSY)
+
+    async def _run_stream_cursor_cli(
+        self, cursor: str, sender: str, message: str
+    ) -> AsyncGenerator[StreamEvent, None]:
+        """`agent -p … --output-format stream-json`, parsed line by line.
+
+        An agent that rejects the flag exits non-zero before printing any event
+        with stderr naming the option; the message is then answered in buffered
+        mode and streaming is switched off for the rest of the process lifetime.
+        Any other failure is reported as a StreamError, without a second run.
+        """
+        cwd = self._config.cursor_working_dir
+        process = None
+        reader = None
+        produced = False
+        err = ""
+        try:
+            deadline = asyncio.get_running_loop().time() + self._config.cursor_timeout
+            chat_id = await self._cursor_chat_id(cursor, normalize_phone(sender), cwd)
+            args = _cursor_args(cursor, message, chat_id) + [CURSOR_OUTPUT_FLAG, CURSOR_STREAM_FORMAT]
+            logger.info("Streaming Cursor Agent…")
+            spawned = time.monotonic()
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd,
+                limit=CLI_LINE_LIMIT,
+            )
+            reader = _drain(process.stderr)
+            parser = ClaudeStreamParser(ERR_PREFIX_CURSOR)
+            lines = _lines_until(process.stdout, deadline)
+            async for raw_line in _first_byte(SPAWN_KIND_CURSOR, spawned, lines):
+                for event in parser.feed_line(raw_line.decode(errors="replace")):
+                    produced = True
+                    yield event
+            await process.wait()
+            err = (await _drained(reader)).decode(errors="replace")[:200]
+        except asyncio.TimeoutError:
+            logger.error(MSG_CURSOR_TIMEOUT, self._config.cursor_timeout)
+            await _reap(process, reader)
+            yield StreamError(MSG_ERR_TIMEOUT)
+            return
+        except Exception as exc:
+            logger.error("Error streaming Cursor Agent: %s", exc)
+            await _reap(process, reader)
+            yield StreamError(f"Error: {exc}")
+            return
+        finally:
+            # closed early or cancelled: nothing may stay blocked on a full pipe
+            await _reap(process, reader)
+
+        match (process.returncode, produced):
+            case (0, True):
+                pass
+            case (0, False):
+                yield StreamError(MSG_ERR_NO_CURSOR_RESPONSE)
+            case (_, False) if any(h in err.lower() for h in CURSOR_STREAM_UNSUPPORTED_HINTS):
+                # only a rejected stream flag is worth a buffered re-run
+                logger.warning(MSG_CURSOR_STREAM_UNSUPPORTED, err.strip())
+                self._cursor_streaming = False
+                yield FinalResult(await self._run_cursor_cli(sender, message))
+            case _:
+                logger.error("Cursor Agent failed: %s", err)
+                yield StreamError(f"Error: {err or 'Unknown error'}")
 
-    async def _stream_claude_cli(self, sender: str, message: str) -> AsyncGenerator[str, None]:
+    async def _stream_claude_cli(
+        self, sender: str, message: str, priority: Priority = Priority.INTERACTIVE
+    ) -> AsyncGenerator[StreamEvent, None]:
+        key = normalize_phone(sender)
+        mode = TTFT_MODE_PARTIAL if self._config.claude_partial_messages else TTFT_MODE_MESSAGE
+        try:
+            async with self._scheduler.admit(
+                SPAWN_KIND_CLAUDE, priority, self._queue_notice(sender)
+            ):
+                started = time.monotonic()
+                first_token = False
+                try:
+                    async for event in self._run_stream_claude_cli(sender, message):
+                        match (event, first_token):
+                            case (StreamMeta(key=k, value=session_id), _) if k == META_SESSION_ID:
+                                self._remember_claude_session(key, session_id)
+                            case (TextDelta() | FinalResult(), False):
+                                first_token = True
+                                ttft = time.monotonic() - started
+                                logger.info(MSG_TTFT, ttft, mode)
+                                yield StreamMeta(META_TTFT, f"{ttft:.3f}")
+                            case _:
+                                pass
+                        yield event
+                finally:
+                    SUBPROCESS_SECONDS.labels(SPAWN_KIND_CLAUDE).observe(time.monotonic() - started)
+        except SchedulerBusy as exc:
+            logger.warning(MSG_SPAWN_REJECTED, SPAWN_KIND_CLAUDE, exc)
+            yield StreamError(MSG_ERR_BUSY)
+
+    async def _run_stream_claude_cli(
+        self, sender: str, message: str
+    ) -> AsyncGenerator[StreamEvent, None]:
+        match self._claude_pool:
+            case None:
+                pass
+            case pool:
+                yielded = False
+                try:
+                    async for event in self._stream_claude_worker(pool, sender, message):
+                        yielded = True
+                        yield event
+                    return
+                except asyncio.TimeoutError:
+                    logger.error(MSG_CLAUDE_TIMEOUT)
+                    yield StreamError(MSG_ERR_TIMEOUT)
+                    return
+                except ClaudeWorkerError as exc:
+                    match yielded:
+                        case True:
+                            yield StreamError(f"Error calling Claude: {exc}")
+                            return
+                        case False:
+                            logger.warning(MSG_CLAUDE_WORKER_FALLBACK, exc)
+        async for event in self._stream_claude_oneshot(sender, message):
+            yield event
+
+    async def _stream_claude_worker(
+        self, pool: ClaudeWorkerPool, sender: str, message: str
+    ) -> AsyncGenerator[StreamEvent, None]:
+        key = normalize_phone(sender)
+        worker = await pool.acquire(key, self._claude_store.get(key), self._claude_model)
+        parser = ClaudeStreamParser()
+        turn = worker.turn(message, self._config.claude_timeout)
+        async for raw in _first_byte(SPAWN_KIND_CLAUDE, time.monotonic(), turn):
+            for event in parser.feed_event(raw):
+                yield event
+
+    async def _stream_claude_oneshot(
+        self, sender: str, message: str
+    ) -> AsyncGenerator[StreamEvent, None]:
         key = normalize_phone(sender)
         session_id = self._claude_store.get(key)
         claude = self._config.claude_cli_path
 
-        base_args = (
-            [claude, CLAUDE_PROMPT_FLAG, message, CLAUDE_RESUME_FLAG, session_id]
-            if session_id
-            else [claude, CLAUDE_PROMPT_FLAG, message, CLAUDE_OUTPUT_FLAG, CLAUDE_STREAM_FORMAT]
-        )
+        match (self._config.claude_partial_messages, session_id):
+            case (True, _):
+                resume = [CLAUDE_RESUME_FLAG, session_id] if session_id else []
+                base_args = [claude, CLAUDE_PROMPT_FLAG, message] + resume + [
+                    CLAUDE_OUTPUT_FLAG, CLAUDE_STREAM_FORMAT,
+                    CLAUDE_VERBOSE_FLAG, CLAUDE_PARTIAL_FLAG,
+                ]
+            case (False, str() as sid) if sid:
+                base_args = [claude, CLAUDE_PROMPT_FLAG, message, CLAUDE_RESUME_FLAG, sid]
+            case _:
+                base_args = [
+                    claude, CLAUDE_PROMPT_FLAG, message, CLAUDE_OUTPUT_FLAG, CLAUDE_STREAM_FORMAT
+                ]
         args = base_args + match_model_args(self._claude_model)
 
+        process = None
+        reader = None
         try:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self._config.claude_timeout
+            spawned = time.monotonic()
             process = await asyncio.create_subprocess_exec(
                 *args,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
+                limit=CLI_LINE_LIMIT,
             )
+            reader = _drain(process.stderr)
             if not process.stdout:
-                yield "Error: No stdout from Claude process"
+                yield StreamError("Error: No stdout from Claude process")
                 return
-            
-            accumulated = ""
-            async for raw_line in process.stdout:
-                line = raw_line.decode(errors="replace").strip()
-                match line:
-                    case "":
-                        continue
-                    case _:
-                        pass
-                try:
-                    event = json.loads(line)
-                    match event.get("type"):
-                        case "assistant":
-                            content = event.get("message", {}).get("content", [])
-                            text = "".join(
-                                b.get("text", "") for b in content if b.get("type") == "text"
-                            )
-                            match text.strip():
-                                case "":
-                                    pass
-                                case t:
-                                    accumulated += t
-                                    yield accumulated
-                        case "result":
-                            new_id = event.get("session_id")
-                            match new_id:
-                                case str() as s if s:
-                                    self._claude_store.set(key, s)
-                                case _:
-                                    pass
-                            final = event.get("result", "").strip()
-                            match final:
-                                case "" | None:
-                                    pass
-                                case r if r != accumulated.strip():
-                                    yield r
-                        case _:
-                            pass
-                except (json.JSONDecodeError, TypeError):
-                    accumulated += line + "\n"
-                    yield accumulated.strip()
 
-            await process.wait()
-            match (process.returncode, accumulated):
-                case (0, _):
+            parser = ClaudeStreamParser()
+            lines = _lines_until(process.stdout, deadline)
+            async for raw_line in _first_byte(SPAWN_KIND_CLAUDE, spawned, lines):
+                for event in parser.feed_line(raw_line.decode(errors="replace")):
+                    yield event
+
+            await asyncio.wait_for(process.wait(), max(0.0, deadline - loop.time()))
+            match process.returncode:
+                case 0:
                     pass
-                case (_, _):
-                    if process.stderr:
-                        err = (await process.stderr.read()).decode()[:100]
-                        yield f"Error calling Claude: {err}"
+                case _:
+                    if reader:
+                        err = (await _drained(reader)).decode()[:100]
+                        yield StreamError(f"Error calling Claude: {err}")
                     else:
-                        yield "Error calling Claude"
+                        yield StreamError("Error calling Claude")
 
         except asyncio.TimeoutError:
-            yield MSG_ERR_TIMEOUT
+            logger.error(MSG_CLAUDE_TIMEOUT)
+            await _reap(process, reader)
+            yield StreamError(MSG_ERR_TIMEOUT)
         except Exception as exc:
             logger.error("Error streaming Claude: %s", exc)
-            yield f"Error: {exc}"
+            await _reap(process, reader)
+            yield StreamError(f"Error: {exc}")
+        finally:
+            await _reap(process, reader)
+
+    def _remember_claude_session(self, key: str, session_id: str | None) -> None:
+        match session_id:
+            case str() as s if s and s != self._claude_store.get(key):
+                self._claude_store.set(key, s)
+            case _:
+                pass
 
-    async def _call_claude_cli(self, sender: str, message: str) -> str:
+    async def _call_claude_worker(
+        self, pool: ClaudeWorkerPool, sender: str, message: str
+    ) -> str:
+        key = normalize_phone(sender)
+        worker = await pool.acquire(key, self._claude_store.get(key), self._claude_model)
+        logger.info("Calling Claude worker (pid %s)…", worker.pid)
+        parser = ClaudeStreamParser()
+        turn = worker.turn(message, self._config.claude_timeout)
+        events = [
+            e
+            async for raw in _first_byte(SPAWN_KIND_CLAUDE, time.monotonic(), turn)
+            for e in parser.feed_event(raw)
+        ]
+        buffer = TextBuffer()
+        list(map(buffer.apply, events))
+        self._remember_claude_session(key, next(
+            (e.value for e in events if isinstance(e, StreamMeta) and e.key == META_SESSION_ID),
+            None,
+        ))
+        match buffer.failed:
+            case True:
+                logger.error("Claude worker error: %s", buffer.text[:100])
+            case False:
+                pass
+        return buffer.text.strip()
+
+    async def _call_claude_cli(
+        self, sender: str, message: str, priority: Priority = Priority.INTERACTIVE
+    ) -> str:
+        try:
+            async with self._scheduler.admit(
+                SPAWN_KIND_CLAUDE, priority, self._queue_notice(sender)
+            ):
+                started = time.monotonic()
+                try:
+                    return await self._run_claude_cli(sender, message)
+                finally:
+                    SUBPROCESS_SECONDS.labels(SPAWN_KIND_CLAUDE).observe(time.monotonic() - started)
+        except SchedulerBusy as exc:
+            logger.warning(MSG_SPAWN_REJECTED, SPAWN_KIND_CLAUDE, exc)
+            return MSG_ERR_BUSY
+
+    async def _run_claude_cli(self, sender: str, message: str) -> str:
+        match self._claude_pool:
+            case None:
+                pass
+            case pool:
+                try:
+                    return await self._call_claude_worker(pool, sender, message)
+                except asyncio.TimeoutError:
+                    logger.error(MSG_CLAUDE_TIMEOUT)
+                    return MSG_ERR_TIMEOUT
+                except ClaudeWorkerError as exc:
+                    logger.warning(MSG_CLAUDE_WORKER_FALLBACK, exc)
         try:
             key = normalize_phone(sender)
             session_id = self._claude_store.get(key)
@@ -302,41 +704,30 @@ class MessageRouter:
             logger.error("Error calling Claude: %s", exc)
             return f"Error: {exc}"
 
-    async def _call_cursor_cli(self, sender: str, message: str) -> str:
+    async def _call_cursor_cli(
+        self, sender: str, message: str, priority: Priority = Priority.INTERACTIVE
+    ) -> str:
+        try:
+            async with self._scheduler.admit(
+                SPAWN_KIND_CURSOR, priority, self._queue_notice(sender)
+            ):
+                started = time.monotonic()
+                try:
+                    return await self._run_cursor_cli(sender, message)
+                finally:
+                    SUBPROCESS_SECONDS.labels(SPAWN_KIND_CURSOR).observe(time.monotonic() - started)
+        except SchedulerBusy as exc:
+            logger.warning(MSG_SPAWN_REJECTED, SPAWN_KIND_CURSOR, exc)
+            return MSG_ERR_BUSY
+
+    async def _run_cursor_cli(self, sender: str, message: str) -> str:
         cursor = self._config.cursor_cli_path
         if cursor is None:
             return MSG_ERR_NO_CURSOR
         try:
-            key = normalize_phone(sender)
-            chat_id = self._chat_store.get(key)
-
             cwd = self._config.cursor_working_dir
-            match chat_id:
-                case None | "":
-                    create = await asyncio.create_subprocess_exec(
-                        cursor,
-                        CURSOR_CREATE_CHAT,
-                        CURSOR_TRUST_FLAG,
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                        cwd=cwd,
-                    )
-                    stdout, _ = await asyncio.wait_for(create.communicate(), timeout=10)
-                    new_chat_id = stdout.decode().strip() if stdout else ""
-                    match (create.returncode, new_chat_id):
-                        case (0, id_val) if id_val:
-                            self._chat_store.set(key, id_val)
-                            chat_id = id_val
-                        case _:
-                            chat_id = None
-                case _:
-                    pass
-
-            args = (
-                [cursor, CURSOR_TRUST_FLAG, CURSOR_PROMPT_FLAG, message, CURSOR_RESUME_FLAG, chat_id]
-                if chat_id
-                else [cursor, CURSOR_TRUST_FLAG, CURSOR_PROMPT_FLAG, message]
-            )
+            chat_id = await self._cursor_chat_id(cursor, normalize_phone(sender), cwd)
+            args = _cursor_args(cursor, message, chat_id)
 
             logger.info("Calling Cursor Agent…")
             process = await asyncio.create_subprocess_exec(
@@ -366,3 +757,27 @@ class MessageRouter:
         except Exception as exc:
             logger.error("Error calling Cursor Agent: %s", exc)
             return f"Error: {exc}"
+
+    async def _cursor_chat_id(self, cursor: str, key: str, cwd: str | None) -> str | None:
+        """Stored Cursor chat for `key`, creating (and storing) one on first use."""
+        match self._chat_store.get(key):
+            case str() as chat_id if chat_id:
+                return chat_id
+            case _:
+                pass
+        create = await asyncio.create_subprocess_exec(
+            cursor,
+            CURSOR_CREATE_CHAT,
+            CURSOR_TRUST_FLAG,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd,
+        )
+        stdout, _ = await asyncio.wait_for(create.communicate(), timeout=10)
+        new_chat_id = stdout.decode().strip() if stdout else ""
+        match (create.returncode, new_chat_id):
+            case (0, id_val) if id_val:
+                self._chat_store.set(key, id_val)
+                return id_val
+            case _:
+                return None
@@ -0,0 +1,152 @@
+"""SpawnScheduler — admission control in front of every Claude / Cursor CLI run.
+
+Each CLI kind has its own concurrency cap and a bounded priority queue
+(interactive text ahead of media-derived prompts, FIFO within a priority).
+A request that would land beyond `max_queue` waiters, or whose expected wait
+exceeds `max_wait` seconds, is rejected immediately with `SchedulerBusy`
+instead of piling more processes onto the box.
+"""
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+from src.constants import SPAWN_DURATION_SMOOTHING, SPAWN_INITIAL_ESTIMATE
+
+# on_queued signature: (position, expected_wait_seconds) -> None
+OnQueued = Callable[[int, float], Awaitable[None]]
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    MEDIA = 1
+
+
+class SchedulerBusy(Exception):
+
+    def __init__(self, kind: str, position: int, expected_wait: float) -> None:
+        super().__init__(f"{kind} queue full (position {position}, ~{expected_wait:.0f}s)")
+        self.kind = kind
+        self.position = position
+        self.expected_wait = expected_wait
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    future: asyncio.Future = field(compare=False)
+
+
+class _Lane:
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, capacity)
+        self.running = 0
+        self.waiters: list[_Waiter] = []
+        self.avg_duration = SPAWN_INITIAL_ESTIMATE
+
+    def ahead_of(self, priority: int) -> int:
+        return sum(1 for w in self.waiters if w.priority <= priority and not w.future.done())
+
+    def expected_wait(self, position: int) -> float:
+        return math.ceil(position / self.capacity) * self.avg_duration
+
+    def record(self, duration: float) -> None:
+        a = SPAWN_DURATION_SMOOTHING
+        self.avg_duration = a * duration + (1 - a) * self.avg_duration
+
+    def discard(self, waiter: _Waiter) -> None:
+        match waiter in self.waiters:
+            case True:
+                self.waiters.remove(waiter)
+                heapq.heapify(self.waiters)
+            case False:
+                pass
+
+    def grant_next(self) -> None:
+        while self.waiters and self.running < self.capacity:
+            waiter = heapq.heappop(self.waiters)
+            match waiter.future.done():
+                case True:
+                    continue  # cancelled while queued
+                case False:
+                    self.running += 1
+                    waiter.future.set_result(None)
+
+
+class SpawnScheduler:
+
+    def __init__(self, limits: dict[str, int], max_queue: int, max_wait: float) -> None:
+        self._lanes = {kind: _Lane(cap) for kind, cap in limits.items()}
+        self._max_queue = max_queue
+        self._max_wait = max_wait
+        self._seq = itertools.count()
+
+    def depth(self, kind: str) -> int:
+        return self._lanes[kind].ahead_of(max(Priority))
+
+    def running(self, kind: str) -> int:
+        return self._lanes[kind].running
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        kind: str,
+        priority: Priority = Priority.INTERACTIVE,
+        on_queued: OnQueued | None = None,
+    ) -> AsyncIterator[None]:
+        """Hold one of `kind`'s run slots for the duration of the block."""
+        lane = self._lanes[kind]
+        await self._enter(kind, lane, priority, on_queued)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            lane.running -= 1
+            lane.record(time.monotonic() - started)
+            lane.grant_next()
+
+    async def _enter(
+        self, kind: str, lane: _Lane, priority: Priority, on_queued: OnQueued | None
+    ) -> None:
+        match (lane.running < lane.capacity, lane.ahead_of(max(Priority))):
+            case (True, 0):
+                lane.running += 1
+                return
+            case _:
+                pass
+        position = lane.ahead_of(priority) + 1
+        expected = lane.expected_wait(position)
+        match (lane.ahead_of(max(Priority)) >= self._max_queue, expected > self._max_wait):
+            case (False, False):
+                pass
+            case _:
+                raise SchedulerBusy(kind, position, expected)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        waiter = _Waiter(int(priority), next(self._seq), future)
+        try:
+            heapq.heappush(lane.waiters, waiter)
+            # the notice is a Telegram send and may itself wait (rate limiter)
+            match on_queued:
+                case None:
+                    pass
+                case cb:
+                    await cb(position, expected)
+            await future
+        except BaseException:
+            match (future.done() and not future.cancelled()):
+                case True:
+                    # granted just as we were cancelled (or the notice failed) — hand the slot on
+                    lane.running -= 1
+                    lane.grant_next()
+                case False:
+                    future.cancel()
+                    lane.discard(waiter)
+            raise
@@ -0,0 +1,44 @@
+"""Cold-start timing for `python -m src.main --startup-report`.
+
+`StartupTimer` times named phases (imports, building, polling start) from a
+reference point taken when src.main is first loaded, and counts the modules
+each phase pulled in. The report mode starts polling, waits for the first
+getUpdates request to leave and prints the breakdown instead of serving.
+"""
+import contextlib
+import sys
+import time
+from collections.abc import Iterator
+
+from src.constants import MSG_STARTUP_FIRST_POLL, MSG_STARTUP_PHASE
+
+
+class StartupTimer:
+
+    def __init__(self, started: float | None = None) -> None:
+        self._started = time.perf_counter() if started is None else started
+        # (phase, seconds, modules imported)
+        self.phases: list[tuple[str, float, int]] = []
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._started
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        began, modules = time.perf_counter(), len(sys.modules)
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - began, len(sys.modules) - modules))
+
+    def report(self, first_poll: float | None) -> str:
+        lines = [
+            (MSG_STARTUP_PHASE % (name, seconds * 1000)) + (f"  +{modules} modules" if modules else "")
+            for name, seconds, modules in self.phases
+        ]
+        match first_poll:
+            case None:
+                pass
+            case seconds:
+                lines.append(MSG_STARTUP_FIRST_POLL % ("time to first poll", seconds * 1000))
+        return "\n".join(["Startup:", *lines])
@@ -0,0 +1,109 @@
+"""SQLiteHistory — append-only message archive in SQLite (WAL mode).
+
+Rows are keyed by a global, monotonically increasing `seq` and indexed on
+(sender, seq), so an append is a single insert and reading the last N entries
+for one sender touches only those N rows.  Nothing is trimmed: the table is the
+full archive.
+"""
+import json
+import logging
+import sqlite3
+from pathlib import Path
+
+from src.message_handler import normalize_phone
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS history ("
+    " seq INTEGER PRIMARY KEY,"
+    " sender TEXT NOT NULL,"
+    " role TEXT NOT NULL,"
+    " content TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS history_sender_seq ON history (sender, seq)",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+)
+_LEGACY_IMPORTED = "legacy_json_imported"
+
+
+def _legacy_rows(raw: object) -> list[tuple[str, str, str]]:
+    """(sender, role, content) rows from the legacy JSON; malformed senders / entries are skipped."""
+    match raw:
+        case dict():
+            pass
+        case _:
+            raise ValueError(f"expected an object, got {type(raw).__name__}")
+    return [
+        (normalize_phone(str(sender)) or str(sender), str(e.get("role", "")), str(e.get("content", "")))
+        for sender, entries in raw.items()
+        if isinstance(entries, list)
+        for e in entries
+        if isinstance(e, dict)
+    ]
+
+
+class SQLiteHistory:
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        # autocommit: each append is its own cheap WAL transaction
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        list(map(self._conn.execute, _SCHEMA))
+
+    def append(self, sender: str, role: str, content: str) -> None:
+        self._conn.execute(
+            "INSERT INTO history (sender, role, content) VALUES (?, ?, ?)",
+            (sender, role, content),
+        )
+
+    def tail(self, sender: str, limit: int) -> list[tuple[str, str]]:
+        """Last `limit` (role, content) rows for `sender`, oldest first."""
+        rows = self._conn.execute(
+            "SELECT role, content FROM history WHERE sender = ? ORDER BY seq DESC LIMIT ?",
+            (sender, limit),
+        ).fetchall()
+        rows.reverse()
+        return rows
+
+    def count(self, sender: str) -> int:
+        (n,) = self._conn.execute(
+            "SELECT COUNT(*) FROM history WHERE sender = ?", (sender,)
+        ).fetchone()
+        return n
+
+    def delete(self, sender: str) -> int:
+        return self._conn.execute("DELETE FROM history WHERE sender = ?", (sender,)).rowcount
+
+    def import_legacy_json(self, legacy: Path) -> int:
+        """One-time import of the old `{sender: [{role, content}, …]}` file. Returns rows added."""
+        match (self._meta(_LEGACY_IMPORTED), legacy.exists()):
+            case (None, True):
+                pass
+            case _:
+                return 0
+        try:
+            with open(legacy) as f:
+                rows = _legacy_rows(json.load(f))
+        except Exception as e:
+            logger.warning("History import from %s failed: %s", legacy.name, e)
+            return 0
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT INTO history (sender, role, content) VALUES (?, ?, ?)", rows
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (_LEGACY_IMPORTED, legacy.name),
+            )
+        logger.info("Imported %d history entries from %s", len(rows), legacy.name)
+        return len(rows)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _meta(self, key: str) -> str | None:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
@@ -0,0 +1,275 @@
+"""AppendLog — snapshot + append-only change log with group-committed fsync.
+
+Layout: the snapshot is a plain JSON object (the same format the stores always
+wrote, so existing `.cursor_chat_ids.json` / `.claude_session_ids.json` files load
+as-is) and `<snapshot>.log` holds one `{"k": key, "v": value}` record per line,
+`v = null` meaning delete.  State = snapshot + replayed log.
+
+`append()` writes the record to the OS immediately (O(record), so readers in this
+process see it), while a background thread fsyncs once per commit window for all
+records that landed in it.  Compaction rewrites the snapshot atomically and keeps
+only the log tail written after the state copy; replaying an already-compacted
+prefix over a newer snapshot is harmless because the last record per key wins.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from functools import reduce
+from itertools import takewhile
+from pathlib import Path
+from typing import IO
+
+from src.constants import (
+    STORE_COMMIT_WINDOW,
+    STORE_COMPACT_MIN_RECORDS,
+    STORE_COMPACT_RATIO,
+    STORE_LOG_SUFFIX,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _decode(raw: bytes) -> dict | None:
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        return None
+
+
+def _apply(state: dict[str, str], record: dict) -> dict[str, str]:
+    match record:
+        case {"k": str() as k, "v": None}:
+            state.pop(k, None)
+        case {"k": str() as k, "v": v}:
+            state[k] = v
+        case _:
+            pass
+    return state
+
+
+def _replay(state: dict[str, str], raw: bytes) -> tuple[int, int]:
+    """Apply log records to `state` in order; a torn line ends the replay.
+
+    Only newline-terminated lines count. Returns (records, bytes) replayed.
+    """
+    lines = raw[: raw.rfind(b"\n") + 1].split(b"\n")[:-1]
+    good = list(takewhile(lambda pair: pair[1] is not None, zip(lines, map(_decode, lines))))
+    reduce(_apply, (record for _, record in good), state)
+    return len(good), sum(len(line) + 1 for line, _ in good)
+
+
+class AppendLog:
+
+    def __init__(
+        self,
+        snapshot: Path,
+        commit_window: float = STORE_COMMIT_WINDOW,
+        compact_min_records: int = STORE_COMPACT_MIN_RECORDS,
+    ) -> None:
+        self._snapshot = snapshot
+        self._log_path = snapshot.with_name(snapshot.name + STORE_LOG_SUFFIX)
+        self._window = commit_window
+        self._compact_min = compact_min_records
+        self._cond = threading.Condition()
+        self._file: IO[bytes] | None = None
+        self._records = 0
+        self._dirty = False
+        self._closed = False
+        self._compacting = False
+        self._generation = 0
+        self._compact_lock = threading.Lock()
+        self._flusher: threading.Thread | None = None
+        self.commits = 0
+
+    @property
+    def log_path(self) -> Path:
+        return self._log_path
+
+    def exists(self) -> bool:
+        return self._snapshot.exists() or self._log_path.exists()
+
+    def load(self) -> dict[str, str]:
+        """Snapshot plus log tail. Raises if the snapshot itself is unreadable."""
+        state: dict[str, str] = {}
+        match self._snapshot.exists():
+            case True:
+                with open(self._snapshot) as f:
+                    state = dict(json.load(f))
+            case False:
+                pass
+        match self._log_path.exists():
+            case True:
+                raw = self._log_path.read_bytes()
+                self._records, replayed = _replay(state, raw)
+                match replayed < len(raw):
+                    case True:
+                        # cut the torn tail, or the next append lands after it and is never replayed
+                        logger.warning(
+                            "Store log %s: dropping %d torn bytes", self._log_path, len(raw) - replayed
+                        )
+                        os.truncate(self._log_path, replayed)
+                    case False:
+                        pass
+            case False:
+                pass
+        return state
+
+    def append(self, key: str, value: str | None) -> None:
+        line = json.dumps({"k": key, "v": value}, separators=(",", ":")).encode() + b"\n"
+        with self._cond:
+            f = self._open()
+            f.write(line)
+            f.flush()
+            self._records += 1
+            self._dirty = True
+            self._ensure_flusher()
+            self._cond.notify()
+
+    def needs_compaction(self, live_keys: int) -> bool:
+        return self._records >= max(self._compact_min, live_keys * STORE_COMPACT_RATIO)
+
+    def compact(self, state: dict[str, str]) -> None:
+        """Rewrite the snapshot from `state` and drop every log record up to now."""
+        with self._compact_lock:
+            with self._cond:
+                mark = (self._generation, self._offset())
+            self._compact(dict(state), mark)
+
+    def compact_soon(self, state: dict[str, str]) -> None:
+        """Like compact(), but the snapshot is written on a background thread."""
+        with self._cond:
+            match self._compacting:
+                case True:
+                    return
+                case False:
+                    self._compacting = True
+            mark = (self._generation, self._offset())
+        threading.Thread(
+            target=self._compact_in_background, args=(dict(state), mark), daemon=True
+        ).start()
+
+    def flush(self) -> None:
+        """Block until every appended record is fsynced."""
+        with self._cond:
+            match (self._dirty, self._file):
+                case (True, f) if f is not None:
+                    os.fsync(f.fileno())
+                    self._dirty = False
+                    self.commits += 1
+                case _:
+                    pass
+
+    def close(self) -> None:
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            match self._file:
+                case None:
+                    pass
+                case f:
+                    f.close()
+                    self._file = None
+
+    # ── internals ─────────────────────────────────────────────────────────────
+
+    def _open(self) -> IO[bytes]:
+        match self._file:
+            case None:
+                self._file = open(self._log_path, "ab")
+                return self._file
+            case f:
+                return f
+
+    def _offset(self) -> int:
+        match self._file:
+            case None:
+                return self._log_path.stat().st_size if self._log_path.exists() else 0
+            case f:
+                return f.tell()
+
+    def _ensure_flusher(self) -> None:
+        match self._flusher:
+            case None:
+                self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+                self._flusher.start()
+                atexit.register(self.close)
+            case _:
+                pass
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._dirty or self._closed)
+                match (self._closed, self._dirty):
+                    case (True, False):
+                        return
+                    case _:
+                        pass
+            # let every write landing in this window share one fsync
+            time.sleep(self._window)
+            with self._cond:
+                match (self._dirty, self._file):
+                    case (True, f) if f is not None:
+                        fd = os.dup(f.fileno())
+                        self._dirty = False
+                    case _:
+                        continue
+            try:
+                os.fsync(fd)
+                self.commits += 1
+            except OSError as exc:
+                logger.warning("Store log fsync failed: %s", exc)
+            finally:
+                os.close(fd)
+
+    def _compact_in_background(self, state: dict[str, str], mark: tuple[int, int]) -> None:
+        try:
+            with self._compact_lock:
+                self._compact(state, mark)
+        finally:
+            with self._cond:
+                self._compacting = False
+
+    def _compact(self, state: dict[str, str], mark: tuple[int, int]) -> None:
+        generation, offset = mark
+        match generation == self._generation:
+            case False:
+                # a newer compaction already covered this state
+                return
+            case True:
+                pass
+        try:
+            _write_atomic(self._snapshot, json.dumps(state, indent=2).encode())
+            with self._cond:
+                tail = b""
+                match self._file:
+                    case None:
+                        pass
+                    case f:
+                        f.close()
+                        self._file = None
+                match self._log_path.exists():
+                    case True:
+                        with open(self._log_path, "rb") as src:
+                            src.seek(offset)
+                            tail = src.read()
+                    case False:
+                        pass
+                _write_atomic(self._log_path, tail)
+                self._records = tail.count(b"\n")
+                self._generation += 1
+        except OSError as exc:
+            logger.warning("Store compaction failed: %s", exc)
@@ -0,0 +1,139 @@
+"""MediaCache — content-addressed results of transcription and image analysis.
+
+Telegram gives every file a stable `file_unique_id`, so a forwarded voice note
+or re-sent screenshot can be recognised before it is downloaded. Results are
+keyed by that id plus caption, backend and model (`media_key`), kept in a small
+in-memory LRU in front of a size-bounded SQLite table, and expire after a TTL.
+"""
+import hashlib
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+
+from src.constants import MEDIA_CACHE_MEMORY_ENTRIES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path(".media_cache.db")
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS media ("
+    " key TEXT PRIMARY KEY,"
+    " value TEXT NOT NULL,"
+    " created REAL NOT NULL,"
+    " accessed REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS media_accessed ON media (accessed)",
+    "CREATE INDEX IF NOT EXISTS media_created ON media (created)",
+)
+
+
+def media_key(
+    kind: str, file_unique_id: str, backend: str, model: str, caption: str | None = None
+) -> str:
+    """Stable key for one (file, prompt, backend, model) combination."""
+    raw = "\0".join((kind, file_unique_id, backend, model, caption or ""))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class MediaCache:
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        max_entries: int = 5000,
+        ttl: float = 30 * 86400,
+        memory_entries: int = MEDIA_CACHE_MEMORY_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._max_entries = max(1, max_entries)
+        self._ttl = ttl
+        self._memory_entries = max(1, min(memory_entries, self._max_entries))
+        self._clock = clock
+        # key → (value, created); most recently used last
+        self._memory: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        list(map(self._conn.execute, _SCHEMA))
+        # row count, kept in step with inserts and deletes so put() needs no COUNT(*)
+        (self._rows,) = self._conn.execute("SELECT COUNT(*) FROM media").fetchone()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> str | None:
+        now = self._clock()
+        match self._memory.get(key) or self._load(key):
+            case (value, created) if now - created < self._ttl:
+                self.hits += 1
+                self._remember(key, value, created)
+                self._conn.execute("UPDATE media SET accessed = ? WHERE key = ?", (now, key))
+                return value
+            case (_, _):
+                self._drop([key])
+            case _:
+                pass
+        self.misses += 1
+        return None
+
+    def put(self, key: str, value: str) -> None:
+        now = self._clock()
+        self._remember(key, value, now)
+        match self._conn.execute("SELECT 1 FROM media WHERE key = ?", (key,)).fetchone():
+            case None:
+                self._rows += 1
+            case _:
+                pass
+        self._conn.execute(
+            "INSERT OR REPLACE INTO media (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+            (key, value, now, now),
+        )
+        self._trim()
+
+    def __len__(self) -> int:
+        (n,) = self._conn.execute("SELECT COUNT(*) FROM media").fetchone()
+        return n
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _load(self, key: str) -> tuple[str, float] | None:
+        row = self._conn.execute(
+            "SELECT value, created FROM media WHERE key = ?", (key,)
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _remember(self, key: str, value: str, created: float) -> None:
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_entries:
+            self._memory.popitem(last=False)
+
+    def _trim(self) -> None:
+        """Once over `max_entries`: drop expired rows, then the least recently used."""
+        match self._rows > self._max_entries:
+            case True:
+                pass
+            case False:
+                return
+        self._drop(self._keys("SELECT key FROM media WHERE created <= ?", self._clock() - self._ttl))
+        match self._rows - self._max_entries:
+            case excess if excess > 0:
+                self._drop(self._keys("SELECT key FROM media ORDER BY accessed LIMIT ?", excess))
+            case _:
+                pass
+
+    def _keys(self, query: str, arg: float | int) -> list[str]:
+        return [key for (key,) in self._conn.execute(query, (arg,)).fetchall()]
+
+    def _drop(self, keys: list[str]) -> None:
+        """Delete `keys` from the table and the memory front alike."""
+        with self._conn:
+            self._conn.execute("BEGIN")
+            deleted = sum(
+                self._conn.execute("DELETE FROM media WHERE key = ?", (key,)).rowcount for key in keys
+            )
+        list(map(lambda key: self._memory.pop(key, None), keys))
+        self._rows -= deleted
@@ -0,0 +1,200 @@
+"""Typed streaming protocol between MessageRouter and transports.
+
+The router yields small events instead of the whole accumulated text on every
+step; consumers keep one growing `TextBuffer` and render only when they need to.
+`accumulated_text` / `events_from_accumulated` adapt to and from the old
+"yield the full text so far" style of `stream_handle`.
+"""
+import json
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class TextDelta:
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class FinalResult:
+    """Authoritative complete reply; replaces the streamed text when they differ."""
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class StreamError:
+    message: str
+
+
+@dataclass(frozen=True, slots=True)
+class StreamMeta:
+    key: str
+    value: str
+
+
+StreamEvent = TextDelta | FinalResult | StreamError | StreamMeta
+
+META_SESSION_ID = "session_id"
+META_TTFT = "ttft"
+
+ERR_PREFIX_CLAUDE = "Error calling Claude"
+ERR_PREFIX_CURSOR = "Error calling Cursor Agent"
+
+
+# ── Claude stream-json parsing ────────────────────────────────────────────────
+
+
+def parse_claude_event(event: dict, error_prefix: str = ERR_PREFIX_CLAUDE) -> list[StreamEvent]:
+    """Map one decoded stream-json event to stream events.
+
+    Cursor Agent's `--output-format stream-json` uses the same assistant/result
+    event shapes, so it shares this parser with a different error prefix.
+    """
+    match event:
+        case {"type": "stream_event", "event": {"type": "content_block_delta", "delta": delta}}:
+            # --include-partial-messages: token-level text as the model produces it
+            match delta:
+                case {"type": "text_delta", "text": str() as t} if t:
+                    return [TextDelta(t)]
+                case _:
+                    return []
+        case {"type": "assistant"}:
+            content = event.get("message", {}).get("content", [])
+            text = "".join(b.get("text", "") for b in content if b.get("type") == "text")
+            return [TextDelta(text)] if text else []
+        case {"type": "result"}:
+            out: list[StreamEvent] = []
+            match event.get("session_id"):
+                case str() as s if s:
+                    out.append(StreamMeta(META_SESSION_ID, s))
+                case _:
+                    pass
+            result = (event.get("result") or "").strip()
+            match (event.get("is_error"), result):
+                case (True, r):
+                    out.append(StreamError(f"{error_prefix}: {r[:100]}"))
+                case (_, ""):
+                    pass
+                case (_, r):
+                    out.append(FinalResult(r))
+            return out
+        case _:
+            return []
+
+
+def parse_claude_line(
+    line: str, on_event: Callable[[dict], list[StreamEvent]] = parse_claude_event
+) -> list[StreamEvent]:
+    """Parse one stdout line; non-JSON output (plain-text mode) is passed through as text."""
+    match line.strip():
+        case "":
+            return []
+        case stripped:
+            pass
+    try:
+        event = json.loads(stripped)
+    except json.JSONDecodeError:
+        return [TextDelta(stripped + "\n")]
+    match event:
+        case dict():
+            return on_event(event)
+        case _:
+            return [TextDelta(stripped + "\n")]
+
+
+class ClaudeStreamParser:
+    """Per-turn parser. With --include-partial-messages the text arrives as
+    `stream_event` deltas and the trailing `assistant` event repeats it, so
+    assistant text is dropped once partial deltas have been seen."""
+
+    def __init__(self, error_prefix: str = ERR_PREFIX_CLAUDE) -> None:
+        self._partial = False
+        self._error_prefix = error_prefix
+
+    def feed_event(self, event: dict) -> list[StreamEvent]:
+        match event:
+            case {"type": "stream_event"}:
+                self._partial = True
+                return parse_claude_event(event, self._error_prefix)
+            case {"type": "assistant"} if self._partial:
+                return []
+            case _:
+                return parse_claude_event(event, self._error_prefix)
+
+    def feed_line(self, line: str) -> list[StreamEvent]:
+        return parse_claude_line(line, self.feed_event)
+
+
+# ── consumer-side buffer ──────────────────────────────────────────────────────
+
+
+class TextBuffer:
+    """Growing reply text. Deltas are appended in O(len(delta)); joins happen only on read."""
+
+    def __init__(self) -> None:
+        self._parts: list[str] = []
+        self._text = ""
+        self.version = 0
+        self.rewrites = 0   # FinalResults that replaced the streamed text instead of extending it
+        self.failed = False
+
+    def __len__(self) -> int:
+        return len(self._text) + sum(map(len, self._parts))
+
+    @property
+    def text(self) -> str:
+        match self._parts:
+            case []:
+                pass
+            case parts:
+                self._text += "".join(parts)
+                self._parts = []
+        return self._text
+
+    def apply(self, event: StreamEvent) -> None:
+        match event:
+            case TextDelta(text=t) if t:
+                self._parts.append(t)
+                self.version += 1
+            case FinalResult(text=t) if t and t != self.text.strip():
+                self._parts, self._text = [], t
+                self.version += 1
+                self.rewrites += 1
+            case StreamError(message=m):
+                self.failed = True
+                match self.text.strip():
+                    case "":
+                        self._text = m
+                    case _:
+                        self._parts.append("\n\n" + m)
+                self.version += 1
+            case _:
+                pass
+
+
+# ── compatibility adapters ────────────────────────────────────────────────────
+
+
+async def accumulated_text(events: AsyncIterator[StreamEvent]) -> AsyncIterator[str]:
+    """Old `stream_handle` contract: yield the full text so far after every change."""
+    buffer = TextBuffer()
+    async for event in events:
+        before = buffer.version
+        buffer.apply(event)
+        match buffer.version != before:
+            case True:
+                yield buffer.text
+            case False:
+                pass
+
+
+async def events_from_accumulated(chunks: AsyncIterator[str]) -> AsyncIterator[StreamEvent]:
+    """Wrap a legacy accumulated-text stream as typed events."""
+    previous = ""
+    async for chunk in chunks:
+        match chunk.startswith(previous):
+            case True:
+                yield TextDelta(chunk[len(previous):])
+            case False:
+                yield FinalResult(chunk)
+        previous = chunk
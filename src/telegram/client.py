@@ -1,8 +1,11 @@
 """TelegramClient — event-driven transport via python-telegram-bot."""
 import asyncio
+import contextlib
 import logging
+import secrets
+import signal
 import time
-from typing import Awaitable, Callable, Optional
+from typing import AsyncIterator, Awaitable, Callable, Optional
 
 from telegram import Bot, PhotoSize, Update
 from telegram.ext import Application, CommandHandler, ContextTypes
@@ -11,32 +14,71 @@ from telegram.ext import filters
 
 from src.bot_client import BotClient, OnModel
 from src.config import Config
+from src.http_server import HTTPServer
 from src.constants import (
     ALBUM_DEBOUNCE_SECONDS,
     CMD_HISTORY,
     CMD_MODEL,
     CMD_NEW,
     CMD_STATUS,
+    MEDIA_KIND_PHOTO,
+    MEDIA_KIND_VOICE,
+    METRICS_PATH,
+    MSG_ALBUM_FLUSHED,
+    MSG_ALBUM_TOO_LARGE,
     MSG_BLOCKED_CHAT,
     MSG_HELP,
     MSG_IMAGE_ANALYSIS_FAILED,
     MSG_IMAGE_NOT_CONFIGURED,
+    MSG_MEDIA_CACHE_HIT,
     MSG_MODEL_USAGE,
     MSG_NO_RESPONSE,
+    MSG_PARTIAL_TRANSCRIPT,
+    MSG_POOL_WAIT_SUMMARY,
+    MSG_RATE_LIMIT_SUMMARY,
     MSG_SEND_FAIL,
     MSG_SEND_OK,
     MSG_STREAM_PLACEHOLDER,
     MSG_VOICE_NOT_CONFIGURED,
     MSG_VOICE_TRANSCRIPTION_FAILED,
-    STREAM_EDIT_INTERVAL,
+    QUEUE_TELEGRAM_UPDATES,
+    SOURCE_PHOTO,
+    SOURCE_VOICE,
+    TELEGRAM_MODE_WEBHOOK,
+    TELEGRAM_POOL_BOT,
+    TELEGRAM_POOL_UPDATES,
 )
+from src.media import Buffer
 from src.message_handler import ChatMessage, normalize_phone
-from src.telegram.typing import TelegramTypingIndicator
+from src.metrics import QUEUE_DEPTH, REPLY_SECONDS, STREAM_EDITS, metrics_handler, reply_route
+from src.storage.media_cache import MediaCache, media_key
+from src.streaming import StreamEvent, TextBuffer, events_from_accumulated
+from src.telegram.compat import seconds_attr
+from src.telegram.download import MediaDownloader
+from src.telegram.renderer import StreamRenderer, plan_reply, send_pieces, send_text_document
+from src.telegram.ratelimit import LaneRateLimiter
+from src.telegram.request import PoolWaitStats, build_request
+from src.telegram.sequencer import ChatSequencer, Slot
+from src.telegram.typing import TelegramTypingIndicator, TypingMultiplexer
+from src.telegram.webhook import serve_webhook
 from src.transcription.client import TranscriptionClient
 from src.vision.client import VisionClient
+from src.vision.preprocess import choose_photo, prepare_image
 
 logger = logging.getLogger(__name__)
 
+# stream_events signature: (message) -> async iterator of StreamEvent
+StreamHandle = Callable[[ChatMessage], AsyncIterator[StreamEvent]]
+
+
+def _route(message: ChatMessage) -> str:
+    """Metrics route: the media kind for voice / photo, else the backend the router picked."""
+    match message.source:
+        case source if source in (SOURCE_VOICE, SOURCE_PHOTO):
+            return source
+        case source:
+            return reply_route.get() or source
+
 
 class TelegramClient(BotClient):
 
@@ -45,14 +87,60 @@ class TelegramClient(BotClient):
         config: Config,
         transcriber: Optional[TranscriptionClient] = None,
         vision_client: Optional[VisionClient] = None,
+        media_cache: Optional[MediaCache] = None,
     ) -> None:
         self._token = config.telegram_bot_token
         self._allowed_chat_id = config.allowed_chat_id
         self._app: Optional[Application] = None
         self._transcriber = transcriber
         self._vision_client = vision_client
-        # album debounce: media_group_id → (best_photo, caption, sender, date, task)
+        self._media_cache = media_cache
+        self._vision_target_size = config.vision_target_size
+        self._vision_jpeg_quality = config.vision_jpeg_quality
+        self._max_concurrent_updates = config.max_concurrent_updates
+        self._document_threshold = config.telegram_document_threshold
+        self._downloader = MediaDownloader(config.media_spill_threshold)
+        self._api_url = config.telegram_api_url
+        self._mode = config.telegram_mode
+        self._webhook = (config.webhook_url, config.webhook_secret, config.webhook_listen, config.webhook_port)
+        self._metrics_at = (config.metrics_listen, config.metrics_port)
+        self._metrics: HTTPServer | None = None
+        self.pool_waits = PoolWaitStats()
+        match config.telegram_rate_limit:
+            case True:
+                self.rate_limiter: LaneRateLimiter | None = LaneRateLimiter(
+                    config.telegram_rate_global,
+                    config.telegram_rate_global_burst,
+                    config.telegram_rate_chat,
+                    config.telegram_rate_chat_burst,
+                )
+            case False:
+                self.rate_limiter = None
+        self._bot_pool = dict(
+            pool_size=config.telegram_pool_size,
+            pool_timeout=config.telegram_pool_timeout,
+            connect_timeout=config.telegram_connect_timeout,
+            read_timeout=config.telegram_read_timeout,
+            write_timeout=config.telegram_write_timeout,
+            http2=config.telegram_http2,
+        )
+        self._updates_pool = dict(
+            pool_size=config.telegram_updates_pool_size,
+            pool_timeout=config.telegram_updates_pool_timeout,
+            connect_timeout=config.telegram_updates_connect_timeout,
+            read_timeout=config.telegram_updates_read_timeout,
+            write_timeout=config.telegram_updates_write_timeout,
+            http2=config.telegram_updates_http2,
+        )
+        # per-sender ordering: session-mutating work runs one at a time per chat
+        self._sequencer = ChatSequencer()
+        # one typing loop per chat, however many jobs are running in it
+        self._typing = TypingMultiplexer()
+        # album debounce: media_group_id → (photos, caption, sender, date, slot, task)
         self._pending_albums: dict[str, dict] = {}
+        self._album_flushes: set[asyncio.Task] = set()
+        self._album_max_images = config.album_max_images
+        self._album_max_pending = config.album_max_pending
 
     # ── BotClient interface ───────────────────────────────────────────────────
 
@@ -64,9 +152,115 @@ class TelegramClient(BotClient):
         on_new: Callable[[str], str] | None = None,
         on_history: Callable[[str], str] | None = None,
         stream_handle: Callable | None = None,
+        on_shutdown: Callable[[], Awaitable[None]] | None = None,
+        stream_events: StreamHandle | None = None,
     ) -> None:
-        self._stream_handle = stream_handle
-        self._app = Application.builder().token(self._token).build()
+        """`stream_events` yields typed StreamEvents; a legacy `stream_handle`
+        (accumulated-text generator) is adapted to the same protocol."""
+        app = self.build_application(
+            on_message, on_model, on_status, on_new, on_history,
+            stream_handle, on_shutdown, stream_events,
+        )
+        match self._mode:
+            case mode if mode == TELEGRAM_MODE_WEBHOOK:
+                asyncio.run(self._run_webhook())
+            case _:
+                app.run_polling()
+
+    async def _run_webhook(self) -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        list(map(lambda sig: loop.add_signal_handler(sig, stop.set), (signal.SIGINT, signal.SIGTERM)))
+        await self.serve_webhook(stop)
+
+    async def serve_webhook(self, stop: asyncio.Event) -> None:
+        """Webhook mode on an application from `build_application()`, until `stop` is set."""
+        url, secret, listen, port = self._webhook
+        await serve_webhook(
+            self._app, url, secret or secrets.token_urlsafe(32), listen, port, stop
+        )
+
+    def build_application(
+        self,
+        on_message: Callable[[ChatMessage], Awaitable[str]],
+        on_model: OnModel | None = None,
+        on_status: Callable[[], str] | None = None,
+        on_new: Callable[[str], str] | None = None,
+        on_history: Callable[[str], str] | None = None,
+        stream_handle: Callable | None = None,
+        on_shutdown: Callable[[], Awaitable[None]] | None = None,
+        stream_events: StreamHandle | None = None,
+    ) -> Application:
+        """The PTB application with every handler registered; `run()` starts it."""
+        match (stream_events, stream_handle):
+            case (None, None):
+                self._stream_handle = None
+            case (None, legacy):
+                self._stream_handle = lambda m: events_from_accumulated(legacy(m))
+            case (events, _):
+                self._stream_handle = events
+        builder = (
+            Application.builder()
+            .token(self._token)
+            .concurrent_updates(self._max_concurrent_updates)
+            .request(build_request(TELEGRAM_POOL_BOT, self.pool_waits, **self._bot_pool))
+            .get_updates_request(
+                build_request(TELEGRAM_POOL_UPDATES, self.pool_waits, **self._updates_pool)
+            )
+        )
+        match self.rate_limiter:
+            case None:
+                pass
+            case limiter:
+                builder = builder.rate_limiter(limiter)
+        match self._api_url:
+            case None:
+                pass
+            case api:
+                # self-hosted Bot API server (or a fake one in tests)
+                builder = builder.base_url(f"{api}/bot").base_file_url(f"{api}/file/bot")
+        match self._mode:
+            case mode if mode == TELEGRAM_MODE_WEBHOOK:
+                # updates arrive over HTTP; no getUpdates loop
+                builder = builder.updater(None)
+            case _:
+                pass
+        async def _post_init(app: Application) -> None:
+            QUEUE_DEPTH.labels(QUEUE_TELEGRAM_UPDATES).set_function(app.update_queue.qsize)
+            match self._metrics_at:
+                case (_, 0):
+                    pass
+                case (listen, port):
+                    self._metrics = await HTTPServer(
+                        {("GET", METRICS_PATH): metrics_handler}, host=listen, port=port
+                    ).start()
+
+        async def _post_shutdown(_app: Application) -> None:
+            await self._downloader.aclose()
+            match self._metrics:
+                case None:
+                    pass
+                case server:
+                    self._metrics = None
+                    await server.stop()
+            match self.pool_waits.methods:
+                case {}:
+                    pass
+                case _:
+                    logger.info(MSG_POOL_WAIT_SUMMARY, self.pool_waits.summary())
+            match self.rate_limiter:
+                case None:
+                    pass
+                case limiter:
+                    logger.info(MSG_RATE_LIMIT_SUMMARY, limiter.summary())
+            match on_shutdown:
+                case None:
+                    pass
+                case cb:
+                    await cb()
+
+        builder = builder.post_init(_post_init).post_shutdown(_post_shutdown)
+        self._app = builder.build()
         self._app.add_handler(
             TGMessageHandler(filters.TEXT & ~filters.COMMAND, self._make_handler(on_message))
         )
@@ -80,7 +274,7 @@ class TelegramClient(BotClient):
             )
         if on_new is not None:
             self._app.add_handler(
-                CommandHandler(CMD_NEW, self._make_sender_handler(on_new))
+                CommandHandler(CMD_NEW, self._make_sender_handler(on_new, sequenced=True))
             )
         if on_history is not None:
             self._app.add_handler(
@@ -93,7 +287,7 @@ class TelegramClient(BotClient):
         self._app.add_handler(
             TGMessageHandler(filters.PHOTO, self._make_photo_handler(on_message))
         )
-        self._app.run_polling()
+        return self._app
 
     async def send_message(self, to: str, text: str) -> bool:
         match self._app:
@@ -101,15 +295,51 @@ class TelegramClient(BotClient):
                 logger.error("send_message called before run()")
                 return False
             case app:
-                try:
-                    await app.bot.send_message(chat_id=int(to), text=text)
-                    return True
-                except Exception as exc:
-                    logger.error("Telegram send_message failed: %s", exc)
-                    return False
+                pass
+        inline, tail = plan_reply(text, self._document_threshold)
+        try:
+            await send_pieces(app.bot, int(to), inline)
+        except Exception as exc:
+            logger.error("Telegram send_message failed: %s", exc)
+            return False
+        match tail:
+            case "":
+                return True
+            case _:
+                return await send_text_document(app.bot, int(to), tail)
 
     # ── helpers (also used in tests) ─────────────────────────────────────────
 
+    async def _cached_media(
+        self,
+        kind: str,
+        file_unique_id: str,
+        backend: TranscriptionClient | VisionClient,
+        caption: Optional[str],
+        produce: Callable[[], Awaitable[str]],
+    ) -> str:
+        """Result for this file + prompt + backend from the media cache, else `produce()` and store it."""
+        match self._media_cache:
+            case None:
+                return await produce()
+            case cache:
+                pass
+        name = type(backend).__name__
+        key = media_key(kind, file_unique_id, name, backend.model, caption)
+        match cache.get(key):
+            case str() as text:
+                logger.info(MSG_MEDIA_CACHE_HIT, kind, name)
+                return text
+            case None:
+                pass
+        text = await produce()
+        match text.strip():
+            case "":
+                pass
+            case _:
+                cache.put(key, text)
+        return text
+
     def _is_allowed(self, update: Update) -> bool:
         if update.effective_chat is None:
             return False
@@ -157,8 +387,14 @@ class TelegramClient(BotClient):
 
         return _handler
 
-    def _make_sender_handler(self, callback: Callable[[str], str]) -> Callable:
-        """Handler for commands that pass the sender ID to the callback."""
+    def _make_sender_handler(
+        self, callback: Callable[[str], str], sequenced: bool = False
+    ) -> Callable:
+        """Handler for commands that pass the sender ID to the callback.
+
+        `sequenced` commands mutate session state, so they wait their turn behind
+        in-flight messages from the same chat; read-only ones answer immediately.
+        """
         async def _handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
             match self._is_allowed(update):
                 case False:
@@ -166,7 +402,13 @@ class TelegramClient(BotClient):
                 case True:
                     pass
             sender = str(update.effective_chat.id) if update.effective_chat else ""
-            await self.send_message(sender, callback(sender))
+            match sequenced:
+                case True:
+                    with self._sequencer.slot(sender) as slot:
+                        await slot.ready()
+                        await self.send_message(sender, callback(sender))
+                case False:
+                    await self.send_message(sender, callback(sender))
 
         return _handler
 
@@ -194,6 +436,7 @@ class TelegramClient(BotClient):
                 case True:
                     pass
 
+            received = time.time()
             sender = str(update.effective_chat.id) if update.effective_chat else ""
             match self._transcriber:
                 case None:
@@ -208,54 +451,133 @@ class TelegramClient(BotClient):
             if not voice:
                 return
             
-            typing = TelegramTypingIndicator(context.bot, sender)
-            await typing.start(sender)
-            try:
-                tg_file = await voice.get_file()
-                audio_bytes = bytes(await tg_file.download_as_bytearray())
-                text = await self._transcriber.transcribe(audio_bytes)
-            except Exception:
+            with self._sequencer.slot(sender) as slot:
+                typing = TelegramTypingIndicator(context.bot, sender, self._typing)
+                await typing.start(sender)
+                try:
+                    async def _transcribe() -> str:
+                        parts: list[str] = []
+                        with await self._downloader.fetch(await voice.get_file()) as audio:
+                            async for part in self._transcriber.transcribe_stream(
+                                audio.view, seconds_attr(voice, "duration")
+                            ):
+                                parts.append(part.text)
+                                match part.total:
+                                    case 1:
+                                        pass
+                                    case total:
+                                        # long note: show each finished segment right away
+                                        await self.send_message(
+                                            sender, MSG_PARTIAL_TRANSCRIPT % (part.index, total, part.text)
+                                        )
+                        return " ".join(filter(None, parts))
+
+                    text = await self._cached_media(
+                        MEDIA_KIND_VOICE, voice.file_unique_id, self._transcriber, None, _transcribe
+                    )
+                except Exception:
+                    await typing.stop(sender)
+                    logger.exception("Voice transcription failed")
+                    await self.send_message(sender, MSG_VOICE_TRANSCRIPTION_FAILED)
+                    return
                 await typing.stop(sender)
-                logger.exception("Voice transcription failed")
-                await self.send_message(sender, MSG_VOICE_TRANSCRIPTION_FAILED)
-                return
-            await typing.stop(sender)
-            msg = ChatMessage(
-                sender=sender,
-                content=text,
-                timestamp=int(update.message.date.timestamp()),
-            )
-            await self._process(msg, context.bot, on_message)
+                msg = ChatMessage(
+                    sender=sender,
+                    content=text,
+                    timestamp=int(update.message.date.timestamp()),
+                    source=SOURCE_VOICE,
+                )
+                await slot.ready()
+                await self._process(msg, context.bot, on_message, received)
 
         return _handler
 
     def _make_photo_handler(
         self, on_message: Callable[[ChatMessage], Awaitable[str]]
     ) -> Callable:
-        async def _process_photo(
+        async def _process_photos(
             sender: str,
-            best_photo: PhotoSize,
+            photos: list[PhotoSize],
             caption: Optional[str],
             timestamp: int,
             bot: Bot,
+            slot: Slot,
         ) -> None:
-            if not self._vision_client:
-                return
-            
-            typing = TelegramTypingIndicator(bot, sender)
-            await typing.start(sender)
-            try:
-                tg_file = await best_photo.get_file()
-                image_bytes = bytes(await tg_file.download_as_bytearray())
-                text = await self._vision_client.analyze(image_bytes, caption)
-            except Exception:
+            received = time.time()
+            with slot:
+                if not self._vision_client:
+                    return
+
+                typing = TelegramTypingIndicator(bot, sender, self._typing)
+                await typing.start(sender)
+                try:
+                    async def _analyze() -> str:
+                        # downloads stay open (and unconverted) until the model call is done
+                        with contextlib.ExitStack() as downloads:
+                            async def _fetch(photo: PhotoSize) -> Buffer:
+                                media = await self._downloader.fetch(await photo.get_file())
+                                downloads.enter_context(media)
+                                return await prepare_image(
+                                    media.view, self._vision_target_size, self._vision_jpeg_quality
+                                )
+
+                            # all downloads in flight at once, then one model round trip; a
+                            # failed download cancels the rest before `downloads` is closed
+                            async with asyncio.TaskGroup() as fetching:
+                                tasks = [fetching.create_task(_fetch(p)) for p in photos]
+                            images = [t.result() for t in tasks]
+                            match images:
+                                case [image]:
+                                    return await self._vision_client.analyze(image, caption)
+                                case _:
+                                    return await self._vision_client.analyze_many(images, caption)
+
+                    text = await self._cached_media(
+                        MEDIA_KIND_PHOTO,
+                        ",".join(p.file_unique_id for p in photos),
+                        self._vision_client,
+                        caption,
+                        _analyze,
+                    )
+                except Exception:
+                    await typing.stop(sender)
+                    logger.exception("Image analysis failed")
+                    await self.send_message(sender, MSG_IMAGE_ANALYSIS_FAILED)
+                    return
                 await typing.stop(sender)
-                logger.exception("Image analysis failed")
-                await self.send_message(sender, MSG_IMAGE_ANALYSIS_FAILED)
-                return
-            await typing.stop(sender)
-            msg = ChatMessage(sender=sender, content=text, timestamp=timestamp)
-            await self._process(msg, bot, on_message)
+                msg = ChatMessage(
+                    sender=sender, content=text, timestamp=timestamp, source=SOURCE_PHOTO
+                )
+                await slot.ready()
+                await self._process(msg, bot, on_message, received)
+
+        async def _process_album(album: dict) -> None:
+            await _process_photos(
+                album["sender"], album["photos"], album["caption"],
+                album["timestamp"], album["bot"], album["slot"],
+            )
+
+        async def _fire(gid: str) -> None:
+            await asyncio.sleep(ALBUM_DEBOUNCE_SECONDS)
+            match self._pending_albums.pop(gid, None):
+                case None:
+                    pass
+                case album:
+                    await _process_album(album)
+
+        def _make_room() -> None:
+            """Bound pending albums: the oldest group is analyzed now instead of after its debounce."""
+            match len(self._pending_albums) >= self._album_max_pending:
+                case True:
+                    oldest = next(iter(self._pending_albums))
+                    album = self._pending_albums.pop(oldest)
+                    album["task"].cancel()
+                    logger.info(MSG_ALBUM_FLUSHED, oldest)
+                    task = asyncio.create_task(_process_album(album))
+                    self._album_flushes.add(task)
+                    task.add_done_callback(self._album_flushes.discard)
+                case False:
+                    pass
 
         async def _handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
             match self._is_allowed(update):
@@ -276,47 +598,40 @@ class TelegramClient(BotClient):
 
             if not update.message:
                 return
-            
+
             photos = update.message.photo
             if not photos:
                 return
 
-            best_photo = photos[-1]
+            best_photo = choose_photo(photos, self._vision_target_size)
             caption = update.message.caption
             timestamp = int(update.message.date.timestamp())
             group_id = update.message.media_group_id
 
-            match group_id:
-                case None:
-                    await _process_photo(sender, best_photo, caption, timestamp, context.bot)
-                case gid:
-                    pending = self._pending_albums.get(gid)
-                    match pending:
-                        case None:
-                            async def _fire(g: str) -> None:
-                                await asyncio.sleep(ALBUM_DEBOUNCE_SECONDS)
-                                album = self._pending_albums.pop(g, None)
-                                match album:
-                                    case None:
-                                        pass
-                                    case a:
-                                        await _process_photo(
-                                            a["sender"], a["photo"],
-                                            a["caption"], a["timestamp"], a["bot"],
-                                        )
-                            task = asyncio.create_task(_fire(gid))
-                            self._pending_albums[gid] = {
-                                "sender": sender, "photo": best_photo,
-                                "caption": caption, "timestamp": timestamp,
-                                "bot": context.bot, "task": task,
-                            }
-                        case existing:
-                            existing["photo"] = best_photo
-                            match caption:
-                                case str() as c if c:
-                                    existing["caption"] = c
-                                case _:
-                                    pass
+            match (group_id, self._pending_albums.get(group_id) if group_id else None):
+                case (None, _):
+                    slot = self._sequencer.slot(sender)
+                    await _process_photos(
+                        sender, [best_photo], caption, timestamp, context.bot, slot
+                    )
+                case (gid, None):
+                    _make_room()
+                    slot = self._sequencer.slot(sender)
+                    self._pending_albums[gid] = {
+                        "sender": sender, "photos": [best_photo],
+                        "caption": caption, "timestamp": timestamp,
+                        "bot": context.bot, "slot": slot,
+                        "task": asyncio.create_task(_fire(gid)),
+                    }
+                case (gid, existing) if len(existing["photos"]) >= self._album_max_images:
+                    logger.warning(MSG_ALBUM_TOO_LARGE, gid, self._album_max_images)
+                case (_, existing):
+                    existing["photos"].append(best_photo)
+                    match caption:
+                        case str() as c if c:
+                            existing["caption"] = c
+                        case _:
+                            pass
 
         return _handler
 
@@ -337,7 +652,9 @@ class TelegramClient(BotClient):
                 case None:
                     await self.send_message(sender, MSG_MODEL_USAGE)
                 case (provider, model_args):
-                    reply = await on_model(sender, provider, model_args)
+                    with self._sequencer.slot(sender) as slot:
+                        await slot.ready()
+                        reply = await on_model(sender, provider, model_args)
                     await self.send_message(sender, reply)
 
         return _handler
@@ -359,11 +676,13 @@ class TelegramClient(BotClient):
                 case None:
                     return
                 case message:
-                    match self._stream_handle:
-                        case None:
-                            await self._process(message, context.bot, on_message)
-                        case sh:
-                            await self._process_streaming(message, context.bot, sh)
+                    with self._sequencer.slot(message.sender) as slot:
+                        await slot.ready()
+                        match self._stream_handle:
+                            case None:
+                                await self._process(message, context.bot, on_message)
+                            case sh:
+                                await self._process_streaming(message, context.bot, sh)
 
         return _handler
 
@@ -372,9 +691,11 @@ class TelegramClient(BotClient):
         message: ChatMessage,
         bot: Bot,
         on_message: Callable[[ChatMessage], Awaitable[str]],
+        received: float | None = None,
     ) -> None:
-        start = time.time()
-        typing = TelegramTypingIndicator(bot, message.sender)
+        """`received` is when the update arrived, if media work ran before the reply."""
+        start = received or time.time()
+        typing = TelegramTypingIndicator(bot, message.sender, self._typing)
         await typing.start(message.sender)
         try:
             response = await on_message(message)
@@ -389,6 +710,7 @@ class TelegramClient(BotClient):
                 success = await self.send_message(message.sender, text)
                 match success:
                     case True:
+                        REPLY_SECONDS.labels(_route(message)).observe(time.time() - start)
                         logger.info(MSG_SEND_OK, elapsed)
                     case False:
                         logger.error(MSG_SEND_FAIL, elapsed)
@@ -397,34 +719,48 @@ class TelegramClient(BotClient):
         self,
         message: ChatMessage,
         bot: Bot,
-        stream_handle: Callable,
+        stream_handle: StreamHandle,
     ) -> None:
         start = time.time()
         sent = await bot.send_message(chat_id=int(message.sender), text=MSG_STREAM_PLACEHOLDER)
-        last_edit = time.time()
-        last_text = MSG_STREAM_PLACEHOLDER
-
-        async for accumulated in stream_handle(message):
-            now = time.time()
-            stripped = accumulated.strip()
-            match (stripped, now - last_edit >= STREAM_EDIT_INTERVAL):
-                case (text, True) if text and text != last_text:
-                    try:
-                        await bot.edit_message_text(
-                            chat_id=int(message.sender),
-                            message_id=sent.message_id,
-                            text=text,
-                        )
-                        last_edit = now
-                        last_text = text
-                    except Exception:
+        buffer = TextBuffer()
+        edits = 0
+
+        def _edited() -> None:
+            nonlocal edits
+            edits += 1
+            self._typing.edited(message.sender)
+
+        renderer = StreamRenderer(
+            bot,
+            int(message.sender),
+            sent.message_id,
+            buffer,
+            document_threshold=self._document_threshold,
+            on_edit=_edited,
+        )
+        typing = TelegramTypingIndicator(bot, message.sender, self._typing)
+        await typing.start(message.sender)
+        try:
+            async for event in stream_handle(message):
+                before = buffer.version
+                buffer.apply(event)
+                match buffer.version != before:
+                    case True:
+                        await renderer.update()
+                    case False:
                         pass
-                case _:
-                    pass
+        finally:
+            await typing.stop(message.sender)
+            delivered = await renderer.close()
 
         elapsed = time.time() - start
-        match last_text:
-            case s if s == MSG_STREAM_PLACEHOLDER:
+        STREAM_EDITS.observe(edits)
+        match (buffer.text.strip(), delivered):
+            case ("", _):
                 logger.warning(MSG_NO_RESPONSE)
-            case _:
+            case (_, True):
+                REPLY_SECONDS.labels(_route(message)).observe(elapsed)
                 logger.info(MSG_SEND_OK, elapsed)
+            case (_, False):
+                logger.error(MSG_SEND_FAIL, elapsed)
@@ -0,0 +1,32 @@
+"""python-telegram-bot compatibility helpers."""
+import warnings
+from datetime import timedelta
+
+from telegram.error import RetryAfter
+from telegram.warnings import PTBDeprecationWarning
+
+
+def seconds_attr(obj: object, name: str) -> float:
+    """A duration attribute (`retry_after`, `duration`, …) in seconds.
+
+    PTB 22 returns ints and warns that these will become timedeltas; both
+    shapes are accepted here so callers never touch the deprecated accessor.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", PTBDeprecationWarning)
+        value = getattr(obj, name, None)
+    match value:
+        case timedelta() as delta:
+            return delta.total_seconds()
+        case None:
+            return 0.0
+        case seconds:
+            return float(seconds)
+
+
+def retry_after_error(cls: type[RetryAfter], seconds: float) -> RetryAfter:
+    """`cls(retry_after)` for a `RetryAfter` subclass, without the warning PTB 22
+    emits while building the message from the deprecated accessor."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", PTBDeprecationWarning)
+        return cls(timedelta(seconds=seconds))
@@ -0,0 +1,85 @@
+"""MediaDownloader — Telegram files streamed straight into a `MediaBuffer`.
+
+PTB's `download_as_bytearray()` holds the whole response body as `bytes` and
+then copies it into a bytearray. Here the body is streamed in chunks from the
+file URL into a buffer preallocated from `Content-Length` (or a temp file past
+the spill threshold). Files served by a local Bot API server (`file_path` is a
+filesystem path) are read the same way in a worker thread.
+"""
+import asyncio
+import logging
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import httpx
+from telegram import File
+
+from src.constants import DOWNLOAD_CHUNK, MSG_DOWNLOAD_FAILED, MSG_MEDIA_SPILLED
+from src.media import MediaBuffer
+
+logger = logging.getLogger(__name__)
+
+
+def _read_local(path: Path, media: MediaBuffer) -> None:
+    with path.open("rb") as handle:
+        while chunk := handle.read(DOWNLOAD_CHUNK):
+            media.write(chunk)
+
+
+class MediaDownloader:
+
+    def __init__(self, spill_threshold: int = 0, timeout: float = 60.0) -> None:
+        self._spill_threshold = spill_threshold
+        self._timeout = timeout
+        # created on first download, reused for every file after that
+        self._http: httpx.AsyncClient | None = None
+
+    def _client(self) -> httpx.AsyncClient:
+        match self._http:
+            case None:
+                self._http = httpx.AsyncClient(timeout=self._timeout)
+            case _:
+                pass
+        return self._http
+
+    async def fetch(self, tg_file: File) -> MediaBuffer:
+        """The file's contents; the caller closes the returned buffer (use `with`)."""
+        match urlsplit(tg_file.file_path or "").scheme:
+            case "http" | "https":
+                media = await self._stream(tg_file.file_path, tg_file.file_size or 0)
+            case _:
+                path = Path(tg_file.file_path)
+                media = MediaBuffer(tg_file.file_size or 0, self._spill_threshold)
+                await asyncio.to_thread(_read_local, path, media)
+        match media.spilled:
+            case True:
+                logger.debug(MSG_MEDIA_SPILLED, len(media))
+            case False:
+                pass
+        return media
+
+    async def _stream(self, url: str, expected: int) -> MediaBuffer:
+        async with self._client().stream("GET", url) as response:
+            match response.status_code:
+                case 200:
+                    pass
+                case code:
+                    # not raise_for_status(): its message carries the URL, and with it the bot token
+                    raise RuntimeError(MSG_DOWNLOAD_FAILED % code)
+            size = int(response.headers.get("content-length") or expected)
+            media = MediaBuffer(size, self._spill_threshold)
+            try:
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK):
+                    media.write(chunk)
+            except BaseException:
+                media.close()
+                raise
+        return media
+
+    async def aclose(self) -> None:
+        client, self._http = self._http, None
+        match client:
+            case None:
+                pass
+            case _:
+                await client.aclose()
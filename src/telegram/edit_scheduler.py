@@ -0,0 +1,219 @@
+"""EditScheduler — paced, flood-control-aware edits of one streamed Telegram message.
+
+The streaming loop only calls `notify()`; the scheduler reads the newest text
+from `source` when an edit is actually due, so intermediate states are
+coalesced for free. Edits are spaced by the larger of `min_interval` and a
+multiple of the measured edit latency, small text growth is held back up to
+`max_interval`, and a 429 `RetryAfter` pushes the next edit out by exactly the
+time Telegram asks for (a `LaneDropped` from the rate limiter likewise, until
+a token frees up). `close()` always delivers the final text — as a last edit
+in the final lane or, when the message can no longer be edited, as a new
+message.
+"""
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+
+from telegram import Bot
+from telegram.error import BadRequest, RetryAfter, TelegramError
+
+from src.constants import (
+    LANE_FINAL,
+    MSG_EDIT_FAILED,
+    MSG_EDIT_FALLBACK,
+    MSG_EDIT_NOT_MODIFIED,
+    MSG_EDIT_RETRY_AFTER,
+    STREAM_EDIT_INTERVAL,
+    STREAM_EDIT_LATENCY_FACTOR,
+    STREAM_EDIT_LATENCY_SMOOTHING,
+    STREAM_EDIT_MAX_INTERVAL,
+    STREAM_EDIT_MIN_GROWTH,
+    STREAM_FINAL_ATTEMPTS,
+)
+from src.telegram.compat import seconds_attr
+from src.telegram.ratelimit import LaneDropped, priority
+
+logger = logging.getLogger(__name__)
+
+
+class EditScheduler:
+
+    def __init__(
+        self,
+        bot: Bot,
+        chat_id: int,
+        message_id: int,
+        source: Callable[[], str],
+        shown: str = "",
+        min_interval: float = STREAM_EDIT_INTERVAL,
+        max_interval: float = STREAM_EDIT_MAX_INTERVAL,
+        on_edit: Callable[[], None] | None = None,
+    ) -> None:
+        self._bot = bot
+        self._chat_id = chat_id
+        self._message_id = message_id
+        self._source = source
+        self._shown = shown
+        self._min_interval = min_interval
+        self._max_interval = max(min_interval, max_interval)
+        self._on_edit = on_edit
+        self._latency = 0.0
+        self._last_edit = time.monotonic()
+        self._retry_at = 0.0
+        self._failures = 0
+        self._broken = False  # message can no longer be edited (deleted, too old, …)
+        self._wake = asyncio.Event()
+        self._closed = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        self.edits = 0
+        self.throttled = 0
+        self.dropped = 0
+
+    @property
+    def shown(self) -> str:
+        return self._shown
+
+    @property
+    def interval(self) -> float:
+        """Current gap between edits: never below `min_interval`, never above `max_interval`."""
+        paced = STREAM_EDIT_LATENCY_FACTOR * self._latency
+        return min(self._max_interval, max(self._min_interval, paced))
+
+    def notify(self) -> None:
+        """The source text changed; an edit will follow once one is due."""
+        self._wake.set()
+
+    async def close(self, final_text: str | None = None) -> bool:
+        """Stop streaming edits and deliver the final text. Returns False only if it could not be sent."""
+        self._closed.set()
+        self._wake.set()
+        await self._task
+        match (final_text if final_text is not None else self._source()).strip():
+            case "":
+                return False
+            case text:
+                pass
+        attempts = 0
+        while not self._broken and attempts < STREAM_FINAL_ATTEMPTS:
+            match text == self._shown:
+                case True:
+                    return True
+                case False:
+                    pass
+            attempts += 1
+            await asyncio.sleep(max(0.0, self._retry_at - time.monotonic()))
+            # the last edit is the reply itself: it queues with final messages, never dropped
+            with priority(LANE_FINAL):
+                await self._edit(text)
+        match text == self._shown:
+            case True:
+                return True
+            case False:
+                logger.warning(MSG_EDIT_FALLBACK, self._chat_id)
+                return await self._send(text)
+
+    # ── internals ─────────────────────────────────────────────────────────────
+
+    async def _run(self) -> None:
+        while not self._closed.is_set() and not self._broken:
+            await self._wake.wait()
+            await self._pause(self._due() - time.monotonic())
+            match self._closed.is_set():
+                case True:
+                    return
+                case False:
+                    pass
+            self._wake.clear()
+            text = self._source().strip()
+            stale = time.monotonic() - self._last_edit >= self._max_interval
+            match (text, len(text) - len(self._shown) >= STREAM_EDIT_MIN_GROWTH or stale):
+                case ("", _):
+                    pass
+                case (t, _) if t == self._shown:
+                    pass
+                case (_, False):
+                    # not worth an edit yet — look again once the text is stale
+                    self._wake.set()
+                    await self._pause(self._last_edit + self._max_interval - time.monotonic())
+                case (t, True):
+                    await self._edit(t)
+
+    def _due(self) -> float:
+        return max(self._retry_at, self._last_edit + self.interval)
+
+    async def _pause(self, delay: float) -> None:
+        """Sleep up to `delay` seconds, returning early when the stream closes."""
+        match delay > 0:
+            case True:
+                try:
+                    await asyncio.wait_for(self._closed.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+            case False:
+                pass
+
+    async def _edit(self, text: str) -> None:
+        started = time.monotonic()
+        try:
+            await self._bot.edit_message_text(
+                chat_id=self._chat_id, message_id=self._message_id, text=text
+            )
+        except LaneDropped as exc:
+            # our own rate limiter had no token to spare; the edit waits, newest text still pending
+            self.dropped += 1
+            self._retry_at = time.monotonic() + seconds_attr(exc, "retry_after")
+            self._wake.set()
+            return
+        except RetryAfter as exc:
+            delay = seconds_attr(exc, "retry_after")
+            self.throttled += 1
+            self._retry_at = time.monotonic() + delay
+            logger.warning(MSG_EDIT_RETRY_AFTER, self._chat_id, delay)
+            self._wake.set()
+            return
+        except BadRequest as exc:
+            match MSG_EDIT_NOT_MODIFIED in str(exc).lower():
+                case True:
+                    self._shown = text
+                case False:
+                    logger.warning(MSG_EDIT_FAILED, self._chat_id, exc)
+                    self._broken = True
+            return
+        except TelegramError as exc:
+            # transient (network, timeout): back off exponentially, keep the newest text pending
+            self._failures += 1
+            self._retry_at = time.monotonic() + min(
+                self._max_interval, self._min_interval * 2 ** self._failures
+            )
+            logger.warning(MSG_EDIT_FAILED, self._chat_id, exc)
+            self._wake.set()
+            return
+        finished = time.monotonic()
+        a = STREAM_EDIT_LATENCY_SMOOTHING
+        self._latency = a * (finished - started) + (1 - a) * self._latency
+        self._last_edit = finished
+        self._failures = 0
+        self._shown = text
+        self.edits += 1
+        match self._on_edit:
+            case None:
+                pass
+            case callback:
+                callback()
+
+    async def _send(self, text: str) -> bool:
+        try:
+            await self._bot.send_message(chat_id=self._chat_id, text=text)
+        except RetryAfter as exc:
+            await asyncio.sleep(seconds_attr(exc, "retry_after"))
+            try:
+                await self._bot.send_message(chat_id=self._chat_id, text=text)
+            except TelegramError as retry_exc:
+                logger.error(MSG_EDIT_FAILED, self._chat_id, retry_exc)
+                return False
+        except TelegramError as exc:
+            logger.error(MSG_EDIT_FAILED, self._chat_id, exc)
+            return False
+        self._shown = text
+        return True
@@ -0,0 +1,235 @@
+"""LaneRateLimiter — token buckets with priority lanes for every Bot API call.
+
+Plugged into PTB as the application's `BaseRateLimiter`, so replies, streaming
+edits and typing actions all draw from the same budget: one global bucket
+(Telegram's per-bot limit) and one bucket per chat. Each call goes into one
+of three lanes, taken from the endpoint:
+
+    final   send* (replies, pieces, documents)  — waits for a token
+    edit    editMessageText                      — dropped when short of tokens
+    typing  sendChatAction                       — dropped when short of tokens
+
+Low lanes never queue. They take a token only while the bucket keeps its lane
+reserve (`RATE_LANE_RESERVE`, a share of the burst) and no final call is
+waiting on it. Otherwise they fail at once with `LaneDropped`, a `RetryAfter`
+that says when a token frees up, so the edit scheduler re-plans the edit and
+the typing loop skips a beat. A streamed reply's last edit is final: wrap it
+in `priority(LANE_FINAL)`. A `RetryAfter` from Telegram blocks the bucket it
+applies to, and a final call is retried once after it.
+
+Per-lane admissions, drops and wait times are kept in `lanes` and exported
+to `/metrics`.
+"""
+import asyncio
+import contextlib
+import contextvars
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Coroutine, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+from src.constants import (
+    LANE_EDIT,
+    LANE_FINAL,
+    LANE_TYPING,
+    LANES,
+    MSG_RATE_LIMIT_FLOOD,
+    RATE_LANE_RESERVE,
+    RATE_LIMIT_MAX_CHATS,
+    RATE_LIMIT_MAX_RETRIES,
+)
+from src.metrics import TELEGRAM_RATE_DROPPED, TELEGRAM_RATE_WAIT_SECONDS
+from src.telegram.compat import retry_after_error, seconds_attr
+
+logger = logging.getLogger(__name__)
+
+_lane: contextvars.ContextVar[str | None] = contextvars.ContextVar("telegram_lane", default=None)
+
+
+@contextlib.contextmanager
+def priority(lane: str) -> Iterator[None]:
+    """Calls made inside go through `lane` instead of their endpoint's."""
+    token = _lane.set(lane)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def endpoint_lane(endpoint: str) -> str | None:
+    """Lane for a Bot API method; None for calls that are not rate limited (getMe, getFile, …)."""
+    match endpoint:
+        case "sendChatAction":
+            return LANE_TYPING
+        case "editMessageText":
+            return LANE_EDIT
+        case e if e.startswith("send"):
+            return LANE_FINAL
+        case _:
+            return None
+
+
+class LaneDropped(RetryAfter):
+    """A low-lane call refused instead of queued; `retry_after` is when a token frees up."""
+
+
+class TokenBucket:
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.waiting = 0           # final calls queued on this bucket
+        self.blocked_until = 0.0   # Telegram's RetryAfter
+        self._updated = time.monotonic()
+
+    def level(self, now: float) -> float:
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return self.tokens
+
+    def eta(self, now: float, keep: float = 0.0) -> float:
+        """Seconds until one token can be taken leaving `keep` behind (0 = now)."""
+        short = max(0.0, keep + 1 - self.level(now))
+        return max(self.blocked_until - now, short / self.rate)
+
+    def full(self, now: float) -> bool:
+        return self.waiting == 0 and self.level(now) >= self.burst
+
+
+@dataclass(slots=True)
+class LaneStats:
+    admitted: int = 0
+    dropped: int = 0
+    total_wait: float = 0.0
+    worst_wait: float = 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.admitted if self.admitted else 0.0
+
+
+class LaneRateLimiter(BaseRateLimiter[str]):
+
+    def __init__(
+        self,
+        global_rate: float,
+        global_burst: float,
+        chat_rate: float,
+        chat_burst: float,
+    ) -> None:
+        self._global = TokenBucket(global_rate, global_burst)
+        self._chat_limits = (chat_rate, chat_burst)
+        # chat id → bucket, an LRU capped at RATE_LIMIT_MAX_CHATS
+        self._chats: OrderedDict[str, TokenBucket] = OrderedDict()
+        self.lanes: dict[str, LaneStats] = {lane: LaneStats() for lane in LANES}
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        self._chats.clear()
+
+    def summary(self) -> str:
+        return ", ".join(
+            f"{lane} admitted={s.admitted} dropped={s.dropped} "
+            f"mean wait {s.mean_wait * 1000:.1f} ms max {s.worst_wait * 1000:.1f} ms"
+            for lane, s in self.lanes.items()
+        )
+
+    def _chat_bucket(self, chat_id: str) -> TokenBucket:
+        match self._chats.get(chat_id):
+            case None:
+                pass
+            case bucket:
+                self._chats.move_to_end(chat_id)
+                return bucket
+        match len(self._chats) >= RATE_LIMIT_MAX_CHATS:
+            case True:
+                # least recently used first; by now it has most likely refilled
+                self._chats.popitem(last=False)
+            case False:
+                pass
+        rate, burst = self._chat_limits
+        bucket = self._chats[chat_id] = TokenBucket(rate, burst)
+        return bucket
+
+    def _buckets(self, data: dict[str, Any]) -> list[TokenBucket]:
+        match data.get("chat_id"):
+            case None:
+                return [self._global]
+            case chat_id:
+                return [self._global, self._chat_bucket(str(chat_id))]
+
+    async def _wait_final(self, buckets: list[TokenBucket]) -> float:
+        started = time.monotonic()
+        list(map(lambda b: setattr(b, "waiting", b.waiting + 1), buckets))
+        try:
+            while (delay := max(b.eta(time.monotonic()) for b in buckets)) > 0:
+                await asyncio.sleep(delay)
+        finally:
+            list(map(lambda b: setattr(b, "waiting", b.waiting - 1), buckets))
+        return time.monotonic() - started
+
+    def _try_low(self, lane: str, buckets: list[TokenBucket]) -> None:
+        now = time.monotonic()
+        # a bucket of one token cannot hold a reserve back; low lanes then need it full
+        eta = max(b.eta(now, min(RATE_LANE_RESERVE[lane] * b.burst, b.burst - 1)) for b in buckets)
+        match (eta > 0, any(b.waiting for b in buckets)):
+            case (False, False):
+                pass
+            case (_, queued):
+                self.lanes[lane].dropped += 1
+                TELEGRAM_RATE_DROPPED.labels(lane).inc()
+                # a final call in the queue has the next token; try again a beat later
+                retry = eta + (1 / min(b.rate for b in buckets) if queued else 0.0)
+                raise retry_after_error(LaneDropped, retry)
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, Any]],
+        args: Any,
+        kwargs: dict[str, Any],
+        endpoint: str,
+        data: dict[str, Any],
+        rate_limit_args: str | None,
+    ) -> Any:
+        lane = rate_limit_args or _lane.get() or endpoint_lane(endpoint)
+        match lane:
+            case None:
+                return await callback(*args, **kwargs)
+            case _:
+                pass
+        buckets = self._buckets(data)
+        attempts = 0
+        while True:
+            match lane:
+                case name if name == LANE_FINAL:
+                    waited = await self._wait_final(buckets)
+                case _:
+                    self._try_low(lane, buckets)
+                    waited = 0.0
+            stats = self.lanes[lane]
+            stats.admitted += 1
+            stats.total_wait += waited
+            stats.worst_wait = max(stats.worst_wait, waited)
+            TELEGRAM_RATE_WAIT_SECONDS.labels(lane).observe(waited)
+            list(map(lambda b: setattr(b, "tokens", b.tokens - 1), buckets))
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as exc:
+                delay = seconds_attr(exc, "retry_after")
+                # per-chat when the call had a chat, else the whole bot
+                buckets[-1].blocked_until = time.monotonic() + delay
+                logger.warning(MSG_RATE_LIMIT_FLOOD, endpoint, data.get("chat_id"), delay)
+                attempts += 1
+                match (lane, attempts <= RATE_LIMIT_MAX_RETRIES):
+                    case (name, True) if name == LANE_FINAL:
+                        pass
+                    case _:
+                        raise
@@ -0,0 +1,239 @@
+"""Long replies — splitting, streamed roll-over and document tails.
+
+Telegram rejects message texts over `TELEGRAM_MESSAGE_LIMIT` characters.
+`split_text` cuts a reply into sendable pieces (at a newline when one is close
+enough). `StreamRenderer` drives one `EditScheduler` per message: when the
+streamed text outgrows the current message, that message gets a last edit with
+its piece and is never touched again, and streaming continues in a new one.
+With a document threshold set, text beyond the threshold is not spread over
+ever more messages but delivered at the end as a file, spooled to disk in
+chunks and uploaded from the open file handle. A final result that replaces
+the streamed text once messages are frozen (after tool use the CLI result is
+only the last turn) is sent whole, starting in the current message.
+"""
+import asyncio
+import itertools
+import logging
+import tempfile
+from collections.abc import Callable
+from typing import IO
+
+from telegram import Bot
+from telegram.error import TelegramError
+
+from src.constants import (
+    DOCUMENT_WRITE_CHUNK,
+    MSG_DOCUMENT_CAPTION,
+    MSG_DOCUMENT_FAILED,
+    MSG_EDIT_FAILED,
+    MSG_REPLY_FAILED,
+    MSG_REPLY_REWRITTEN,
+    MSG_STREAM_PLACEHOLDER,
+    STREAM_EDIT_INTERVAL,
+    STREAM_EDIT_MAX_INTERVAL,
+    TELEGRAM_DOCUMENT_NAME,
+    TELEGRAM_MESSAGE_LIMIT,
+)
+from src.streaming import TextBuffer
+from src.telegram.edit_scheduler import EditScheduler
+
+logger = logging.getLogger(__name__)
+
+
+def split_point(text: str, limit: int = TELEGRAM_MESSAGE_LIMIT) -> int:
+    """Length of the first piece: up to `limit`, ending after a newline in its second half if any."""
+    match len(text) <= limit:
+        case True:
+            return len(text)
+        case False:
+            pass
+    cut = text.rfind("\n", 0, limit)
+    return cut + 1 if cut >= limit // 2 else limit
+
+
+def split_text(text: str, limit: int = TELEGRAM_MESSAGE_LIMIT) -> list[str]:
+    """Pieces of `text`, each at most `limit` chars; concatenated they give `text` back."""
+    pieces: list[str] = []
+    rest = text
+    while rest:
+        cut = split_point(rest, limit)
+        pieces.append(rest[:cut])
+        rest = rest[cut:]
+    return pieces
+
+
+def plan_reply(
+    text: str, document_threshold: int = 0, limit: int = TELEGRAM_MESSAGE_LIMIT
+) -> tuple[list[str], str]:
+    """(messages to send inline, tail for a document). Without a threshold there is no tail."""
+    pieces = split_text(text, limit)
+    match (document_threshold, len(text)):
+        case (threshold, size) if threshold and size > threshold:
+            pass
+        case _:
+            return pieces, ""
+    # whole pieces while they fit under the threshold, always at least the first one
+    ends = list(itertools.accumulate(map(len, pieces)))
+    keep = max(1, sum(1 for end in ends if end <= document_threshold))
+    return pieces[:keep], text[ends[keep - 1]:]
+
+
+async def send_pieces(bot: Bot, chat_id: int, pieces: list[str]) -> None:
+    """Send pieces in order, one message each; raises on the first failure."""
+    queue = list(pieces)
+    while queue:
+        await bot.send_message(chat_id=chat_id, text=queue.pop(0))
+
+
+def _spool(text: str) -> IO[bytes]:
+    handle = tempfile.TemporaryFile()
+    list(map(
+        lambda i: handle.write(text[i:i + DOCUMENT_WRITE_CHUNK].encode()),
+        range(0, len(text), DOCUMENT_WRITE_CHUNK),
+    ))
+    handle.seek(0)
+    return handle
+
+
+async def send_text_document(bot: Bot, chat_id: int, text: str) -> bool:
+    """Upload `text` as a file; the encoding and disk writes happen off the event loop."""
+    handle = await asyncio.to_thread(_spool, text)
+    try:
+        await bot.send_document(
+            chat_id=chat_id,
+            document=handle,
+            filename=TELEGRAM_DOCUMENT_NAME,
+            caption=MSG_DOCUMENT_CAPTION,
+        )
+        return True
+    except TelegramError as exc:
+        logger.error(MSG_DOCUMENT_FAILED, chat_id, exc)
+        return False
+    finally:
+        handle.close()
+
+
+class StreamRenderer:
+
+    def __init__(
+        self,
+        bot: Bot,
+        chat_id: int,
+        message_id: int,
+        buffer: TextBuffer,
+        shown: str = MSG_STREAM_PLACEHOLDER,
+        document_threshold: int = 0,
+        limit: int = TELEGRAM_MESSAGE_LIMIT,
+        min_interval: float = STREAM_EDIT_INTERVAL,
+        max_interval: float = STREAM_EDIT_MAX_INTERVAL,
+        on_edit: Callable[[], None] | None = None,
+    ) -> None:
+        self._bot = bot
+        self._chat_id = chat_id
+        self._buffer = buffer
+        self._on_edit = on_edit
+        self._document_threshold = document_threshold
+        self._limit = limit
+        self._intervals = (min_interval, max_interval)
+        self._frozen = 0        # chars of the reply already final in earlier messages
+        self._spilled = False   # past the document threshold: the tail goes out as a file
+        self._rewrites = buffer.rewrites
+        self._editor = self._new_editor(message_id, shown)
+        self.messages = 1
+
+    def _new_editor(self, message_id: int, shown: str) -> EditScheduler:
+        min_interval, max_interval = self._intervals
+        return EditScheduler(
+            self._bot, self._chat_id, message_id,
+            source=self._window, shown=shown,
+            min_interval=min_interval, max_interval=max_interval, on_edit=self._on_edit,
+        )
+
+    def _window(self) -> str:
+        """Text of the current message: the unfrozen part, capped at one message."""
+        return self._buffer.text[self._frozen:self._frozen + self._limit]
+
+    def _overflowing(self) -> bool:
+        return not self._spilled and len(self._buffer) - self._frozen > self._limit
+
+    def _rewritten(self) -> bool:
+        """The buffer was replaced after messages were frozen: `_frozen` no longer points into it."""
+        return self._frozen > 0 and self._buffer.rewrites != self._rewrites
+
+    async def update(self) -> None:
+        """The buffer changed; edit the current message or roll over into a new one."""
+        match self._rewritten():
+            case True:
+                # left to close(): the stale offset must not cut the new text
+                return
+            case False:
+                pass
+        while self._overflowing():
+            await self._roll_over()
+        match self._spilled:
+            case True:
+                pass
+            case False:
+                self._editor.notify()
+
+    async def close(self) -> bool:
+        """Deliver the final text: last edits, then the document tail if one was started."""
+        match self._rewritten():
+            case True:
+                return await self._send_rewritten()
+            case False:
+                pass
+        while self._overflowing():
+            await self._roll_over()
+        match self._spilled:
+            case True:
+                return await send_text_document(
+                    self._bot, self._chat_id, self._buffer.text[self._frozen:]
+                )
+            case False:
+                return await self._editor.close()
+
+    async def _roll_over(self) -> None:
+        rest = self._buffer.text[self._frozen:]
+        piece = rest[:split_point(rest, self._limit)]
+        await self._editor.close(piece)
+        self._frozen += len(piece)
+        match self._document_threshold:
+            case threshold if threshold and self._frozen + self._limit > threshold:
+                # another full message would cross the threshold
+                self._spilled = True
+                return
+            case _:
+                pass
+        try:
+            sent = await self._bot.send_message(
+                chat_id=self._chat_id, text=MSG_STREAM_PLACEHOLDER
+            )
+        except TelegramError as exc:
+            # cannot open another message — keep the rest for a document at the end
+            logger.warning(MSG_EDIT_FAILED, self._chat_id, exc)
+            self._spilled = True
+            return
+        self.messages += 1
+        self._editor = self._new_editor(sent.message_id, MSG_STREAM_PLACEHOLDER)
+
+    async def _send_rewritten(self) -> bool:
+        """Send the replacement text whole: in the current message unless it is closed, then new ones."""
+        logger.info(MSG_REPLY_REWRITTEN, self._chat_id)
+        pieces, tail = plan_reply(self._buffer.text, self._document_threshold, self._limit)
+        match self._spilled:
+            case True:
+                delivered = True
+            case False:
+                delivered = await self._editor.close(pieces.pop(0))
+        try:
+            await send_pieces(self._bot, self._chat_id, pieces)
+        except TelegramError as exc:
+            logger.error(MSG_REPLY_FAILED, self._chat_id, exc)
+            return False
+        self.messages += len(pieces)
+        match tail:
+            case "":
+                return delivered
+            case _:
+                return await send_text_document(self._bot, self._chat_id, tail) and delivered
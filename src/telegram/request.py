@@ -0,0 +1,133 @@
+"""Telegram Bot API request pools with per-method pool-wait instrumentation.
+
+The bot talks to Telegram through two `HTTPXRequest` pools: one for API calls
+(replies, edits, typing actions, file downloads) and one for getUpdates.
+`build_request()` makes either with its own size, timeouts and HTTP version.
+
+Every request records how long it queued for a pooled connection in a shared
+`PoolWaitStats`: the time from httpx accepting the request to the first
+connection-level trace event — the TCP connect for a fresh connection, the
+request headers for a reused one. Waits past `TELEGRAM_POOL_WAIT_WARN` are
+logged as they happen, so an undersized pool shows up next to the slow reply.
+The same trace feeds the `/metrics` histograms: the pool wait, and the time
+from the request to its response headers, per method.
+"""
+import importlib.util
+import logging
+import time
+from dataclasses import dataclass
+
+import httpx
+from telegram.request import HTTPXRequest
+
+from src.constants import (
+    MSG_HTTP2_UNAVAILABLE,
+    MSG_POOL_WAIT_SLOW,
+    TELEGRAM_POOL_WAIT_WARN,
+)
+from src.metrics import TELEGRAM_API_SECONDS, TELEGRAM_POOL_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class PoolWait:
+    count: int = 0
+    total: float = 0.0
+    worst: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class PoolWaitStats:
+
+    def __init__(self, warn_after: float = TELEGRAM_POOL_WAIT_WARN) -> None:
+        self._warn_after = warn_after
+        # Bot API method → accumulated waits
+        self.methods: dict[str, PoolWait] = {}
+
+    def record(self, pool: str, method: str, seconds: float) -> None:
+        wait = self.methods.setdefault(method, PoolWait())
+        wait.count += 1
+        wait.total += seconds
+        wait.worst = max(wait.worst, seconds)
+        match seconds >= self._warn_after:
+            case True:
+                logger.warning(MSG_POOL_WAIT_SLOW, pool, method, seconds * 1000)
+            case False:
+                pass
+
+    def summary(self) -> str:
+        """One line, methods with the most total wait first."""
+        ordered = sorted(self.methods.items(), key=lambda item: item[1].total, reverse=True)
+        return ", ".join(
+            f"{method} n={w.count} mean {w.mean * 1000:.1f} ms max {w.worst * 1000:.1f} ms"
+            for method, w in ordered
+        )
+
+
+def api_method(path: str) -> str:
+    """`/bot<token>/sendMessage` → `sendMessage`; file downloads → `file`."""
+    match path.split("/"):
+        case [_, "file", *_]:
+            return "file"
+        case [*_, method]:
+            return method
+
+
+def _http_version(pool: str, http2: bool) -> str:
+    match (http2, importlib.util.find_spec("h2")):
+        case (False, _):
+            return "1.1"
+        case (True, None):
+            logger.warning(MSG_HTTP2_UNAVAILABLE, pool)
+            return "1.1"
+        case _:
+            return "2"
+
+
+def _event_hooks(pool: str, stats: PoolWaitStats) -> dict:
+    async def on_request(request: httpx.Request) -> None:
+        queued = time.perf_counter()
+        method = api_method(request.url.path)
+        acquired = False
+
+        async def trace(event: str, info: dict) -> None:
+            nonlocal acquired
+            match (acquired, event.endswith(".receive_response_headers.complete")):
+                case (True, True):
+                    TELEGRAM_API_SECONDS.labels(method).observe(time.perf_counter() - queued)
+                case (True, False):
+                    pass
+                case (False, _):
+                    acquired = True
+                    waited = time.perf_counter() - queued
+                    stats.record(pool, method, waited)
+                    TELEGRAM_POOL_WAIT_SECONDS.labels(method).observe(waited)
+
+        request.extensions["trace"] = trace
+
+    return {"request": [on_request]}
+
+
+def build_request(
+    pool: str,
+    stats: PoolWaitStats,
+    pool_size: int,
+    pool_timeout: float,
+    connect_timeout: float,
+    read_timeout: float,
+    write_timeout: float,
+    http2: bool = False,
+) -> HTTPXRequest:
+    return HTTPXRequest(
+        connection_pool_size=pool_size,
+        pool_timeout=pool_timeout,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        write_timeout=write_timeout,
+        http_version=_http_version(pool, http2),
+        httpx_kwargs={"event_hooks": _event_hooks(pool, stats)},
+    )
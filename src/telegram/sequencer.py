@@ -0,0 +1,66 @@
+"""ChatSequencer — per-sender ordering for concurrently handled Telegram updates.
+
+A slot is issued synchronously when an update arrives, so slots queue in arrival
+order.  Work that is safe to overlap (downloads, transcription) runs before
+`await slot.ready()`; routing to the CLI runs after it, strictly one at a time
+per sender — `--resume` on the same session must never run concurrently.
+"""
+import asyncio
+
+
+class Slot:
+
+    def __init__(self, previous: asyncio.Future | None, done: asyncio.Future) -> None:
+        self._previous = previous
+        self._done = done
+
+    async def ready(self) -> None:
+        """Wait until every earlier slot for the same sender has finished."""
+        match self._previous:
+            case None:
+                pass
+            case prev:
+                await asyncio.shield(prev)
+
+    def release(self) -> None:
+        # never finish before our predecessor — a slot released early (e.g. a failed
+        # download) must not let its successor overtake a still-running earlier slot
+        match (self._done.done(), self._previous):
+            case (True, _):
+                pass
+            case (False, None):
+                self._done.set_result(None)
+            case (False, prev) if prev.done():
+                self._done.set_result(None)
+            case (False, prev):
+                prev.add_done_callback(lambda _: self.release())
+
+    def __enter__(self) -> "Slot":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.release()
+
+
+class ChatSequencer:
+
+    def __init__(self) -> None:
+        self._tails: dict[str, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._tails)
+
+    def slot(self, key: str) -> Slot:
+        """Issue the next slot for `key`. Must be called before the handler's first await."""
+        done: asyncio.Future = asyncio.get_running_loop().create_future()
+        slot = Slot(self._tails.get(key), done)
+        self._tails[key] = done
+        done.add_done_callback(lambda f: self._forget(key, f))
+        return slot
+
+    def _forget(self, key: str, done: asyncio.Future) -> None:
+        match self._tails.get(key):
+            case tail if tail is done:
+                del self._tails[key]
+            case _:
+                pass
@@ -1,56 +1,175 @@
-"""Telegram typing indicator — sends chat action every N seconds until stopped."""
+"""Telegram typing indicator — one chat action loop per chat, shared by its jobs.
+
+`TypingMultiplexer` keeps a reference count of active jobs per chat and runs a
+single loop for the chat while it is above zero, so concurrent replies, voice
+notes and photos in one chat send one TYPING action per interval between them.
+The interval holds across jobs too: a job that starts right after another one
+ended waits out the remainder instead of sending again. A streaming edit
+(`edited()`) already shows the chat is busy, so the action is skipped until
+the chat has been quiet for `edit_quiet` seconds.
+
+`TelegramTypingIndicator` is the per-job handle behind the `TypingIndicator`
+interface.
+"""
 import asyncio
 import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 
 from telegram import Bot
 from telegram.constants import ChatAction
 
 from src.bot_client import TypingIndicator
-from src.constants import TELEGRAM_TYPING_INTERVAL
+from src.constants import TELEGRAM_TYPING_EDIT_QUIET, TELEGRAM_TYPING_INTERVAL
+from src.telegram.ratelimit import LaneDropped
 
 logger = logging.getLogger(__name__)
 
 
-async def _keep_typing(bot: Bot, chat_id: str, stop: asyncio.Event) -> None:
-    while not stop.is_set():
-        try:
-            await bot.send_chat_action(chat_id=int(chat_id), action=ChatAction.TYPING)
-        except Exception as exc:
-            logger.debug("Typing action failed: %s", exc)
-        await asyncio.sleep(TELEGRAM_TYPING_INTERVAL)
+@dataclass(slots=True)
+class _ChatTyping:
+    refs: int = 0
+    task: asyncio.Task | None = None
+    last_sent: float = float("-inf")
+    last_edit: float = float("-inf")
+    # pending removal once the chat is idle and its windows have passed
+    forget: asyncio.TimerHandle | None = None
 
 
-class TelegramTypingIndicator(TypingIndicator):
+class TypingMultiplexer:
 
-    def __init__(self, bot: Bot, chat_id: str) -> None:
-        self._bot = bot
-        self._chat_id = chat_id
-        self._stop_event: asyncio.Event | None = None
-        self._task: asyncio.Task | None = None
+    def __init__(
+        self,
+        interval: float = TELEGRAM_TYPING_INTERVAL,
+        edit_quiet: float = TELEGRAM_TYPING_EDIT_QUIET,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._interval = interval
+        self._edit_quiet = edit_quiet
+        self._clock = clock
+        # chat id → refcount, loop task and last action / edit times; dropped once idle
+        self._chats: dict[str, _ChatTyping] = {}
+        self.sent = 0
+        self.skipped = 0
+        self.dropped = 0
 
-    async def start(self, to: str) -> None:
-        await self.stop(to)
-        self._stop_event = asyncio.Event()
-        self._task = asyncio.create_task(
-            _keep_typing(self._bot, self._chat_id, self._stop_event)
-        )
+    def active(self, chat_id: str) -> int:
+        """Jobs currently holding the indicator for `chat_id`."""
+        match self._chats.get(chat_id):
+            case None:
+                return 0
+            case chat:
+                return chat.refs
 
-    async def stop(self, to: str) -> None:
-        match self._stop_event:
+    def edited(self, chat_id: str) -> None:
+        """A streaming edit just landed in `chat_id`."""
+        chat = self._chats.setdefault(chat_id, _ChatTyping())
+        chat.last_edit = self._clock()
+        self._retire(chat_id, chat)
+
+    def acquire(self, bot: Bot, chat_id: str) -> None:
+        chat = self._chats.setdefault(chat_id, _ChatTyping())
+        chat.refs += 1
+        match chat.task:
             case None:
+                chat.task = asyncio.create_task(self._keep_typing(bot, chat_id, chat))
+            case _:
                 pass
-            case event:
-                event.set()
 
-        match self._task:
+    async def release(self, chat_id: str) -> None:
+        match self._chats.get(chat_id):
             case None:
-                pass
-            case task:
+                return
+            case chat:
+                chat.refs = max(0, chat.refs - 1)
+        match (chat.refs, chat.task):
+            case (0, asyncio.Task() as task):
+                chat.task = None
                 task.cancel()
                 try:
                     await task
                 except asyncio.CancelledError:
                     pass
-                self._task = None
+                self._retire(chat_id, chat)
+            case _:
+                pass
+
+    def _retire(self, chat_id: str, chat: _ChatTyping) -> None:
+        """Drop an idle chat's entry once neither its interval nor its edit-quiet
+        window still applies; until then a later job must honour them."""
+        match (chat.refs, chat.forget):
+            case (0, None):
+                pass
+            case _:
+                return
+        until = max(chat.last_sent + self._interval, chat.last_edit + self._edit_quiet)
+        remaining = until - self._clock()
+        match remaining > 0:
+            case True:
+                chat.forget = asyncio.get_running_loop().call_later(remaining, self._expire, chat_id)
+            case False:
+                self._chats.pop(chat_id, None)
+
+    def _expire(self, chat_id: str) -> None:
+        match self._chats.get(chat_id):
+            case None:
+                pass
+            case chat:
+                chat.forget = None
+                self._retire(chat_id, chat)
+
+    async def _keep_typing(self, bot: Bot, chat_id: str, chat: _ChatTyping) -> None:
+        while True:
+            await asyncio.sleep(await self._tick(bot, chat_id, chat))
+
+    async def _tick(self, bot: Bot, chat_id: str, chat: _ChatTyping) -> float:
+        """Send the action if one is due; seconds until the chat should be looked at again."""
+        now = self._clock()
+        match (chat.last_sent + self._interval - now, chat.last_edit + self._edit_quiet - now):
+            case (wait, _) if wait > 0:
+                # the last action (from this or an earlier job) is still showing
+                return wait
+            case (_, quiet) if quiet > 0:
+                # a streaming edit shows the chat is busy; look again once it is quiet
+                self.skipped += 1
+                return quiet
+            case _:
+                pass
+        chat.last_sent = now
+        try:
+            await bot.send_chat_action(chat_id=int(chat_id), action=ChatAction.TYPING)
+            self.sent += 1
+        except LaneDropped:
+            # the rate limiter kept the token for replies: skip this beat
+            self.dropped += 1
+        except Exception as exc:
+            logger.debug("Typing action failed: %s", exc)
+        return 0.0
 
-        self._stop_event = None
+
+class TelegramTypingIndicator(TypingIndicator):
+
+    def __init__(
+        self, bot: Bot, chat_id: str, multiplexer: TypingMultiplexer | None = None
+    ) -> None:
+        self._bot = bot
+        self._chat_id = chat_id
+        self._multiplexer = multiplexer or TypingMultiplexer()
+        self._held = False
+
+    async def start(self, to: str) -> None:
+        match self._held:
+            case True:
+                pass
+            case False:
+                self._held = True
+                self._multiplexer.acquire(self._bot, self._chat_id)
+
+    async def stop(self, to: str) -> None:
+        match self._held:
+            case True:
+                self._held = False
+                await self._multiplexer.release(self._chat_id)
+            case False:
+                pass
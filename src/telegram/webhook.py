@@ -0,0 +1,115 @@
+"""Webhook transport — Telegram pushes updates to an embedded HTTP server.
+
+`webhook_handler` checks the secret token Telegram echoes in every delivery,
+parses the update and drops it on the application's `update_queue`; the reply
+(200, empty) goes out before any handler runs, so Telegram never waits on the
+bot. `serve_webhook` runs the application lifecycle the way `run_polling()`
+does (init → start → stop → shutdown, with the post_* hooks) around the server.
+"""
+import asyncio
+import contextlib
+import hmac
+import json
+import logging
+from urllib.parse import urlsplit
+
+from telegram import Update
+from telegram.ext import Application
+
+from src.constants import (
+    MSG_WEBHOOK_BAD_UPDATE,
+    MSG_WEBHOOK_REJECTED,
+    MSG_WEBHOOK_SET,
+    WEBHOOK_MAX_CONNECTIONS,
+    WEBHOOK_SECRET_HEADER,
+)
+from src.http_server import Handler, HTTPServer, Request, Response
+
+logger = logging.getLogger(__name__)
+
+
+def webhook_path(url: str) -> str:
+    """Local path to serve: the path part of the public webhook URL."""
+    return urlsplit(url).path or "/"
+
+
+def webhook_handler(app: Application, secret: str) -> Handler:
+    expected = secret.encode()
+
+    async def handle(request: Request) -> Response:
+        presented = request.headers.get(WEBHOOK_SECRET_HEADER, "").encode("latin-1")
+        match hmac.compare_digest(presented, expected):
+            case False:
+                logger.warning(MSG_WEBHOOK_REJECTED)
+                return Response(403)
+            case True:
+                pass
+        try:
+            match json.loads(request.body):
+                case dict() as payload:
+                    update = Update.de_json(payload, app.bot)
+                case other:
+                    raise ValueError(f"expected an object, got {type(other).__name__}")
+        except (ValueError, TypeError, KeyError, AttributeError) as exc:
+            # 200 anyway: an error status makes Telegram redeliver the same payload
+            logger.warning(MSG_WEBHOOK_BAD_UPDATE, exc)
+            return Response()
+        app.update_queue.put_nowait(update)
+        return Response()
+
+    return handle
+
+
+async def serve_webhook(
+    app: Application,
+    url: str,
+    secret: str,
+    listen: str,
+    port: int,
+    stop: asyncio.Event,
+) -> None:
+    """Register the webhook and process pushed updates until `stop` is set."""
+    server = HTTPServer(
+        {("POST", webhook_path(url)): webhook_handler(app, secret)}, host=listen, port=port
+    )
+    # each stage is undone in reverse if a later one fails (e.g. the port is taken)
+    async with contextlib.AsyncExitStack() as stages:
+        await app.initialize()
+        stages.push_async_callback(_shutdown, app)
+        match app.post_init:
+            case None:
+                pass
+            case hook:
+                await hook(app)
+        await app.start()
+        stages.push_async_callback(_stop, app)
+        await server.start()
+        stages.push_async_callback(server.stop)
+        await app.bot.set_webhook(
+            url=url,
+            secret_token=secret,
+            allowed_updates=Update.ALL_TYPES,
+            max_connections=WEBHOOK_MAX_CONNECTIONS,
+        )
+        logger.info(MSG_WEBHOOK_SET, url)
+        # the webhook stays registered on the way out: Telegram holds updates until
+        # the next start, and polling mode removes it on its own
+        await stop.wait()
+
+
+async def _stop(app: Application) -> None:
+    await app.stop()
+    match app.post_stop:
+        case None:
+            pass
+        case hook:
+            await hook(app)
+
+
+async def _shutdown(app: Application) -> None:
+    await app.shutdown()
+    match app.post_shutdown:
+        case None:
+            pass
+        case hook:
+            await hook(app)
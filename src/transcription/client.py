@@ -1,9 +1,33 @@
 """TranscriptionClient — abstract base for speech-to-text backends."""
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from src.media import Buffer
+
+
+@dataclass(frozen=True, slots=True)
+class TranscriptPart:
+    index: int  # 1-based position in the recording
+    total: int
+    text: str
 
 
 class TranscriptionClient(ABC):
+    # backend model id; part of the media cache key
+    model: str = ""
+
     @abstractmethod
-    async def transcribe(self, audio: bytes) -> str:
-        """Convert raw audio bytes to text. Raises on failure."""
+    async def transcribe(self, audio: Buffer) -> str:
+        """Convert raw audio to text. Raises on failure."""
         ...
+
+    async def transcribe_stream(
+        self, audio: Buffer, duration: float = 0.0
+    ) -> AsyncIterator[TranscriptPart]:
+        """Transcript pieces in recording order, each as soon as it and all before it are done.
+        Backends that can split long audio override this; the default yields one piece."""
+        yield TranscriptPart(1, 1, await self.transcribe(audio))
+
+    async def aclose(self) -> None:
+        """Release backend resources at shutdown. Nothing to do by default."""
@@ -0,0 +1,199 @@
+"""LocalTranscriptionClient — offline speech-to-text in a process pool.
+
+Each worker process loads the model once (pool initializer) and keeps it warm
+for every job after that; `start()` spawns all workers up front so the first
+voice note does not pay for the model load. Jobs beyond `workers + queue_size`
+in flight are rejected instead of piling up behind a busy CPU; a job counts
+until the pool is done with it, even if its caller stopped waiting.
+
+Engines run inside the worker: `faster-whisper` (optional dependency, CTranslate2
+int8 on CPU) or `stub`, which needs nothing and is what the tests use.
+"""
+import asyncio
+import concurrent.futures
+import importlib.util
+import io
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections.abc import AsyncIterator
+
+from src.constants import (
+    LOCAL_ENGINE_FASTER_WHISPER,
+    LOCAL_ENGINE_STUB,
+    LOCAL_STT_COMPUTE_TYPE,
+    LOCAL_STT_STUB_TEXT,
+    MSG_LOCAL_STT_CLOSED,
+    MSG_LOCAL_STT_MISSING,
+    MSG_LOCAL_STT_QUEUE_FULL,
+    MSG_LOCAL_STT_READY,
+    MSG_LOCAL_STT_UNKNOWN_ENGINE,
+)
+from src.media import Buffer
+from src.transcription.client import TranscriptionClient, TranscriptPart
+from src.transcription.segment import split_audio, transcribe_segments
+
+logger = logging.getLogger(__name__)
+
+
+class _FasterWhisperEngine:
+
+    def __init__(self, model: str, threads: int) -> None:
+        from faster_whisper import WhisperModel
+
+        self._model = WhisperModel(
+            model, device="cpu", compute_type=LOCAL_STT_COMPUTE_TYPE, cpu_threads=threads
+        )
+
+    def transcribe(self, audio: bytes) -> str:
+        segments, _ = self._model.transcribe(io.BytesIO(audio), beam_size=1)
+        return " ".join(s.text.strip() for s in segments).strip()
+
+
+class StubEngine:
+    """Deterministic engine without a model: text derived from the input size."""
+
+    def __init__(self, model: str, threads: int) -> None:
+        self._model = model
+
+    def transcribe(self, audio: bytes) -> str:
+        return LOCAL_STT_STUB_TEXT % (self._model, len(audio))
+
+
+ENGINES = {
+    LOCAL_ENGINE_FASTER_WHISPER: _FasterWhisperEngine,
+    LOCAL_ENGINE_STUB: StubEngine,
+}
+
+# worker-process state, set once by the pool initializer
+_engine: _FasterWhisperEngine | StubEngine | None = None
+_loads = 0
+
+
+def _init_worker(engine: str, model: str, threads: int) -> None:
+    global _engine, _loads
+    _engine = ENGINES[engine](model, threads)
+    _loads += 1
+
+
+def _warm() -> tuple[int, int]:
+    """(pid, model loads) of the worker that ran this; loads stays 1 for a warm worker."""
+    return os.getpid(), _loads
+
+
+def _run(audio: bytes) -> str:
+    return _engine.transcribe(audio)
+
+
+class LocalTranscriptionClient(TranscriptionClient):
+
+    def __init__(
+        self,
+        engine: str = LOCAL_ENGINE_FASTER_WHISPER,
+        model: str = "base",
+        workers: int = 2,
+        queue_size: int = 8,
+        segment_seconds: float = 120.0,
+        ffmpeg_path: str | None = None,
+    ) -> None:
+        match engine:
+            case str() as e if e not in ENGINES:
+                raise ValueError(MSG_LOCAL_STT_UNKNOWN_ENGINE % e)
+            case e if e == LOCAL_ENGINE_FASTER_WHISPER and not importlib.util.find_spec("faster_whisper"):
+                raise RuntimeError(MSG_LOCAL_STT_MISSING)
+            case _:
+                pass
+        self.model = f"{engine}:{model}"
+        self._engine = engine
+        self._model_name = model
+        self._workers = max(1, workers)
+        self._capacity = self._workers + max(0, queue_size)
+        self._segment_seconds = segment_seconds
+        self._ffmpeg_path = ffmpeg_path
+        self._pool: concurrent.futures.ProcessPoolExecutor | None = None
+        # released from the pool's thread when a job finishes or is cancelled
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        match self._pool:
+            case None:
+                # split the cores between workers so they do not oversubscribe the CPU
+                threads = max(1, (os.cpu_count() or 1) // self._workers)
+                self._pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    # spawn, not fork: the parent runs an event loop and HTTP threads
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self._engine, self._model_name, threads),
+                )
+            case _:
+                pass
+        return self._pool
+
+    def start(self) -> list[concurrent.futures.Future]:
+        """Spawn every worker now; each loads the model in its initializer. Does not block."""
+        began = time.monotonic()
+        pool = self._executor()
+        # no worker is idle yet, so each submit spawns one more process
+        futures = [pool.submit(_warm) for _ in range(self._workers)]
+        pending = len(futures)
+
+        def _ready(_: concurrent.futures.Future) -> None:
+            nonlocal pending
+            pending -= 1
+            match pending:
+                case 0:
+                    logger.info(
+                        MSG_LOCAL_STT_READY, self._engine, self._model_name,
+                        self._workers, time.monotonic() - began,
+                    )
+                case _:
+                    pass
+
+        list(map(lambda f: f.add_done_callback(_ready), futures))
+        return futures
+
+    def _release(self, _: concurrent.futures.Future | None = None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def transcribe(self, audio: Buffer) -> str:
+        with self._lock:
+            match self._in_flight >= self._capacity:
+                case True:
+                    raise RuntimeError(MSG_LOCAL_STT_QUEUE_FULL % self._in_flight)
+                case False:
+                    self._in_flight += 1
+        try:
+            # the worker needs its own copy anyway; bytes() is the one that pickles
+            job = self._executor().submit(_run, bytes(audio))
+        except BaseException:
+            self._release()
+            raise
+        # a cancelled caller cancels a queued job, but a running one keeps its slot until done
+        job.add_done_callback(self._release)
+        return await asyncio.wrap_future(job)
+
+    async def transcribe_stream(
+        self, audio: Buffer, duration: float = 0.0
+    ) -> AsyncIterator[TranscriptPart]:
+        """Long audio is split at silences and spread over the workers, released in order."""
+        segments = await split_audio(audio, duration, self._segment_seconds, self._ffmpeg_path)
+        async for part in transcribe_segments(segments, self.transcribe, self._workers):
+            yield part
+
+    async def aclose(self) -> None:
+        pool, self._pool = self._pool, None
+        match pool:
+            case None:
+                pass
+            case _:
+                await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
+                logger.info(MSG_LOCAL_STT_CLOSED)
@@ -0,0 +1,142 @@
+"""Silence-aligned audio segmentation with ffmpeg.
+
+Long voice notes are cut into pieces of at most `target` seconds so they can
+be transcribed concurrently. Cuts land in the middle of detected silences
+when one falls in the back half of a window, otherwise at the window end.
+Without ffmpeg on PATH, or when it runs past FFMPEG_TIMEOUT, the audio is
+returned whole.
+"""
+import asyncio
+import logging
+import re
+import shutil
+import tempfile
+from collections.abc import AsyncIterator, Awaitable, Callable
+from pathlib import Path
+
+from src.constants import (
+    FFMPEG_SILENCE_FILTER,
+    FFMPEG_TIMEOUT,
+    MSG_FFMPEG_MISSING,
+    MSG_FFMPEG_TIMEOUT,
+    MSG_VOICE_SEGMENTED,
+    VOICE_FILENAME,
+)
+from src.media import Buffer
+from src.transcription.client import TranscriptPart
+
+logger = logging.getLogger(__name__)
+
+_SILENCE = re.compile(r"silence_(start|end): (-?[\d.]+)")
+
+
+def parse_silences(ffmpeg_log: str) -> list[tuple[float, float]]:
+    """(start, end) pairs from `silencedetect` output; an unterminated silence is dropped."""
+    marks = _SILENCE.findall(ffmpeg_log)
+    starts = [float(v) for kind, v in marks if kind == "start"]
+    ends = [float(v) for kind, v in marks if kind == "end"]
+    return list(zip(starts, ends))
+
+
+def plan_cuts(silences: list[tuple[float, float]], duration: float, target: float) -> list[float]:
+    """Cut times so no segment exceeds `target` seconds, preferring silence midpoints."""
+    midpoints = [(s + e) / 2 for s, e in silences]
+    cuts: list[float] = []
+    last = 0.0
+    while duration - last > target:
+        window = [m for m in midpoints if last + target / 2 < m <= last + target]
+        last = max(window) if window else last + target
+        cuts.append(round(last, 3))
+    return cuts
+
+
+async def _ffmpeg(ffmpeg: str, *args: str) -> tuple[int, str]:
+    """(exit code, stderr). TimeoutError past FFMPEG_TIMEOUT; never leaves ffmpeg running."""
+    process = await asyncio.create_subprocess_exec(
+        ffmpeg, "-hide_banner", "-nostats", *args,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        _, stderr = await asyncio.wait_for(process.communicate(), FFMPEG_TIMEOUT)
+        return process.returncode, stderr.decode(errors="replace")
+    finally:
+        # timed out or cancelled (the voice note was abandoned)
+        match process.returncode:
+            case None:
+                try:
+                    process.kill()
+                except ProcessLookupError:
+                    pass
+                await process.wait()
+            case _:
+                pass
+
+
+async def split_audio(
+    audio: Buffer, duration: float, target: float, ffmpeg_path: str | None = None
+) -> list[Buffer]:
+    """Segments of `audio` (OGG/Opus), in order. One segment when short or ffmpeg is unavailable."""
+    ffmpeg = ffmpeg_path or shutil.which("ffmpeg")
+    match (duration > target, ffmpeg):
+        case (False, _):
+            return [audio]
+        case (True, None):
+            logger.warning(MSG_FFMPEG_MISSING)
+            return [audio]
+        case _:
+            pass
+    try:
+        return await _split(audio, duration, target, ffmpeg)
+    except asyncio.TimeoutError:
+        logger.warning(MSG_FFMPEG_TIMEOUT, FFMPEG_TIMEOUT)
+        return [audio]
+
+
+async def _split(audio: Buffer, duration: float, target: float, ffmpeg: str) -> list[Buffer]:
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / VOICE_FILENAME
+        await asyncio.to_thread(source.write_bytes, audio)
+        _, log = await _ffmpeg(ffmpeg, "-i", str(source), "-af", FFMPEG_SILENCE_FILTER, "-f", "null", "-")
+        cuts = plan_cuts(parse_silences(log), duration, target)
+        match cuts:
+            case []:
+                return [audio]
+            case _:
+                pass
+        pattern = str(Path(tmp) / "part%03d.ogg")
+        code, log = await _ffmpeg(
+            ffmpeg, "-i", str(source), "-f", "segment",
+            "-segment_times", ",".join(map(str, cuts)), "-c", "copy", pattern,
+        )
+        parts = sorted(Path(tmp).glob("part*.ogg"))
+        match (code, parts):
+            case (0, [_, _, *_]):
+                logger.info(MSG_VOICE_SEGMENTED, duration, len(parts))
+                return await asyncio.to_thread(lambda: [p.read_bytes() for p in parts])
+            case _:
+                logger.warning("ffmpeg segmentation failed: %s", log[-200:])
+                return [audio]
+
+
+async def transcribe_segments(
+    segments: list[Buffer],
+    transcribe: Callable[[Buffer], Awaitable[str]],
+    max_concurrency: int,
+) -> AsyncIterator[TranscriptPart]:
+    """Transcribe segments concurrently (at most `max_concurrency` at once), yielding them in order."""
+    limit = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _one(segment: Buffer) -> str:
+        async with limit:
+            return await transcribe(segment)
+
+    tasks = [asyncio.create_task(_one(s)) for s in segments]
+    try:
+        for index, task in enumerate(tasks, start=1):
+            yield TranscriptPart(index, len(tasks), await task)
+    finally:
+        # consumer gave up or a segment failed: stop the rest and wait for them,
+        # so no failure goes unretrieved and no cancelled call is left running
+        list(map(lambda t: t.cancel(), tasks))
+        await asyncio.gather(*tasks, return_exceptions=True)
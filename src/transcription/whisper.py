@@ -1,23 +1,41 @@
 """WhisperTranscriptionClient — OpenAI Whisper speech-to-text backend."""
-import io
-
-from openai import AsyncOpenAI
+from collections.abc import AsyncIterator
 
 from src.constants import VOICE_FILENAME, WHISPER_MODEL
-from src.transcription.client import TranscriptionClient
+from src.media import Buffer, ViewReader
+from src.providers import ProviderRegistry
+from src.transcription.client import TranscriptionClient, TranscriptPart
+from src.transcription.segment import split_audio, transcribe_segments
 
 
 class WhisperTranscriptionClient(TranscriptionClient):
+    model = WHISPER_MODEL
 
-    def __init__(self, api_key: str) -> None:
-        self._api_key = api_key
+    def __init__(
+        self,
+        providers: ProviderRegistry,
+        segment_seconds: float = 120.0,
+        max_concurrency: int = 3,
+        ffmpeg_path: str | None = None,
+    ) -> None:
+        self._providers = providers
+        self._segment_seconds = segment_seconds
+        self._max_concurrency = max(1, max_concurrency)
+        self._ffmpeg_path = ffmpeg_path
 
-    async def transcribe(self, audio: bytes) -> str:
-        client = AsyncOpenAI(api_key=self._api_key)
-        audio_file = io.BytesIO(audio)
-        audio_file.name = VOICE_FILENAME
-        response = await client.audio.transcriptions.create(
-            model=WHISPER_MODEL,
-            file=audio_file,
-        )
+    async def transcribe(self, audio: Buffer) -> str:
+        async with self._providers.openai() as client:
+            response = await client.audio.transcriptions.create(
+                model=self.model,
+                # the multipart body is streamed from the buffer; no BytesIO copy
+                file=(VOICE_FILENAME, ViewReader(audio)),
+            )
         return response.text.strip()
+
+    async def transcribe_stream(
+        self, audio: Buffer, duration: float = 0.0
+    ) -> AsyncIterator[TranscriptPart]:
+        """Long audio is split at silences; segments run concurrently and are released in order."""
+        segments = await split_audio(audio, duration, self._segment_seconds, self._ffmpeg_path)
+        async for part in transcribe_segments(segments, self.transcribe, self._max_concurrency):
+            yield part
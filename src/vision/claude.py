@@ -1,41 +1,48 @@
 """ClaudeVisionClient — Anthropic Claude vision backend."""
-import base64
+import asyncio
+from collections.abc import Sequence
 
-from anthropic import AsyncAnthropic
-
-from src.constants import CLAUDE_VISION_MODEL, MSG_IMAGE_DEFAULT_PROMPT
+from src.constants import CLAUDE_VISION_MODEL, MSG_ALBUM_DEFAULT_PROMPT, MSG_IMAGE_DEFAULT_PROMPT
+from src.media import Buffer, encode_base64
+from src.providers import ProviderRegistry
 from src.vision.client import VisionClient
 
 
+async def _image_block(image: Buffer) -> dict:
+    return {
+        "type": "image",
+        "source": {
+            "type": "base64",
+            "media_type": "image/jpeg",
+            "data": await asyncio.to_thread(encode_base64, image),
+        },
+    }
+
+
 class ClaudeVisionClient(VisionClient):
+    model = CLAUDE_VISION_MODEL
+
+    def __init__(self, providers: ProviderRegistry) -> None:
+        self._providers = providers
+
+    async def analyze(self, image_bytes: Buffer, caption: str | None = None) -> str:
+        return await self.analyze_many([image_bytes], caption)
 
-    def __init__(self, api_key: str) -> None:
-        self._api_key = api_key
-
-    async def analyze(self, image_bytes: bytes, caption: str | None = None) -> str:
-        client = AsyncAnthropic(api_key=self._api_key)
-        prompt = caption or MSG_IMAGE_DEFAULT_PROMPT
-        image_data = base64.standard_b64encode(image_bytes).decode()
-        message = await client.messages.create(
-            model=CLAUDE_VISION_MODEL,
-            max_tokens=1024,
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "image",
-                            "source": {
-                                "type": "base64",
-                                "media_type": "image/jpeg",
-                                "data": image_data,
-                            },
-                        },
-                        {"type": "text", "text": prompt},
-                    ],
-                }
-            ],
-        )
+    async def analyze_many(self, images: Sequence[Buffer], caption: str | None = None) -> str:
+        default = MSG_IMAGE_DEFAULT_PROMPT if len(images) == 1 else MSG_ALBUM_DEFAULT_PROMPT
+        prompt = caption or default
+        blocks = await asyncio.gather(*map(_image_block, images))
+        async with self._providers.anthropic() as client:
+            message = await client.messages.create(
+                model=self.model,
+                max_tokens=1024,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": [*blocks, {"type": "text", "text": prompt}],
+                    }
+                ],
+            )
         match getattr(message.content[0], "text", None):
             case str() as t:
                 return t.strip()
@@ -1,9 +1,25 @@
 """VisionClient — abstract base for image analysis backends."""
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+from src.constants import MSG_ALBUM_IMAGE_LABEL
+from src.media import Buffer
 
 
 class VisionClient(ABC):
+    # backend model id; part of the media cache key
+    model: str = ""
+
     @abstractmethod
-    async def analyze(self, image_bytes: bytes, caption: str | None = None) -> str:
-        """Analyze image bytes and return a text description. Raises on failure."""
+    async def analyze(self, image_bytes: Buffer, caption: str | None = None) -> str:
+        """Analyze an image buffer (JPEG bytes) and return a text description. Raises on failure."""
         ...
+
+    async def analyze_many(self, images: Sequence[Buffer], caption: str | None = None) -> str:
+        """Analyze several images (an album) together. Backends that accept multiple
+        images per request override this with a single call; the default fans out."""
+        answers = await asyncio.gather(*(self.analyze(i, caption) for i in images))
+        return "\n\n".join(
+            f"{MSG_ALBUM_IMAGE_LABEL % n} {a}" for n, a in enumerate(answers, start=1)
+        )
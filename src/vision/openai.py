@@ -1,35 +1,43 @@
 """OpenAIVisionClient — OpenAI GPT-4o vision backend."""
-import base64
+import asyncio
+from collections.abc import Sequence
 
-from openai import AsyncOpenAI
-
-from src.constants import MSG_IMAGE_DEFAULT_PROMPT, OPENAI_VISION_MODEL
+from src.constants import MSG_ALBUM_DEFAULT_PROMPT, MSG_IMAGE_DEFAULT_PROMPT, OPENAI_VISION_MODEL
+from src.media import Buffer, encode_base64
+from src.providers import ProviderRegistry
 from src.vision.client import VisionClient
 
 
+async def _image_block(image: Buffer) -> dict:
+    image_data = await asyncio.to_thread(encode_base64, image)
+    return {
+        "type": "image_url",
+        "image_url": {"url": f"data:image/jpeg;base64,{image_data}"},
+    }
+
+
 class OpenAIVisionClient(VisionClient):
+    model = OPENAI_VISION_MODEL
+
+    def __init__(self, providers: ProviderRegistry) -> None:
+        self._providers = providers
+
+    async def analyze(self, image_bytes: Buffer, caption: str | None = None) -> str:
+        return await self.analyze_many([image_bytes], caption)
 
-    def __init__(self, api_key: str) -> None:
-        self._api_key = api_key
-
-    async def analyze(self, image_bytes: bytes, caption: str | None = None) -> str:
-        client = AsyncOpenAI(api_key=self._api_key)
-        prompt = caption or MSG_IMAGE_DEFAULT_PROMPT
-        image_data = base64.standard_b64encode(image_bytes).decode()
-        response = await client.chat.completions.create(
-            model=OPENAI_VISION_MODEL,
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "image_url",
-                            "image_url": {"url": f"data:image/jpeg;base64,{image_data}"},
-                        },
-                        {"type": "text", "text": prompt},
-                    ],
-                }
-            ],
-        )
+    async def analyze_many(self, images: Sequence[Buffer], caption: str | None = None) -> str:
+        default = MSG_IMAGE_DEFAULT_PROMPT if len(images) == 1 else MSG_ALBUM_DEFAULT_PROMPT
+        prompt = caption or default
+        blocks = await asyncio.gather(*map(_image_block, images))
+        async with self._providers.openai() as client:
+            response = await client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": [*blocks, {"type": "text", "text": prompt}],
+                    }
+                ],
+            )
         content = response.choices[0].message.content
         return content.strip() if content else ""
@@ -0,0 +1,72 @@
+"""Image preprocessing before vision analysis.
+
+Telegram already stores every photo at several resolutions, so the cheapest
+downscale is picking the right `PhotoSize`: `choose_photo` takes the smallest
+one whose long side reaches the target. If the chosen file is still larger,
+`downsample` resizes and recompresses it with Pillow (optional dependency) in
+a worker thread, reading the downloaded buffer in place (`src.media`).
+"""
+import asyncio
+import io
+import logging
+from collections.abc import Sequence
+
+from telegram import PhotoSize
+
+from src.constants import MSG_PILLOW_MISSING
+from src.media import Buffer, ViewReader
+
+logger = logging.getLogger(__name__)
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - depends on the environment
+    Image = None
+
+
+def _long_side(photo: PhotoSize) -> int:
+    return max(photo.width, photo.height)
+
+
+def choose_photo(sizes: Sequence[PhotoSize], target: int) -> PhotoSize:
+    """Smallest size whose long side is at least `target`; the largest when none is (or target is 0)."""
+    by_size = sorted(sizes, key=_long_side)
+    match (target, [p for p in by_size if _long_side(p) >= target]):
+        case (t, [first, *_]) if t > 0:
+            return first
+        case _:
+            return by_size[-1]
+
+
+def downsample(data: Buffer, max_side: int, quality: int) -> Buffer:
+    """JPEG no larger than `max_side` on its long side; `data` unchanged if already small or Pillow is absent."""
+    match (Image, max_side):
+        case (None, _) | (_, 0):
+            return data
+        case _:
+            pass
+    with Image.open(ViewReader(data)) as img:
+        match max(img.size) > max_side:
+            case False:
+                return data
+            case True:
+                pass
+        # JPEG draft mode decodes at a reduced DCT scale: far less work than a full decode
+        img.draft("RGB", (max_side, max_side))
+        img.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        out = io.BytesIO()
+        img.convert("RGB").save(out, format="JPEG", quality=quality)
+    # getbuffer() exposes the encoded bytes without another copy
+    return out.getbuffer()
+
+
+async def prepare_image(data: Buffer, max_side: int, quality: int) -> Buffer:
+    """Downsample off the event loop. Returns the buffer to hand to a vision backend."""
+    match (Image, max_side):
+        case (None, s) if s:
+            logger.debug(MSG_PILLOW_MISSING)
+            return data
+        case (None, _) | (_, 0):
+            return data
+        case _:
+            return await asyncio.to_thread(downsample, data, max_side, quality)
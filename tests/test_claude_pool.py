@@ -0,0 +1,202 @@
+"""TDD: ClaudeWorkerPool tests written FIRST"""
+import sys
+import time
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.claude_pool import ClaudeWorkerError, ClaudeWorkerPool
+from src.message_handler import ChatMessage
+from src.router import MessageRouter
+
+FAKE_CLAUDE = f"""#!{sys.executable}
+import json, sys
+args = sys.argv[1:]
+session = args[args.index("--resume") + 1] if "--resume" in args else "sess-new"
+for n, line in enumerate(sys.stdin, 1):
+    text = json.loads(line)["message"]["content"]
+    if text == "crash":
+        sys.exit(3)
+    block = {{"type": "text", "text": "x" * 200000 if text == "big" else "echo:" + text}}
+    print(json.dumps({{"type": "assistant", "message": {{"content": [block]}}}}), flush=True)
+    print(json.dumps({{"type": "result", "result": f"echo:{{text}}#{{n}}", "session_id": session}}), flush=True)
+"""
+
+
+@pytest.fixture
+def fake_claude(tmp_path):
+    path = tmp_path / "claude"
+    path.write_text(FAKE_CLAUDE)
+    path.chmod(0o755)
+    return str(path)
+
+
+async def _run_turn(worker, text: str) -> list[dict]:
+    return [e async for e in worker.turn(text, timeout=10)]
+
+
+# ── worker turns ──────────────────────────────────────────────────────────────
+
+
+async def test_turn_yields_events_until_result(fake_claude):
+    pool = ClaudeWorkerPool(fake_claude, max_workers=2, idle_ttl=60)
+    worker = await pool.acquire("123", None, None)
+    events = await _run_turn(worker, "hi")
+    await pool.close()
+
+    assert [e["type"] for e in events] == ["assistant", "result"]
+    assert events[-1]["result"] == "echo:hi#1"
+    assert worker.session_id == "sess-new"
+
+
+async def test_same_session_reuses_live_worker(fake_claude):
+    pool = ClaudeWorkerPool(fake_claude, max_workers=2, idle_ttl=60)
+    first = await pool.acquire("123", "s1", None)
+    await _run_turn(first, "one")
+    second = await pool.acquire("123", "s1", None)
+    events = await _run_turn(second, "two")
+    await pool.close()
+
+    assert second is first
+    assert events[-1]["result"] == "echo:two#2"
+
+
+async def test_session_change_respawns_worker(fake_claude):
+    pool = ClaudeWorkerPool(fake_claude, max_workers=2, idle_ttl=60)
+    first = await pool.acquire("123", "s1", None)
+    second = await pool.acquire("123", None, None)
+    await pool.close()
+
+    assert second is not first
+    assert not first.alive
+
+
+async def test_model_change_respawns_worker(fake_claude):
+    pool = ClaudeWorkerPool(fake_claude, max_workers=2, idle_ttl=60)
+    first = await pool.acquire("123", "s1", None)
+    second = await pool.acquire("123", "s1", "claude-opus-4-6")
+    await pool.close()
+
+    assert second is not first
+
+
+async def test_max_workers_evicts_least_recently_used(fake_claude):
+    pool = ClaudeWorkerPool(fake_claude, max_workers=2, idle_ttl=60)
+    a = await pool.acquire("a", None, None)
+    await pool.acquire("b", None, None)
+    await pool.acquire("c", None, None)
+    alive_a = a.alive
+    size = len(pool)
+    await pool.close()
+
+    assert size == 2
+    assert not alive_a
+
+
+async def test_idle_workers_are_evicted_after_ttl(fake_claude):
+    pool = ClaudeWorkerPool(fake_claude, max_workers=4, idle_ttl=60)
+    stale = await pool.acquire("a", None, None)
+    stale.last_used = time.monotonic() - 120
+    await pool.acquire("b", None, None)
+    size = len(pool)
+    await pool.close()
+
+    assert size == 1
+    assert not stale.alive
+
+
+async def test_crashed_worker_raises_worker_error(fake_claude):
+    pool = ClaudeWorkerPool(fake_claude, max_workers=2, idle_ttl=60)
+    worker = await pool.acquire("123", None, None)
+    with pytest.raises(ClaudeWorkerError):
+        await _run_turn(worker, "crash")
+    await pool.close()
+
+
+
+async def test_turn_reads_lines_over_the_default_stream_limit(fake_claude):
+    pool = ClaudeWorkerPool(fake_claude, max_workers=2, idle_ttl=60)
+    worker = await pool.acquire("123", None, None)
+    events = await _run_turn(worker, "big")
+    again = await _run_turn(worker, "hi")
+    await pool.close()
+
+    assert len(events[0]["message"]["content"][0]["text"]) == 200000
+    assert again[-1]["result"] == "echo:hi#2"
+
+
+async def test_abandoned_turn_kills_the_worker_and_the_next_acquire_respawns(fake_claude):
+    pool = ClaudeWorkerPool(fake_claude, max_workers=2, idle_ttl=60)
+    worker = await pool.acquire("123", None, None)
+    turn = worker.turn("hi", timeout=10)
+    first = await anext(turn)
+    await turn.aclose()
+
+    assert first["type"] == "assistant"
+    assert not worker.alive
+    fresh = await pool.acquire("123", None, None)
+    events = await _run_turn(fresh, "again")
+    await pool.close()
+
+    assert fresh is not worker
+    assert events[-1]["result"] == "echo:again#1"
+
+async def test_missing_binary_raises_worker_error(tmp_path):
+    pool = ClaudeWorkerPool(str(tmp_path / "nope"), max_workers=2, idle_ttl=60)
+    with pytest.raises(ClaudeWorkerError):
+        await pool.acquire("123", None, None)
+
+
+# ── router integration ────────────────────────────────────────────────────────
+
+
+def make_pool_router(monkeypatch, claude_path: str) -> MessageRouter:
+    from src.config import Config
+
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "test-token")
+    monkeypatch.setenv("ALLOWED_CHAT_ID", "123456789")
+    monkeypatch.setenv("CLAUDE_CLI_PATH", claude_path)
+    monkeypatch.setenv("CLAUDE_WORKER_POOL", "true")
+    return MessageRouter(Config.from_env())
+
+
+async def test_router_stores_session_id_from_worker(monkeypatch, fake_claude):
+    router = make_pool_router(monkeypatch, fake_claude)
+    router._claude_store.delete("123456789")
+    reply = await router._call_claude_cli("123456789", "hello")
+    stored = router._claude_store.get("123456789")
+    router._claude_store.delete("123456789")
+    await router.aclose()
+
+    assert reply == "echo:hello#1"
+    assert stored == "sess-new"
+
+
+async def test_router_falls_back_to_one_shot_when_worker_fails(monkeypatch, fake_claude):
+    router = make_pool_router(monkeypatch, fake_claude)
+    failing = AsyncMock(side_effect=ClaudeWorkerError("boom"))
+
+    async def fake_exec(*args, **kwargs):
+        proc = AsyncMock()
+        proc.returncode = 0
+        proc.communicate = AsyncMock(return_value=(b"one-shot reply", b""))
+        return proc
+
+    with patch.object(router._claude_pool, "acquire", new=failing):
+        with patch("asyncio.create_subprocess_exec", side_effect=fake_exec):
+            router._claude_store.set("123456789", "s1")
+            reply = await router._call_claude_cli("123456789", "hello")
+            router._claude_store.delete("123456789")
+
+    assert reply == "one-shot reply"
+
+
+async def test_router_stream_uses_worker(monkeypatch, fake_claude):
+    router = make_pool_router(monkeypatch, fake_claude)
+    router._claude_store.delete("123456789")
+    msg = ChatMessage(sender="123456789", content="@claude hi", timestamp=0)
+    chunks = [c async for c in router.stream_handle(msg)]
+    router.handle_new_command("123456789")
+    await router.aclose()
+
+    assert chunks[-1] == "echo:hi#1"
@@ -173,3 +173,93 @@ def test_config_openai_api_key_default_is_none(monkeypatch):
     config = Config.from_env()
 
     assert config.openai_api_key is None
+
+
+def test_config_max_concurrent_updates_from_env(monkeypatch):
+    """MAX_CONCURRENT_UPDATES controls how many updates are handled in parallel."""
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "bot:tok")
+    monkeypatch.setenv("ALLOWED_CHAT_ID", "123456789")
+    monkeypatch.setenv("MAX_CONCURRENT_UPDATES", "16")
+
+    config = Config.from_env()
+
+    assert config.max_concurrent_updates == 16
+
+
+def test_config_local_transcription_backend_from_env(monkeypatch):
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "bot:tok")
+    monkeypatch.setenv("ALLOWED_CHAT_ID", "123456789")
+    monkeypatch.setenv("TRANSCRIPTION_BACKEND", "Local")
+    monkeypatch.setenv("LOCAL_STT_WORKERS", "3")
+
+    config = Config.from_env()
+
+    assert config.transcription_backend == "local"
+    assert config.local_stt_workers == 3
+    assert config.local_stt_engine == "faster-whisper"
+
+
+def test_config_unknown_transcription_backend_fails(monkeypatch):
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "bot:tok")
+    monkeypatch.setenv("ALLOWED_CHAT_ID", "123456789")
+    monkeypatch.setenv("TRANSCRIPTION_BACKEND", "vosk")
+
+    with pytest.raises(ValueError, match="TRANSCRIPTION_BACKEND"):
+        Config.from_env()
+
+
+def test_config_telegram_request_pools_from_env(monkeypatch):
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "bot:tok")
+    monkeypatch.setenv("ALLOWED_CHAT_ID", "123456789")
+    monkeypatch.setenv("TELEGRAM_POOL_SIZE", "32")
+    monkeypatch.setenv("TELEGRAM_POOL_TIMEOUT", "2.5")
+    monkeypatch.setenv("TELEGRAM_HTTP2", "true")
+    monkeypatch.setenv("TELEGRAM_UPDATES_POOL_SIZE", "0")
+
+    config = Config.from_env()
+
+    assert config.telegram_pool_size == 32
+    assert config.telegram_pool_timeout == 2.5
+    assert config.telegram_http2 is True
+    assert config.telegram_updates_pool_size == 1
+    assert config.telegram_updates_http2 is False
+
+
+def test_config_telegram_rate_limit_from_env(monkeypatch):
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "bot:tok")
+    monkeypatch.setenv("ALLOWED_CHAT_ID", "123456789")
+    monkeypatch.setenv("TELEGRAM_RATE_LIMIT", "false")
+    monkeypatch.setenv("TELEGRAM_RATE_CHAT_BURST", "0")
+
+    config = Config.from_env()
+
+    assert config.telegram_rate_limit is False
+    assert config.telegram_rate_chat_burst == 1.0
+    assert config.telegram_rate_global == 30.0
+
+
+def test_config_metrics_endpoint_is_off_by_default(monkeypatch):
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "bot:tok")
+    monkeypatch.setenv("ALLOWED_CHAT_ID", "123456789")
+
+    assert Config.from_env().metrics_port == 0
+
+    monkeypatch.setenv("METRICS_PORT", "9464")
+    config = Config.from_env()
+
+    assert config.metrics_port == 9464
+    assert config.metrics_listen == "127.0.0.1"
+
+
+def test_config_log_format_defaults_to_rich_and_is_validated(monkeypatch):
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "bot:tok")
+    monkeypatch.setenv("ALLOWED_CHAT_ID", "123456789")
+
+    assert Config.from_env().log_format == "rich"
+
+    monkeypatch.setenv("LOG_FORMAT", "JSON")
+    assert Config.from_env().log_format == "json"
+
+    monkeypatch.setenv("LOG_FORMAT", "xml")
+    with pytest.raises(ValueError, match="LOG_FORMAT"):
+        Config.from_env()
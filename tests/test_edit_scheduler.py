@@ -0,0 +1,130 @@
+"""TDD: EditScheduler tests written FIRST"""
+import asyncio
+from datetime import timedelta
+
+from unittest.mock import AsyncMock, MagicMock
+
+from telegram.error import BadRequest, RetryAfter
+
+from src.telegram.compat import retry_after_error
+from src.telegram.edit_scheduler import EditScheduler
+from src.telegram.ratelimit import LaneDropped
+
+
+def make_bot() -> MagicMock:
+    bot = MagicMock()
+    bot.edit_message_text = AsyncMock()
+    bot.send_message = AsyncMock()
+    return bot
+
+
+def make_scheduler(bot, state: dict, min_interval=0.01, max_interval=0.05) -> EditScheduler:
+    return EditScheduler(
+        bot, 1, 7, source=lambda: state["text"], shown="...",
+        min_interval=min_interval, max_interval=max_interval,
+    )
+
+
+def edited_texts(bot) -> list[str]:
+    return [c.kwargs["text"] for c in bot.edit_message_text.call_args_list]
+
+
+async def test_coalesces_to_newest_text():
+    bot = make_bot()
+    state = {"text": ""}
+    editor = make_scheduler(bot, state, min_interval=0.05, max_interval=0.05)
+    list(map(lambda i: (state.update(text="x" * 50 * i), editor.notify()), range(1, 6)))
+    await asyncio.sleep(0.08)
+    assert edited_texts(bot) == ["x" * 250]
+    assert await editor.close()
+
+
+async def test_small_growth_is_held_until_max_interval():
+    bot = make_bot()
+    state = {"text": "ab"}
+    editor = make_scheduler(bot, state, min_interval=0.01, max_interval=0.1)
+    editor.notify()
+    await asyncio.sleep(0.04)
+    assert bot.edit_message_text.await_count == 0
+    await asyncio.sleep(0.1)
+    assert edited_texts(bot) == ["ab"]
+    await editor.close()
+
+
+async def test_retry_after_defers_next_edit_and_final_lands():
+    bot = make_bot()
+    bot.edit_message_text.side_effect = [RetryAfter(timedelta(seconds=0.1)), None]
+    state = {"text": "y" * 60}
+    editor = make_scheduler(bot, state)
+    editor.notify()
+    await asyncio.sleep(0.03)
+    assert bot.edit_message_text.await_count == 1
+    assert editor.throttled == 1
+
+    state["text"] = "y" * 60 + " done"
+    loop = asyncio.get_running_loop()
+    before = loop.time()
+    assert await editor.close()
+    assert loop.time() - before >= 0.05
+    assert edited_texts(bot)[-1] == "y" * 60 + " done"
+
+
+async def test_unmodified_final_counts_as_delivered():
+    bot = make_bot()
+    bot.edit_message_text.side_effect = BadRequest("Message is not modified")
+    editor = make_scheduler(bot, {"text": "same"})
+    assert await editor.close()
+    bot.send_message.assert_not_awaited()
+
+
+async def test_uneditable_message_falls_back_to_new_message():
+    bot = make_bot()
+    bot.edit_message_text.side_effect = BadRequest("Message to edit not found")
+    editor = make_scheduler(bot, {"text": "final answer"})
+    assert await editor.close()
+    assert bot.send_message.call_args.kwargs["text"] == "final answer"
+
+
+async def test_interval_tracks_edit_latency():
+    bot = make_bot()
+
+    async def slow_edit(**kwargs):
+        await asyncio.sleep(0.02)
+
+    bot.edit_message_text.side_effect = slow_edit
+    editor = make_scheduler(bot, {"text": "z" * 100}, min_interval=0.001, max_interval=1.0)
+    editor.notify()
+    await asyncio.sleep(0.05)
+    assert editor.edits == 1
+    assert editor.interval > 0.001
+    await editor.close()
+
+
+async def test_on_edit_called_for_each_landed_edit():
+    bot = make_bot()
+    state = {"text": "x" * 50}
+    landed = []
+    editor = EditScheduler(
+        bot, 1, 7, source=lambda: state["text"], shown="...",
+        min_interval=0.01, max_interval=0.05, on_edit=lambda: landed.append(editor.shown),
+    )
+    editor.notify()
+    await asyncio.sleep(0.03)
+    assert await editor.close("done")
+    assert landed == ["x" * 50, "done"]
+
+
+async def test_edit_dropped_by_rate_limiter_is_retried_quietly(caplog):
+    bot = make_bot()
+    bot.edit_message_text.side_effect = [
+        retry_after_error(LaneDropped, 0.03), None, None,
+    ]
+    state = {"text": "x" * 50}
+    editor = make_scheduler(bot, state)
+    editor.notify()
+    await asyncio.sleep(0.06)
+
+    assert edited_texts(bot) == ["x" * 50, "x" * 50]
+    assert (editor.dropped, editor.throttled) == (1, 0)
+    assert not caplog.records
+    assert await editor.close()
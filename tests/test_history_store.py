@@ -0,0 +1,97 @@
+"""TDD: SQLite-backed MessageHistoryStore tests written FIRST"""
+import json
+import sqlite3
+
+from src.chat_store import HistoryEntry, MessageHistoryStore
+
+
+def _make_store(tmp_path, max_per_sender: int = 4) -> MessageHistoryStore:
+    return MessageHistoryStore(
+        path=tmp_path / "history.db",
+        max_per_sender=max_per_sender,
+        legacy_path=tmp_path / "history.json",
+    )
+
+
+def test_append_and_get_in_order(tmp_path):
+    store = _make_store(tmp_path)
+    store.append("123", "you", "hello")
+    store.append("123", "bot", "hi")
+    assert store.get("123") == [HistoryEntry("you", "hello"), HistoryEntry("bot", "hi")]
+
+
+def test_get_returns_only_newest_entries(tmp_path):
+    store = _make_store(tmp_path, max_per_sender=2)
+    list(map(lambda i: store.append("123", "you", f"m{i}"), range(5)))
+    assert [e.content for e in store.get("123")] == ["m3", "m4"]
+
+
+def test_full_archive_is_kept(tmp_path):
+    store = _make_store(tmp_path, max_per_sender=2)
+    list(map(lambda i: store.append("123", "you", f"m{i}"), range(5)))
+    assert len(store.get("123", limit=100)) == 5
+
+
+def test_senders_are_isolated_and_normalized(tmp_path):
+    store = _make_store(tmp_path)
+    store.append("\u2066+123\u2069", "you", "a")
+    store.append("456", "you", "b")
+    assert [e.content for e in store.get("123")] == ["a"]
+    assert [e.content for e in store.get("456")] == ["b"]
+
+
+def test_delete_clears_only_that_sender(tmp_path):
+    store = _make_store(tmp_path)
+    store.append("123", "you", "a")
+    store.append("456", "you", "b")
+    store.delete("123")
+    assert store.get("123") == []
+    assert len(store.get("456")) == 1
+
+
+def test_history_persists_across_instances(tmp_path):
+    _make_store(tmp_path).append("123", "you", "hello")
+    assert _make_store(tmp_path).get("123") == [HistoryEntry("you", "hello")]
+
+
+def test_database_uses_wal_and_sender_index(tmp_path):
+    _make_store(tmp_path)
+    conn = sqlite3.connect(tmp_path / "history.db")
+    (mode,) = conn.execute("PRAGMA journal_mode").fetchone()
+    indexes = conn.execute("PRAGMA index_list(history)").fetchall()
+    assert mode == "wal"
+    assert any(row[1] == "history_sender_seq" for row in indexes)
+
+
+def test_legacy_json_is_imported_once(tmp_path):
+    legacy = tmp_path / "history.json"
+    legacy.write_text(json.dumps({
+        "123": [{"role": "you", "content": "old q"}, {"role": "bot", "content": "old a"}],
+    }))
+    store = _make_store(tmp_path)
+    assert [e.content for e in store.get("123")] == ["old q", "old a"]
+
+    reopened = _make_store(tmp_path)
+    assert len(reopened.get("123", limit=100)) == 2
+
+
+def test_corrupt_legacy_json_starts_empty(tmp_path):
+    (tmp_path / "history.json").write_text("{not json")
+    assert _make_store(tmp_path).get("123") == []
+
+
+def test_malformed_legacy_entries_are_skipped_and_senders_normalized(tmp_path):
+    (tmp_path / "history.json").write_text(json.dumps({
+        "+1 (23)": [{"role": "you", "content": "kept"}, "not an entry", 7],
+        "456": "not a list",
+        "789": None,
+    }))
+    store = _make_store(tmp_path)
+
+    assert [e.content for e in store.get("123")] == ["kept"]
+    assert store.get("456") == []
+
+
+def test_legacy_json_that_is_not_an_object_starts_empty(tmp_path):
+    (tmp_path / "history.json").write_text("[1, 2, 3]")
+    assert _make_store(tmp_path).get("123") == []
@@ -0,0 +1,38 @@
+"""TDD: load harness tests written FIRST"""
+import json
+import subprocess
+
+from benchmarks.fake_cli import install
+from benchmarks.load import measure, parser
+from src.streaming import ClaudeStreamParser, FinalResult, TextBuffer
+
+
+def test_fake_cli_streams_what_the_parser_expects(tmp_path):
+    claude, _ = install(tmp_path, delay=0, tokens=5, rate=0)
+
+    out = subprocess.run(
+        [str(claude), "-p", "req-1-1.", "--output-format", "stream-json", "--verbose",
+         "--include-partial-messages"],
+        capture_output=True, check=True, text=True,
+    ).stdout
+
+    parser_, buffer = ClaudeStreamParser(), TextBuffer()
+    events = [e for line in out.splitlines() for e in parser_.feed_line(line)]
+    list(map(buffer.apply, events))
+    assert buffer.text == "word0 word1 word2 word3 word4 req-1-1."
+    assert isinstance(events[-1], FinalResult)
+
+
+async def test_load_run_reports_latency_throughput_and_rss(tmp_path):
+    args = parser().parse_args([
+        "--chats", "2", "--messages", "2", "--tokens", "5", "--token-rate", "0",
+        "--cli-delay", "0", "--api-latency", "0", "--no-rate-limit", "--timeout", "20",
+    ])
+
+    result = await measure(args)
+
+    assert (result["replies"], result["failed"]) == (4, 0)
+    assert result["latency_seconds"]["p50"] <= result["latency_seconds"]["p99"]
+    assert result["bot_api_calls"]["sendMessage"] >= 4
+    assert result["peak_rss_mb"] > 0
+    json.dumps(result)
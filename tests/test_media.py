@@ -0,0 +1,107 @@
+"""TDD: media buffer and download tests written FIRST"""
+import base64
+import io
+
+import httpx
+import pytest
+from unittest.mock import MagicMock
+
+from src.constants import BASE64_CHUNK
+from src.media import MediaBuffer, ViewReader, encode_base64
+from src.telegram.download import MediaDownloader
+
+
+def test_encode_matches_stdlib_for_all_buffer_types():
+    data = bytes(range(256)) * 10
+    expected = base64.b64encode(data).decode()
+    assert encode_base64(data) == expected
+    assert encode_base64(bytearray(data)) == expected
+    assert encode_base64(memoryview(data)) == expected
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, BASE64_CHUNK - 1, BASE64_CHUNK, 2 * BASE64_CHUNK + 1])
+def test_encode_across_chunk_boundaries(size):
+    data = bytes(range(256)) * (size // 256 + 1)
+    assert encode_base64(data[:size]) == base64.b64encode(data[:size]).decode()
+
+
+def test_view_reader_reads_and_seeks_like_a_file():
+    reader = io.BufferedReader(ViewReader(memoryview(b"hello world")))
+    assert reader.read(5) == b"hello"
+    assert reader.seek(0, io.SEEK_END) == 11
+    reader.seek(6)
+    assert reader.read() == b"world"
+
+
+def test_buffer_preallocated_from_expected_size():
+    with MediaBuffer(expected_size=8, spill_threshold=100) as media:
+        media.write(b"abc")
+        media.write(b"defgh")
+        assert bytes(media.view) == b"abcdefgh"
+        assert not media.spilled
+
+
+def test_buffer_handles_wrong_expected_size():
+    with MediaBuffer(expected_size=10) as short:
+        short.write(b"abc")
+        assert bytes(short.view) == b"abc"
+    with MediaBuffer(expected_size=2) as long:
+        long.write(b"abc")
+        long.write(b"def")
+        assert bytes(long.view) == b"abcdef"
+
+
+def test_buffer_spills_to_disk_past_threshold():
+    with MediaBuffer(expected_size=0, spill_threshold=4) as media:
+        media.write(b"abc")
+        assert not media.spilled
+        media.write(b"defgh")
+        assert media.spilled
+        assert bytes(media.view) == b"abcdefgh"
+    with MediaBuffer(expected_size=10, spill_threshold=4) as known:
+        assert known.spilled
+
+
+def test_buffer_close_releases_view():
+    media = MediaBuffer(spill_threshold=2)
+    media.write(b"abcdef")
+    view = media.view
+    media.close()
+    with pytest.raises(ValueError):
+        bytes(view)
+
+
+async def test_downloader_streams_url_into_buffer():
+    body = bytes(range(256)) * 1000
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body)
+
+    downloader = MediaDownloader(spill_threshold=64 * 1024)
+    downloader._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    tg_file = MagicMock(file_path="https://api.telegram.org/file/botTOKEN/voice.ogg", file_size=None)
+    try:
+        with await downloader.fetch(tg_file) as media:
+            assert media.spilled
+            assert media.view == body
+    finally:
+        await downloader.aclose()
+
+
+async def test_downloader_error_hides_url():
+    downloader = MediaDownloader()
+    downloader._http = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(404))
+    )
+    tg_file = MagicMock(file_path="https://api.telegram.org/file/botSECRET/x.jpg", file_size=3)
+    with pytest.raises(RuntimeError) as info:
+        await downloader.fetch(tg_file)
+    await downloader.aclose()
+    assert "SECRET" not in str(info.value)
+
+
+async def test_downloader_reads_local_bot_api_files(tmp_path):
+    path = tmp_path / "photo.jpg"
+    path.write_bytes(b"jpeg-bytes")
+    with await MediaDownloader().fetch(MagicMock(file_path=str(path), file_size=10)) as media:
+        assert bytes(media.view) == b"jpeg-bytes"
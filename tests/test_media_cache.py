@@ -0,0 +1,128 @@
+"""TDD: MediaCache tests written FIRST"""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.storage.media_cache import MediaCache, media_key
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_key_depends_on_every_component():
+    base = media_key("photo", "uid", "ClaudeVisionClient", "m", "caption")
+    assert base == media_key("photo", "uid", "ClaudeVisionClient", "m", "caption")
+    assert base != media_key("photo", "uid", "ClaudeVisionClient", "m", "other")
+    assert base != media_key("photo", "uid", "OpenAIVisionClient", "m", "caption")
+    assert base != media_key("photo", "uid", "ClaudeVisionClient", "m2", "caption")
+    assert base != media_key("photo", "uid2", "ClaudeVisionClient", "m", "caption")
+
+
+def test_hit_and_miss_counters(tmp_path):
+    cache = MediaCache(tmp_path / "m.db")
+    assert cache.get("k") is None
+    cache.put("k", "hello")
+    assert cache.get("k") == "hello"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_entries_survive_restart(tmp_path):
+    path = tmp_path / "m.db"
+    MediaCache(path).put("k", "persisted")
+    assert MediaCache(path).get("k") == "persisted"
+
+
+def test_ttl_expires_entries(tmp_path):
+    clock = FakeClock()
+    cache = MediaCache(tmp_path / "m.db", ttl=60, clock=clock)
+    cache.put("k", "v")
+    clock.now += 61
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_size_bound_evicts_least_recently_used(tmp_path):
+    clock = FakeClock()
+    cache = MediaCache(tmp_path / "m.db", max_entries=2, memory_entries=1, clock=clock)
+    cache.put("a", "1")
+    clock.now += 1
+    cache.put("b", "2")
+    clock.now += 1
+    assert cache.get("a") == "1"  # a is now more recent than b
+    clock.now += 1
+    cache.put("c", "3")
+    assert len(cache) == 2
+    assert MediaCache(tmp_path / "m.db", clock=clock).get("b") is None
+
+
+async def test_voice_cache_hit_skips_download_and_transcription(tmp_path):
+    from src.telegram.client import TelegramClient
+    from src.transcription.client import TranscriptionClient
+    from tests.test_telegram_client import make_config
+
+    class FakeTranscriber(TranscriptionClient):
+        model = "whisper-1"
+        transcribe = AsyncMock(return_value="hello")
+
+    transcriber = FakeTranscriber()
+    client = TelegramClient(
+        make_config(), transcriber=transcriber, media_cache=MediaCache(tmp_path / "m.db")
+    )
+
+    audio = tmp_path / "voice.ogg"
+    audio.write_bytes(b"ogg")
+
+    def voice_update() -> MagicMock:
+        update = MagicMock()
+        update.effective_chat.id = 123456789
+        update.message.voice.file_unique_id = "same-file"
+        update.message.voice.get_file = AsyncMock(
+            return_value=MagicMock(file_path=str(audio), file_size=3)
+        )
+        update.message.date.timestamp.return_value = 1000.0
+        return update
+
+    handler = client._make_voice_handler(AsyncMock())
+    second = voice_update()
+    typing = MagicMock(start=AsyncMock(), stop=AsyncMock())
+    with (
+        patch.object(client, "_process", new=AsyncMock()) as process,
+        patch("src.telegram.client.TelegramTypingIndicator", return_value=typing),
+    ):
+        await handler(voice_update(), MagicMock())
+        await handler(second, MagicMock())
+
+    transcriber.transcribe.assert_awaited_once()
+    second.message.voice.get_file.assert_not_awaited()
+    assert process.await_args.args[0].content == "hello"
+
+
+def test_eviction_also_drops_the_memory_front(tmp_path):
+    clock = FakeClock()  # never advances: every row ties on `accessed`
+    cache = MediaCache(tmp_path / "m.db", max_entries=2, memory_entries=2, clock=clock)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"
+    cache.put("c", "3")
+
+    served = [k for k in "abc" if cache.get(k) is not None]
+    assert len(cache) == 2
+    assert len(served) == 2
+
+
+def test_trim_waits_until_the_table_is_over_the_bound(tmp_path):
+    clock = FakeClock()
+    cache = MediaCache(tmp_path / "m.db", max_entries=3, ttl=60, clock=clock)
+    cache.put("old", "1")
+    clock.now += 61
+    cache.put("new", "2")
+    cache.put("new", "2 again")   # a replace is not a new row
+    assert len(cache) == 2       # expired "old" is only swept once over the bound
+
+    cache.put("x", "3")
+    cache.put("y", "4")
+    assert len(cache) == 3
+    assert cache.get("old") is None
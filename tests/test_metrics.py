@@ -0,0 +1,135 @@
+"""TDD: metrics registry and /metrics endpoint tests written FIRST"""
+import asyncio
+import dataclasses
+from unittest.mock import AsyncMock, patch
+
+import httpx
+
+from benchmarks.fake_bot_api import FakeBotAPI
+from src.constants import ROUTE_CLAUDE, SPAWN_KIND_CLAUDE
+from src.message_handler import ChatMessage
+from src.metrics import SUBPROCESS_SECONDS, Counter, Gauge, Histogram, render, reply_route
+from src.router import MessageRouter, _first_byte
+from src.telegram.client import TelegramClient
+from tests.test_router import make_config as make_router_config
+from tests.test_telegram_client import make_config
+from tests.test_webhook import free_port
+
+TOKEN = "123:test"
+
+
+def test_histogram_renders_cumulative_buckets_sum_and_count():
+    registry: list = []
+    latency = Histogram("op_seconds", "Op latency.", ("op",), buckets=(0.1, 1.0), registry=registry)
+
+    list(map(latency.labels("read").observe, (0.05, 0.5, 0.5, 3.0)))
+    latency.labels('we"ird').observe(0.1)
+
+    lines = render(registry).splitlines()
+    assert lines[:2] == ["# HELP op_seconds Op latency.", "# TYPE op_seconds histogram"]
+    assert 'op_seconds_bucket{op="read",le="0.1"} 1' in lines
+    assert 'op_seconds_bucket{op="read",le="1"} 3' in lines
+    assert 'op_seconds_bucket{op="read",le="+Inf"} 4' in lines
+    assert 'op_seconds_sum{op="read"} 4.05' in lines
+    assert 'op_seconds_count{op="read"} 4' in lines
+    # an observation on a bound falls in that bucket; label values are escaped
+    assert 'op_seconds_bucket{op="we\\"ird",le="0.1"} 1' in lines
+
+
+def test_counter_and_gauge_including_scrape_time_functions():
+    registry: list = []
+    dropped = Counter("dropped", "Dropped calls.", ("lane",), registry=registry)
+    depth = Gauge("depth", "Queue depth.", ("queue",), registry=registry)
+    queue: list[int] = [1, 2]
+
+    dropped.labels("edit").inc()
+    dropped.labels("edit").inc(2)
+    depth.labels("manual").set(5)
+    depth.labels("manual").dec()
+    depth.labels("live").set_function(lambda: len(queue))
+    queue.append(3)
+
+    text = render(registry)
+    assert 'dropped_total{lane="edit"} 3' in text
+    assert 'depth{queue="manual"} 4' in text
+    assert 'depth{queue="live"} 3' in text
+
+
+async def test_router_sets_route_and_times_the_cli_call(monkeypatch):
+    router = MessageRouter(make_router_config(monkeypatch))
+    child = SUBPROCESS_SECONDS.labels(SPAWN_KIND_CLAUDE)
+    before = child.count
+
+    async def _run() -> str:
+        with patch.object(router, "_run_claude_cli", new=AsyncMock(return_value="4")):
+            return await router.handle(ChatMessage(sender="123456789", content="@claude 2+2?", timestamp=0))
+
+    # the route is set in the caller's context, where the client reads it
+    task = asyncio.create_task(_run())
+    assert await task == "4"
+    assert child.count == before + 1
+    assert reply_route.get() is None
+
+    with patch.object(router, "_run_claude_cli", new=AsyncMock(return_value="4")):
+        await router.handle(ChatMessage(sender="123456789", content="@claude 2+2?", timestamp=0))
+    assert reply_route.get() == ROUTE_CLAUDE
+    reply_route.set(None)
+
+
+async def test_first_byte_wrapper_closes_the_inner_stream_when_closed():
+    closed = asyncio.Event()
+
+    async def turn():
+        try:
+            yield "one"
+            yield "two"
+        finally:
+            closed.set()
+
+    outer = _first_byte(SPAWN_KIND_CLAUDE, 0.0, turn())
+    assert await anext(outer) == "one"
+    await outer.aclose()
+
+    assert closed.is_set()
+
+async def test_metrics_endpoint_reports_the_reply_and_bot_api_calls():
+    api = await FakeBotAPI(TOKEN).start()
+    port, metrics_port = free_port(), free_port()
+    config = dataclasses.replace(
+        make_config(token=TOKEN),
+        telegram_api_url=api.url,
+        telegram_mode="webhook",
+        webhook_url=f"http://127.0.0.1:{port}/hook",
+        webhook_listen="127.0.0.1",
+        webhook_port=port,
+        webhook_secret="s3cret",
+        metrics_port=metrics_port,
+    )
+    client = TelegramClient(config)
+    replied = asyncio.Event()
+    api.on_sent = lambda sent: replied.set()
+
+    async def on_message(message) -> str:
+        return "echo: " + message.content
+
+    client.build_application(on_message)
+    stop = asyncio.Event()
+    serving = asyncio.create_task(client.serve_webhook(stop))
+    try:
+        while api.webhook is None:
+            await asyncio.sleep(0.01)
+        await api.inject(123456789, "hello")
+        await asyncio.wait_for(replied.wait(), 5)
+        async with httpx.AsyncClient() as http:
+            response = await http.get(f"http://127.0.0.1:{metrics_port}/metrics")
+    finally:
+        stop.set()
+        await serving
+        await api.stop()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'bot_reply_seconds_count{route="text"}' in response.text
+    assert 'telegram_api_seconds_count{method="sendMessage"}' in response.text
+    assert 'telegram_pool_wait_seconds_count{method="setWebhook"}' in response.text
+    assert 'bot_queue_depth{queue="telegram_updates"} 0' in response.text
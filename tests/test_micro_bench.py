@@ -0,0 +1,43 @@
+"""TDD: microbenchmark regression check tests written FIRST"""
+import json
+
+from benchmarks.micro import main, parser, regressions
+
+
+def test_regressions_are_cases_over_the_threshold_with_a_baseline():
+    baseline = {"a": 1.0, "b": 1.0, "c": 1.0}
+    results = {"a": 1.2, "b": 1.3, "c": 0.5, "new": 9.0}
+
+    assert regressions(results, baseline, threshold=25) == [("b", 1.0, 1.3)]
+
+
+def test_save_then_check_against_the_stored_baseline(tmp_path, capsys):
+    baseline = tmp_path / "micro.json"
+    small = ["--senders", "200", "--response-mb", "0.01", "--repeat", "1", "--baseline", str(baseline)]
+
+    assert main(parser().parse_args(small + ["--only", "chat_store|parse_line", "--save"])) == 0
+    saved = json.loads(baseline.read_text())
+    assert set(saved["results"]) == {"chat_store.set", "streaming.parse_line"}
+    assert saved["sizes"]["senders"] == 200
+
+    # a baseline no real run can match: every case regresses
+    saved["results"] = {name: 1e-12 for name in saved["results"]}
+    baseline.write_text(json.dumps(saved))
+    assert main(parser().parse_args(small + ["--only", "chat_store|parse_line", "--check"])) == 1
+    assert "REGRESSION chat_store.set" in capsys.readouterr().out
+
+
+def test_save_refuses_to_mix_sizes_in_one_baseline(tmp_path, capsys):
+    baseline = tmp_path / "micro.json"
+    common = ["--response-mb", "0.01", "--repeat", "1", "--baseline", str(baseline), "--save"]
+    assert main(parser().parse_args(["--senders", "200", "--only", "chat_store|parse_line", *common])) == 0
+    before = baseline.read_text()
+
+    # chat_store.set would stay at 200 senders under a "sizes" of 300
+    assert main(parser().parse_args(["--senders", "300", "--only", "parse_line", *common])) == 2
+    assert "chat_store.set" in capsys.readouterr().out
+    assert baseline.read_text() == before
+
+    # re-running every stored case at the new sizes replaces them all
+    assert main(parser().parse_args(["--senders", "300", "--only", "chat_store|parse_line", *common])) == 0
+    assert json.loads(baseline.read_text())["sizes"]["senders"] == 300
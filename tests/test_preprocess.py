@@ -0,0 +1,54 @@
+"""TDD: image preprocessing tests written FIRST"""
+import io
+
+import pytest
+from telegram import PhotoSize
+
+from src.vision.preprocess import choose_photo, downsample, prepare_image
+
+
+def sizes() -> list[PhotoSize]:
+    return [
+        PhotoSize(f"id{side}", f"u{side}", side, side * 3 // 4)
+        for side in (90, 320, 800, 1280, 2560)
+    ]
+
+
+def test_choose_smallest_size_meeting_target():
+    assert choose_photo(sizes(), 1000).width == 1280
+    assert choose_photo(sizes(), 800).width == 800
+
+
+def test_choose_largest_when_target_exceeds_all_or_disabled():
+    assert choose_photo(sizes(), 4000).width == 2560
+    assert choose_photo(sizes(), 0).width == 2560
+
+
+def test_choose_uses_long_side_for_portrait():
+    portrait = [PhotoSize("a", "a", 600, 1300), PhotoSize("b", "b", 1200, 2600)]
+    assert choose_photo(portrait, 1280).file_id == "a"
+
+
+def _jpeg(width: int, height: int) -> bytes:
+    Image = pytest.importorskip("PIL.Image")
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), (120, 30, 200)).save(out, format="JPEG")
+    return out.getvalue()
+
+
+def test_downsample_limits_long_side():
+    Image = pytest.importorskip("PIL.Image")
+
+    small = downsample(_jpeg(3000, 2000), 1280, 85)
+    with Image.open(io.BytesIO(small)) as img:
+        assert max(img.size) == 1280
+
+
+def test_downsample_keeps_small_images_untouched():
+    data = _jpeg(640, 480)
+    assert downsample(data, 1280, 85) is data
+
+
+async def test_prepare_image_disabled_returns_input():
+    data = b"not an image"
+    assert await prepare_image(data, 0, 85) is data
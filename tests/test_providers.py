@@ -0,0 +1,65 @@
+"""TDD: ProviderRegistry tests written FIRST"""
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.providers import ProviderRegistry
+
+
+async def test_client_is_built_once_and_reused():
+    registry = ProviderRegistry(openai_api_key="k")
+    with patch("src.providers.AsyncOpenAI") as mock_cls:
+        async with registry.openai() as first:
+            pass
+        async with registry.openai() as second:
+            pass
+    assert first is second
+    mock_cls.assert_called_once()
+
+
+async def test_timeout_and_retries_are_passed_to_sdk():
+    registry = ProviderRegistry(anthropic_api_key="k", timeout=12.5, max_retries=5)
+    with patch("src.providers.AsyncAnthropic") as mock_cls:
+        async with registry.anthropic():
+            pass
+    kwargs = mock_cls.call_args.kwargs
+    assert kwargs["timeout"] == 12.5
+    assert kwargs["max_retries"] == 5
+    assert kwargs["http_client"] is not None
+
+
+async def test_concurrency_limit_per_provider():
+    registry = ProviderRegistry(openai_api_key="k", anthropic_api_key="k", openai_max_concurrency=2)
+    active = peak = 0
+
+    async def call() -> None:
+        nonlocal active, peak
+        async with registry.openai():
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    with patch("src.providers.AsyncOpenAI"):
+        await asyncio.gather(*(call() for _ in range(6)))
+    assert peak == 2
+
+
+async def test_missing_key_raises():
+    registry = ProviderRegistry()
+    assert not registry.has("openai")
+    with pytest.raises(RuntimeError):
+        async with registry.openai():
+            pass
+
+
+async def test_aclose_closes_opened_clients():
+    registry = ProviderRegistry(openai_api_key="k", anthropic_api_key="k")
+    sdk = MagicMock()
+    sdk.close = AsyncMock()
+    with patch("src.providers.AsyncOpenAI", return_value=sdk):
+        async with registry.openai():
+            pass
+        await registry.aclose()
+    sdk.close.assert_awaited_once()
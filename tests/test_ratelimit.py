@@ -0,0 +1,115 @@
+"""TDD: LaneRateLimiter tests written FIRST"""
+import asyncio
+import time
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from telegram.error import RetryAfter
+
+from src.constants import LANE_EDIT, LANE_FINAL, LANE_TYPING
+from src.telegram.compat import seconds_attr
+from src.telegram.ratelimit import LaneDropped, LaneRateLimiter, endpoint_lane, priority
+
+
+def call(limiter: LaneRateLimiter, endpoint: str, chat_id: int | None = 1, callback=None):
+    callback = callback or AsyncMock(return_value=True)
+    data = {} if chat_id is None else {"chat_id": chat_id}
+    return limiter.process_request(callback, (), {}, endpoint, data, None)
+
+
+def test_lanes_follow_the_endpoint():
+    assert endpoint_lane("sendMessage") == LANE_FINAL
+    assert endpoint_lane("sendDocument") == LANE_FINAL
+    assert endpoint_lane("editMessageText") == LANE_EDIT
+    assert endpoint_lane("sendChatAction") == LANE_TYPING
+    assert endpoint_lane("getFile") is None
+
+
+async def test_final_calls_wait_for_a_token():
+    limiter = LaneRateLimiter(global_rate=100, global_burst=100, chat_rate=20, chat_burst=1)
+
+    started = time.monotonic()
+    await asyncio.gather(*(call(limiter, "sendMessage") for _ in range(3)))
+
+    assert time.monotonic() - started >= 0.09
+    final = limiter.lanes[LANE_FINAL]
+    assert final.admitted == 3
+    assert final.worst_wait >= 0.09
+
+
+async def test_low_lanes_are_dropped_when_the_reserve_is_reached():
+    limiter = LaneRateLimiter(global_rate=100, global_burst=100, chat_rate=0.1, chat_burst=4)
+
+    await call(limiter, "sendMessage")
+    await call(limiter, "sendMessage")        # 2 of 4 tokens left
+    with pytest.raises(LaneDropped):
+        await call(limiter, "sendChatAction")  # typing leaves half the burst
+    await call(limiter, "editMessageText")     # edit may go down to 20 %
+    with pytest.raises(LaneDropped) as dropped:
+        await call(limiter, "editMessageText")
+    await call(limiter, "sendMessage")         # final takes the last token
+
+    assert limiter.lanes[LANE_TYPING].dropped == 1
+    assert (limiter.lanes[LANE_EDIT].admitted, limiter.lanes[LANE_EDIT].dropped) == (1, 1)
+    assert seconds_attr(dropped.value, "retry_after") > 1
+    # other chats have their own bucket
+    await call(limiter, "sendChatAction", chat_id=2)
+
+
+async def test_low_lanes_yield_to_a_queued_final_call():
+    limiter = LaneRateLimiter(global_rate=100, global_burst=100, chat_rate=20, chat_burst=1)
+    await call(limiter, "sendMessage")
+    queued = asyncio.create_task(call(limiter, "sendMessage"))
+    await asyncio.sleep(0)
+
+    with pytest.raises(LaneDropped):
+        await call(limiter, "editMessageText", chat_id=1)
+    await queued
+
+
+async def test_priority_makes_an_edit_final():
+    limiter = LaneRateLimiter(global_rate=100, global_burst=100, chat_rate=20, chat_burst=1)
+    await call(limiter, "sendMessage")
+
+    with priority(LANE_FINAL):
+        await call(limiter, "editMessageText")
+
+    assert limiter.lanes[LANE_FINAL].admitted == 2
+    assert limiter.lanes[LANE_EDIT].dropped == 0
+
+
+async def test_telegram_flood_control_blocks_and_final_is_retried():
+    limiter = LaneRateLimiter(global_rate=100, global_burst=100, chat_rate=100, chat_burst=100)
+    flaky = AsyncMock(side_effect=[RetryAfter(timedelta(seconds=0.05)), True])
+
+    assert await call(limiter, "sendMessage", callback=flaky) is True
+    assert flaky.await_count == 2
+    assert limiter.lanes[LANE_FINAL].worst_wait >= 0.04
+
+    flood = AsyncMock(side_effect=RetryAfter(timedelta(seconds=1)))
+    with pytest.raises(RetryAfter):
+        await call(limiter, "sendChatAction", callback=flood)
+    with pytest.raises(LaneDropped):
+        await call(limiter, "sendChatAction")
+
+
+async def test_calls_outside_the_lanes_are_not_limited():
+    limiter = LaneRateLimiter(global_rate=1, global_burst=1, chat_rate=1, chat_burst=1)
+    results = await asyncio.gather(*(call(limiter, "getFile", chat_id=None) for _ in range(5)))
+
+    assert results == [True] * 5
+    assert sum(s.admitted for s in limiter.lanes.values()) == 0
+
+
+async def test_chat_buckets_are_an_lru_capped_at_max_chats(monkeypatch):
+    monkeypatch.setattr("src.telegram.ratelimit.RATE_LIMIT_MAX_CHATS", 2)
+    # slow refill: no bucket is full again, which the old prune relied on
+    limiter = LaneRateLimiter(global_rate=100, global_burst=100, chat_rate=0.01, chat_burst=5)
+
+    await call(limiter, "sendMessage", chat_id=1)
+    await call(limiter, "sendMessage", chat_id=2)
+    await call(limiter, "sendMessage", chat_id=1)
+    await call(limiter, "sendMessage", chat_id=3)
+
+    assert list(limiter._chats) == ["1", "3"]
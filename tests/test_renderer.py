@@ -0,0 +1,117 @@
+"""TDD: long-reply rendering tests written FIRST"""
+import asyncio
+
+from unittest.mock import AsyncMock, MagicMock
+
+from src.streaming import FinalResult, TextBuffer, TextDelta
+from src.telegram.renderer import StreamRenderer, plan_reply, split_text
+
+
+def make_bot() -> MagicMock:
+    bot = MagicMock()
+    bot.edit_message_text = AsyncMock()
+    bot.send_message = AsyncMock(side_effect=lambda **kw: MagicMock(message_id=100 + bot.send_message.await_count))
+    bot.send_document = AsyncMock()
+    return bot
+
+
+def test_split_prefers_newline_in_second_half():
+    text = "a" * 6 + "\n" + "b" * 6
+    assert split_text(text, limit=10) == ["a" * 6 + "\n", "b" * 6]
+
+
+def test_split_hard_cuts_without_a_good_newline():
+    assert split_text("ab\n" + "c" * 20, limit=10) == ["ab\n" + "c" * 7, "c" * 10, "c" * 3]
+
+
+def test_split_round_trips():
+    text = ("line of code\n" * 500) + "x" * 9000
+    assert "".join(split_text(text, limit=4096)) == text
+    assert all(len(p) <= 4096 for p in split_text(text, limit=4096))
+
+
+def test_plan_reply_without_threshold_has_no_tail():
+    pieces, tail = plan_reply("x" * 25, limit=10)
+    assert pieces == ["x" * 10, "x" * 10, "x" * 5]
+    assert tail == ""
+
+
+def test_plan_reply_moves_text_past_threshold_to_document():
+    pieces, tail = plan_reply("x" * 35, document_threshold=20, limit=10)
+    assert pieces == ["x" * 10, "x" * 10]
+    assert tail == "x" * 15
+
+
+async def _stream(renderer: StreamRenderer, buffer: TextBuffer, chunks: list[str]) -> bool:
+    queue = list(chunks)
+    while queue:
+        buffer.apply(TextDelta(queue.pop(0)))
+        await renderer.update()
+        await asyncio.sleep(0.005)
+    return await renderer.close()
+
+
+async def test_stream_rolls_over_and_freezes_earlier_messages():
+    bot = make_bot()
+    buffer = TextBuffer()
+    renderer = StreamRenderer(bot, 1, 7, buffer, limit=10, min_interval=0.001, max_interval=0.001)
+
+    assert await _stream(renderer, buffer, ["x" * 8, "y" * 8, "z" * 8])
+
+    edits = [(c.kwargs["message_id"], c.kwargs["text"]) for c in bot.edit_message_text.call_args_list]
+    assert renderer.messages == 3
+    assert (7, "x" * 8 + "yy") in edits
+    assert edits[-1] == (102, "z" * 4)
+    # once frozen, a message is never edited again
+    assert [m for m, _ in edits].index(101) > max(i for i, (m, _) in enumerate(edits) if m == 7)
+    assert all(len(t) <= 10 for _, t in edits)
+
+
+async def test_stream_beyond_threshold_sends_document_tail():
+    bot = make_bot()
+    buffer = TextBuffer()
+    renderer = StreamRenderer(
+        bot, 1, 7, buffer, document_threshold=15, limit=10, min_interval=0.001, max_interval=0.001
+    )
+
+    assert await _stream(renderer, buffer, ["a" * 10, "b" * 10, "c" * 10])
+
+    assert renderer.messages == 1
+    document = bot.send_document.call_args.kwargs["document"]
+    assert document.closed
+    assert bot.send_document.call_args.kwargs["filename"] == "reply.md"
+
+
+async def test_final_result_rewriting_frozen_text_is_sent_whole():
+    bot = make_bot()
+    buffer = TextBuffer()
+    renderer = StreamRenderer(bot, 1, 7, buffer, min_interval=0.001, max_interval=0.001)
+    buffer.apply(TextDelta("a" * 3000))
+    await renderer.update()
+    buffer.apply(TextDelta("a" * 2500))
+    await renderer.update()
+
+    # after tool use the CLI result is only the last turn, not the streamed text
+    buffer.apply(FinalResult("b" * 5000))
+    await renderer.update()
+    assert await renderer.close()
+
+    edits = [(c.kwargs["message_id"], c.kwargs["text"]) for c in bot.edit_message_text.call_args_list]
+    sent = [c.kwargs["text"] for c in bot.send_message.call_args_list]
+    assert edits[-1] == (101, "b" * 4096)
+    assert sent[-1] == "b" * 904
+    assert all(t == "a" * len(t) for m, t in edits if m == 7)
+
+
+async def test_client_send_message_splits_long_text():
+    from src.telegram.client import TelegramClient
+    from tests.test_telegram_client import make_config
+
+    client = TelegramClient(make_config())
+    client._app = MagicMock()
+    client._app.bot = make_bot()
+
+    assert await client.send_message("123", "x" * 5000)
+
+    sent = [c.kwargs["text"] for c in client._app.bot.send_message.call_args_list]
+    assert sent == ["x" * 4096, "x" * 904]
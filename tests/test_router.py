@@ -255,6 +255,14 @@ def test_status_shows_voice_disabled_when_no_key(monkeypatch):
     assert "disabled" in router.handle_status_command()
 
 
+def test_status_shows_voice_enabled_for_local_backend(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setenv("TRANSCRIPTION_BACKEND", "local")
+    monkeypatch.setattr("src.config.load_dotenv", lambda **_: None)
+    router = MessageRouter(make_config(monkeypatch))
+    assert "enabled (local)" in router.handle_status_command()
+
+
 def test_status_shows_cursor_not_configured(monkeypatch):
     router = MessageRouter(make_config(monkeypatch, cursor_cli=""))
     assert "not configured" in router.handle_status_command()
@@ -0,0 +1,183 @@
+"""TDD: SpawnScheduler tests written FIRST"""
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.message_handler import ChatMessage
+from src.scheduler import Priority, SchedulerBusy, SpawnScheduler
+
+
+def make_scheduler(cap: int = 1, max_queue: int = 5, max_wait: float = 1000) -> SpawnScheduler:
+    return SpawnScheduler({"claude": cap, "cursor": cap}, max_queue=max_queue, max_wait=max_wait)
+
+
+async def _run(scheduler, name, log, priority=Priority.INTERACTIVE, hold=0.0, kind="claude"):
+    async with scheduler.admit(kind, priority):
+        log.append(name)
+        await asyncio.sleep(hold)
+
+
+async def test_cap_limits_concurrent_runs():
+    scheduler = make_scheduler(cap=2)
+    peak = 0
+
+    async def job():
+        nonlocal peak
+        async with scheduler.admit("claude"):
+            peak = max(peak, scheduler.running("claude"))
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(job() for _ in range(6)))
+    assert peak == 2
+    assert scheduler.running("claude") == 0
+
+
+async def test_kinds_have_independent_caps():
+    scheduler = make_scheduler(cap=1)
+    log: list[str] = []
+    await asyncio.gather(
+        _run(scheduler, "claude", log, hold=0.02),
+        _run(scheduler, "cursor", log, kind="cursor"),
+    )
+    assert log == ["claude", "cursor"]
+
+
+async def test_interactive_jumps_ahead_of_media():
+    scheduler = make_scheduler(cap=1)
+    log: list[str] = []
+    first = asyncio.create_task(_run(scheduler, "running", log, hold=0.02))
+    await asyncio.sleep(0)
+    media = asyncio.create_task(_run(scheduler, "media", log, Priority.MEDIA))
+    await asyncio.sleep(0)
+    text = asyncio.create_task(_run(scheduler, "text", log, Priority.INTERACTIVE))
+    await asyncio.gather(first, media, text)
+    assert log == ["running", "text", "media"]
+
+
+async def test_queued_callback_reports_position():
+    scheduler = make_scheduler(cap=1)
+    positions: list[int] = []
+
+    async def on_queued(position: int, expected: float) -> None:
+        positions.append(position)
+
+    async def queued():
+        async with scheduler.admit("claude", on_queued=on_queued):
+            pass
+
+    holder = asyncio.create_task(_run(scheduler, "a", [], hold=0.02))
+    await asyncio.sleep(0)
+    await asyncio.gather(holder, queued(), queued())
+    assert positions == [1, 2]
+
+
+async def test_full_queue_rejects_immediately():
+    scheduler = make_scheduler(cap=1, max_queue=1)
+    holder = asyncio.create_task(_run(scheduler, "a", [], hold=0.05))
+    await asyncio.sleep(0)
+    waiting = asyncio.create_task(_run(scheduler, "b", []))
+    await asyncio.sleep(0)
+
+    with pytest.raises(SchedulerBusy):
+        async with scheduler.admit("claude"):
+            pass
+    await asyncio.gather(holder, waiting)
+
+
+async def test_expected_wait_over_threshold_rejects():
+    scheduler = make_scheduler(cap=1, max_wait=0.0)
+    holder = asyncio.create_task(_run(scheduler, "a", [], hold=0.02))
+    await asyncio.sleep(0)
+
+    with pytest.raises(SchedulerBusy):
+        async with scheduler.admit("claude"):
+            pass
+    await holder
+
+
+async def test_cancelled_waiter_does_not_leak_slot():
+    scheduler = make_scheduler(cap=1)
+    holder = asyncio.create_task(_run(scheduler, "a", [], hold=0.02))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(_run(scheduler, "b", []))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await holder
+    log: list[str] = []
+    await _run(scheduler, "c", log)
+    assert log == ["c"]
+    assert scheduler.running("claude") == 0
+
+
+
+async def test_cancelled_during_queue_notice_does_not_leak_slot():
+    scheduler = make_scheduler(cap=1)
+    noticed = asyncio.Event()
+
+    async def slow_notice(position: int, expected: float) -> None:
+        noticed.set()
+        await asyncio.sleep(10)   # e.g. a Telegram send held by the rate limiter
+
+    async def queued() -> None:
+        async with scheduler.admit("claude", on_queued=slow_notice):
+            pass
+
+    holder = asyncio.create_task(_run(scheduler, "a", [], hold=0.02))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(queued())
+    await noticed.wait()
+    waiter.cancel()
+    await holder
+    log: list[str] = []
+    await asyncio.wait_for(_run(scheduler, "c", log), 1)
+    assert log == ["c"]
+    assert scheduler.running("claude") == 0
+    assert scheduler.depth("claude") == 0
+
+
+# ── router integration ────────────────────────────────────────────────────────
+
+
+def make_config(monkeypatch):
+    from src.config import Config
+
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "test-token")
+    monkeypatch.setenv("ALLOWED_CHAT_ID", "123456789")
+    monkeypatch.setenv("CLAUDE_MAX_PROCESSES", "1")
+    monkeypatch.setenv("SPAWN_QUEUE_MAX", "0")
+    return Config.from_env()
+
+
+async def test_router_replies_busy_when_queue_is_full(monkeypatch):
+    from src.constants import MSG_ERR_BUSY
+    from src.router import MessageRouter
+
+    router = MessageRouter(make_config(monkeypatch))
+    release = asyncio.Event()
+
+    async def slow_run(sender, message):
+        await release.wait()
+        return "done"
+
+    with patch.object(router, "_run_claude_cli", side_effect=slow_run):
+        first = asyncio.create_task(router._call_claude_cli("123", "one"))
+        await asyncio.sleep(0)
+        second = await router._call_claude_cli("123", "two")
+        release.set()
+        assert await first == "done"
+
+    assert second == MSG_ERR_BUSY
+
+
+async def test_router_passes_media_priority_for_voice(monkeypatch):
+    from src.constants import SOURCE_VOICE
+    from src.router import MessageRouter
+
+    router = MessageRouter(make_config(monkeypatch))
+    msg = ChatMessage(sender="123", content="@claude hi", timestamp=0, source=SOURCE_VOICE)
+
+    with patch.object(router, "_call_claude_cli", new=AsyncMock(return_value="ok")) as mock:
+        await router.handle(msg)
+
+    assert mock.call_args.kwargs["priority"] == Priority.MEDIA
@@ -0,0 +1,67 @@
+"""TDD: ChatSequencer tests written FIRST"""
+import asyncio
+
+from src.telegram.sequencer import ChatSequencer
+
+
+async def _job(sequencer: ChatSequencer, key: str, name: str, log: list, delay: float) -> None:
+    with sequencer.slot(key) as slot:
+        await slot.ready()
+        log.append(f"{name}:start")
+        await asyncio.sleep(delay)
+        log.append(f"{name}:end")
+
+
+async def test_same_sender_runs_strictly_in_arrival_order():
+    sequencer, log = ChatSequencer(), []
+    await asyncio.gather(
+        _job(sequencer, "123", "a", log, 0.03),
+        _job(sequencer, "123", "b", log, 0.0),
+        _job(sequencer, "123", "c", log, 0.01),
+    )
+    assert log == ["a:start", "a:end", "b:start", "b:end", "c:start", "c:end"]
+
+
+async def test_different_senders_run_in_parallel():
+    sequencer, log = ChatSequencer(), []
+    await asyncio.gather(
+        _job(sequencer, "123", "a", log, 0.03),
+        _job(sequencer, "456", "b", log, 0.0),
+    )
+    assert log.index("b:end") < log.index("a:end")
+
+
+async def test_work_before_ready_overlaps_but_routing_stays_ordered():
+    sequencer, log = ChatSequencer(), []
+
+    async def media(name: str, prep: float) -> None:
+        with sequencer.slot("123") as slot:
+            await asyncio.sleep(prep)  # e.g. download + transcription
+            log.append(f"{name}:prepared")
+            await slot.ready()
+            log.append(f"{name}:routed")
+
+    await asyncio.gather(media("slow", 0.03), media("fast", 0.0))
+    assert log == ["fast:prepared", "slow:prepared", "slow:routed", "fast:routed"]
+
+
+async def test_early_release_does_not_let_successor_overtake():
+    sequencer, log = ChatSequencer(), []
+
+    async def failing() -> None:
+        with sequencer.slot("123"):
+            return  # e.g. download failed before routing
+
+    await asyncio.gather(
+        _job(sequencer, "123", "a", log, 0.03),
+        failing(),
+        _job(sequencer, "123", "c", log, 0.0),
+    )
+    assert log == ["a:start", "a:end", "c:start", "c:end"]
+
+
+async def test_finished_senders_are_forgotten():
+    sequencer = ChatSequencer()
+    await _job(sequencer, "123", "a", [], 0.0)
+    await asyncio.sleep(0)
+    assert len(sequencer) == 0
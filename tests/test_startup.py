@@ -0,0 +1,99 @@
+"""TDD: lazy imports and cold-start budget tests written FIRST"""
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.fake_bot_api import FakeBotAPI
+from src.constants import STARTUP_BUDGET_SECONDS
+from src.logs import JsonFormatter
+from src.startup import StartupTimer
+
+REPO = Path(__file__).resolve().parent.parent
+TOKEN = "123:test"
+HEAVY = ("anthropic", "openai", "rich", "telegram")
+
+
+def _env(**extra: str) -> dict[str, str]:
+    # no API keys: nothing may pull in an SDK; empty values also mask a local .env
+    return {
+        **os.environ,
+        "PYTHONPATH": str(REPO),
+        "OPENAI_API_KEY": "",
+        "ANTHROPIC_API_KEY": "",
+        "LOG_FORMAT": "plain",
+        **extra,
+    }
+
+
+def test_importing_main_and_plain_or_json_logging_load_no_heavy_modules(tmp_path):
+    script = (
+        "import sys, src.main\n"
+        "from src.logs import setup_logging\n"
+        "setup_logging('INFO', 'plain'); setup_logging('INFO', 'json')\n"
+        f"print(sorted(m for m in {HEAVY!r} if m in sys.modules))\n"
+    )
+
+    out = subprocess.run(
+        [sys.executable, "-c", script], cwd=tmp_path, env=_env(), capture_output=True, check=True, text=True
+    ).stdout
+
+    assert out.strip() == "[]"
+
+
+def test_provider_sdk_names_resolve_on_first_use():
+    import openai
+
+    import src.providers
+
+    assert src.providers.AsyncOpenAI is openai.AsyncOpenAI
+    assert src.providers.OpenAIHttpxClient is openai.DefaultAsyncHttpxClient
+
+
+def test_json_formatter_writes_one_object_per_record():
+    record = logging.LogRecord("src.router", logging.WARNING, __file__, 1, "busy: %s", ("chat",), None)
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["level"] == "WARNING"
+    assert entry["logger"] == "src.router"
+    assert entry["message"] == "busy: chat"
+
+
+def test_startup_timer_reports_phases_and_first_poll():
+    timer = StartupTimer()
+    with timer.phase("import json"):
+        pass
+
+    report = timer.report(0.25)
+
+    assert [name for name, _, _ in timer.phases] == ["import json"]
+    assert "import json" in report
+    assert "time to first poll" in report and "250.0 ms" in report
+
+
+async def test_cold_start_reaches_the_first_poll_within_budget(tmp_path):
+    api = await FakeBotAPI(TOKEN).start()
+    try:
+        started = time.perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "src.main", "--startup-report",
+            cwd=tmp_path,
+            env=_env(TELEGRAM_BOT_TOKEN=TOKEN, ALLOWED_CHAT_ID="123456789", TELEGRAM_API_URL=api.url),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        out, err = await asyncio.wait_for(process.communicate(), 60)
+        elapsed = time.perf_counter() - started
+    finally:
+        await api.stop()
+
+    assert process.returncode == 0, err.decode()
+    assert api.calls.get("getUpdates", 0) >= 1
+    assert "time to first poll" in out.decode()
+    # spawn to exit: interpreter start, imports, getMe, the first getUpdates and shutdown
+    assert elapsed < STARTUP_BUDGET_SECONDS, out.decode()
@@ -0,0 +1,138 @@
+"""TDD: AppendLog tests written FIRST"""
+import json
+import time
+
+from src.chat_store import ChatStore
+from src.storage.log import AppendLog
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+# ── replay ────────────────────────────────────────────────────────────────────
+
+
+def test_appended_records_replay_on_load(tmp_path):
+    log = AppendLog(tmp_path / "s.json")
+    log.append("a", "1")
+    log.append("b", "2")
+    log.append("a", "3")
+    log.close()
+
+    assert AppendLog(tmp_path / "s.json").load() == {"a": "3", "b": "2"}
+
+
+def test_delete_record_removes_key(tmp_path):
+    log = AppendLog(tmp_path / "s.json")
+    log.append("a", "1")
+    log.append("a", None)
+    log.close()
+
+    assert AppendLog(tmp_path / "s.json").load() == {}
+
+
+def test_torn_final_record_is_ignored(tmp_path):
+    log = AppendLog(tmp_path / "s.json")
+    log.append("a", "1")
+    log.close()
+    with open(log.log_path, "ab") as f:
+        f.write(b'{"k":"b","v"')
+
+    assert AppendLog(tmp_path / "s.json").load() == {"a": "1"}
+
+
+def test_appends_after_a_torn_record_survive_the_next_restart(tmp_path):
+    log = AppendLog(tmp_path / "s.json")
+    log.append("a", "1")
+    log.append("b", "2")
+    log.close()
+    with open(log.log_path, "ab") as f:
+        f.write(b'{"k":"c","v":"3')
+
+    log = AppendLog(tmp_path / "s.json")
+    assert log.load() == {"a": "1", "b": "2"}
+    log.append("d", "4")
+    log.append("a", "9")
+    log.close()
+
+    assert AppendLog(tmp_path / "s.json").load() == {"a": "9", "b": "2", "d": "4"}
+
+
+def test_log_tail_applies_over_snapshot(tmp_path):
+    p = tmp_path / "s.json"
+    p.write_text(json.dumps({"a": "old", "b": "keep"}))
+    log = AppendLog(p)
+    log.append("a", "new")
+    log.close()
+
+    assert AppendLog(p).load() == {"a": "new", "b": "keep"}
+
+
+# ── legacy migration ──────────────────────────────────────────────────────────
+
+
+def test_legacy_json_store_loads_and_is_not_rewritten_on_set(tmp_path):
+    p = tmp_path / ".claude_session_ids.json"
+    p.write_text(json.dumps({"972546838910": "session-abc"}, indent=2))
+    before = p.read_text()
+
+    store = ChatStore(path=p)
+    store.set("111", "session-new")
+
+    assert store.get("972546838910") == "session-abc"
+    assert p.read_text() == before
+    assert ChatStore(path=p).get("111") == "session-new"
+
+
+# ── compaction ────────────────────────────────────────────────────────────────
+
+
+def test_compact_writes_snapshot_and_truncates_log(tmp_path):
+    p = tmp_path / "s.json"
+    log = AppendLog(p)
+    log.append("a", "1")
+    log.append("b", "2")
+    log.compact({"a": "1", "b": "2"})
+
+    assert json.loads(p.read_text()) == {"a": "1", "b": "2"}
+    assert log.log_path.read_bytes() == b""
+
+
+def test_compaction_keeps_records_written_after_state_copy(tmp_path):
+    p = tmp_path / "s.json"
+    log = AppendLog(p)
+    log.append("a", "1")
+    log.compact_soon({"a": "1"})
+    log.append("b", "2")
+    assert _wait_for(lambda: not log._compacting)
+    log.close()
+
+    assert AppendLog(p).load() == {"a": "1", "b": "2"}
+
+
+def test_needs_compaction_scales_with_live_keys(tmp_path):
+    log = AppendLog(tmp_path / "s.json", compact_min_records=2)
+    log.append("a", "1")
+    assert not log.needs_compaction(live_keys=1)
+    log.append("a", "2")
+    log.append("a", "3")
+    log.append("a", "4")
+    assert log.needs_compaction(live_keys=1)
+    log.close()
+
+
+# ── group commit ──────────────────────────────────────────────────────────────
+
+
+def test_writes_in_one_window_share_an_fsync(tmp_path):
+    log = AppendLog(tmp_path / "s.json", commit_window=0.2)
+    list(map(lambda i: log.append(str(i), "v"), range(100)))
+
+    assert _wait_for(lambda: log.commits >= 1)
+    assert not log._dirty
+    assert log.commits <= 2
+    log.close()
@@ -0,0 +1,373 @@
+"""TDD: typed streaming protocol tests written FIRST"""
+import json
+import sys
+
+from unittest.mock import AsyncMock, MagicMock
+
+from src.streaming import (
+    FinalResult,
+    StreamError,
+    StreamMeta,
+    TextBuffer,
+    TextDelta,
+    accumulated_text,
+    events_from_accumulated,
+    parse_claude_event,
+    parse_claude_line,
+)
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+# ── Claude stream-json parsing ────────────────────────────────────────────────
+
+
+def test_assistant_event_becomes_text_delta():
+    event = {"type": "assistant", "message": {"content": [{"type": "text", "text": "hi"}]}}
+    assert parse_claude_event(event) == [TextDelta("hi")]
+
+
+def test_result_event_yields_session_meta_and_final():
+    event = {"type": "result", "result": " done ", "session_id": "s1"}
+    assert parse_claude_event(event) == [StreamMeta("session_id", "s1"), FinalResult("done")]
+
+
+def test_error_result_becomes_stream_error():
+    events = parse_claude_event({"type": "result", "result": "boom", "is_error": True})
+    assert isinstance(events[0], StreamError)
+    assert "boom" in events[0].message
+
+
+def test_non_json_line_passes_through_as_text():
+    assert parse_claude_line("plain output\n") == [TextDelta("plain output\n")]
+
+
+def test_blank_and_unknown_lines_yield_nothing():
+    assert parse_claude_line("   \n") == []
+    assert parse_claude_line(json.dumps({"type": "system"})) == []
+
+
+# ── TextBuffer ────────────────────────────────────────────────────────────────
+
+
+def test_buffer_appends_deltas():
+    buffer = TextBuffer()
+    list(map(buffer.apply, [TextDelta("a"), TextDelta("b"), TextDelta("c")]))
+    assert buffer.text == "abc"
+    assert buffer.version == 3
+    assert len(buffer) == 3
+
+
+def test_buffer_final_result_replaces_text_only_when_different():
+    buffer = TextBuffer()
+    buffer.apply(TextDelta("hello"))
+    buffer.apply(FinalResult("hello"))
+    assert buffer.version == 1
+    buffer.apply(FinalResult("hello world"))
+    assert buffer.text == "hello world"
+
+
+def test_buffer_error_on_empty_text_shows_message():
+    buffer = TextBuffer()
+    buffer.apply(StreamError("Error: nope"))
+    assert buffer.text == "Error: nope"
+    assert buffer.failed
+
+
+def test_buffer_ignores_meta():
+    buffer = TextBuffer()
+    buffer.apply(StreamMeta("session_id", "s1"))
+    assert buffer.version == 0
+
+
+# ── adapters ──────────────────────────────────────────────────────────────────
+
+
+async def test_accumulated_text_matches_legacy_contract():
+    events = [TextDelta("a"), StreamMeta("k", "v"), TextDelta("b"), FinalResult("ab!")]
+    assert [t async for t in accumulated_text(_aiter(events))] == ["a", "ab", "ab!"]
+
+
+async def test_events_from_accumulated_produces_deltas():
+    chunks = ["a", "ab", "xyz"]
+    events = [e async for e in events_from_accumulated(_aiter(chunks))]
+    assert events == [TextDelta("a"), TextDelta("b"), FinalResult("xyz")]
+
+
+# ── router + client ───────────────────────────────────────────────────────────
+
+
+async def test_router_stream_handle_adapter_yields_accumulated(monkeypatch):
+    from unittest.mock import patch
+    from src.config import Config
+    from src.message_handler import ChatMessage
+    from src.router import MessageRouter
+
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "test-token")
+    monkeypatch.setenv("ALLOWED_CHAT_ID", "123456789")
+    router = MessageRouter(Config.from_env())
+
+    async def fake_stream(sender, message, priority=None):
+        yield TextDelta("Hel")
+        yield TextDelta("lo")
+        yield FinalResult("Hello")
+
+    msg = ChatMessage(sender="123456789", content="@claude hi", timestamp=0)
+    with patch.object(router, "_stream_claude_cli", side_effect=fake_stream):
+        chunks = [c async for c in router.stream_handle(msg)]
+    router.handle_new_command("123456789")
+
+    assert chunks == ["Hel", "Hello"]
+
+
+async def test_process_streaming_delivers_final_text():
+    from src.message_handler import ChatMessage
+    from src.telegram.client import TelegramClient
+    from tests.test_telegram_client import make_config
+
+    client = TelegramClient(make_config())
+    bot = MagicMock()
+    bot.send_message = AsyncMock(return_value=MagicMock(message_id=7))
+    bot.edit_message_text = AsyncMock()
+
+    async def stream(message):
+        yield TextDelta("par")
+        yield TextDelta("tial")
+        yield FinalResult("partial, done")
+
+    msg = ChatMessage(sender="123456789", content="hi", timestamp=0)
+    await client._process_streaming(msg, bot, stream)
+
+    assert bot.edit_message_text.call_args.kwargs["text"] == "partial, done"
+
+
+# ── partial messages (--include-partial-messages) ─────────────────────────────
+
+
+def _partial(text: str) -> dict:
+    return {
+        "type": "stream_event",
+        "event": {"type": "content_block_delta", "index": 0,
+                  "delta": {"type": "text_delta", "text": text}},
+    }
+
+
+def test_partial_delta_becomes_text_delta():
+    assert parse_claude_event(_partial("tok")) == [TextDelta("tok")]
+
+
+def test_parser_drops_assistant_text_already_streamed_as_partials():
+    from src.streaming import ClaudeStreamParser
+
+    parser = ClaudeStreamParser()
+    assistant = {"type": "assistant", "message": {"content": [{"type": "text", "text": "Hi!"}]}}
+    events = parser.feed_event(_partial("Hi")) + parser.feed_event(_partial("!"))
+    events += parser.feed_event(assistant)
+    assert events == [TextDelta("Hi"), TextDelta("!")]
+
+
+def test_parser_keeps_assistant_text_without_partials():
+    from src.streaming import ClaudeStreamParser
+
+    assistant = {"type": "assistant", "message": {"content": [{"type": "text", "text": "Hi"}]}}
+    assert ClaudeStreamParser().feed_event(assistant) == [TextDelta("Hi")]
+
+
+async def test_partial_mode_passes_flag_and_reports_ttft(monkeypatch):
+    import asyncio
+    from unittest.mock import patch
+    from src.config import Config
+    from src.router import MessageRouter
+    from src.streaming import META_TTFT
+
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "test-token")
+    monkeypatch.setenv("ALLOWED_CHAT_ID", "123456789")
+    monkeypatch.setenv("CLAUDE_PARTIAL_MESSAGES", "true")
+    router = MessageRouter(Config.from_env())
+    captured: list[str] = []
+
+    async def fake_exec(*args, **kwargs):
+        captured.extend(args)
+        stdout = asyncio.StreamReader()
+        stdout.feed_data((json.dumps(_partial("Hel")) + "\n").encode())
+        stdout.feed_data((json.dumps(_partial("lo")) + "\n").encode())
+        stdout.feed_eof()
+        proc = MagicMock()
+        proc.stdout = stdout
+        proc.returncode = 0
+        proc.wait = AsyncMock(return_value=0)
+        return proc
+
+    with patch("asyncio.create_subprocess_exec", side_effect=fake_exec):
+        events = [e async for e in router._stream_claude_cli("123", "hi")]
+
+    assert "--include-partial-messages" in captured
+    assert isinstance(events[0], StreamMeta) and events[0].key == META_TTFT
+    assert events[1:] == [TextDelta("Hel"), TextDelta("lo")]
+
+
+# ── Cursor Agent stream-json ──────────────────────────────────────────────────
+
+
+def _cursor_router(monkeypatch):
+    from src.config import Config
+    from src.router import MessageRouter
+
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "test-token")
+    monkeypatch.setenv("ALLOWED_CHAT_ID", "123456789")
+    monkeypatch.setenv("CURSOR_CLI_PATH", "/usr/bin/agent")
+    return MessageRouter(Config.from_env())
+
+
+def _fake_process(lines: list[str], returncode: int = 0, stderr: bytes = b""):
+    import asyncio
+
+    stdout = asyncio.StreamReader()
+    list(map(lambda line: stdout.feed_data((line + "\n").encode()), lines))
+    stdout.feed_eof()
+    err = asyncio.StreamReader()
+    err.feed_data(stderr)
+    err.feed_eof()
+    proc = MagicMock()
+    proc.stdout, proc.stderr, proc.returncode = stdout, err, returncode
+    proc.wait = AsyncMock(return_value=returncode)
+    return proc
+
+
+async def test_cursor_stream_json_is_parsed_incrementally(monkeypatch):
+    from unittest.mock import patch
+
+    router = _cursor_router(monkeypatch)
+    captured: list[str] = []
+    lines = [
+        json.dumps({"type": "system", "subtype": "init"}),
+        json.dumps({"type": "assistant", "message": {"content": [{"type": "text", "text": "Hel"}]}}),
+        json.dumps({"type": "assistant", "message": {"content": [{"type": "text", "text": "lo"}]}}),
+        json.dumps({"type": "result", "result": "Hello"}),
+    ]
+
+    async def fake_exec(*args, **kwargs):
+        captured.extend(args)
+        return _fake_process(lines)
+
+    with (
+        patch.object(router, "_cursor_chat_id", new=AsyncMock(return_value="chat-1")),
+        patch("asyncio.create_subprocess_exec", side_effect=fake_exec),
+    ):
+        events = [e async for e in router._stream_cursor_cli("123", "hi")]
+
+    assert captured[-2:] == ["--output-format", "stream-json"]
+    assert "chat-1" in captured
+    assert events == [TextDelta("Hel"), TextDelta("lo"), FinalResult("Hello")]
+
+
+async def test_cursor_without_stream_json_falls_back_to_buffered(monkeypatch):
+    from unittest.mock import patch
+
+    router = _cursor_router(monkeypatch)
+    proc = _fake_process([], returncode=1, stderr=b"error: unknown option '--output-format'")
+
+    with (
+        patch.object(router, "_cursor_chat_id", new=AsyncMock(return_value=None)),
+        patch("asyncio.create_subprocess_exec", new=AsyncMock(return_value=proc)),
+        patch.object(router, "_run_cursor_cli", new=AsyncMock(return_value="buffered")) as run,
+    ):
+        first = [e async for e in router._stream_cursor_cli("123", "hi")]
+        second = [e async for e in router._stream_cursor_cli("123", "again")]
+
+    assert first == second == [FinalResult("buffered")]
+    assert router._cursor_streaming is False
+    assert run.await_count == 2
+
+
+async def test_cursor_stream_failure_is_reported_without_a_buffered_rerun(monkeypatch):
+    from unittest.mock import patch
+
+    router = _cursor_router(monkeypatch)
+    proc = _fake_process([], returncode=1, stderr=b"Error: not authenticated, run agent login")
+
+    with (
+        patch.object(router, "_cursor_chat_id", new=AsyncMock(return_value=None)),
+        patch("asyncio.create_subprocess_exec", new=AsyncMock(return_value=proc)),
+        patch.object(router, "_run_cursor_cli", new=AsyncMock(return_value="buffered")) as run,
+    ):
+        events = [e async for e in router._stream_cursor_cli("123", "hi")]
+
+    assert events == [StreamError("Error: Error: not authenticated, run agent login")]
+    assert router._cursor_streaming is True
+    run.assert_not_awaited()
+
+
+FAKE_AGENT = """#!{python}
+import json, sys, time
+sys.stderr.write("noise " * 40000)   # more than a pipe buffer, read by nobody until exit
+block = {{"type": "text", "text": "x" * 200000}}
+print(json.dumps({{"type": "assistant", "message": {{"content": [block]}}}}), flush=True)
+time.sleep(60)
+"""
+
+
+async def test_cursor_stream_reads_long_lines_and_kills_the_agent_when_closed(monkeypatch, tmp_path):
+    import asyncio
+    from unittest.mock import patch
+
+    agent = tmp_path / "agent"
+    agent.write_text(FAKE_AGENT.format(python=sys.executable))
+    agent.chmod(0o755)
+    router = _cursor_router(monkeypatch)
+    spawned: list = []
+    real_exec = asyncio.create_subprocess_exec
+
+    async def tracking_exec(*args, **kwargs):
+        spawned.append(await real_exec(*args, **kwargs))
+        return spawned[-1]
+
+    with (
+        patch.object(router, "_cursor_chat_id", new=AsyncMock(return_value=None)),
+        patch("asyncio.create_subprocess_exec", side_effect=tracking_exec),
+    ):
+        stream = router._run_stream_cursor_cli(str(agent), "123", "hi")
+        first = await asyncio.wait_for(anext(stream), 10)
+        await stream.aclose()
+
+    assert first == TextDelta("x" * 200000)
+    # killed and reaped, not left sleeping behind a closed reply
+    assert spawned[0].returncode is not None
+
+
+async def _collect(events):
+    return [e async for e in events]
+
+
+async def test_claude_oneshot_stream_times_out_and_kills_the_cli(monkeypatch, tmp_path):
+    import asyncio
+    from unittest.mock import patch
+    from src.config import Config
+    from src.constants import MSG_ERR_TIMEOUT
+    from src.router import MessageRouter
+
+    claude = tmp_path / "claude"
+    claude.write_text(FAKE_AGENT.format(python=sys.executable))
+    claude.chmod(0o755)
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "test-token")
+    monkeypatch.setenv("ALLOWED_CHAT_ID", "123456789")
+    monkeypatch.setenv("CLAUDE_CLI_PATH", str(claude))
+    monkeypatch.setenv("CLAUDE_TIMEOUT", "1")
+    router = MessageRouter(Config.from_env())
+    spawned: list = []
+    real_exec = asyncio.create_subprocess_exec
+
+    async def tracking_exec(*args, **kwargs):
+        spawned.append(await real_exec(*args, **kwargs))
+        return spawned[-1]
+
+    with patch("asyncio.create_subprocess_exec", side_effect=tracking_exec):
+        events = await asyncio.wait_for(_collect(router._stream_claude_cli("123", "hi")), 10)
+
+    # the hung CLI is cut off at CLAUDE_TIMEOUT, which also frees its scheduler slot
+    assert events[-1] == StreamError(MSG_ERR_TIMEOUT)
+    assert TextDelta("x" * 200000) in events
+    assert spawned[0].returncode is not None
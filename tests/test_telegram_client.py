@@ -167,3 +167,190 @@ def test_help_text_mentions_model_command():
 def test_help_text_mentions_routing():
     from src.constants import MSG_HELP
     assert "@claude" in MSG_HELP
+
+
+# ── per-chat ordering ─────────────────────────────────────────────────────────
+
+
+async def test_text_handler_serializes_same_chat_but_not_others():
+    import asyncio
+    from unittest.mock import patch
+
+    client = TelegramClient(make_config(chat_id="123456789"))
+    client._stream_handle = None
+    log: list[str] = []
+
+    async def fake_process(message, bot, on_message):
+        log.append(f"{message.content}:start")
+        await asyncio.sleep(0.02 if message.content == "first" else 0)
+        log.append(f"{message.content}:end")
+
+    handler = client._make_handler(on_message=None)
+    with patch.object(client, "_process", side_effect=fake_process):
+        await asyncio.gather(
+            handler(make_update(chat_id=123456789, text="first"), MagicMock()),
+            handler(make_update(chat_id=123456789, text="second"), MagicMock()),
+        )
+
+    assert log == ["first:start", "first:end", "second:start", "second:end"]
+
+
+# ── albums ────────────────────────────────────────────────────────────────────
+
+
+def _album_update(group: str, uid: str, caption: str | None = None) -> MagicMock:
+    from telegram import PhotoSize
+
+    photo = PhotoSize(f"id-{uid}", uid, 1280, 960)
+    update = MagicMock()
+    update.effective_chat.id = 123456789
+    update.message.photo = [photo]
+    update.message.caption = caption
+    update.message.media_group_id = group
+    update.message.date.timestamp.return_value = 1000.0
+    return update
+
+
+async def test_album_photos_are_analyzed_in_one_call(monkeypatch, tmp_path):
+    import asyncio
+    import dataclasses
+    from unittest.mock import AsyncMock, patch
+    from telegram import PhotoSize
+    from src.vision.client import VisionClient
+
+    monkeypatch.setattr("src.telegram.client.ALBUM_DEBOUNCE_SECONDS", 0.01)
+    vision = MagicMock(spec=VisionClient)
+    seen: list[bytes] = []
+
+    async def analyze_many(images, caption):
+        # downloads are only valid during the call
+        seen.extend(map(bytes, images))
+        return "three images"
+
+    vision.analyze_many = AsyncMock(side_effect=analyze_many)
+    client = TelegramClient(dataclasses.replace(make_config(), vision_target_size=0),
+                            vision_client=vision)
+
+    async def fake_get_file(self, *args, **kwargs):
+        path = tmp_path / self.file_unique_id
+        path.write_bytes(self.file_unique_id.encode())
+        return MagicMock(file_path=str(path), file_size=None)
+
+    handler = client._make_photo_handler(AsyncMock())
+    typing = MagicMock(start=AsyncMock(), stop=AsyncMock())
+    with (
+        patch.object(PhotoSize, "get_file", new=fake_get_file),
+        patch.object(client, "_process", new=AsyncMock()) as process,
+        patch("src.telegram.client.TelegramTypingIndicator", return_value=typing),
+    ):
+        await handler(_album_update("g1", "a", caption="compare these"), MagicMock())
+        await handler(_album_update("g1", "b"), MagicMock())
+        await handler(_album_update("g1", "c"), MagicMock())
+        await asyncio.sleep(0.05)
+
+    _, caption = vision.analyze_many.await_args.args
+    assert seen == [b"a", b"b", b"c"]
+    assert caption == "compare these"
+    vision.analyze_many.assert_awaited_once()
+    assert process.await_args.args[0].content == "three images"
+
+
+async def test_album_download_failure_closes_the_downloads_still_in_flight(monkeypatch):
+    import asyncio
+    from unittest.mock import AsyncMock, patch
+    from telegram import PhotoSize
+    from src.constants import MSG_IMAGE_ANALYSIS_FAILED
+    from src.vision.client import VisionClient
+
+    monkeypatch.setattr("src.telegram.client.ALBUM_DEBOUNCE_SECONDS", 0.01)
+    client = TelegramClient(make_config(), vision_client=MagicMock(spec=VisionClient))
+    opened: list[MagicMock] = []
+
+    async def fetch(file):
+        match file.file_path:
+            case "b":
+                raise OSError("download failed")
+            case _:
+                await asyncio.sleep(0.02)
+                media = MagicMock()
+                opened.append(media)
+                return media
+
+    async def fake_get_file(self, *args, **kwargs):
+        return MagicMock(file_path=self.file_unique_id)
+
+    handler = client._make_photo_handler(AsyncMock())
+    typing = MagicMock(start=AsyncMock(), stop=AsyncMock())
+    with (
+        patch.object(PhotoSize, "get_file", new=fake_get_file),
+        patch.object(client._downloader, "fetch", new=fetch),
+        patch.object(client, "send_message", new=AsyncMock()) as send,
+        patch("src.telegram.client.TelegramTypingIndicator", return_value=typing),
+    ):
+        await handler(_album_update("g1", "a"), MagicMock())
+        await handler(_album_update("g1", "b"), MagicMock())
+        await asyncio.sleep(0.1)
+
+    # the slow sibling was cancelled, not left to open a buffer after the stack closed
+    assert all(media.__exit__.called for media in opened)
+    send.assert_awaited_once_with("123456789", MSG_IMAGE_ANALYSIS_FAILED)
+
+async def test_album_bounds_images_and_pending_groups(monkeypatch):
+    import dataclasses
+    from unittest.mock import AsyncMock, patch
+    from src.vision.client import VisionClient
+
+    client = TelegramClient(
+        dataclasses.replace(make_config(), album_max_images=2, album_max_pending=1),
+        vision_client=MagicMock(spec=VisionClient),
+    )
+    handler = client._make_photo_handler(AsyncMock())
+    with patch.object(client, "_process", new=AsyncMock()):
+        await handler(_album_update("g1", "a"), MagicMock())
+        await handler(_album_update("g1", "b"), MagicMock())
+        await handler(_album_update("g1", "c"), MagicMock())
+        assert [p.file_unique_id for p in client._pending_albums["g1"]["photos"]] == ["a", "b"]
+
+        with patch("src.telegram.client.TelegramTypingIndicator"):
+            await handler(_album_update("g2", "d"), MagicMock())
+        assert list(client._pending_albums) == ["g2"]
+        assert len(client._album_flushes) == 1
+        client._pending_albums["g2"]["task"].cancel()
+        list(map(lambda t: t.cancel(), client._album_flushes))
+
+
+async def test_long_voice_note_sends_partial_transcripts(tmp_path):
+    from unittest.mock import AsyncMock, patch
+    from src.transcription.client import TranscriptionClient, TranscriptPart
+
+    class Segmented(TranscriptionClient):
+        async def transcribe(self, audio):
+            return ""
+
+        async def transcribe_stream(self, audio, duration=0.0):
+            yield TranscriptPart(1, 2, "first half")
+            yield TranscriptPart(2, 2, "second half")
+
+    client = TelegramClient(make_config(), transcriber=Segmented())
+    update = MagicMock()
+    update.effective_chat.id = 123456789
+    update.message.voice.duration = 300
+    audio = tmp_path / "voice.ogg"
+    audio.write_bytes(b"ogg")
+    update.message.voice.get_file = AsyncMock(
+        return_value=MagicMock(file_path=str(audio), file_size=3)
+    )
+    update.message.date.timestamp.return_value = 1000.0
+    typing = MagicMock(start=AsyncMock(), stop=AsyncMock())
+
+    with (
+        patch.object(client, "send_message", new=AsyncMock()) as send,
+        patch.object(client, "_process", new=AsyncMock()) as process,
+        patch("src.telegram.client.TelegramTypingIndicator", return_value=typing),
+    ):
+        await client._make_voice_handler(AsyncMock())(update, MagicMock())
+
+    assert [c.args[1] for c in send.await_args_list] == [
+        "🎙 (1/2) first half", "🎙 (2/2) second half"
+    ]
+    assert process.await_args.args[0].content == "first half second half"
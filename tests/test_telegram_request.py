@@ -0,0 +1,61 @@
+"""TDD: Telegram request pool tests written FIRST"""
+import asyncio
+import logging
+
+from telegram import Bot
+
+from benchmarks.fake_bot_api import FakeBotAPI
+from src.telegram.request import PoolWaitStats, api_method, build_request
+
+TOKEN = "123:test"
+
+
+def test_api_method_from_request_path():
+    assert api_method(f"/bot{TOKEN}/sendMessage") == "sendMessage"
+    assert api_method(f"/file/bot{TOKEN}/voice/file_1.oga") == "file"
+
+
+def test_pool_wait_stats_accumulate_and_warn(caplog):
+    stats = PoolWaitStats(warn_after=0.1)
+
+    with caplog.at_level(logging.WARNING):
+        stats.record("bot", "sendMessage", 0.01)
+        stats.record("bot", "sendMessage", 0.03)
+        stats.record("bot", "editMessageText", 0.2)
+
+    wait = stats.methods["sendMessage"]
+    assert (wait.count, round(wait.mean, 3), wait.worst) == (2, 0.02, 0.03)
+    assert stats.summary().startswith("editMessageText n=1")
+    assert len(caplog.records) == 1
+    assert "editMessageText" in caplog.records[0].getMessage()
+
+
+async def test_requests_queued_behind_a_full_pool_report_their_wait():
+    api = await FakeBotAPI(TOKEN, latency=0.05).start()
+    stats = PoolWaitStats()
+    request = build_request("bot", stats, pool_size=1, pool_timeout=5, connect_timeout=5,
+                            read_timeout=5, write_timeout=5)
+    bot = Bot(TOKEN, base_url=f"{api.url}/bot", request=request)
+    try:
+        await bot.initialize()
+        await asyncio.gather(*(bot.send_message(1, f"m{n}") for n in range(3)))
+    finally:
+        await bot.shutdown()
+        await api.stop()
+
+    waits = stats.methods["sendMessage"]
+    assert waits.count == 3
+    # one connection: the third message queues behind two 50 ms calls
+    assert waits.worst >= 0.09
+    assert stats.methods["getMe"].count == 1
+
+
+def test_http2_falls_back_without_h2(monkeypatch, caplog):
+    monkeypatch.setattr("src.telegram.request.importlib.util.find_spec", lambda name: None)
+
+    with caplog.at_level(logging.WARNING):
+        request = build_request("updates", PoolWaitStats(), pool_size=1, pool_timeout=1,
+                                connect_timeout=1, read_timeout=1, write_timeout=1, http2=True)
+
+    assert request.http_version == "1.1"
+    assert "h2 is not installed" in caplog.text
@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 from src.transcription.client import TranscriptionClient
 from src.transcription.whisper import WhisperTranscriptionClient
+from src.providers import ProviderRegistry
 
 
 def test_whisper_client_implements_abc():
@@ -12,7 +13,7 @@ def test_whisper_client_implements_abc():
 
 @pytest.mark.asyncio
 async def test_whisper_transcribe_calls_openai_with_audio():
-    client = WhisperTranscriptionClient(api_key="test-key")
+    client = WhisperTranscriptionClient(ProviderRegistry(openai_api_key="test-key"))
     audio_bytes = b"fake-audio-data"
 
     mock_response = MagicMock()
@@ -27,7 +28,7 @@ async def test_whisper_transcribe_calls_openai_with_audio():
     mock_openai = MagicMock()
     mock_openai.audio = mock_audio
 
-    with patch("src.transcription.whisper.AsyncOpenAI", return_value=mock_openai):
+    with patch("src.providers.AsyncOpenAI", return_value=mock_openai):
         result = await client.transcribe(audio_bytes)
 
     assert result == "hello from voice"
@@ -36,7 +37,7 @@ async def test_whisper_transcribe_calls_openai_with_audio():
 
 @pytest.mark.asyncio
 async def test_whisper_transcribe_returns_stripped_text():
-    client = WhisperTranscriptionClient(api_key="test-key")
+    client = WhisperTranscriptionClient(ProviderRegistry(openai_api_key="test-key"))
 
     mock_response = MagicMock()
     mock_response.text = "  hello  "
@@ -46,7 +47,7 @@ async def test_whisper_transcribe_returns_stripped_text():
     mock_openai = MagicMock()
     mock_openai.audio.transcriptions = mock_transcriptions
 
-    with patch("src.transcription.whisper.AsyncOpenAI", return_value=mock_openai):
+    with patch("src.providers.AsyncOpenAI", return_value=mock_openai):
         result = await client.transcribe(b"audio")
 
     assert result == "hello"
@@ -54,13 +55,218 @@ async def test_whisper_transcribe_returns_stripped_text():
 
 @pytest.mark.asyncio
 async def test_whisper_transcribe_raises_on_api_error():
-    client = WhisperTranscriptionClient(api_key="test-key")
+    client = WhisperTranscriptionClient(ProviderRegistry(openai_api_key="test-key"))
 
     mock_transcriptions = AsyncMock()
     mock_transcriptions.create = AsyncMock(side_effect=Exception("API error"))
     mock_openai = MagicMock()
     mock_openai.audio.transcriptions = mock_transcriptions
 
-    with patch("src.transcription.whisper.AsyncOpenAI", return_value=mock_openai):
+    with patch("src.providers.AsyncOpenAI", return_value=mock_openai):
         with pytest.raises(Exception, match="API error"):
             await client.transcribe(b"audio")
+
+
+# ── long voice notes: segmentation + transcribe_stream ────────────────────────
+
+
+def test_parse_silences_pairs_start_and_end():
+    from src.transcription.segment import parse_silences
+
+    log = (
+        "[silencedetect @ 0x1] silence_start: 10.5\n"
+        "[silencedetect @ 0x1] silence_end: 11.5 | silence_duration: 1\n"
+        "[silencedetect @ 0x1] silence_start: 99\n"
+    )
+    assert parse_silences(log) == [(10.5, 11.5)]
+
+
+def test_plan_cuts_prefers_latest_silence_in_window():
+    from src.transcription.segment import plan_cuts
+
+    silences = [(40.0, 42.0), (100.0, 102.0), (150.0, 151.0)]
+    assert plan_cuts(silences, duration=250, target=120) == [101.0, 221.0]
+
+
+def test_plan_cuts_short_audio_is_not_split():
+    from src.transcription.segment import plan_cuts
+
+    assert plan_cuts([(5.0, 6.0)], duration=90, target=120) == []
+
+
+async def test_split_audio_without_ffmpeg_returns_whole_clip():
+    from src.transcription.segment import split_audio
+
+    with patch("src.transcription.segment.shutil.which", return_value=None):
+        assert await split_audio(b"ogg", duration=600, target=120) == [b"ogg"]
+
+
+async def test_transcribe_stream_runs_concurrently_and_yields_in_order():
+    import asyncio
+
+    client = WhisperTranscriptionClient(
+        ProviderRegistry(openai_api_key="test-key"), max_concurrency=2
+    )
+    delays = {b"s1": 0.03, b"s2": 0.01, b"s3": 0.0}
+    active = peak = 0
+
+    async def fake_transcribe(segment: bytes) -> str:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(delays[segment])
+        active -= 1
+        return segment.decode()
+
+    with (
+        patch("src.transcription.whisper.split_audio", new=AsyncMock(return_value=list(delays))),
+        patch.object(client, "transcribe", side_effect=fake_transcribe),
+    ):
+        parts = [p async for p in client.transcribe_stream(b"long", duration=600)]
+
+    assert [(p.index, p.total, p.text) for p in parts] == [(1, 3, "s1"), (2, 3, "s2"), (3, 3, "s3")]
+    assert peak == 2
+
+
+async def test_failed_segment_cancels_and_awaits_the_others():
+    import asyncio
+
+    from src.transcription.segment import transcribe_segments
+
+    stopped: list[bytes] = []
+
+    async def fake_transcribe(segment: bytes) -> str:
+        match segment:
+            case b"bad":
+                raise RuntimeError("whisper failed")
+            case _:
+                try:
+                    await asyncio.sleep(60)
+                finally:
+                    stopped.append(segment)
+                return ""
+
+    with pytest.raises(RuntimeError):
+        [p async for p in transcribe_segments([b"bad", b"s2", b"s3"], fake_transcribe, 3)]
+
+    assert sorted(stopped) == [b"s2", b"s3"]
+
+
+async def test_ffmpeg_is_killed_when_the_split_is_cancelled(tmp_path):
+    import asyncio
+    import sys
+
+    from src.transcription.segment import split_audio
+
+    ffmpeg = tmp_path / "ffmpeg"
+    ffmpeg.write_text(f"#!{sys.executable}\nimport time\ntime.sleep(60)\n")
+    ffmpeg.chmod(0o755)
+    spawned: list = []
+    real_exec = asyncio.create_subprocess_exec
+
+    async def tracking_exec(*args, **kwargs):
+        spawned.append(await real_exec(*args, **kwargs))
+        return spawned[-1]
+
+    with patch("asyncio.create_subprocess_exec", side_effect=tracking_exec):
+        split = asyncio.create_task(split_audio(b"ogg", duration=600, target=120, ffmpeg_path=str(ffmpeg)))
+        while not spawned:
+            await asyncio.sleep(0.01)
+        split.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await split
+
+    assert spawned[0].returncode is not None
+
+
+async def test_ffmpeg_past_its_timeout_leaves_the_clip_whole(tmp_path, monkeypatch):
+    import sys
+
+    from src.transcription.segment import split_audio
+
+    ffmpeg = tmp_path / "ffmpeg"
+    ffmpeg.write_text(f"#!{sys.executable}\nimport time\ntime.sleep(60)\n")
+    ffmpeg.chmod(0o755)
+    monkeypatch.setattr("src.transcription.segment.FFMPEG_TIMEOUT", 0.2)
+
+    assert await split_audio(b"ogg", duration=600, target=120, ffmpeg_path=str(ffmpeg)) == [b"ogg"]
+
+
+async def test_local_client_transcribes_in_warm_worker_processes():
+    import asyncio
+    import os
+    from src.transcription.local import LocalTranscriptionClient
+
+    client = LocalTranscriptionClient(engine="stub", model="tiny", workers=2)
+    try:
+        warm = await asyncio.gather(*map(asyncio.wrap_future, client.start()))
+        text = await client.transcribe(b"x" * 10)
+    finally:
+        await client.aclose()
+
+    assert isinstance(client, TranscriptionClient)
+    assert client.model == "stub:tiny"
+    assert text == "[stub tiny] 10 bytes"
+    # model loaded once per worker, never in this process
+    assert all(loads == 1 for _, loads in warm)
+    assert os.getpid() not in {pid for pid, _ in warm}
+
+
+async def test_local_client_rejects_jobs_beyond_queue():
+    import asyncio
+    from src.transcription.local import LocalTranscriptionClient
+
+    client = LocalTranscriptionClient(engine="stub", workers=1, queue_size=0)
+    try:
+        results = await asyncio.gather(
+            client.transcribe(b"a"), client.transcribe(b"b"), return_exceptions=True
+        )
+    finally:
+        await client.aclose()
+
+    assert results[0] == "[stub base] 1 bytes"
+    assert isinstance(results[1], RuntimeError)
+    assert client.in_flight == 0
+
+
+async def test_local_client_job_keeps_its_slot_after_the_caller_is_cancelled(monkeypatch):
+    import asyncio
+    import concurrent.futures
+    import threading
+
+    from src.transcription.local import LocalTranscriptionClient
+
+    started, finish = threading.Event(), threading.Event()
+
+    def slow_run(audio: bytes) -> str:
+        started.set()
+        finish.wait(5)
+        return "done"
+
+    client = LocalTranscriptionClient(engine="stub", workers=1, queue_size=0)
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr("src.transcription.local._run", slow_run)
+    monkeypatch.setattr(client, "_executor", lambda: pool)
+    try:
+        caller = asyncio.create_task(client.transcribe(b"a"))
+        await asyncio.to_thread(started.wait, 5)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+
+        # the pool is still busy with the abandoned job: no room for another
+        assert client.in_flight == 1
+        with pytest.raises(RuntimeError):
+            await client.transcribe(b"b")
+    finally:
+        finish.set()
+        pool.shutdown(wait=True)
+
+    assert client.in_flight == 0
+
+
+def test_local_client_unknown_engine_fails():
+    from src.transcription.local import LocalTranscriptionClient
+
+    with pytest.raises(ValueError, match="nope"):
+        LocalTranscriptionClient(engine="nope")
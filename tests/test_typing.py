@@ -0,0 +1,104 @@
+"""TDD: TypingMultiplexer tests written FIRST"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from src.telegram.typing import TelegramTypingIndicator, TypingMultiplexer
+
+
+def make_bot() -> MagicMock:
+    bot = MagicMock()
+    bot.send_chat_action = AsyncMock()
+    return bot
+
+
+def actions(bot, chat_id: int) -> int:
+    return sum(c.kwargs["chat_id"] == chat_id for c in bot.send_chat_action.call_args_list)
+
+
+async def test_concurrent_jobs_in_one_chat_share_one_action_per_interval():
+    bot, mux = make_bot(), TypingMultiplexer(interval=0.05, edit_quiet=0.05)
+    jobs = [TelegramTypingIndicator(bot, "1", mux) for _ in range(3)]
+
+    await asyncio.gather(*(j.start("1") for j in jobs))
+    await asyncio.sleep(0.12)
+    assert mux.active("1") == 3
+    await asyncio.gather(*(j.stop("1") for j in jobs))
+
+    assert actions(bot, 1) == 3
+    assert mux.active("1") == 0
+
+
+async def test_loop_stops_with_the_last_job_and_chats_are_independent():
+    bot, mux = make_bot(), TypingMultiplexer(interval=0.05, edit_quiet=0.05)
+    first, other = TelegramTypingIndicator(bot, "1", mux), TelegramTypingIndicator(bot, "2", mux)
+
+    await first.start("1")
+    await other.start("2")
+    await asyncio.sleep(0.01)
+    await first.stop("1")
+    await first.stop("1")  # idempotent: does not release the other chat's hold
+    await asyncio.sleep(0.07)
+    await other.stop("2")
+
+    assert actions(bot, 1) == 1
+    assert actions(bot, 2) == 2
+
+
+async def test_next_job_waits_out_the_interval_of_the_previous_one():
+    bot, mux = make_bot(), TypingMultiplexer(interval=0.1, edit_quiet=0.1)
+    job = TelegramTypingIndicator(bot, "1", mux)
+
+    await job.start("1")
+    await asyncio.sleep(0.01)
+    await job.stop("1")
+    await job.start("1")
+    await asyncio.sleep(0.03)
+
+    assert actions(bot, 1) == 1
+    await job.stop("1")
+
+
+async def test_recent_streaming_edit_skips_the_action():
+    now = [100.0]
+    bot, mux = make_bot(), TypingMultiplexer(interval=5, edit_quiet=10, clock=lambda: now[0])
+
+    mux.edited("1")
+    chat = mux._chats["1"]
+    assert await mux._tick(bot, "1", chat) == 10
+    now[0] += 4
+    assert await mux._tick(bot, "1", chat) == 6
+    assert (actions(bot, 1), mux.skipped) == (0, 2)
+
+    now[0] += 6  # quiet since the edit → typing resumes
+    await mux._tick(bot, "1", chat)
+    assert actions(bot, 1) == 1
+    assert await mux._tick(bot, "1", chat) == 5
+    chat.forget.cancel()
+
+
+async def test_actions_dropped_by_the_rate_limiter_are_not_counted_as_sent():
+    from src.telegram.ratelimit import LaneDropped
+
+    bot, mux = make_bot(), TypingMultiplexer(interval=0.05, edit_quiet=0.05)
+    bot.send_chat_action = AsyncMock(side_effect=[LaneDropped(1), None])
+    job = TelegramTypingIndicator(bot, "1", mux)
+
+    await job.start("1")
+    await asyncio.sleep(0.07)
+    await job.stop("1")
+
+    assert (mux.sent, mux.dropped) == (1, 1)
+
+
+async def test_idle_chats_are_forgotten_once_their_windows_pass():
+    bot, mux = make_bot(), TypingMultiplexer(interval=0.03, edit_quiet=0.03)
+    job = TelegramTypingIndicator(bot, "1", mux)
+
+    await job.start("1")
+    await asyncio.sleep(0.01)
+    await job.stop("1")
+    mux.edited("2")  # an edit in a chat nobody is typing in
+    assert set(mux._chats) == {"1", "2"}  # still inside the interval / quiet window
+
+    await asyncio.sleep(0.06)
+    assert mux._chats == {}
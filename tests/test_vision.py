@@ -2,15 +2,17 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from src.providers import ProviderRegistry
+
 
 async def test_claude_vision_analyze_calls_api_with_image():
     from src.vision.claude import ClaudeVisionClient
 
-    client = ClaudeVisionClient(api_key="test-key")
+    client = ClaudeVisionClient(ProviderRegistry(anthropic_api_key="test-key"))
     mock_response = MagicMock()
     mock_response.content = [MagicMock(text="  a cat  ")]
 
-    with patch("src.vision.claude.AsyncAnthropic") as mock_cls:
+    with patch("src.providers.AsyncAnthropic") as mock_cls:
         mock_anthropic = AsyncMock()
         mock_anthropic.messages.create = AsyncMock(return_value=mock_response)
         mock_cls.return_value = mock_anthropic
@@ -26,11 +28,11 @@ async def test_claude_vision_analyze_calls_api_with_image():
 async def test_claude_vision_analyze_returns_stripped_text():
     from src.vision.claude import ClaudeVisionClient
 
-    client = ClaudeVisionClient(api_key="test-key")
+    client = ClaudeVisionClient(ProviderRegistry(anthropic_api_key="test-key"))
     mock_response = MagicMock()
     mock_response.content = [MagicMock(text="  a dog \n")]
 
-    with patch("src.vision.claude.AsyncAnthropic") as mock_cls:
+    with patch("src.providers.AsyncAnthropic") as mock_cls:
         mock_anthropic = AsyncMock()
         mock_anthropic.messages.create = AsyncMock(return_value=mock_response)
         mock_cls.return_value = mock_anthropic
@@ -43,11 +45,11 @@ async def test_claude_vision_analyze_returns_stripped_text():
 async def test_claude_vision_analyze_uses_caption_when_provided():
     from src.vision.claude import ClaudeVisionClient
 
-    client = ClaudeVisionClient(api_key="test-key")
+    client = ClaudeVisionClient(ProviderRegistry(anthropic_api_key="test-key"))
     mock_response = MagicMock()
     mock_response.content = [MagicMock(text="answer")]
 
-    with patch("src.vision.claude.AsyncAnthropic") as mock_cls:
+    with patch("src.providers.AsyncAnthropic") as mock_cls:
         mock_anthropic = AsyncMock()
         mock_anthropic.messages.create = AsyncMock(return_value=mock_response)
         mock_cls.return_value = mock_anthropic
@@ -63,9 +65,9 @@ async def test_claude_vision_analyze_uses_caption_when_provided():
 async def test_claude_vision_analyze_raises_on_api_error():
     from src.vision.claude import ClaudeVisionClient
 
-    client = ClaudeVisionClient(api_key="test-key")
+    client = ClaudeVisionClient(ProviderRegistry(anthropic_api_key="test-key"))
 
-    with patch("src.vision.claude.AsyncAnthropic") as mock_cls:
+    with patch("src.providers.AsyncAnthropic") as mock_cls:
         mock_anthropic = AsyncMock()
         mock_anthropic.messages.create = AsyncMock(side_effect=RuntimeError("API down"))
         mock_cls.return_value = mock_anthropic
@@ -80,13 +82,13 @@ async def test_claude_vision_analyze_raises_on_api_error():
 async def test_openai_vision_analyze_calls_api_with_image():
     from src.vision.openai import OpenAIVisionClient
 
-    client = OpenAIVisionClient(api_key="test-key")
+    client = OpenAIVisionClient(ProviderRegistry(openai_api_key="test-key"))
     mock_choice = MagicMock()
     mock_choice.message.content = "  a cat  "
     mock_response = MagicMock()
     mock_response.choices = [mock_choice]
 
-    with patch("src.vision.openai.AsyncOpenAI") as mock_cls:
+    with patch("src.providers.AsyncOpenAI") as mock_cls:
         mock_openai = AsyncMock()
         mock_openai.chat.completions.create = AsyncMock(return_value=mock_response)
         mock_cls.return_value = mock_openai
@@ -102,13 +104,13 @@ async def test_openai_vision_analyze_calls_api_with_image():
 async def test_openai_vision_analyze_returns_stripped_text():
     from src.vision.openai import OpenAIVisionClient
 
-    client = OpenAIVisionClient(api_key="test-key")
+    client = OpenAIVisionClient(ProviderRegistry(openai_api_key="test-key"))
     mock_choice = MagicMock()
     mock_choice.message.content = "  a dog \n"
     mock_response = MagicMock()
     mock_response.choices = [mock_choice]
 
-    with patch("src.vision.openai.AsyncOpenAI") as mock_cls:
+    with patch("src.providers.AsyncOpenAI") as mock_cls:
         mock_openai = AsyncMock()
         mock_openai.chat.completions.create = AsyncMock(return_value=mock_response)
         mock_cls.return_value = mock_openai
@@ -121,13 +123,13 @@ async def test_openai_vision_analyze_returns_stripped_text():
 async def test_openai_vision_analyze_uses_caption_when_provided():
     from src.vision.openai import OpenAIVisionClient
 
-    client = OpenAIVisionClient(api_key="test-key")
+    client = OpenAIVisionClient(ProviderRegistry(openai_api_key="test-key"))
     mock_choice = MagicMock()
     mock_choice.message.content = "answer"
     mock_response = MagicMock()
     mock_response.choices = [mock_choice]
 
-    with patch("src.vision.openai.AsyncOpenAI") as mock_cls:
+    with patch("src.providers.AsyncOpenAI") as mock_cls:
         mock_openai = AsyncMock()
         mock_openai.chat.completions.create = AsyncMock(return_value=mock_response)
         mock_cls.return_value = mock_openai
@@ -143,12 +145,64 @@ async def test_openai_vision_analyze_uses_caption_when_provided():
 async def test_openai_vision_analyze_raises_on_api_error():
     from src.vision.openai import OpenAIVisionClient
 
-    client = OpenAIVisionClient(api_key="test-key")
+    client = OpenAIVisionClient(ProviderRegistry(openai_api_key="test-key"))
 
-    with patch("src.vision.openai.AsyncOpenAI") as mock_cls:
+    with patch("src.providers.AsyncOpenAI") as mock_cls:
         mock_openai = AsyncMock()
         mock_openai.chat.completions.create = AsyncMock(side_effect=RuntimeError("API down"))
         mock_cls.return_value = mock_openai
 
         with pytest.raises(RuntimeError):
             await client.analyze(b"bytes")
+
+
+# ── albums (analyze_many) ─────────────────────────────────────────────────────
+
+
+async def test_claude_analyze_many_sends_one_request_with_all_images():
+    from src.vision.claude import ClaudeVisionClient
+
+    client = ClaudeVisionClient(ProviderRegistry(anthropic_api_key="test-key"))
+    mock_response = MagicMock()
+    mock_response.content = [MagicMock(text="three screenshots")]
+
+    with patch("src.providers.AsyncAnthropic") as mock_cls:
+        mock_anthropic = AsyncMock()
+        mock_anthropic.messages.create = AsyncMock(return_value=mock_response)
+        mock_cls.return_value = mock_anthropic
+
+        result = await client.analyze_many([b"a", b"b", b"c"], caption="compare")
+
+    mock_anthropic.messages.create.assert_awaited_once()
+    content = mock_anthropic.messages.create.call_args.kwargs["messages"][0]["content"]
+    assert [b["type"] for b in content] == ["image", "image", "image", "text"]
+    assert result == "three screenshots"
+
+
+async def test_openai_analyze_many_sends_one_request_with_all_images():
+    from src.vision.openai import OpenAIVisionClient
+
+    client = OpenAIVisionClient(ProviderRegistry(openai_api_key="test-key"))
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock(message=MagicMock(content="two"))]
+
+    with patch("src.providers.AsyncOpenAI") as mock_cls:
+        mock_openai = AsyncMock()
+        mock_openai.chat.completions.create = AsyncMock(return_value=mock_response)
+        mock_cls.return_value = mock_openai
+
+        await client.analyze_many([b"a", b"b"])
+
+    mock_openai.chat.completions.create.assert_awaited_once()
+    content = mock_openai.chat.completions.create.call_args.kwargs["messages"][0]["content"]
+    assert [b["type"] for b in content] == ["image_url", "image_url", "text"]
+
+
+async def test_default_analyze_many_fans_out_and_labels():
+    from src.vision.client import VisionClient
+
+    class Single(VisionClient):
+        async def analyze(self, image_bytes, caption=None):
+            return bytes(image_bytes).decode()
+
+    assert await Single().analyze_many([b"x", b"y"]) == "Image 1: x\n\nImage 2: y"
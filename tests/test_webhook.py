@@ -0,0 +1,138 @@
+"""TDD: webhook transport and embedded HTTP server tests written FIRST"""
+import asyncio
+import dataclasses
+import json
+import socket
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from benchmarks.fake_bot_api import FakeBotAPI
+from src.constants import WEBHOOK_SECRET_HEADER
+from src.http_server import HTTPServer, Request, Response
+from src.telegram.client import TelegramClient
+from src.telegram.webhook import serve_webhook, webhook_handler, webhook_path
+from tests.test_telegram_client import make_config
+
+TOKEN = "123:test"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def echo(request: Request) -> Response:
+    return Response(body=request.body)
+
+
+async def test_server_routes_and_keeps_connections_alive():
+    server = await HTTPServer({("POST", "/echo"): echo}, max_body=16).start()
+    try:
+        async with httpx.AsyncClient(base_url=server.url) as client:
+            first = await client.post("/echo", content=b"hi")
+            second = await client.post("/echo?x=1", content=b"again")
+            missing = await client.post("/nope")
+            wrong_method = await client.get("/echo")
+            too_big = await client.post("/echo", content=b"x" * 17)
+    finally:
+        await server.stop()
+
+    assert (first.status_code, first.content) == (200, b"hi")
+    assert second.content == b"again"
+    assert (missing.status_code, wrong_method.status_code, too_big.status_code) == (404, 405, 413)
+
+
+async def test_server_returns_500_when_handler_raises():
+    async def boom(request: Request) -> Response:
+        raise RuntimeError("boom")
+
+    server = await HTTPServer({("GET", "/"): boom}).start()
+    try:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(server.url + "/")
+    finally:
+        await server.stop()
+    assert response.status_code == 500
+
+
+def test_webhook_path_from_url():
+    assert webhook_path("https://bot.example.com/telegram/hook") == "/telegram/hook"
+    assert webhook_path("https://bot.example.com") == "/"
+
+
+async def test_webhook_handler_checks_secret_and_queues_update():
+    app = MagicMock()
+    app.update_queue = asyncio.Queue()
+    handle = webhook_handler(app, "s3cret")
+    update = {"update_id": 7}
+
+    def request(secret: str, body: bytes) -> Request:
+        return Request("POST", "/", {WEBHOOK_SECRET_HEADER: secret}, body)
+
+    rejected = await handle(request("wrong", json.dumps(update).encode()))
+    garbage = await handle(request("s3cret", b"not json"))
+    not_objects = [await handle(request("s3cret", body)) for body in (b"[1, 2]", b'"hi"', b"null")]
+    accepted = await handle(request("s3cret", json.dumps(update).encode()))
+
+    assert rejected.status == 403
+    assert (garbage.status, accepted.status) == (200, 200)
+    assert [r.status for r in not_objects] == [200, 200, 200]
+    assert app.update_queue.qsize() == 1
+    assert app.update_queue.get_nowait().update_id == 7
+
+
+async def test_serve_webhook_tears_the_application_down_when_the_port_is_taken():
+    taken = await HTTPServer({}).start()
+    app = MagicMock()
+    list(map(lambda name: setattr(app, name, AsyncMock()), (
+        "initialize", "start", "stop", "shutdown", "post_init", "post_stop", "post_shutdown",
+    )))
+    try:
+        with pytest.raises(OSError):
+            await serve_webhook(app, "http://x/hook", "s", "127.0.0.1", taken.port, asyncio.Event())
+    finally:
+        await taken.stop()
+
+    app.stop.assert_awaited_once()
+    app.shutdown.assert_awaited_once()
+    app.post_shutdown.assert_awaited_once()
+    app.bot.set_webhook.assert_not_called()
+
+async def test_webhook_mode_end_to_end_against_fake_bot_api():
+    api = await FakeBotAPI(TOKEN).start()
+    port = free_port()
+    config = dataclasses.replace(
+        make_config(token=TOKEN),
+        telegram_api_url=api.url,
+        telegram_mode="webhook",
+        webhook_url=f"http://127.0.0.1:{port}/hook",
+        webhook_listen="127.0.0.1",
+        webhook_port=port,
+        webhook_secret="s3cret",
+    )
+    client = TelegramClient(config)
+    replied = asyncio.Event()
+    api.on_sent = lambda sent: replied.set()
+
+    async def on_message(message) -> str:
+        return "echo: " + message.content
+
+    client.build_application(on_message)
+    stop = asyncio.Event()
+    serving = asyncio.create_task(client.serve_webhook(stop))
+    try:
+        while api.webhook is None:
+            await asyncio.sleep(0.01)
+        assert api.webhook == (config.webhook_url, "s3cret")
+        await api.inject(123456789, "hello")
+        await asyncio.wait_for(replied.wait(), 5)
+    finally:
+        stop.set()
+        await serving
+        await api.stop()
+
+    assert api.sent[0].text == "echo: hello"
+    assert "getUpdates" not in api.calls